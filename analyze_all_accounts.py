@@ -1,7 +1,15 @@
 """
 全アカウントの価格取得状況を分析
+
+使用例:
+    python analyze_all_accounts.py
+
+    # 稼働中の master.db ではなく分析用スナップショットから出品一覧を読む
+    # （事前に python inventory/scripts/export_snapshot.py を実行）
+    python analyze_all_accounts.py --snapshot
 """
 import sys
+import argparse
 from pathlib import Path
 from collections import defaultdict
 
@@ -11,14 +19,40 @@ sys.path.insert(0, str(Path(__file__).resolve().parent))
 from inventory.core.master_db import MasterDB
 from platforms.base.accounts.manager import AccountManager
 
+def load_listed_asins_from_snapshot():
+    """スナップショットから出品済み（BASE）のASINをアカウント別に取得"""
+    from inventory.core.snapshot_store import SnapshotReader
+
+    reader = SnapshotReader()
+    info = reader.info('listings')
+    print(f"スナップショット: {reader.snapshot_dir}（{info['exported_at']} 時点）")
+
+    listings = reader.table('listings', columns=['asin', 'platform', 'account_id', 'status'])
+    listed = listings[(listings['platform'] == 'base') & (listings['status'] == 'listed')]
+    return {
+        account_id: [{'asin': asin} for asin in group['asin']]
+        for account_id, group in listed.groupby('account_id')
+    }
+
+
 def main():
+    parser = argparse.ArgumentParser(description='全アカウントの価格取得状況を分析')
+    parser.add_argument('--snapshot', action='store_true',
+                        help='分析用スナップショット（export_snapshot.py で作成）から出品一覧を読む')
+    args = parser.parse_args()
+
     print("=" * 70)
     print("全アカウントの価格取得状況分析")
     print("=" * 70)
     print()
 
-    master_db = MasterDB()
     account_manager = AccountManager()
+    if args.snapshot:
+        master_db = None
+        snapshot_listings = load_listed_asins_from_snapshot()
+    else:
+        master_db = MasterDB()
+        snapshot_listings = None
 
     # アクティブなアカウントを取得
     accounts = account_manager.get_active_accounts()
@@ -41,11 +75,14 @@ def main():
         print(f"【{account_name}】({account_id})")
 
         # 出品一覧を取得
-        listings = master_db.get_listings_by_account(
-            platform='base',
-            account_id=account_id,
-            status='listed'
-        )
+        if snapshot_listings is not None:
+            listings = snapshot_listings.get(account_id, [])
+        else:
+            listings = master_db.get_listings_by_account(
+                platform='base',
+                account_id=account_id,
+                status='listed'
+            )
 
         print(f"  出品数: {len(listings)}件")
 
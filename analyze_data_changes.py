@@ -1,18 +1,42 @@
 #!/usr/bin/env python3
 """
 バックアップとの詳細な比較分析
+
+使用例:
+    python analyze_data_changes.py
+
+    # 現在のDBの代わりに分析用スナップショット（products / listings）を読む
+    # （事前に python inventory/scripts/export_snapshot.py を実行）
+    python analyze_data_changes.py --snapshot
 """
+import sys
 import sqlite3
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
 
-def compare_dbs():
-    """2つのDBを比較して、タイトルが消失した商品を特定"""
+def compare_dbs(snapshot: bool = False):
+    """
+    2つのDBを比較して、タイトルが消失した商品を特定
+
+    Args:
+        snapshot: Trueの場合、現在のDBとして分析用スナップショットを使う
+    """
 
     print("=" * 70)
     print("バックアップとの詳細比較分析")
     print("=" * 70)
 
     # 現在のDBからASINとtitle_jaのマッピングを取得
-    current_conn = sqlite3.connect(r'C:\Users\hiroo\Documents\GitHub\ecauto\inventory\data\master.db')
+    if snapshot:
+        from inventory.core.snapshot_store import SnapshotReader
+
+        reader = SnapshotReader()
+        print(f"スナップショット: {reader.snapshot_dir}（{reader.info('products')['exported_at']} 時点）")
+        current_conn = reader.to_sqlite(['products', 'listings'])
+    else:
+        current_conn = sqlite3.connect(r'C:\Users\hiroo\Documents\GitHub\ecauto\inventory\data\master.db')
     current_cur = current_conn.cursor()
 
     backup_conn = sqlite3.connect(r'C:\Users\hiroo\Documents\GitHub\ecauto\inventory\data\master.db.backup_20251126_issue013')
@@ -123,4 +147,9 @@ def compare_dbs():
     print("=" * 70)
 
 if __name__ == '__main__':
-    compare_dbs()
+    parser = argparse.ArgumentParser(description='バックアップとの詳細な比較分析')
+    parser.add_argument('--snapshot', action='store_true',
+                        help='現在のDBの代わりに分析用スナップショット（export_snapshot.py で作成）を読む')
+    args = parser.parse_args()
+
+    compare_dbs(snapshot=args.snapshot)
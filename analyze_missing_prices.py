@@ -1,8 +1,16 @@
 """
 価格情報が欠損している商品の詳細分析
+
+使用例:
+    python analyze_missing_prices.py
+
+    # 稼働中の master.db ではなく分析用スナップショットから出品一覧を読む
+    # （事前に python inventory/scripts/export_snapshot.py を実行）
+    python analyze_missing_prices.py --snapshot
 """
 import sys
 import os
+import argparse
 from pathlib import Path
 import json
 
@@ -15,12 +23,24 @@ from integrations.amazon.sp_api_client import AmazonSPAPIClient
 from integrations.amazon.config import SP_API_CREDENTIALS
 
 def main():
+    parser = argparse.ArgumentParser(description='価格情報が欠損している商品の詳細分析')
+    parser.add_argument('--snapshot', action='store_true',
+                        help='分析用スナップショット（export_snapshot.py で作成）から出品一覧を読む')
+    args = parser.parse_args()
+
     print("=" * 70)
     print("価格情報が欠損している商品の詳細分析")
     print("=" * 70)
     print()
 
-    master_db = MasterDB()
+    if args.snapshot:
+        from inventory.core.snapshot_store import SnapshotReader
+
+        listing_source = SnapshotReader()
+        print(f"スナップショット: {listing_source.snapshot_dir}"
+              f"（{listing_source.info('listings')['exported_at']} 時点）")
+    else:
+        listing_source = MasterDB()
     cache = AmazonProductCache()
 
     # 1. 価格情報がない商品を抽出
@@ -29,7 +49,7 @@ def main():
     # 全出品を取得
     all_listings = []
     for account_id in ['base_account_1', 'base_account_2']:
-        listings = master_db.get_listings_by_account(
+        listings = listing_source.get_listings_by_account(
             platform='base',
             account_id=account_id,
             status='listed'
@@ -2,9 +2,17 @@
 価格取得失敗の詳細分析スクリプト
 
 「価格情報が取得できません」の原因を詳細に分類します
+
+使用例:
+    python analyze_price_failures.py
+
+    # 稼働中の master.db ではなく分析用スナップショットから出品一覧を読む
+    # （事前に python inventory/scripts/export_snapshot.py を実行）
+    python analyze_price_failures.py --snapshot
 """
 import sys
 import os
+import argparse
 from pathlib import Path
 from collections import defaultdict
 
@@ -16,6 +24,11 @@ from integrations.amazon.sp_api_client import AmazonSPAPIClient
 from integrations.amazon.config import SP_API_CREDENTIALS
 
 def main():
+    parser = argparse.ArgumentParser(description='価格取得失敗の詳細分析')
+    parser.add_argument('--snapshot', action='store_true',
+                        help='分析用スナップショット（export_snapshot.py で作成）から出品一覧を読む')
+    args = parser.parse_args()
+
     print("=" * 70)
     print("価格取得失敗の詳細分析")
     print("=" * 70)
@@ -23,9 +36,16 @@ def main():
 
     # 1. 出品済み商品のASINを取得
     print("【1. 出品済み商品の取得】")
-    master_db = MasterDB()
+    if args.snapshot:
+        from inventory.core.snapshot_store import SnapshotReader
+
+        listing_source = SnapshotReader()
+        print(f"  スナップショット: {listing_source.snapshot_dir}"
+              f"（{listing_source.info('listings')['exported_at']} 時点）")
+    else:
+        listing_source = MasterDB()
 
-    listings = master_db.get_listings_by_account(
+    listings = listing_source.get_listings_by_account(
         platform='base',
         account_id='base_account_1',  # テスト用に1アカウントのみ
         status='listed'
@@ -0,0 +1,200 @@
+"""
+モジュール読み込み時間のチェック（python -X importtime）
+
+状態確認・キュー確認等の短いコマンドや、マルチアカウントマネージャーが起動する子プロセスは、
+毎回モジュールの読み込み時間を払う。重い依存（sp_api / yfinance / pandas / playwright 等）が
+モジュールの先頭で読み込まれるようになっていないかを確認する。
+
+チェック内容（対象ごと）:
+    - 読み込み時間（-X importtime の累積時間、複数回の最小値）が予算以内か
+    - 読み込んではいけないモジュール（forbidden）が読み込まれていないか
+
+予算超過・禁止モジュールの読み込みがあれば終了コード1で終了する（CIやコミット前の確認用）。
+読み込み時間は環境によって変わるため、遅い環境では --budget-scale で予算を調整する。
+
+使い方:
+    python benchmarks/import_time.py
+
+    # 一部のみ・予算を2倍に
+    python benchmarks/import_time.py --only ecauto,integrations.amazon.sp_api_client --budget-scale 2
+
+    # 読み込みに時間がかかっているモジュールの上位を表示
+    python benchmarks/import_time.py --only common.pricing.calculator --top 15
+"""
+
+import sys
+import argparse
+import subprocess
+from pathlib import Path
+from typing import Dict, Any, List, Set, Tuple
+
+project_root = Path(__file__).resolve().parent.parent
+
+# 重い依存（起動時に読み込まれると数百ms〜数秒かかる）
+HEAVY_MODULES = ['sp_api', 'yfinance', 'pandas', 'numpy', 'playwright']
+
+# 対象モジュール → 予算（ms）と読み込んではいけないモジュール
+TARGETS: Dict[str, Dict[str, Any]] = {
+    'ecauto': {
+        'budget_ms': 30,
+        'forbidden': HEAVY_MODULES + ['requests', 'yaml', 'sqlite3', 'argparse'],
+    },
+    'integrations.amazon.sp_api_client': {
+        'budget_ms': 80,
+        'forbidden': HEAVY_MODULES + ['requests'],
+    },
+    'common.pricing': {
+        'budget_ms': 10,
+        'forbidden': HEAVY_MODULES + ['common.pricing.calculator', 'common.currency'],
+    },
+    'common.pricing.calculator': {
+        'budget_ms': 60,
+        'forbidden': HEAVY_MODULES,
+    },
+    'common.currency': {
+        'budget_ms': 20,
+        'forbidden': HEAVY_MODULES,
+    },
+    'inventory.core.master_db': {
+        'budget_ms': 40,
+        'forbidden': HEAVY_MODULES + ['requests'],
+    },
+    # AccountManager → BASE APIクライアント（requests）は読み込まれる
+    'scheduler.queue_manager': {
+        'budget_ms': 150,
+        'forbidden': HEAVY_MODULES,
+    },
+    'scheduled_tasks.daemon_base': {
+        'budget_ms': 100,
+        'forbidden': HEAVY_MODULES + ['requests'],
+    },
+}
+
+
+def measure(module: str = None) -> Tuple[float, Dict[str, float]]:
+    """
+    別プロセスで module を読み込み、-X importtime の結果を返す
+
+    Args:
+        module: 対象モジュール（Noneの場合はインタプリタの起動時に読み込まれるモジュールのみ）
+
+    Returns:
+        tuple: (対象モジュールの累積時間ms, {読み込まれたモジュール名: 累積時間ms})
+    """
+    code = f"import sys; sys.path.insert(0, {str(project_root)!r})"
+    if module:
+        code += f"; import {module}"
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True,
+        text=True,
+        cwd=str(project_root),
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{module} の読み込みに失敗しました:\n{result.stderr[-2000:]}")
+
+    # 形式: "import time: self [us] | cumulative | imported package"
+    modules: Dict[str, float] = {}
+    target_ms = None
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|', 2)
+        cumulative_ms = int(cumulative) / 1000
+        stripped = name.strip()
+        modules[stripped] = cumulative_ms
+        if module and name == ' ' + module:
+            # インデントなし（トップレベル）の行が対象モジュール本体
+            target_ms = cumulative_ms
+    if target_ms is None:
+        target_ms = modules.get(module, 0.0)
+    return target_ms, modules
+
+
+def check(
+    module: str,
+    spec: Dict[str, Any],
+    repeat: int,
+    budget_scale: float,
+    startup_modules: Set[str]
+) -> Dict[str, Any]:
+    """
+    対象モジュールを repeat 回計測し、予算・禁止モジュールを確認
+
+    Args:
+        startup_modules: インタプリタの起動時（site・.pth等）に読み込まれるモジュール（対象外）
+    """
+    timings = []
+    loaded: Dict[str, float] = {}
+    for _ in range(repeat):
+        target_ms, modules = measure(module)
+        timings.append(target_ms)
+        if not loaded or target_ms <= min(timings):
+            loaded = {name: ms for name, ms in modules.items() if name not in startup_modules}
+
+    budget_ms = spec['budget_ms'] * budget_scale
+    forbidden = sorted(
+        name for name in loaded
+        if any(name == f or name.startswith(f + '.') for f in spec['forbidden'])
+    )
+    # 上位パッケージのみ表示（sp_api.api.* 等を1行にまとめる）
+    forbidden_roots = sorted({
+        next(f for f in spec['forbidden'] if name == f or name.startswith(f + '.'))
+        for name in forbidden
+    })
+    best_ms = min(timings)
+    return {
+        'module': module,
+        'ms': best_ms,
+        'budget_ms': budget_ms,
+        'forbidden': forbidden_roots,
+        'ok': best_ms <= budget_ms and not forbidden_roots,
+        'modules': loaded,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='モジュール読み込み時間のチェック（python -X importtime）')
+    parser.add_argument('--only', type=str, help=f"対象モジュール（カンマ区切り: {', '.join(TARGETS)}）")
+    parser.add_argument('--repeat', type=int, default=3, help='計測回数（最小値を使用、デフォルト: 3）')
+    parser.add_argument('--budget-scale', type=float, default=1.0, help='予算の倍率（遅い環境用、デフォルト: 1.0）')
+    parser.add_argument('--top', type=int, default=0, help='読み込み時間の上位N件のモジュールを表示')
+    args = parser.parse_args()
+
+    names = [n.strip() for n in args.only.split(',')] if args.only else list(TARGETS)
+    unknown = [n for n in names if n not in TARGETS]
+    if unknown:
+        parser.error(f"不明な対象: {', '.join(unknown)}")
+
+    _, startup = measure()
+    startup_modules = set(startup)
+
+    results: List[Dict[str, Any]] = []
+    print(f"{'モジュール':<40}{'時間(ms)':>10}{'予算(ms)':>10}  結果")
+    print("-" * 75)
+    for name in names:
+        result = check(name, TARGETS[name], args.repeat, args.budget_scale, startup_modules)
+        results.append(result)
+        status = 'OK' if result['ok'] else 'NG'
+        print(f"{name:<40}{result['ms']:>10.1f}{result['budget_ms']:>10.0f}  {status}")
+        if result['forbidden']:
+            print(f"    読み込まれた禁止モジュール: {', '.join(result['forbidden'])}")
+        if args.top:
+            top = sorted(
+                ((m, ms) for m, ms in result['modules'].items() if m != name),
+                key=lambda x: x[1],
+                reverse=True
+            )[:args.top]
+            for module, ms in top:
+                print(f"    {ms:>8.1f}ms  {module}")
+
+    failed = [r['module'] for r in results if not r['ok']]
+    print("-" * 75)
+    if failed:
+        print(f"NG: {', '.join(failed)}")
+        sys.exit(1)
+    print("すべて予算内です")
+
+
+if __name__ == '__main__':
+    main()
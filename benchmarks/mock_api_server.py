@@ -0,0 +1,755 @@
+"""
+SP-API / BASE / eBay のローカルモックサーバー
+
+認証情報・ネットワークなしで同期・出品デーモンを動かし、スループットを計測するためのサーバー。
+1プロセスで3サービスを提供し、本番と同じレート制限を再現する。
+
+- SP-API（/sp-api, LWA: /lwa/auth/o2/token）
+    getItemOffersBatch 0.1 req/s, getItemOffers 0.5 req/s, getPricing 0.5 req/s, getCatalogItem 2 req/s
+    超過時は 429 + {"errors": [{"code": "QuotaExceeded", ...}]}、x-amzn-RateLimit-Limit ヘッダー付き
+- BASE（/base/1）
+    アクセストークンごとに 5,000 req/h、超過時は 400 + {"error": "hour_api_limit", ...}
+- eBay（/ebay）
+    アクセストークンごとに 5 req/s（バースト10）、超過時は 429 + Retry-After
+
+レスポンスの遅延（--latency-ms, --jitter-ms）とエラー注入（--error-rate で 500/503 を返す）を設定できる。
+商品情報・オファーはASINから決定的に生成し、BASE・eBayの商品はメモリ上に保持する（再起動で消える）。
+
+使い方:
+    python benchmarks/mock_api_server.py --port 8800 --latency-ms 150 --error-rate 0.01
+
+    # クライアント側（AmazonSPAPIClient, BaseAPIClient, EbayAPIClient が全てモックに向く）
+    ECAUTO_MOCK_API_URL=http://127.0.0.1:8800 python scheduled_tasks/sync_inventory_daemon.py
+
+クォータ等は --config でJSONを渡して上書きできる（DEFAULT_CONFIG と同じ構造、指定した項目のみ上書き）。
+"""
+
+import sys
+import json
+import time
+import random
+import hashlib
+import logging
+import argparse
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Optional, Tuple
+from urllib.parse import urlsplit, parse_qs
+
+logger = logging.getLogger('mock_api')
+
+DEFAULT_PORT = 8800
+
+JP_MARKETPLACE_ID = 'A1VC38T7YXB528'
+
+DEFAULT_CONFIG = {
+    'latency_ms': 0,          # 全レスポンスに加える遅延（ミリ秒）
+    'jitter_ms': 0,           # 遅延の揺らぎ（0〜jitter_ms をランダムに加算）
+    'error_rate': 0.0,        # 500/503 を返す確率（クォータ判定の後に適用）
+    'services': {
+        # サービスごとの latency_ms / jitter_ms / error_rate の上書き
+        'sp_api': {},
+        'base': {},
+        'ebay': {},
+    },
+    'quotas': {
+        # SP-API: オペレーションごとのトークンバケット（rate: req/s, burst: 最大連続数）
+        'sp_api': {
+            'getItemOffersBatch': {'rate': 0.1, 'burst': 1},
+            'getItemOffers': {'rate': 0.5, 'burst': 1},
+            'getPricing': {'rate': 0.5, 'burst': 1},
+            'getCatalogItem': {'rate': 2.0, 'burst': 2},
+        },
+        # BASE: アクセストークンごとの1時間あたりの上限
+        'base': {'hourly_limit': 5000},
+        # eBay: アクセストークンごとのトークンバケット
+        'ebay': {'rate': 5.0, 'burst': 10},
+    },
+    'data': {
+        'out_of_stock_rate': 0.1,  # オファーなし（在庫切れ）にするASINの割合
+        'orders_per_token': 0,     # BASEの注文一覧に返す合成注文の件数
+    },
+}
+
+
+# =========================================================================
+# レート制限
+# =========================================================================
+
+class TokenBucket:
+    """トークンバケット（rate: 1秒あたりの補充数, burst: 最大保持数）"""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def try_acquire(self) -> Tuple[bool, float]:
+        """
+        Returns:
+            tuple: (取得できたか, 次に取得できるまでの秒数)
+        """
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True, 0.0
+        return False, (1 - self.tokens) / self.rate if self.rate > 0 else 3600.0
+
+
+class HourlyWindow:
+    """直近1時間のリクエスト数による上限（BASEの hour_api_limit）"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.timestamps = deque()
+
+    def try_acquire(self) -> Tuple[bool, float]:
+        now = time.monotonic()
+        while self.timestamps and self.timestamps[0] <= now - 3600:
+            self.timestamps.popleft()
+        if len(self.timestamps) >= self.limit:
+            return False, self.timestamps[0] + 3600 - now
+        self.timestamps.append(now)
+        return True, 0.0
+
+
+class QuotaRegistry:
+    """キーごとのレート制限（スレッドセーフ）"""
+
+    def __init__(self):
+        self._limiters = {}
+        self._lock = threading.Lock()
+
+    def try_acquire(self, key: tuple, factory) -> Tuple[bool, float]:
+        with self._lock:
+            limiter = self._limiters.get(key)
+            if limiter is None:
+                limiter = self._limiters[key] = factory()
+            return limiter.try_acquire()
+
+
+# =========================================================================
+# 合成データ
+# =========================================================================
+
+_WORDS = ['ワイヤレス', 'イヤホン', 'ステンレス', 'タンブラー', 'LED', 'デスクライト', '収納', 'ボックス',
+          'アウトドア', 'チェア', 'スマホ', 'ケース', '充電式', '大容量', 'コンパクト', 'USB']
+_BRANDS = ['Anker', 'サーモス', 'アイリスオーヤマ', 'エレコム', 'Generic']
+_CATEGORIES = [['ホーム&キッチン', 'キッチン用品'], ['家電&カメラ', 'イヤホン'], ['スポーツ&アウトドア', 'キャンプ用品']]
+
+
+def _rng(*parts) -> random.Random:
+    """値から決定的な乱数生成器を作成（同じASINなら常に同じデータ）"""
+    digest = hashlib.md5('|'.join(str(p) for p in parts).encode('utf-8')).hexdigest()
+    return random.Random(int(digest[:16], 16))
+
+
+def catalog_item(asin: str) -> Dict[str, Any]:
+    """Catalog Items API（getCatalogItem）形式の商品情報"""
+    rng = _rng('catalog', asin)
+    title = ' '.join(rng.sample(_WORDS, 5))
+    images = []
+    for index in range(rng.randint(1, 5)):
+        variant = 'MAIN' if index == 0 else f'PT{index:02d}'
+        for size in (500, 1500):
+            images.append({
+                'variant': variant,
+                'link': f'https://m.media-amazon.com/images/I/{asin}_{variant}_{size}.jpg',
+                'height': size,
+                'width': size,
+            })
+    return {
+        'asin': asin,
+        'summaries': [{'marketplaceId': JP_MARKETPLACE_ID, 'itemName': title, 'brandName': rng.choice(_BRANDS)}],
+        'attributes': {
+            'bullet_point': [{'value': f'{word}。モックサーバーの商品説明です。'} for word in rng.sample(_WORDS, 3)],
+        },
+        'salesRanks': [{
+            'marketplaceId': JP_MARKETPLACE_ID,
+            'ranks': [{'title': title} for title in rng.choice(_CATEGORIES)],
+        }],
+        'images': [{'marketplaceId': JP_MARKETPLACE_ID, 'images': images}],
+    }
+
+
+def item_offers(asin: str, out_of_stock_rate: float) -> list:
+    """Product Pricing API（getItemOffers）形式のオファー一覧"""
+    rng = _rng('offers', asin)
+    if rng.random() < out_of_stock_rate:
+        return []
+    base_price = rng.randrange(500, 30000)
+    offers = []
+    for index in range(rng.randint(1, 4)):
+        is_fba = rng.random() < 0.6
+        offers.append({
+            'SubCondition': 'new',
+            'ListingPrice': {'CurrencyCode': 'JPY', 'Amount': float(base_price + index * rng.randrange(0, 500))},
+            'Shipping': {'CurrencyCode': 'JPY', 'Amount': 0.0 if is_fba or rng.random() < 0.5 else 450.0},
+            'ShippingTime': {
+                'minimumHours': 0,
+                'maximumHours': rng.choice([0, 24, 48, 72, 96]),
+                'availabilityType': 'NOW' if rng.random() < 0.8 else 'FUTURE_WITH_DATE',
+            },
+            'IsFulfilledByAmazon': is_fba,
+            'PrimeInformation': {'IsPrime': is_fba, 'IsNationalPrime': is_fba},
+            'IsBuyBoxWinner': index == 0,
+            'IsFeaturedMerchant': True,
+        })
+    return offers
+
+
+def pricing_offers(asin: str, out_of_stock_rate: float) -> list:
+    """Product Pricing API（getPricing）形式のオファー（BuyBox）"""
+    offers = item_offers(asin, out_of_stock_rate)
+    if not offers:
+        return []
+    best = offers[0]
+    return [{
+        'OfferType': 'BuyBox',
+        'BuyingPrice': {'ListingPrice': best['ListingPrice'], 'Shipping': best['Shipping']},
+        'IsFulfilledByAmazon': best['IsFulfilledByAmazon'],
+    }]
+
+
+def base_orders(token: str, count: int) -> list:
+    """BASEの注文一覧（合成、新しい順）"""
+    rng = _rng('orders', token)
+    now = datetime.now()
+    orders = []
+    for i in range(count):
+        ordered = now - timedelta(minutes=rng.randrange(0, 60 * 24 * 60))
+        orders.append({
+            'unique_key': hashlib.md5(f'{token}:{i}'.encode('utf-8')).hexdigest()[:16].upper(),
+            'ordered': int(ordered.timestamp()),
+            'modified': int((ordered + timedelta(hours=rng.randrange(0, 48))).timestamp()),
+            'dispatch_status': rng.choice(['ordered', 'unpaid', 'dispatched', 'cancelled']),
+            'total': rng.randrange(1000, 30000),
+            'item_id': 100000000 + rng.randrange(0, 1000000),
+        })
+    orders.sort(key=lambda o: o['ordered'], reverse=True)
+    return orders
+
+
+# =========================================================================
+# サーバー本体
+# =========================================================================
+
+class MockState:
+    """サーバー全体の状態（設定・レート制限・BASE/eBayの商品）"""
+
+    def __init__(self, config: Dict[str, Any], seed: Optional[int] = None):
+        self.config = config
+        self.quotas = QuotaRegistry()
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'throttled': 0, 'injected_errors': 0}
+
+        self.base_items = {}      # item_id -> item
+        self.next_item_id = 100000000
+        self.ebay_inventory = {}  # sku -> inventory item
+        self.ebay_offers = {}     # offer_id -> offer
+        self.next_offer_id = 1
+        self._orders_cache = {}
+
+    def service_setting(self, service: str, key: str):
+        return self.config['services'].get(service, {}).get(key, self.config[key])
+
+    def count(self, key: str):
+        with self.lock:
+            self.stats[key] += 1
+
+    def orders_for(self, token: str) -> list:
+        with self.lock:
+            if token not in self._orders_cache:
+                self._orders_cache[token] = base_orders(token, self.config['data']['orders_per_token'])
+            return self._orders_cache[token]
+
+
+class MockAPIHandler(BaseHTTPRequestHandler):
+    """リクエストをサービスごとのハンドラーに振り分ける"""
+
+    server_version = 'ecauto-mock-api/1.0'
+    protocol_version = 'HTTP/1.1'
+
+    @property
+    def state(self) -> MockState:
+        return self.server.state
+
+    # --- 共通処理 ------------------------------------------------------------
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_PUT(self):
+        self._dispatch('PUT')
+
+    def do_DELETE(self):
+        self._dispatch('DELETE')
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+    def _dispatch(self, method: str):
+        parts = urlsplit(self.path)
+        self.query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        length = int(self.headers.get('Content-Length') or 0)
+        self.body = self.rfile.read(length) if length else b''
+        self.state.count('requests')
+
+        path = parts.path
+        if path.startswith('/sp-api/'):
+            service, handler = 'sp_api', self._handle_sp_api
+        elif path.startswith('/lwa/'):
+            service, handler = 'sp_api', self._handle_lwa
+        elif path.startswith('/base/1/'):
+            service, handler = 'base', self._handle_base
+        elif path.startswith('/ebay/'):
+            service, handler = 'ebay', self._handle_ebay
+        elif path == '/stats':
+            self._send_json(200, self.state.stats)
+            return
+        else:
+            self._send_json(404, {'error': 'not_found', 'path': path})
+            return
+
+        self._apply_latency(service)
+        try:
+            handler(method, path.split('/', 2)[2] if path.count('/') >= 2 else '')
+        except Exception as e:
+            logger.exception(f"モックサーバー内部エラー: {method} {path}")
+            self._send_json(500, {'error': 'mock_internal_error', 'message': str(e)})
+
+    def _apply_latency(self, service: str):
+        latency = self.state.service_setting(service, 'latency_ms')
+        jitter = self.state.service_setting(service, 'jitter_ms')
+        delay = latency + (self.state.random.uniform(0, jitter) if jitter else 0)
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+    def _inject_error(self, service: str) -> bool:
+        """エラー注入（True の場合はエラーレスポンス送信済み）"""
+        rate = self.state.service_setting(service, 'error_rate')
+        if rate <= 0 or self.state.random.random() >= rate:
+            return False
+        self.state.count('injected_errors')
+        status = self.state.random.choice([500, 503])
+        if service == 'sp_api':
+            self._send_json(status, {'errors': [{'code': 'InternalFailure', 'message': 'Injected error'}]})
+        elif service == 'base':
+            self._send_json(status, {'error': 'server_error', 'error_description': 'Injected error'})
+        else:
+            self._send_json(status, {'errors': [{'errorId': 2003, 'domain': 'ACCESS', 'message': 'Injected error'}]})
+        return True
+
+    def _bearer_token(self, header: str = 'Authorization') -> Optional[str]:
+        value = self.headers.get(header, '')
+        if header == 'Authorization':
+            return value[7:] if value.startswith('Bearer ') else None
+        return value or None
+
+    def _json_body(self) -> Dict[str, Any]:
+        return json.loads(self.body.decode('utf-8')) if self.body else {}
+
+    def _form_body(self) -> Dict[str, str]:
+        return {k: v[-1] for k, v in parse_qs(self.body.decode('utf-8')).items()}
+
+    def _send_json(self, status: int, payload: Any, headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _issue_token(self, prefix: str, refresh_token: Optional[str] = None) -> Dict[str, Any]:
+        suffix = hashlib.md5(f'{refresh_token}:{time.time()}'.encode('utf-8')).hexdigest()[:24]
+        return {
+            'access_token': f'{prefix}-{suffix}',
+            'refresh_token': refresh_token or f'{prefix}-refresh-{suffix}',
+            'token_type': 'bearer',
+            'expires_in': 3600,
+        }
+
+    # --- SP-API ----------------------------------------------------------------
+
+    def _handle_lwa(self, method: str, path: str):
+        form = self._form_body()
+        if form.get('grant_type') != 'refresh_token' or not form.get('refresh_token'):
+            self._send_json(400, {'error': 'invalid_request', 'error_description': 'refresh_token is required'})
+            return
+        token = self._issue_token('Atza|mock', form['refresh_token'])
+        token.pop('refresh_token')
+        self._send_json(200, token)
+
+    def _sp_api_quota(self, operation: str) -> bool:
+        """SP-APIのレート制限（True の場合は429送信済み）"""
+        quota = self.state.config['quotas']['sp_api'].get(operation)
+        if not quota:
+            return False
+        token = self._bearer_token('x-amz-access-token') or 'anonymous'
+        ok, retry_after = self.state.quotas.try_acquire(
+            ('sp_api', operation, token),
+            lambda: TokenBucket(quota['rate'], quota['burst'])
+        )
+        if ok:
+            return False
+        self.state.count('throttled')
+        self._send_json(429, {'errors': [{
+            'code': 'QuotaExceeded',
+            'message': 'You exceeded your quota for the requested resource.',
+            'details': f'{operation}: retry after {retry_after:.1f}s',
+        }]}, headers={'x-amzn-RateLimit-Limit': str(quota['rate'])})
+        return True
+
+    def _sp_api_ok(self, operation: str, payload: Dict[str, Any]):
+        quota = self.state.config['quotas']['sp_api'].get(operation)
+        headers = {'x-amzn-RateLimit-Limit': str(quota['rate'])} if quota else None
+        self._send_json(200, payload, headers=headers)
+
+    def _handle_sp_api(self, method: str, path: str):
+        if not self._bearer_token('x-amz-access-token'):
+            self._send_json(403, {'errors': [{'code': 'Unauthorized', 'message': 'Access to requested resource is denied.'}]})
+            return
+
+        segments = path.strip('/').split('/')
+        out_of_stock_rate = self.state.config['data']['out_of_stock_rate']
+
+        # GET /catalog/{version}/items/{asin}
+        if method == 'GET' and len(segments) == 4 and segments[0] == 'catalog' and segments[2] == 'items':
+            operation, handler = 'getCatalogItem', lambda: catalog_item(segments[3])
+        # GET /products/pricing/v0/items/{asin}/offers
+        elif method == 'GET' and segments[:4] == ['products', 'pricing', 'v0', 'items'] and len(segments) == 6:
+            asin = segments[4]
+            operation, handler = 'getItemOffers', lambda: {'payload': {
+                'ASIN': asin, 'status': 'Success', 'ItemCondition': 'New',
+                'Offers': item_offers(asin, out_of_stock_rate),
+            }}
+        # GET /products/pricing/v0/price?ItemType=Asin&Asins=...
+        elif method == 'GET' and segments == ['products', 'pricing', 'v0', 'price']:
+            asins = [a for a in self.query.get('Asins', '').split(',') if a]
+            operation, handler = 'getPricing', lambda: {'payload': [
+                {'ASIN': asin, 'status': 'Success', 'Product': {'Offers': pricing_offers(asin, out_of_stock_rate)}}
+                for asin in asins
+            ]}
+        # POST /batches/products/pricing/v0/itemOffers
+        elif method == 'POST' and segments == ['batches', 'products', 'pricing', 'v0', 'itemOffers']:
+            operation, handler = 'getItemOffersBatch', lambda: self._item_offers_batch(out_of_stock_rate)
+        else:
+            self._send_json(404, {'errors': [{'code': 'NotFound', 'message': f'{method} /{path} is not mocked'}]})
+            return
+
+        if self._sp_api_quota(operation) or self._inject_error('sp_api'):
+            return
+        self._sp_api_ok(operation, handler())
+
+    def _item_offers_batch(self, out_of_stock_rate: float) -> Dict[str, Any]:
+        responses = []
+        for request in self._json_body().get('requests', []):
+            asin = request.get('uri', '').rstrip('/').split('/')[-2]
+            responses.append({
+                'status': {'statusCode': 200, 'reasonPhrase': 'OK'},
+                'headers': {'x-amzn-RequestId': hashlib.md5(asin.encode('utf-8')).hexdigest()},
+                'body': {'payload': {
+                    'ASIN': asin, 'status': 'Success', 'ItemCondition': 'New',
+                    'Offers': item_offers(asin, out_of_stock_rate),
+                }},
+                'request': {
+                    'MarketplaceId': request.get('MarketplaceId', JP_MARKETPLACE_ID),
+                    'Asin': asin,
+                    'ItemCondition': request.get('ItemCondition', 'New'),
+                },
+            })
+        return {'responses': responses}
+
+    # --- BASE ------------------------------------------------------------------
+
+    def _base_error(self, status: int, error: str, description: str):
+        self._send_json(status, {'error': error, 'error_description': description})
+
+    def _handle_base(self, method: str, path: str):
+        route = path[len('1/'):] if path.startswith('1/') else path
+
+        if route == 'oauth/token' and method == 'POST':
+            form = self._form_body()
+            self._send_json(200, self._issue_token('base-mock', form.get('refresh_token')))
+            return
+
+        token = self._bearer_token()
+        if not token:
+            self._base_error(401, 'invalid_request', 'アクセストークンが指定されていません。')
+            return
+
+        limit = self.state.config['quotas']['base']['hourly_limit']
+        ok, _ = self.state.quotas.try_acquire(('base', token), lambda: HourlyWindow(limit))
+        if not ok:
+            self.state.count('throttled')
+            self._base_error(400, 'hour_api_limit', '1時間のAPIの利用上限を超えました。時間を置いてから再度アクセスしてください。')
+            return
+        if self._inject_error('base'):
+            return
+
+        state = self.state
+        form = self._form_body() if method == 'POST' else {}
+
+        if route == 'items/add' and method == 'POST':
+            with state.lock:
+                item_id = state.next_item_id
+                state.next_item_id += 1
+                item = dict(form, item_id=item_id, images=[])
+                state.base_items[item_id] = item
+            self._send_json(200, {'item': item})
+        elif route == 'items/edit' and method == 'POST':
+            item = self._base_item(form.get('item_id'))
+            if item is not None:
+                with state.lock:
+                    item.update({k: v for k, v in form.items() if k != 'item_id'})
+                self._send_json(200, {'item': item})
+        elif route == 'items/delete' and method == 'POST':
+            item = self._base_item(form.get('item_id'))
+            if item is not None:
+                with state.lock:
+                    state.base_items.pop(item['item_id'], None)
+                self._send_json(200, {'result': True})
+        elif route == 'items/add_image' and method == 'POST':
+            item = self._base_item(form.get('item_id'))
+            if item is not None:
+                with state.lock:
+                    item['images'].append({'image_no': form.get('image_no'), 'url': form.get('image_url')})
+                self._send_json(200, {'item': item})
+        elif route == 'items' and method == 'GET':
+            offset = int(self.query.get('offset', 0))
+            limit_items = min(int(self.query.get('limit', 20)), 100)
+            with state.lock:
+                items = list(state.base_items.values())[offset:offset + limit_items]
+            self._send_json(200, {'items': items})
+        elif route.startswith('items/detail/') and method == 'GET':
+            item = self._base_item(route.rsplit('/', 1)[-1])
+            if item is not None:
+                self._send_json(200, {'item': item})
+        elif route == 'orders' and method == 'GET':
+            orders = state.orders_for(token)
+            if self.query.get('start_ordered'):
+                start = datetime.strptime(self.query['start_ordered'], '%Y-%m-%d').timestamp()
+                orders = [o for o in orders if o['ordered'] >= start]
+            offset = int(self.query.get('offset', 0))
+            limit_orders = min(int(self.query.get('limit', 20)), 100)
+            page = [{k: v for k, v in o.items() if k != 'item_id'} for o in orders[offset:offset + limit_orders]]
+            self._send_json(200, {'orders': page})
+        elif route.startswith('orders/detail/') and method == 'GET':
+            unique_key = route.rsplit('/', 1)[-1]
+            order = next((o for o in state.orders_for(token) if o['unique_key'] == unique_key), None)
+            if order is None:
+                self._base_error(400, 'bad_unique_key', '注文が見つかりません。')
+                return
+            detail = {k: v for k, v in order.items() if k != 'item_id'}
+            detail['order_items'] = [{
+                'item_id': order['item_id'], 'variation_id': None, 'title': 'モック商品',
+                'price': order['total'], 'amount': 1, 'status': order['dispatch_status'],
+            }]
+            self._send_json(200, {'order': detail})
+        else:
+            self._base_error(404, 'not_found', f'{method} /1/{route} はモックされていません。')
+
+    def _base_item(self, item_id) -> Optional[Dict[str, Any]]:
+        """BASE商品を取得（ない場合は400を送信してNone）"""
+        try:
+            item = self.state.base_items.get(int(item_id))
+        except (TypeError, ValueError):
+            item = None
+        if item is None:
+            self._base_error(400, 'bad_item_id', '商品が見つかりません。')
+        return item
+
+    # --- eBay ------------------------------------------------------------------
+
+    def _ebay_error(self, status: int, error_id: int, message: str, headers: Optional[Dict[str, str]] = None):
+        self._send_json(status, {'errors': [{
+            'errorId': error_id, 'domain': 'API_INVENTORY', 'category': 'REQUEST', 'message': message,
+        }]}, headers=headers)
+
+    def _handle_ebay(self, method: str, path: str):
+        if path == 'identity/v1/oauth2/token' and method == 'POST':
+            form = self._form_body()
+            self._send_json(200, self._issue_token('v^1.1#mock', form.get('refresh_token')))
+            return
+
+        token = self._bearer_token()
+        if not token:
+            self._ebay_error(401, 1001, 'Invalid access token')
+            return
+
+        quota = self.state.config['quotas']['ebay']
+        ok, retry_after = self.state.quotas.try_acquire(
+            ('ebay', token), lambda: TokenBucket(quota['rate'], quota['burst'])
+        )
+        if not ok:
+            self.state.count('throttled')
+            self._ebay_error(429, 2001, 'Too many requests. The request limit has been reached for the resource.',
+                             headers={'Retry-After': str(max(1, int(retry_after + 0.999)))})
+            return
+        if self._inject_error('ebay'):
+            return
+
+        state = self.state
+        prefix = 'sell/inventory/v1/'
+        route = path[len(prefix):] if path.startswith(prefix) else None
+        segments = route.split('/') if route else []
+
+        if route is None:
+            self._ebay_error(404, 2002, f'{method} /{path} is not mocked')
+        elif segments[0] == 'inventory_item' and len(segments) == 2:
+            sku = segments[1]
+            if method == 'PUT':
+                with state.lock:
+                    state.ebay_inventory[sku] = dict(self._json_body(), sku=sku)
+                self._send_no_content()
+            elif method == 'GET':
+                item = state.ebay_inventory.get(sku)
+                if item is None:
+                    self._ebay_error(404, 25702, f'SKU {sku} was not found')
+                else:
+                    self._send_json(200, item)
+            elif method == 'DELETE':
+                with state.lock:
+                    found = state.ebay_inventory.pop(sku, None)
+                if found is None:
+                    self._ebay_error(404, 25702, f'SKU {sku} was not found')
+                else:
+                    self._send_no_content()
+        elif segments == ['inventory_item'] and method == 'GET':
+            offset = int(self.query.get('offset', 0))
+            limit = int(self.query.get('limit', 25))
+            with state.lock:
+                items = list(state.ebay_inventory.values())
+            self._send_json(200, {'total': len(items), 'inventoryItems': items[offset:offset + limit]})
+        elif segments == ['offer'] and method == 'POST':
+            with state.lock:
+                offer_id = str(state.next_offer_id)
+                state.next_offer_id += 1
+                state.ebay_offers[offer_id] = dict(self._json_body(), offerId=offer_id, status='UNPUBLISHED')
+            self._send_json(201, {'offerId': offer_id})
+        elif segments == ['offer'] and method == 'GET':
+            sku = self.query.get('sku')
+            with state.lock:
+                offers = [o for o in state.ebay_offers.values() if not sku or o.get('sku') == sku]
+            limit = int(self.query.get('limit', 25))
+            self._send_json(200, {'total': len(offers), 'offers': offers[:limit]})
+        elif segments[0] == 'offer' and len(segments) == 3 and segments[2] == 'publish' and method == 'POST':
+            offer = state.ebay_offers.get(segments[1])
+            if offer is None:
+                self._ebay_error(404, 25713, 'This Offer is not available.')
+                return
+            with state.lock:
+                offer['status'] = 'PUBLISHED'
+                offer['listing'] = {'listingId': f'11{int(segments[1]):010d}', 'listingStatus': 'ACTIVE'}
+            self._send_json(200, {'listingId': offer['listing']['listingId']})
+        elif segments[0] == 'offer' and len(segments) == 2:
+            offer = state.ebay_offers.get(segments[1])
+            if offer is None:
+                self._ebay_error(404, 25713, 'This Offer is not available.')
+            elif method == 'GET':
+                self._send_json(200, offer)
+            elif method == 'PUT':
+                with state.lock:
+                    offer.update({k: v for k, v in self._json_body().items() if k not in ('offerId', 'status')})
+                self._send_no_content()
+            elif method == 'DELETE':
+                with state.lock:
+                    state.ebay_offers.pop(segments[1], None)
+                self._send_no_content()
+        elif segments[0] == 'location' and len(segments) == 2 and method in ('PUT', 'POST'):
+            self._send_no_content()
+        else:
+            self._ebay_error(404, 2002, f'{method} /{path} is not mocked')
+
+    def _send_no_content(self):
+        self.send_response(204)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+
+def _merge(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    """設定を再帰的にマージ（override の項目のみ上書き）"""
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def create_server(host: str = '127.0.0.1', port: int = DEFAULT_PORT,
+                  config: Optional[Dict[str, Any]] = None, seed: Optional[int] = None) -> ThreadingHTTPServer:
+    """
+    モックサーバーを作成（serve_forever() で起動）
+
+    Args:
+        host: 待ち受けアドレス
+        port: ポート（0 の場合は空きポート）
+        config: DEFAULT_CONFIG への上書き
+        seed: 遅延・エラー注入の乱数シード
+    """
+    server = ThreadingHTTPServer((host, port), MockAPIHandler)
+    server.daemon_threads = True
+    server.state = MockState(_merge(DEFAULT_CONFIG, config or {}), seed=seed)
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SP-API / BASE / eBay のローカルモックサーバー')
+    parser.add_argument('--host', type=str, default='127.0.0.1', help='待ち受けアドレス（デフォルト: 127.0.0.1）')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'ポート（デフォルト: {DEFAULT_PORT}）')
+    parser.add_argument('--latency-ms', type=float, help='レスポンス遅延（ミリ秒）')
+    parser.add_argument('--jitter-ms', type=float, help='遅延の揺らぎ（ミリ秒）')
+    parser.add_argument('--error-rate', type=float, help='500/503 を返す確率（0〜1）')
+    parser.add_argument('--orders', type=int, help='BASEの注文一覧に返す合成注文の件数（アクセストークンごと）')
+    parser.add_argument('--config', type=str, help='設定JSON（DEFAULT_CONFIG と同じ構造）')
+    parser.add_argument('--seed', type=int, help='遅延・エラー注入の乱数シード')
+    parser.add_argument('--verbose', action='store_true', help='リクエストごとのログを表示')
+
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format='%(asctime)s [%(levelname)s] %(message)s'
+    )
+
+    config = {}
+    if args.config:
+        with open(args.config, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+    for key, value in (('latency_ms', args.latency_ms), ('jitter_ms', args.jitter_ms),
+                       ('error_rate', args.error_rate)):
+        if value is not None:
+            config[key] = value
+    if args.orders is not None:
+        config = _merge(config, {'data': {'orders_per_token': args.orders}})
+
+    server = create_server(args.host, args.port, config, seed=args.seed)
+    host, port = server.server_address[:2]
+    logger.info(f"モックAPIサーバーを起動しました: http://{host}:{port}")
+    logger.info(f"  クライアント側: ECAUTO_MOCK_API_URL=http://{host}:{port}")
+    logger.info(f"  統計: http://{host}:{port}/stats")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        logger.info(f"停止しました: {json.dumps(server.state.stats, ensure_ascii=False)}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,486 @@
+"""
+同期・出品処理のベンチマーク
+
+合成データ（benchmarks/synthetic.py）で master.db・アカウント設定・Amazon商品キャッシュを作成し、
+主要な処理の所要時間を計測して JSON に保存する。
+
+計測対象:
+    price_sync          PriceSync.sync_account_prices（skip_cache_update=True, dry_run=True、全アカウント）
+    stock_visibility    StockVisibilitySync.sync_all_listings（dry_run=True）
+    add_batch_to_queue  UploadQueueManager.add_batch_to_queue（未キューのASINを複数アカウントへ分散）
+    upload_queue_due    MasterDB.get_upload_queue_due（アカウントごと + プラットフォーム全体）
+    ng_filter           NGKeywordFilter.clean_product_data
+    prohibited_scan     scan_products（全件再スコアリング / 前回結果の再利用）
+    pricing             PriceCalculator.calculate_selling_price
+    amazon_cache        AmazonProductCache.get_product
+
+BASE API・SP-APIには接続しない（BASE APIクライアントはオフラインの代替に差し替え、
+API待機の time.sleep は計測から除外して回数・秒数のみ記録する）。
+SP-APIを使わないため、sync_account_prices は skip_cache_update=True で計測する。
+
+使い方:
+    # デフォルト規模（商品10万・出品20万・キュー5万）
+    python benchmarks/run_benchmarks.py
+
+    # 1/10の規模で一部のみ
+    python benchmarks/run_benchmarks.py --scale 0.1 --only price_sync,upload_queue_due
+
+    # 前回結果と比較
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/20260101_120000_abc1234.json
+
+結果は benchmarks/results/{日時}_{コミット}.json に保存される（--output で変更可）。
+"""
+
+import sys
+import io
+import json
+import time
+import random
+import logging
+import argparse
+import importlib
+import platform
+import subprocess
+import contextlib
+import tempfile
+import shutil
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Callable, Optional
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.synthetic import write_account_config, generate_master_db, generate_cache_dir, make_asin
+from inventory.core.master_db import MasterDB
+from platforms.base.accounts.manager import AccountManager
+
+
+DEFAULT_PRODUCTS = 100000
+DEFAULT_LISTINGS = 200000
+DEFAULT_QUEUE = 50000
+DEFAULT_ACCOUNTS = 4
+DEFAULT_QUEUE_BATCH = 5000
+DEFAULT_SAMPLE = 20000       # NGフィルター・価格計算の対象件数
+DEFAULT_CACHE_FILES = 20000  # Amazon商品キャッシュのファイル数
+RESULTS_DIR = project_root / 'benchmarks' / 'results'
+
+
+# ==================== オフライン代替 ====================
+
+class OfflineBaseClient:
+    """BASE APIクライアントの代替（通信せず呼び出し回数のみ数える）"""
+
+    calls = 0
+
+    def __init__(self, account_id: str, account_manager=None, **kwargs):
+        self.account_id = account_id
+
+    def update_item(self, item_id: str, updates: Dict[str, Any]) -> Dict[str, Any]:
+        OfflineBaseClient.calls += 1
+        return {'item': {'item_id': item_id, **updates}}
+
+    def get_item(self, item_id: str) -> Dict[str, Any]:
+        OfflineBaseClient.calls += 1
+        return {'item': {'item_id': item_id, 'stock': 1}}
+
+
+class SkippedSleep:
+    """モジュールの time の代替（sleep は待たずに合計秒数を記録）"""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def sleep(self, seconds: float):
+        self.count += 1
+        self.seconds += seconds
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+@contextlib.contextmanager
+def patched(module, **attrs):
+    """モジュール属性を一時的に差し替える"""
+    original = {name: getattr(module, name) for name in attrs}
+    for name, value in attrs.items():
+        setattr(module, name, value)
+    try:
+        yield
+    finally:
+        for name, value in original.items():
+            setattr(module, name, value)
+
+
+# ==================== ベンチマーク ====================
+
+class BenchmarkContext:
+    """ベンチマーク間で共有する合成データ"""
+
+    def __init__(self, work_dir: Path, account_ids: List[str], counts: Dict[str, int], args):
+        self.work_dir = work_dir
+        self.db_path = work_dir / 'master.db'
+        self.account_config = work_dir / 'accounts' / 'account_config.json'
+        self.cache_dir = work_dir / 'cache' / 'amazon_products'
+        self.account_ids = account_ids
+        self.counts = counts
+        self.args = args
+
+    def master_db(self) -> MasterDB:
+        return MasterDB(self.db_path)
+
+    def account_manager(self) -> AccountManager:
+        return AccountManager(str(self.account_config))
+
+    def sample_products(self, limit: int) -> List[Dict[str, Any]]:
+        with self.master_db().get_connection() as conn:
+            rows = conn.execute(
+                'SELECT asin, title_ja, title_en, description_ja, description_en, amazon_price_jpy '
+                'FROM products LIMIT ?', (limit,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+
+def bench_price_sync(ctx: BenchmarkContext) -> Dict[str, Any]:
+    from platforms.base.scripts import sync_prices
+
+    sleeper = SkippedSleep()
+    with patched(
+        sync_prices,
+        MasterDB=lambda: ctx.master_db(),
+        AccountManager=lambda: ctx.account_manager(),
+        BaseAPIClient=OfflineBaseClient,
+        SP_API_CREDENTIALS={},
+        time=sleeper,
+    ):
+        price_sync = sync_prices.PriceSync()
+        start = time.perf_counter()
+        for account_id in ctx.account_ids:
+            price_sync.sync_account_prices(account_id, dry_run=True, skip_cache_update=True)
+        elapsed = time.perf_counter() - start
+
+    return {
+        'seconds': elapsed,
+        'items': price_sync.stats['total_listings'],
+        'extra': {
+            'price_updated': price_sync.stats['price_updated'],
+            'no_update_needed': price_sync.stats['no_update_needed'],
+            'skipped_sleep_count': sleeper.count,
+            'skipped_sleep_seconds': round(sleeper.seconds, 1),
+        },
+    }
+
+
+def bench_stock_visibility(ctx: BenchmarkContext) -> Dict[str, Any]:
+    from inventory.scripts import sync_stock_visibility
+
+    sleeper = SkippedSleep()
+    OfflineBaseClient.calls = 0
+    with patched(
+        sync_stock_visibility,
+        MasterDB=lambda: ctx.master_db(),
+        AccountManager=lambda: ctx.account_manager(),
+        BaseAPIClient=OfflineBaseClient,
+        time=sleeper,
+    ):
+        visibility_sync = sync_stock_visibility.StockVisibilitySync()
+        start = time.perf_counter()
+        stats = visibility_sync.sync_all_listings(platform='base', dry_run=True)
+        elapsed = time.perf_counter() - start
+
+    return {
+        'seconds': elapsed,
+        'items': stats['total_products'],
+        'extra': {
+            'updated_to_hidden': stats['updated_to_hidden'],
+            'updated_to_public': stats['updated_to_public'],
+            'api_calls': OfflineBaseClient.calls,
+            'skipped_sleep_count': sleeper.count,
+        },
+    }
+
+
+def bench_add_batch_to_queue(ctx: BenchmarkContext) -> Dict[str, Any]:
+    from scheduler.queue_manager import UploadQueueManager
+
+    # まだキューに無いASIN（合成データの商品番号の範囲外）を追加する
+    offset = ctx.counts['products'] + 1
+    asins = [make_asin(offset + i) for i in range(ctx.args.queue_batch)]
+
+    queue_manager = UploadQueueManager(str(ctx.db_path))
+    queue_manager.account_manager = ctx.account_manager()
+
+    start = time.perf_counter()
+    result = queue_manager.add_batch_to_queue(
+        asins,
+        platform='base',
+        auto_distribute_accounts=True,
+        start_time=datetime.now() + timedelta(days=7)
+    )
+    elapsed = time.perf_counter() - start
+
+    return {
+        'seconds': elapsed,
+        'items': len(asins),
+        'extra': {'success': result['success'], 'failed': result['failed']},
+    }
+
+
+def bench_upload_queue_due(ctx: BenchmarkContext) -> Dict[str, Any]:
+    db = ctx.master_db()
+    rounds = 20  # デーモンの巡回相当
+
+    returned = 0
+    calls = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        returned += len(db.get_upload_queue_due(limit=100, platform='base'))
+        calls += 1
+        for account_id in ctx.account_ids:
+            returned += len(db.get_upload_queue_due(limit=100, platform='base', account_id=account_id))
+            calls += 1
+    elapsed = time.perf_counter() - start
+
+    return {'seconds': elapsed, 'items': calls, 'extra': {'rows_returned': returned}}
+
+
+def bench_ng_filter(ctx: BenchmarkContext) -> Dict[str, Any]:
+    from common.ng_keyword_filter import NGKeywordFilter
+
+    products = ctx.sample_products(ctx.args.sample)
+    ng_filter = NGKeywordFilter(str(project_root / 'config' / 'ng_keywords.json'))
+
+    removed = 0
+    start = time.perf_counter()
+    for product in products:
+        _, any_removed = ng_filter.clean_product_data(product, asin=product['asin'])
+        removed += any_removed
+    elapsed = time.perf_counter() - start
+
+    return {'seconds': elapsed, 'items': len(products), 'extra': {'removed': removed}}
+
+
+def bench_prohibited_scan(ctx: BenchmarkContext) -> Dict[str, Any]:
+    from inventory.core.prohibited_item_checker import ProhibitedItemChecker
+    from inventory.scripts.scan_prohibited_items import scan_products
+
+    db = ctx.master_db()
+    checker = ProhibitedItemChecker()
+
+    start = time.perf_counter()
+    results = scan_products(db, checker, full_rescan=True)
+    full_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scan_products(db, checker)
+    cached_elapsed = time.perf_counter() - start
+
+    return {
+        'seconds': full_elapsed,
+        'items': ctx.counts['products'],
+        'extra': {'flagged': len(results), 'cached_rescan_seconds': round(cached_elapsed, 4)},
+    }
+
+
+def bench_pricing(ctx: BenchmarkContext) -> Dict[str, Any]:
+    from common.pricing.calculator import PriceCalculator
+
+    rng = random.Random(0)
+    prices = [rng.randrange(500, 30000) for _ in range(ctx.args.sample)]
+    calculator = PriceCalculator()
+
+    start = time.perf_counter()
+    for price in prices:
+        calculator.calculate_selling_price(amazon_price=price, platform='base', current_price=price * 1.3)
+    elapsed = time.perf_counter() - start
+
+    return {'seconds': elapsed, 'items': len(prices)}
+
+
+def bench_amazon_cache(ctx: BenchmarkContext) -> Dict[str, Any]:
+    from inventory.core.cache_manager import AmazonProductCache
+
+    cache = AmazonProductCache(str(ctx.cache_dir))
+    asins = [make_asin(i) for i in range(ctx.counts['cache_files'])]
+
+    hits = 0
+    start = time.perf_counter()
+    for asin in asins:
+        hits += cache.get_product(asin) is not None
+    elapsed = time.perf_counter() - start
+
+    return {'seconds': elapsed, 'items': len(asins), 'extra': {'hits': hits}}
+
+
+BENCHMARKS: Dict[str, Callable[[BenchmarkContext], Dict[str, Any]]] = {
+    'price_sync': bench_price_sync,
+    'stock_visibility': bench_stock_visibility,
+    'add_batch_to_queue': bench_add_batch_to_queue,
+    'upload_queue_due': bench_upload_queue_due,
+    'ng_filter': bench_ng_filter,
+    'prohibited_scan': bench_prohibited_scan,
+    'pricing': bench_pricing,
+    'amazon_cache': bench_amazon_cache,
+}
+
+# import時に標準出力を再設定するスクリプト（出力を捕捉する前に読み込んでおく）
+PRELOAD_MODULES = {
+    'price_sync': 'platforms.base.scripts.sync_prices',
+    'stock_visibility': 'inventory.scripts.sync_stock_visibility',
+}
+
+
+# ==================== 実行・保存 ====================
+
+def git_commit() -> Optional[str]:
+    """現在のコミット（短縮形、取得できなければNone）"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=project_root, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def prepare(work_dir: Path, args) -> BenchmarkContext:
+    """合成データを作成"""
+    products = max(1, int(args.products * args.scale))
+    listings = int(args.listings * args.scale)
+    queue = int(args.queue * args.scale)
+    cache_files = min(products, int(args.cache_files * args.scale))
+
+    print(f"合成データを作成中: 商品 {products:,} / 出品 {listings:,} / キュー {queue:,} / "
+          f"キャッシュ {cache_files:,} / アカウント {args.accounts}")
+    start = time.perf_counter()
+
+    account_ids = write_account_config(work_dir / 'accounts' / 'account_config.json', args.accounts)
+    counts = generate_master_db(work_dir / 'master.db', account_ids, products, listings, queue, seed=args.seed)
+    counts['cache_files'] = generate_cache_dir(work_dir / 'cache' / 'amazon_products', cache_files, seed=args.seed)
+
+    print(f"  完了（{time.perf_counter() - start:.1f}秒）")
+    return BenchmarkContext(work_dir, account_ids, counts, args)
+
+
+def run(ctx: BenchmarkContext, names: List[str], verbose: bool) -> Dict[str, Any]:
+    """ベンチマークを順に実行"""
+    results = {}
+    for name in names:
+        print(f"[{name}] 実行中...", flush=True)
+        output = io.StringIO()
+        try:
+            if name in PRELOAD_MODULES:
+                importlib.import_module(PRELOAD_MODULES[name])
+            # 各処理の標準出力（進捗表示等）は計測対象外にする
+            with contextlib.redirect_stdout(sys.stdout if verbose else output):
+                result = BENCHMARKS[name](ctx)
+        except Exception as e:
+            print(f"  エラー: {e}")
+            results[name] = {'error': str(e)}
+            continue
+
+        items = result.get('items') or 0
+        result['per_item_us'] = round(result['seconds'] / items * 1e6, 2) if items else None
+        result['seconds'] = round(result['seconds'], 4)
+        results[name] = result
+        print(f"  {result['seconds']:.3f}秒 / {items:,}件"
+              + (f"（{result['per_item_us']:.1f}µs/件）" if result['per_item_us'] is not None else ''))
+    return results
+
+
+def compare(report: Dict[str, Any], baseline_path: Path):
+    """前回結果との比較を表示（1件あたりの時間で比較）"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    print(f"\n比較: {baseline_path.name}（{baseline.get('git_commit')}）")
+    if baseline.get('scale') != report['scale']:
+        print("  [注意] 合成データの規模が異なります（件数に依存する処理は単純比較できません）")
+
+    print(f"  {'ベンチマーク':<20}{'前回(µs/件)':>14}{'今回(µs/件)':>14}{'変化':>10}")
+    for name, result in report['results'].items():
+        before = baseline.get('results', {}).get(name, {}).get('per_item_us')
+        after = result.get('per_item_us')
+        if not before or after is None:
+            continue
+        change = (after - before) / before * 100
+        print(f"  {name:<22}{before:>14.1f}{after:>14.1f}{change:>+9.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='同期・出品処理のベンチマーク（合成データ）')
+    parser.add_argument('--products', type=int, default=DEFAULT_PRODUCTS, help=f'商品数（デフォルト: {DEFAULT_PRODUCTS}）')
+    parser.add_argument('--listings', type=int, default=DEFAULT_LISTINGS, help=f'出品数（デフォルト: {DEFAULT_LISTINGS}）')
+    parser.add_argument('--queue', type=int, default=DEFAULT_QUEUE, help=f'キュー行数（デフォルト: {DEFAULT_QUEUE}）')
+    parser.add_argument('--accounts', type=int, default=DEFAULT_ACCOUNTS, help=f'アカウント数（デフォルト: {DEFAULT_ACCOUNTS}）')
+    parser.add_argument('--queue-batch', type=int, default=DEFAULT_QUEUE_BATCH,
+                        help=f'add_batch_to_queue で追加する件数（デフォルト: {DEFAULT_QUEUE_BATCH}）')
+    parser.add_argument('--sample', type=int, default=DEFAULT_SAMPLE,
+                        help=f'NGフィルター・価格計算の件数（デフォルト: {DEFAULT_SAMPLE}）')
+    parser.add_argument('--cache-files', type=int, default=DEFAULT_CACHE_FILES,
+                        help=f'Amazon商品キャッシュのファイル数（デフォルト: {DEFAULT_CACHE_FILES}）')
+    parser.add_argument('--scale', type=float, default=1.0, help='商品・出品・キュー・キャッシュ件数の倍率（デフォルト: 1.0）')
+    parser.add_argument('--seed', type=int, default=42, help='乱数シード（デフォルト: 42）')
+    parser.add_argument('--only', type=str, help=f"実行するベンチマーク（カンマ区切り: {', '.join(BENCHMARKS)}）")
+    parser.add_argument('--work-dir', type=str, help='合成データの作成先（デフォルト: 一時ディレクトリ、実行後に削除）')
+    parser.add_argument('--keep', action='store_true', help='合成データを削除しない')
+    parser.add_argument('--output', type=str, help='結果JSONの出力先（デフォルト: benchmarks/results/{日時}_{コミット}.json）')
+    parser.add_argument('--compare', type=str, help='比較する前回の結果JSON')
+    parser.add_argument('--verbose', action='store_true', help='各処理のログ・標準出力を表示')
+
+    args = parser.parse_args()
+
+    names = [n.strip() for n in args.only.split(',')] if args.only else list(BENCHMARKS)
+    unknown = [n for n in names if n not in BENCHMARKS]
+    if unknown:
+        parser.error(f"不明なベンチマーク: {', '.join(unknown)}")
+
+    # 各処理の INFO ログ（商品ごとの出力）は計測対象外
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+    if not args.verbose:
+        logging.disable(logging.WARNING)
+
+    work_dir = Path(args.work_dir) if args.work_dir else Path(tempfile.mkdtemp(prefix='ecauto_bench_'))
+    work_dir.mkdir(parents=True, exist_ok=True)
+
+    try:
+        ctx = prepare(work_dir, args)
+        results = run(ctx, names, args.verbose)
+    finally:
+        if not args.keep and not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    commit = git_commit()
+    report = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'git_commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'scale': {
+            'products': ctx.counts['products'],
+            'listings': ctx.counts['listings'],
+            'upload_queue': ctx.counts['upload_queue'],
+            'cache_files': ctx.counts['cache_files'],
+            'accounts': args.accounts,
+            'queue_batch': args.queue_batch,
+            'sample': args.sample,
+            'seed': args.seed,
+        },
+        'results': results,
+    }
+
+    output_path = Path(args.output) if args.output else \
+        RESULTS_DIR / f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{commit or 'nogit'}.json"
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n結果を保存しました: {output_path}")
+
+    if args.compare:
+        compare(report, Path(args.compare))
+
+
+if __name__ == '__main__':
+    main()
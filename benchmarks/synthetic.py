@@ -0,0 +1,259 @@
+"""
+合成データ生成
+
+ベンチマーク用に本番相当の規模の master.db・アカウント設定・Amazon商品キャッシュを生成する。
+
+- products: タイトル・説明文の一部に NGキーワード / 禁止商品キーワードを混ぜる
+  （config/ng_keywords.json・config/prohibited_items.json から取得）
+- listings: 各商品にアカウントを割り当て（1商品に複数出品あり）、大半は listed
+- upload_queue: pending / success / failed を混在させ、scheduled_time は過去〜未来に分散
+- Amazon商品キャッシュ: AmazonProductCache と同じ形式（{asin}.json + metadata.json）
+
+乱数のシードを固定しているため、同じ引数なら同じデータが生成される。
+"""
+
+import json
+import random
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Any, List
+
+from inventory.core.master_db import MasterDB
+
+project_root = Path(__file__).resolve().parent.parent
+
+PLATFORM = 'base'
+
+# 通常の商品名に使う語
+_WORDS = [
+    'ワイヤレス', 'イヤホン', 'Bluetooth', '充電式', 'ステンレス', 'タンブラー', '保温', '保冷',
+    'キッチン', '収納', 'ボックス', 'LED', 'デスクライト', '折りたたみ', 'アウトドア', 'チェア',
+    'スマホ', 'ケース', '耐衝撃', 'クリア', '日本製', '大容量', 'コンパクト', '軽量', 'USB',
+    'Type-C', 'ケーブル', '2m', 'ブラック', 'ホワイト', 'セット', '替えブラシ', '電動', '歯ブラシ',
+]
+_CATEGORIES = [
+    'Home & Kitchen > Kitchen & Dining', 'Electronics > Headphones', 'Sports & Outdoors > Camping',
+    'Office Products > Lighting', 'Cell Phones & Accessories > Cases', 'Beauty > Oral Care',
+]
+_BRANDS = ['Anker', 'サーモス', 'アイリスオーヤマ', 'エレコム', 'パナソニック', 'Generic', '']
+
+
+def _load_keywords() -> Dict[str, List[str]]:
+    """データに混ぜるNGキーワード・禁止商品キーワード・高リスクカテゴリ"""
+    keywords = {'ng': [], 'prohibited': [], 'categories': []}
+
+    ng_path = project_root / 'config' / 'ng_keywords.json'
+    if ng_path.exists():
+        with open(ng_path, 'r', encoding='utf-8') as f:
+            keywords['ng'] = json.load(f).get('keywords', [])
+
+    prohibited_path = project_root / 'config' / 'prohibited_items.json'
+    if prohibited_path.exists():
+        with open(prohibited_path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        for level in ('strict', 'moderate', 'low'):
+            for group in config.get('keywords', {}).get(level, {}).values():
+                keywords['prohibited'].extend(group.get('keywords', []))
+        keywords['categories'] = config.get('categories', {}).get('high_risk', [])
+
+    return keywords
+
+
+def make_asin(i: int) -> str:
+    """連番から疑似ASINを作成（B + 9桁）"""
+    return f'B{i:09d}'
+
+
+def write_account_config(config_path: Path, accounts: int) -> List[str]:
+    """
+    AccountManager 用のアカウント設定を作成
+
+    Returns:
+        list: アカウントIDのリスト
+    """
+    account_ids = [f'bench_account_{i + 1}' for i in range(accounts)]
+    config = {
+        'owners': [{'id': 'bench_owner', 'name': 'ベンチマーク', 'proxy_id': None}],
+        'accounts': [
+            {
+                'id': account_id,
+                'owner_id': 'bench_owner',
+                'name': f'ベンチマーク{i + 1}',
+                'active': True,
+                'daily_upload_limit': 1000000,
+                'rate_limit_per_hour': 50,
+                'credentials': {},
+            }
+            for i, account_id in enumerate(account_ids)
+        ],
+    }
+    config_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(config_path, 'w', encoding='utf-8') as f:
+        json.dump(config, f, ensure_ascii=False, indent=2)
+    return account_ids
+
+
+def generate_master_db(
+    db_path: Path,
+    account_ids: List[str],
+    products: int,
+    listings: int,
+    queue: int,
+    seed: int = 42
+) -> Dict[str, Any]:
+    """
+    合成 master.db を作成（既存ファイルは作り直す）
+
+    Args:
+        db_path: 出力先
+        account_ids: 出品・キューに割り当てるアカウント
+        products: 商品数
+        listings: 出品数（products 以上の場合は1商品に複数出品）
+        queue: upload_queue の行数
+        seed: 乱数シード
+
+    Returns:
+        dict: 生成件数
+    """
+    rng = random.Random(seed)
+    keywords = _load_keywords()
+
+    db_path = Path(db_path)
+    if db_path.exists():
+        db_path.unlink()
+    MasterDB(db_path)  # スキーマ作成（以降の一括投入はsqlite3で直接行う）
+
+    now = datetime.now()
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=OFF')
+
+        # products
+        product_rows = []
+        for i in range(products):
+            words = rng.sample(_WORDS, 6)
+            if keywords['ng'] and rng.random() < 0.1:
+                words.insert(rng.randrange(len(words)), rng.choice(keywords['ng']))
+            description_words = rng.sample(_WORDS, 12)
+            if keywords['prohibited'] and rng.random() < 0.02:
+                description_words.insert(rng.randrange(len(description_words)), rng.choice(keywords['prohibited']))
+            category = rng.choice(keywords['categories']) if keywords['categories'] and rng.random() < 0.01 \
+                else rng.choice(_CATEGORIES)
+            in_stock = rng.random() < 0.85
+            product_rows.append((
+                make_asin(i),
+                ' '.join(words),
+                ' '.join(words),
+                '。'.join(description_words) * 3,
+                ' '.join(description_words),
+                category,
+                rng.choice(_BRANDS),
+                json.dumps([f'https://m.media-amazon.com/images/I/{i:09d}.jpg']),
+                rng.randrange(500, 30000) if rng.random() < 0.97 else None,
+                in_stock,
+                (now - timedelta(hours=rng.randrange(0, 72))).isoformat(),
+            ))
+        conn.executemany('''
+            INSERT INTO products
+            (asin, title_ja, title_en, description_ja, description_en, category, brand, images,
+             amazon_price_jpy, amazon_in_stock, last_fetched_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', product_rows)
+
+        # listings（1商品に複数アカウントで出品されるケースを含む）
+        listing_rows = []
+        for i in range(listings):
+            product_index = i % products if products else 0
+            account_id = account_ids[(i // products + product_index) % len(account_ids)] if products else account_ids[0]
+            status = 'listed' if rng.random() < 0.9 else rng.choice(['pending', 'sold', 'delisted'])
+            listing_rows.append((
+                make_asin(product_index),
+                PLATFORM,
+                account_id,
+                str(100000000 + i),
+                f'BENCH-{i:08d}',
+                rng.randrange(700, 45000),
+                rng.choice([0, 1, 1, 1]),
+                status,
+                'public' if rng.random() < 0.8 else 'hidden',
+                (now - timedelta(days=rng.randrange(0, 365))).isoformat(),
+            ))
+        conn.executemany('''
+            INSERT INTO listings
+            (asin, platform, account_id, platform_item_id, sku, selling_price, in_stock_quantity,
+             status, visibility, listed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', listing_rows)
+
+        # upload_queue（UNIQUE(asin, platform, account_id) を満たすよう出品と重ならない組み合わせにする）
+        queue_rows = []
+        for i in range(queue):
+            product_index = (products - 1 - i) % products if products else 0
+            account_id = account_ids[(i // max(products, 1)) % len(account_ids)]
+            status = rng.choices(['pending', 'success', 'failed'], weights=[6, 3, 1])[0]
+            scheduled = now + timedelta(minutes=rng.randrange(-3 * 24 * 60, 3 * 24 * 60))
+            queue_rows.append((
+                make_asin(product_index),
+                PLATFORM,
+                account_id,
+                scheduled.strftime('%Y-%m-%d %H:%M:%S'),
+                rng.choice([1, 5, 5, 5, 10, 20]),
+                status,
+            ))
+        conn.executemany('''
+            INSERT OR IGNORE INTO upload_queue
+            (asin, platform, account_id, scheduled_time, priority, status)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', queue_rows)
+
+        conn.commit()
+        counts = {
+            table: conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+            for table in ('products', 'listings', 'upload_queue')
+        }
+        conn.execute('PRAGMA journal_mode=DELETE')
+    finally:
+        conn.close()
+
+    return counts
+
+
+def generate_cache_dir(cache_dir: Path, count: int, seed: int = 42) -> int:
+    """
+    AmazonProductCache 形式のキャッシュディレクトリを作成
+
+    Args:
+        cache_dir: 出力先（amazon_products ディレクトリ、metadata.json は親に作成）
+        count: 作成するASIN数（make_asin(0) から連番）
+        seed: 乱数シード
+
+    Returns:
+        int: 作成件数
+    """
+    rng = random.Random(seed)
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    now = datetime.now().isoformat()
+
+    for i in range(count):
+        asin = make_asin(i)
+        data = {
+            'asin': asin,
+            'title_ja': ' '.join(rng.sample(_WORDS, 6)),
+            'price': rng.randrange(500, 30000),
+            'in_stock': rng.random() < 0.85,
+            'images': [f'https://m.media-amazon.com/images/I/{i:09d}.jpg'],
+            'price_updated_at': now,
+            'stock_updated_at': now,
+            'basic_info_updated_at': now,
+            'cached_at': now,
+        }
+        with open(cache_dir / f'{asin}.json', 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+
+    with open(cache_dir.parent / 'metadata.json', 'w', encoding='utf-8') as f:
+        json.dump({'total_cached': count, 'last_bulk_update': now, 'cache_hits': 0, 'cache_misses': 0}, f)
+
+    return count
@@ -1,6 +1,7 @@
 """デーモンの実行状態を確認するスクリプト"""
 
 import sys
+import json
 from pathlib import Path
 from datetime import datetime
 
@@ -10,6 +11,15 @@ sys.path.insert(0, str(Path(__file__).resolve().parent))
 # ロックファイルを確認
 lock_file = Path(__file__).parent / 'logs' / 'sync_inventory_daemon.lock'
 log_file = Path(__file__).parent / 'logs' / 'sync_inventory.log'
+status_file = Path(__file__).parent / 'logs' / 'status' / 'sync_inventory.json'
+
+# ステータスファイル（DaemonBaseが書き出す実行状態・次回実行予定）
+status = None
+if status_file.exists():
+    try:
+        status = json.loads(status_file.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        status = None
 
 print("\n" + "=" * 70)
 print("デーモン実行状態チェック")
@@ -32,6 +42,22 @@ if lock_file.exists():
 else:
     print("\n[NG] ロックファイルなし → デーモンは停止中")
 
+# ステータスファイルの確認
+if status:
+    state_labels = {'running': '実行中', 'waiting': '待機中', 'stopped': '停止'}
+    print(f"\n[STATUS] ステータスファイル: {status_file}")
+    print(f"   状態: {state_labels.get(status.get('state'), status.get('state'))}")
+    print(f"   スケジュール: {status.get('schedule')}")
+    if status.get('last_started_at'):
+        print(f"   前回開始: {status['last_started_at']}")
+    if status.get('last_duration_seconds') is not None:
+        result = '成功' if status.get('last_success') else '失敗'
+        print(f"   前回所要時間: {status['last_duration_seconds']:.0f}秒（{result}）")
+    if status.get('pending_work') is not None:
+        print(f"   未処理件数: {status['pending_work']:,}")
+    if status.get('next_run_at'):
+        print(f"   次回実行: {status['next_run_at']}（{status.get('next_run_reason')}）")
+
 # ログファイルの確認
 if log_file.exists():
     print(f"\n[LOG] ログファイル: {log_file}")
@@ -58,7 +84,10 @@ if log_file.exists():
         print("   [警告] SP-APIを呼び出している可能性があります！")
     elif "サマリー" in last_line or "完了" in last_line:
         print("\n[完了] 状態: 最後の実行は正常に完了")
-        print("   次回実行: 3時間後")
+        if status and status.get('next_run_at'):
+            print(f"   次回実行: {status['next_run_at']}")
+        else:
+            print("   次回実行: 不明（ステータスファイルなし）")
     elif "SIGINT" in last_line:
         print("\n[停止] 状態: 手動停止（Ctrl+C）")
     elif "ERROR" in last_line or "エラー" in last_line:
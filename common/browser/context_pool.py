@@ -0,0 +1,638 @@
+"""
+Browser Context Pool
+
+(platform, account_id, proxy_id) ごとに launch_persistent_context を起動したまま保持し、
+タスクごとに発生するChromium起動・プロファイル読み込みの待ち時間をなくします。
+
+- lease(): 同一プロセス内でページを貸し出す（async with で返却）
+- 常駐プロセス（このファイルを直接実行）は各コンテキストをリモートデバッグポート付きで起動し、
+  エンドポイントをレジストリ（data/browser_pool/registry.json）に登録する。
+  各Sessionクラス（launch_browser / start）はレジストリを参照して connect_over_cdp で接続し、
+  常駐プロセスが無い場合は従来通りChromiumを起動する
+- バックグラウンドでログイン状態をヘルスチェック（結果はレジストリにも記録）
+- N回使用後、またはメモリ使用量が上限を超えた場合、使用中のページが無いときに再起動
+
+使用方法:
+    # 常駐プロセスを起動（platform:account_id[:proxy_id] を複数指定可）
+    python common/browser/context_pool.py \\
+        --key amazon_business:amazon_business_main \\
+        --key yahoo_auction:yahoo_01:proxy_01
+
+    # 以降、住所録クリーンアップ等のCLIタスクは自動的に常駐ブラウザへ接続する
+    python platforms/amazon_business/scripts/cleanup_addresses.py
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import socket
+import sys
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Dict, Any, Callable, Awaitable, NamedTuple, List
+from urllib.parse import urlparse
+
+from playwright.async_api import async_playwright, Playwright, BrowserContext, Page
+
+# プロジェクトルートをパスに追加（直接実行時用）
+project_root = Path(__file__).resolve().parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from common.browser.profile_manager import ProfileManager
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+
+# 共通のブラウザ起動引数
+BROWSER_ARGS = [
+    "--disable-blink-features=AutomationControlled",
+    "--disable-automation",
+    "--disable-dev-shm-usage",
+    "--no-sandbox",
+]
+
+# プラットフォーム別の追加引数
+PLATFORM_BROWSER_ARGS = {
+    # WebRTC無効化（ローカルIP漏洩防止）
+    "yahoo_auction": [
+        "--disable-webrtc",
+        "--disable-features=WebRtcHideLocalIpsWithMdns",
+    ],
+}
+
+# プラットフォーム別のビューポート（未指定は1920x1080）
+PLATFORM_VIEWPORTS = {
+    "yahoo_auction": {"width": 1280, "height": 720},
+}
+DEFAULT_VIEWPORT = {"width": 1920, "height": 1080}
+
+
+class PoolKey(NamedTuple):
+    """プールのキー"""
+    platform: str
+    account_id: str
+    proxy_id: Optional[str] = None
+
+    def __str__(self) -> str:
+        return f"{self.platform}:{self.account_id}:{self.proxy_id or ''}"
+
+    @classmethod
+    def parse(cls, value: str) -> 'PoolKey':
+        """'platform:account_id[:proxy_id]' 形式の文字列からキーを作成"""
+        parts = value.split(":")
+        if len(parts) < 2 or not parts[0] or not parts[1]:
+            raise ValueError(f"キーの形式が不正です（platform:account_id[:proxy_id]）: {value}")
+        return cls(parts[0], parts[1], parts[2] if len(parts) > 2 and parts[2] else None)
+
+
+class BrowserPoolRegistry:
+    """
+    常駐プールのエンドポイント登録簿
+
+    常駐プロセスが書き込み、CLIタスク側（各Sessionクラス）が参照する。
+    """
+
+    DEFAULT_PATH = project_root / "data" / "browser_pool" / "registry.json"
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Args:
+            path: レジストリファイルのパス（デフォルト: data/browser_pool/registry.json）
+        """
+        self.path = Path(path or self.DEFAULT_PATH)
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """全エントリを読み込む"""
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"レジストリの読み込みに失敗しました: {e}")
+            return {}
+
+    def _save(self, entries: Dict[str, Dict[str, Any]]):
+        """アトミックに書き込む"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entries, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def register(self, key: PoolKey, **entry):
+        """エントリを登録・更新"""
+        entries = self.load()
+        current = entries.get(str(key), {})
+        current.update(entry)
+        current["updated_at"] = datetime.now().isoformat()
+        entries[str(key)] = current
+        self._save(entries)
+
+    def unregister(self, key: PoolKey):
+        """エントリを削除"""
+        entries = self.load()
+        if entries.pop(str(key), None) is not None:
+            self._save(entries)
+
+    def find_endpoint(
+        self,
+        platform: str,
+        account_id: str,
+        proxy_id: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        接続可能なCDPエンドポイントを取得
+
+        Args:
+            platform: プラットフォーム名
+            account_id: アカウントID
+            proxy_id: プロキシID
+
+        Returns:
+            str or None: 'http://127.0.0.1:<port>'（常駐プロセスが無い・応答しない場合None）
+        """
+        entry = self.load().get(str(PoolKey(platform, account_id, proxy_id)))
+        if not entry or not entry.get("endpoint"):
+            return None
+
+        # ポートに接続できるかで生存確認（プロセスが落ちて残ったエントリを無視する）
+        parsed = urlparse(entry["endpoint"])
+        try:
+            with socket.create_connection((parsed.hostname, parsed.port), timeout=0.5):
+                pass
+        except OSError:
+            return None
+
+        return entry["endpoint"]
+
+
+async def attach_pooled_context(
+    playwright: Playwright,
+    platform: str,
+    account_id: str,
+    proxy_id: Optional[str] = None,
+    registry: Optional[BrowserPoolRegistry] = None
+) -> Optional[BrowserContext]:
+    """
+    常駐プールのコンテキストに接続（async API用）
+
+    接続したコンテキストは close() しないこと（常駐ブラウザごと終了するため）。
+    作成したページを閉じ、playwright.stop() で接続のみ切断する。
+
+    Returns:
+        BrowserContext or None: 常駐プロセスが無い場合None
+    """
+    endpoint = (registry or BrowserPoolRegistry()).find_endpoint(platform, account_id, proxy_id)
+    if not endpoint:
+        return None
+
+    try:
+        browser = await playwright.chromium.connect_over_cdp(endpoint)
+    except Exception as e:
+        logger.warning(f"常駐ブラウザへの接続に失敗しました（通常起動します）: {e}")
+        return None
+
+    if not browser.contexts:
+        return None
+
+    logger.info(f"常駐ブラウザに接続しました: {platform}/{account_id} ({endpoint})")
+    return browser.contexts[0]
+
+
+# ----------------------------------------------------------------------
+# ヘルスチェック（ログイン状態の確認）
+# ----------------------------------------------------------------------
+
+HealthCheck = Callable[[Page, PoolKey], Awaitable[bool]]
+
+
+async def _check_amazon_business(page: Page, key: PoolKey) -> bool:
+    from platforms.amazon_business.browser.session import AmazonBusinessSession
+    return await AmazonBusinessSession(account_id=key.account_id).check_login_status(page)
+
+
+async def _check_mercari_shops(page: Page, key: PoolKey) -> bool:
+    from platforms.mercari_shops.browser.session import MercariShopsSession
+    return await MercariShopsSession(account_id=key.account_id).check_login_status(page)
+
+
+async def _check_yahoo_auction(page: Page, key: PoolKey) -> bool:
+    # YahooAuctionSession は sync API のため、同じ判定をここで行う
+    await page.goto(
+        "https://auctions.yahoo.co.jp/user/jp/show/mystatus",
+        wait_until="domcontentloaded",
+        timeout=30000
+    )
+    return "login.yahoo.co.jp" not in page.url and "mystatus" in page.url
+
+
+DEFAULT_HEALTH_CHECKS: Dict[str, HealthCheck] = {
+    "amazon_business": _check_amazon_business,
+    "mercari_shops": _check_mercari_shops,
+    "yahoo_auction": _check_yahoo_auction,
+}
+
+
+# ----------------------------------------------------------------------
+# プール本体
+# ----------------------------------------------------------------------
+
+@dataclass
+class PooledContext:
+    """プール内のコンテキスト1件分の状態"""
+    key: PoolKey
+    context: BrowserContext
+    port: int
+    keeper_page: Page
+    started_at: float = field(default_factory=time.time)
+    uses: int = 0
+    healthy: Optional[bool] = None
+    last_health_check: Optional[float] = None
+    count_pages: bool = True
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    @property
+    def endpoint(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    @property
+    def active_pages(self) -> int:
+        """使用中のページ数（維持用の空白ページを除く）"""
+        return max(0, len(self.context.pages) - 1)
+
+
+class BrowserContextPool:
+    """
+    ウォームなブラウザコンテキストのプール
+
+    使用例（同一プロセス内）:
+        async with BrowserContextPool(headless=True) as pool:
+            async with pool.lease("amazon_business", "amazon_business_main") as page:
+                await page.goto("https://www.amazon.co.jp/")
+    """
+
+    def __init__(
+        self,
+        headless: bool = False,
+        max_uses: int = 50,
+        max_memory_mb: Optional[int] = 1500,
+        health_check_interval: int = 600,
+        maintenance_interval: int = 15,
+        publish: bool = False,
+        registry: Optional[BrowserPoolRegistry] = None,
+        health_checks: Optional[Dict[str, HealthCheck]] = None
+    ):
+        """
+        Args:
+            headless: ヘッドレスモード
+            max_uses: 再起動までのページ使用回数
+            max_memory_mb: 再起動するメモリ使用量（MB、psutil未インストール時は無効）
+            health_check_interval: ログイン状態の確認間隔（秒、0で無効）
+            maintenance_interval: 再起動判定の間隔（秒）
+            publish: Trueの場合、エンドポイントをレジストリに登録（常駐プロセス用）
+            registry: BrowserPoolRegistryインスタンス
+            health_checks: プラットフォーム別のログイン確認関数（デフォルト: DEFAULT_HEALTH_CHECKS）
+        """
+        self.headless = headless
+        self.max_uses = max_uses
+        self.max_memory_mb = max_memory_mb if psutil else None
+        self.health_check_interval = health_check_interval
+        self.maintenance_interval = maintenance_interval
+        self.publish = publish
+        self.registry = registry or BrowserPoolRegistry()
+        self.health_checks = dict(DEFAULT_HEALTH_CHECKS if health_checks is None else health_checks)
+
+        self.profile_manager = ProfileManager()
+        self._playwright: Optional[Playwright] = None
+        self._contexts: Dict[PoolKey, PooledContext] = {}
+        self._launch_lock = asyncio.Lock()
+        self._maintenance_task: Optional[asyncio.Task] = None
+
+        if max_memory_mb and not psutil:
+            logger.warning("psutilがインストールされていません。メモリ使用量による再起動は無効です。")
+
+    async def __aenter__(self) -> 'BrowserContextPool':
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+        return False
+
+    async def start(self):
+        """Playwrightを起動し、メンテナンスタスクを開始"""
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        if self._maintenance_task is None:
+            self._maintenance_task = asyncio.create_task(self._maintenance_loop())
+
+    async def close(self):
+        """全コンテキストを閉じてPlaywrightを停止"""
+        if self._maintenance_task:
+            self._maintenance_task.cancel()
+            try:
+                await self._maintenance_task
+            except asyncio.CancelledError:
+                pass
+            self._maintenance_task = None
+
+        for pooled in list(self._contexts.values()):
+            await self._close_context(pooled)
+        self._contexts.clear()
+
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def warm_up(self, keys: List[PoolKey]):
+        """指定キーのコンテキストを事前に起動"""
+        for key in keys:
+            await self._get_or_launch(key)
+
+    @asynccontextmanager
+    async def lease(self, platform: str, account_id: str, proxy_id: Optional[str] = None):
+        """
+        ページを貸し出す
+
+        ブロックを抜けるとページを閉じ、必要に応じてコンテキストを再起動する。
+
+        Yields:
+            Page: ウォームなコンテキスト上の新規ページ
+        """
+        key = PoolKey(platform, account_id, proxy_id)
+        pooled = await self._get_or_launch(key)
+        page = await pooled.context.new_page()
+
+        try:
+            yield page
+        finally:
+            try:
+                await page.close()
+            except Exception:
+                pass
+            await self._recycle_if_needed(pooled)
+
+    def get_status(self) -> List[Dict[str, Any]]:
+        """全コンテキストの状態を取得"""
+        return [
+            {
+                "key": str(pooled.key),
+                "endpoint": pooled.endpoint,
+                "uses": pooled.uses,
+                "active_pages": pooled.active_pages,
+                "healthy": pooled.healthy,
+                "memory_mb": self._get_memory_mb(pooled),
+                "uptime_seconds": int(time.time() - pooled.started_at),
+            }
+            for pooled in self._contexts.values()
+        ]
+
+    # ------------------------------------------------------------------
+    # 起動・終了
+    # ------------------------------------------------------------------
+
+    async def _get_or_launch(self, key: PoolKey) -> PooledContext:
+        async with self._launch_lock:
+            pooled = self._contexts.get(key)
+            if pooled is None:
+                await self.start()
+                pooled = await self._launch(key)
+                self._contexts[key] = pooled
+            return pooled
+
+    async def _launch(self, key: PoolKey) -> PooledContext:
+        """永続コンテキストをリモートデバッグポート付きで起動"""
+        profile_path = self.profile_manager.create_profile(key.platform, key.account_id)
+        port = _find_free_port()
+
+        options = {
+            "user_data_dir": str(profile_path),
+            "headless": self.headless,
+            "viewport": PLATFORM_VIEWPORTS.get(key.platform, DEFAULT_VIEWPORT),
+            "locale": "ja-JP",
+            "timezone_id": "Asia/Tokyo",
+            "args": BROWSER_ARGS + PLATFORM_BROWSER_ARGS.get(key.platform, []) + [
+                f"--remote-debugging-port={port}",
+            ],
+            "ignore_default_args": ["--enable-automation"],
+        }
+
+        if key.proxy_id:
+            from common.proxy.proxy_manager import ProxyManager
+            proxy_config = ProxyManager().get_proxy_for_playwright(key.proxy_id)
+            if proxy_config:
+                options["proxy"] = proxy_config
+            else:
+                logger.warning(f"プロキシが見つかりません: {key.proxy_id}")
+
+        started = time.perf_counter()
+        context = await self._playwright.chromium.launch_persistent_context(**options)
+
+        # 保存されたCookieを読み込む（各Sessionクラスの _load_cookies と同じ形式）
+        cookie_file = profile_path / "cookies.json"
+        if cookie_file.exists():
+            try:
+                with open(cookie_file, "r", encoding="utf-8") as f:
+                    await context.add_cookies(json.load(f))
+            except Exception as e:
+                logger.warning(f"Cookie読み込みエラー ({key}): {e}")
+
+        # 最後のタブが閉じられるとブラウザが終了するため、空白ページを1枚維持する
+        keeper_page = context.pages[0] if context.pages else await context.new_page()
+
+        pooled = PooledContext(key=key, context=context, port=port, keeper_page=keeper_page)
+        context.on("page", lambda page: self._on_page(pooled))
+
+        logger.info(f"コンテキスト起動: {key} ({time.perf_counter() - started:.1f}秒, port={port})")
+
+        if self.publish:
+            self.registry.register(
+                key,
+                endpoint=pooled.endpoint,
+                pid=os.getpid(),
+                started_at=datetime.now().isoformat(),
+                healthy=None,
+            )
+
+        return pooled
+
+    def _on_page(self, pooled: PooledContext):
+        """ページ作成時（lease・CDP接続側のnew_pageの両方）に使用回数を加算"""
+        if pooled.count_pages:
+            pooled.uses += 1
+
+    async def _close_context(self, pooled: PooledContext):
+        if self.publish:
+            self.registry.unregister(pooled.key)
+        try:
+            await pooled.context.close()
+        except Exception as e:
+            logger.warning(f"コンテキスト終了エラー ({pooled.key}): {e}")
+
+    async def _restart(self, pooled: PooledContext, reason: str):
+        """コンテキストを再起動（プロファイルは維持されるためログイン状態は保持される）"""
+        logger.info(f"コンテキスト再起動: {pooled.key}（{reason}）")
+        async with self._launch_lock:
+            await self._close_context(pooled)
+            self._contexts[pooled.key] = await self._launch(pooled.key)
+
+    # ------------------------------------------------------------------
+    # 再起動判定・ヘルスチェック
+    # ------------------------------------------------------------------
+
+    def _recycle_reason(self, pooled: PooledContext) -> Optional[str]:
+        if self.max_uses and pooled.uses >= self.max_uses:
+            return f"使用回数 {pooled.uses}回"
+        if self.max_memory_mb:
+            memory_mb = self._get_memory_mb(pooled)
+            if memory_mb and memory_mb >= self.max_memory_mb:
+                return f"メモリ使用量 {memory_mb}MB"
+        return None
+
+    async def _recycle_if_needed(self, pooled: PooledContext):
+        """使用中のページが無い場合のみ、条件を満たしていれば再起動"""
+        if pooled.lock.locked():
+            return
+        async with pooled.lock:
+            if pooled.active_pages > 0 or self._contexts.get(pooled.key) is not pooled:
+                return
+            reason = self._recycle_reason(pooled)
+            if reason:
+                await self._restart(pooled, reason)
+
+    async def _health_check(self, pooled: PooledContext):
+        """ログイン状態を確認（使用中でない場合のみ）"""
+        check = self.health_checks.get(pooled.key.platform)
+        if check is None or pooled.active_pages > 0 or pooled.lock.locked():
+            return
+
+        async with pooled.lock:
+            pooled.count_pages = False
+            try:
+                page = await pooled.context.new_page()
+            finally:
+                pooled.count_pages = True
+
+            try:
+                pooled.healthy = bool(await check(page, pooled.key))
+            except Exception as e:
+                logger.warning(f"ヘルスチェックエラー ({pooled.key}): {e}")
+                pooled.healthy = False
+            finally:
+                await page.close()
+
+        pooled.last_health_check = time.time()
+        if not pooled.healthy:
+            logger.warning(f"ログイン状態が無効です。再ログインが必要です: {pooled.key}")
+        if self.publish:
+            self.registry.register(pooled.key, healthy=pooled.healthy)
+
+    async def _maintenance_loop(self):
+        while True:
+            await asyncio.sleep(self.maintenance_interval)
+            for pooled in list(self._contexts.values()):
+                try:
+                    await self._recycle_if_needed(pooled)
+                    pooled = self._contexts[pooled.key]
+
+                    due = (
+                        pooled.last_health_check is None
+                        or time.time() - pooled.last_health_check >= self.health_check_interval
+                    )
+                    if self.health_check_interval and due:
+                        await self._health_check(pooled)
+                except Exception as e:
+                    logger.error(f"メンテナンスエラー ({pooled.key}): {e}")
+
+    def _get_memory_mb(self, pooled: PooledContext) -> Optional[int]:
+        """ブラウザプロセス（子プロセス含む）のRSS合計（MB）"""
+        if not psutil:
+            return None
+
+        port_arg = f"--remote-debugging-port={pooled.port}"
+        try:
+            for proc in psutil.Process().children(recursive=True):
+                try:
+                    if port_arg in proc.cmdline():
+                        procs = [proc] + proc.children(recursive=True)
+                        return int(sum(p.memory_info().rss for p in procs) / 1024 / 1024)
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+        except psutil.Error:
+            pass
+        return None
+
+
+def _find_free_port() -> int:
+    """空いているローカルポートを取得"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def _serve(args):
+    keys = [PoolKey.parse(value) for value in args.key]
+
+    async with BrowserContextPool(
+        headless=args.headless,
+        max_uses=args.max_uses,
+        max_memory_mb=args.max_memory_mb,
+        health_check_interval=args.health_interval,
+        publish=True
+    ) as pool:
+        await pool.warm_up(keys)
+
+        print("=" * 60)
+        print("ブラウザコンテキストプール 起動完了")
+        print("=" * 60)
+        for status in pool.get_status():
+            print(f"  {status['key']:<50} {status['endpoint']}")
+        print()
+        print("Ctrl+C で終了します")
+
+        while True:
+            await asyncio.sleep(args.status_interval)
+            for status in pool.get_status():
+                logger.info(
+                    f"{status['key']}: uses={status['uses']}, active={status['active_pages']}, "
+                    f"healthy={status['healthy']}, memory={status['memory_mb']}MB"
+                )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ブラウザコンテキストプール（常駐）")
+    parser.add_argument(
+        "--key",
+        action="append",
+        required=True,
+        help="platform:account_id[:proxy_id]（複数指定可）"
+    )
+    parser.add_argument("--headless", action="store_true", help="ヘッドレスモードで実行")
+    parser.add_argument("--max-uses", type=int, default=50, help="再起動までのページ使用回数（デフォルト: 50）")
+    parser.add_argument("--max-memory-mb", type=int, default=1500, help="再起動するメモリ使用量MB（デフォルト: 1500、要psutil）")
+    parser.add_argument("--health-interval", type=int, default=600, help="ログイン状態の確認間隔・秒（デフォルト: 600、0で無効）")
+    parser.add_argument("--status-interval", type=int, default=300, help="状態ログの出力間隔・秒（デフォルト: 300）")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        print("\n終了しました")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,409 @@
+"""
+Request Filter
+
+ブラウザ自動化のリクエストを遮断・スタブ化し、ページ読み込み時間とプロキシ帯域を削減します。
+
+- プラットフォーム別のプロファイル（config/request_filter_profiles.json）
+  - block_resource_types: 遮断するリソースタイプ（font, media 等）
+  - stub_resource_types:  ダミー応答を返すリソースタイプ（画像は1x1 GIFを返し、レイアウト崩れやonerrorを防ぐ）
+  - block_domains:        遮断する解析・広告系ドメイン（スクリプトは空のJSを返す）
+  - allow_domains:        常に通すドメイン（block_domains より優先）
+  - extends:              継承元プロファイル（ドメインは結合、リソースタイプは上書き）
+- タスクごとに遮断件数・削減バイト数（推定）・受信バイト数を集計し、
+  logs/request_filter_stats.jsonl に追記する
+
+削減バイト数は遮断したリクエストの実サイズを取得できないため、
+リソースタイプ別の推定サイズ（estimated_bytes）から算出する。
+
+ルートは遮断・スタブ化の対象になり得るURL（block_domains と、対象リソースタイプの拡張子）にのみ設定する。
+Playwright はルートを設定した Page / BrowserContext でHTTPキャッシュを無効にする（Chromiumでは
+ルートが1つでもあれば全リクエストが対象）ため、通過させたスクリプト・CSSは毎回再取得になる。
+このコストは推定削減バイト数に含まれないため、通過分の受信バイト数をリソースタイプ別に記録する
+（bytes_received_by_type）。遮断の効果はフィルタ無し（block_resources=False）の実行と受信バイト数で比較すること。
+拡張子の無いURLの画像等はルートに掛からず、そのまま通過する。
+
+使用例（async API）:
+    request_filter = RequestFilter.for_platform("amazon_business")
+    await request_filter.install(context)   # Page / BrowserContext のどちらでも可
+    ...
+    request_filter.record()
+
+使用例（sync API）:
+    request_filter = RequestFilter.for_platform("yahoo_auction")
+    request_filter.install_sync(context)
+"""
+
+import base64
+import json
+import logging
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+project_root = Path(__file__).resolve().parent.parent.parent
+
+DEFAULT_CONFIG_PATH = project_root / "config" / "request_filter_profiles.json"
+DEFAULT_STATS_PATH = project_root / "logs" / "request_filter_stats.jsonl"
+
+# 1x1 透過GIF
+TRANSPARENT_GIF = base64.b64decode("R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7")
+
+# リソースタイプ → URLの拡張子（ルートの対象を絞り込むため）
+RESOURCE_TYPE_EXTENSIONS = {
+    "image": ("png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico", "bmp"),
+    "media": ("mp4", "webm", "ogg", "ogv", "mp3", "m4a", "wav", "mov", "m3u8"),
+    "font": ("woff", "woff2", "ttf", "otf", "eot"),
+    "stylesheet": ("css",),
+    "script": ("js", "mjs"),
+}
+
+# 判定結果
+ACTION_CONTINUE = "continue"
+ACTION_BLOCK = "block"
+ACTION_STUB = "stub"
+
+
+@dataclass
+class RequestFilterProfile:
+    """遮断プロファイル"""
+    name: str
+    block_resource_types: frozenset = frozenset()
+    stub_resource_types: frozenset = frozenset()
+    block_domains: Tuple[str, ...] = ()
+    allow_domains: Tuple[str, ...] = ()
+    estimated_bytes: Dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, name: str, config_path: Optional[Path] = None) -> 'RequestFilterProfile':
+        """
+        設定ファイルからプロファイルを読み込む
+
+        Args:
+            name: プロファイル名（プラットフォーム名。未定義の場合は 'default'）
+            config_path: 設定ファイルパス
+
+        Returns:
+            RequestFilterProfile
+        """
+        config_path = Path(config_path or DEFAULT_CONFIG_PATH)
+        if not config_path.exists():
+            logger.warning(f"設定ファイルが見つかりません: {config_path}（遮断なし）")
+            return cls(name=name)
+
+        with open(config_path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+
+        profiles = config.get("profiles", {})
+        if name not in profiles:
+            name = "default"
+
+        merged = cls._resolve(profiles, name, set())
+        return cls(
+            name=name,
+            block_resource_types=frozenset(merged.get("block_resource_types", [])),
+            stub_resource_types=frozenset(merged.get("stub_resource_types", [])),
+            block_domains=tuple(merged.get("block_domains", [])),
+            allow_domains=tuple(merged.get("allow_domains", [])),
+            estimated_bytes=dict(config.get("estimated_bytes", {})),
+        )
+
+    @classmethod
+    def _resolve(cls, profiles: Dict[str, Any], name: str, seen: set) -> Dict[str, Any]:
+        """extends を辿ってプロファイルを合成"""
+        if name in seen or name not in profiles:
+            return {}
+        seen.add(name)
+
+        profile = profiles[name]
+        base = cls._resolve(profiles, profile["extends"], seen) if profile.get("extends") else {}
+
+        merged = dict(base)
+        for key in ("block_resource_types", "stub_resource_types"):
+            if key in profile:
+                merged[key] = list(profile[key])
+        for key in ("block_domains", "allow_domains"):
+            merged[key] = list(dict.fromkeys(base.get(key, []) + profile.get(key, [])))
+        return merged
+
+    def decide(self, url: str, resource_type: str) -> str:
+        """
+        リクエストの扱いを判定
+
+        Args:
+            url: リクエストURL
+            resource_type: Playwrightのリソースタイプ
+
+        Returns:
+            str: 'continue' / 'block' / 'stub'
+        """
+        parsed = urlparse(url)
+        if parsed.scheme not in ("http", "https"):
+            return ACTION_CONTINUE
+
+        host_path = f"{parsed.hostname or ''}{parsed.path}"
+        if _match_any(host_path, self.allow_domains):
+            return ACTION_CONTINUE
+
+        if _match_any(host_path, self.block_domains):
+            # スクリプトは空応答にする（読み込み失敗によるページ側のエラーを防ぐ）
+            return ACTION_STUB if resource_type == "script" else ACTION_BLOCK
+
+        if resource_type in self.stub_resource_types:
+            return ACTION_STUB
+        if resource_type in self.block_resource_types:
+            return ACTION_BLOCK
+        return ACTION_CONTINUE
+
+    def route_pattern(self) -> Optional[Any]:
+        """
+        ルートを設定するURLのパターン（遮断・スタブ化の対象になり得るURLのみ）
+
+        Returns:
+            re.Pattern / "**/*"（拡張子で絞り込めないリソースタイプを対象にしている場合）/
+            None（対象が無い場合。ルートを設定しない）
+        """
+        resource_types = self.block_resource_types | self.stub_resource_types
+        if any(resource_type not in RESOURCE_TYPE_EXTENSIONS for resource_type in resource_types):
+            return "**/*"
+
+        alternatives = []
+        if self.block_domains:
+            domains = "|".join(re.escape(pattern) for pattern in self.block_domains)
+            alternatives.append(rf"^https?://([^/?#]*\.)?({domains})")
+        extensions = sorted({ext for rt in resource_types for ext in RESOURCE_TYPE_EXTENSIONS[rt]})
+        if extensions:
+            alternatives.append(rf"^https?://[^?#]*\.({'|'.join(extensions)})([?#]|$)")
+        if not alternatives:
+            return None
+        return re.compile("|".join(alternatives), re.IGNORECASE)
+
+
+def _match_any(host_path: str, patterns: Tuple[str, ...]) -> bool:
+    """ホスト（+パス）がパターンのいずれかに該当するか（サブドメインも対象）"""
+    dotted = f".{host_path}"
+    return any(f".{pattern}" in dotted for pattern in patterns)
+
+
+def _stub_response(resource_type: str) -> Dict[str, Any]:
+    """スタブ応答（route.fulfill の引数）"""
+    if resource_type == "image":
+        return {"status": 200, "content_type": "image/gif", "body": TRANSPARENT_GIF}
+    if resource_type == "script":
+        return {"status": 200, "content_type": "application/javascript", "body": ""}
+    if resource_type == "stylesheet":
+        return {"status": 200, "content_type": "text/css", "body": ""}
+    return {"status": 204, "body": ""}
+
+
+class RequestFilter:
+    """
+    リクエスト遮断と集計（1タスク = 1インスタンス）
+    """
+
+    def __init__(self, profile: RequestFilterProfile, task_name: Optional[str] = None):
+        """
+        Args:
+            profile: 遮断プロファイル
+            task_name: 集計上のタスク名（デフォルト: 実行スクリプト名）
+        """
+        self.profile = profile
+        self.task_name = task_name or Path(sys.argv[0]).stem or "interactive"
+        self.started_at = time.time()
+
+        self._lock = threading.Lock()
+        self.requests_total = 0
+        self.blocked: Dict[str, int] = {}
+        self.stubbed: Dict[str, int] = {}
+        self.bytes_received = 0
+        self.bytes_received_by_type: Dict[str, int] = {}
+        self.http_cache_disabled = False
+        self.recorded = False
+
+    @classmethod
+    def for_platform(cls, platform: str, task_name: Optional[str] = None) -> 'RequestFilter':
+        """プラットフォーム名のプロファイルで作成"""
+        return cls(RequestFilterProfile.load(platform), task_name=task_name)
+
+    # ------------------------------------------------------------------
+    # インストール
+    # ------------------------------------------------------------------
+
+    async def install(self, target):
+        """
+        async API の Page / BrowserContext にルートを設定
+
+        Args:
+            target: Page または BrowserContext
+        """
+        async def handle_route(route):
+            request = route.request
+            action = self._decide(request.url, request.resource_type)
+            if action == ACTION_BLOCK:
+                await route.abort()
+            elif action == ACTION_STUB:
+                await route.fulfill(**_stub_response(request.resource_type))
+            else:
+                await route.continue_()
+
+        pattern = self.profile.route_pattern()
+        if pattern is not None:
+            await target.route(pattern, handle_route)
+            self.http_cache_disabled = True
+        target.on("request", self._on_request)
+        target.on("response", self._on_response)
+
+    def install_sync(self, target):
+        """
+        sync API の Page / BrowserContext にルートを設定
+
+        Args:
+            target: Page または BrowserContext
+        """
+        def handle_route(route):
+            request = route.request
+            action = self._decide(request.url, request.resource_type)
+            if action == ACTION_BLOCK:
+                route.abort()
+            elif action == ACTION_STUB:
+                route.fulfill(**_stub_response(request.resource_type))
+            else:
+                route.continue_()
+
+        pattern = self.profile.route_pattern()
+        if pattern is not None:
+            target.route(pattern, handle_route)
+            self.http_cache_disabled = True
+        target.on("request", self._on_request)
+        target.on("response", self._on_response)
+
+    def _decide(self, url: str, resource_type: str) -> str:
+        action = self.profile.decide(url, resource_type)
+        with self._lock:
+            if action == ACTION_BLOCK:
+                self.blocked[resource_type] = self.blocked.get(resource_type, 0) + 1
+            elif action == ACTION_STUB:
+                self.stubbed[resource_type] = self.stubbed.get(resource_type, 0) + 1
+        return action
+
+    def _on_request(self, request):
+        """リクエスト数を加算（ルートに掛からないリクエストも含む）"""
+        with self._lock:
+            self.requests_total += 1
+
+    def _on_response(self, response):
+        """通過したレスポンスの受信バイト数（Content-Length）をリソースタイプ別に加算"""
+        try:
+            length = int(response.headers.get("content-length") or 0)
+        except (TypeError, ValueError):
+            return
+        resource_type = response.request.resource_type
+        with self._lock:
+            self.bytes_received += length
+            self.bytes_received_by_type[resource_type] = self.bytes_received_by_type.get(resource_type, 0) + length
+
+    # ------------------------------------------------------------------
+    # 集計
+    # ------------------------------------------------------------------
+
+    @property
+    def bytes_saved(self) -> int:
+        """削減バイト数（推定）"""
+        estimated = self.profile.estimated_bytes
+        default = estimated.get("other", 0)
+        with self._lock:
+            counts = list(self.blocked.items()) + list(self.stubbed.items())
+        return sum(count * estimated.get(resource_type, default) for resource_type, count in counts)
+
+    def get_summary(self) -> Dict[str, Any]:
+        """集計結果を取得"""
+        with self._lock:
+            blocked = dict(self.blocked)
+            stubbed = dict(self.stubbed)
+            requests_total = self.requests_total
+            bytes_received = self.bytes_received
+            bytes_received_by_type = dict(self.bytes_received_by_type)
+
+        return {
+            "task": self.task_name,
+            "profile": self.profile.name,
+            "started_at": datetime.fromtimestamp(self.started_at).isoformat(),
+            "duration_seconds": round(time.time() - self.started_at, 1),
+            "requests_total": requests_total,
+            "blocked": blocked,
+            "stubbed": stubbed,
+            "blocked_total": sum(blocked.values()) + sum(stubbed.values()),
+            "bytes_saved_estimate": self.bytes_saved,
+            "bytes_received": bytes_received,
+            "bytes_received_by_type": bytes_received_by_type,
+            "http_cache_disabled": self.http_cache_disabled,
+        }
+
+    def record(self, stats_path: Optional[Path] = None) -> Dict[str, Any]:
+        """
+        集計結果をログ出力し、JSONLに追記（同一インスタンスでは1回のみ）
+
+        Args:
+            stats_path: 出力先（デフォルト: logs/request_filter_stats.jsonl）
+
+        Returns:
+            dict: 集計結果
+        """
+        summary = self.get_summary()
+        if self.recorded:
+            return summary
+        self.recorded = True
+
+        logger.info(
+            f"リクエスト遮断 [{summary['task']}/{summary['profile']}]: "
+            f"{summary['blocked_total']}/{summary['requests_total']}件, "
+            f"削減 約{summary['bytes_saved_estimate'] / 1024 / 1024:.1f}MB, "
+            f"受信 {summary['bytes_received'] / 1024 / 1024:.1f}MB"
+        )
+
+        stats_path = Path(stats_path or DEFAULT_STATS_PATH)
+        try:
+            stats_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(stats_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(summary, ensure_ascii=False) + "\n")
+        except OSError as e:
+            logger.warning(f"遮断統計の保存に失敗しました: {e}")
+
+        return summary
+
+
+def load_stats(stats_path: Optional[Path] = None, task_name: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    記録済みの集計結果を読み込む
+
+    Args:
+        stats_path: 統計ファイル（デフォルト: logs/request_filter_stats.jsonl）
+        task_name: 指定時はタスク名で絞り込む
+
+    Returns:
+        list: 集計結果のリスト（古い順）
+    """
+    stats_path = Path(stats_path or DEFAULT_STATS_PATH)
+    if not stats_path.exists():
+        return []
+
+    entries = []
+    with open(stats_path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if task_name is None or entry.get("task") == task_name:
+                entries.append(entry)
+    return entries
@@ -6,8 +6,10 @@
 
 import yaml
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable, Tuple
+from functools import lru_cache
 import logging
+import re
 
 logger = logging.getLogger(__name__)
 
@@ -15,8 +17,15 @@ logger = logging.getLogger(__name__)
 class CategoryRouter:
     """
     カテゴリに基づいて出品先アカウントを決定するルーター
+
+    設定読み込み時にルールを1度だけコンパイルし（ルール単位の正規表現）、
+    カテゴリ文字列 → マッチ結果 をLRUキャッシュする。
+    カテゴリは同じ値が大量に繰り返されるため、実際の照合はユニークなカテゴリ数分のみとなる。
     """
 
+    # カテゴリ文字列 → マッチ結果 のキャッシュサイズ
+    MATCH_CACHE_SIZE = 4096
+
     def __init__(self, config_path: str = None):
         """
         Args:
@@ -28,6 +37,7 @@ class CategoryRouter:
 
         self.config_path = Path(config_path)
         self.config = self._load_config()
+        self._compile_rules()
 
     def _load_config(self) -> Dict[str, Any]:
         """設定ファイルを読み込む"""
@@ -45,8 +55,46 @@ class CategoryRouter:
         return config
 
     def reload_config(self):
-        """設定ファイルを再読み込み"""
+        """設定ファイルを再読み込み（コンパイル済みルール・キャッシュも再構築）"""
         self.config = self._load_config()
+        self._compile_rules()
+
+    def _compile_rules(self):
+        """
+        ルーティングルールをコンパイル
+
+        - 優先順位順のルールリストを保持
+        - ルールごとにキーワードの正規表現（OR結合）を作成
+        - マッチ結果のLRUキャッシュを作り直す
+        """
+        self._rules = self._build_routing_rules()
+        self._compiled_rules: List[Tuple[str, Tuple[str, ...], 're.Pattern']] = [
+            (
+                rule['account_id'],
+                tuple(rule['keywords']),
+                re.compile('|'.join(re.escape(keyword) for keyword in rule['keywords']))
+            )
+            for rule in self._rules
+        ]
+        self._match_category = lru_cache(maxsize=self.MATCH_CACHE_SIZE)(self._match_category_uncached)
+
+    def _match_category_uncached(self, category: str) -> Tuple[Tuple[str, str], ...]:
+        """
+        カテゴリにマッチする全ルールを優先順位順に返す（キャッシュなし）
+
+        Args:
+            category: 商品カテゴリ
+
+        Returns:
+            tuple: ((account_id, matched_keyword), ...)
+        """
+        matches = []
+        for account_id, keywords, pattern in self._compiled_rules:
+            if pattern.search(category):
+                # 従来と同じくキーワード定義順で最初に含まれるものを採用
+                matched_keyword = next(keyword for keyword in keywords if keyword in category)
+                matches.append((account_id, matched_keyword))
+        return tuple(matches)
 
     @property
     def is_enabled(self) -> bool:
@@ -62,6 +110,15 @@ class CategoryRouter:
         """
         ルーティングルールを優先順位順で取得
 
+        Returns:
+            List[dict]: 優先順位順のルーティングルール
+        """
+        return [dict(rule, keywords=list(rule['keywords'])) for rule in self._rules]
+
+    def _build_routing_rules(self) -> List[Dict[str, Any]]:
+        """
+        設定からルーティングルールを構築（優先順位順）
+
         Returns:
             List[dict]: 優先順位順のルーティングルール
         """
@@ -106,22 +163,15 @@ class CategoryRouter:
             logger.debug("カテゴリが空のため、デフォルトアカウントを返します")
             return self._get_valid_default(available_accounts)
 
-        # ルールを優先順位順にチェック
-        rules = self.get_routing_rules()
-
-        for rule in rules:
-            account_id = rule['account_id']
-
+        # コンパイル済みルールで照合（カテゴリ単位でキャッシュ）
+        for account_id, keyword in self._match_category(category):
             # 利用可能なアカウントかチェック
             if available_accounts and account_id not in available_accounts:
                 logger.debug(f"アカウント {account_id} は利用不可のためスキップ")
                 continue
 
-            # キーワードマッチング
-            for keyword in rule['keywords']:
-                if keyword in category:
-                    logger.info(f"カテゴリルーティング: '{category}' -> {account_id} (keyword: '{keyword}')")
-                    return account_id
+            logger.debug(f"カテゴリルーティング: '{category}' -> {account_id} (keyword: '{keyword}')")
+            return account_id
 
         # マッチしない場合はデフォルト
         default = self._get_valid_default(available_accounts)
@@ -147,10 +197,28 @@ class CategoryRouter:
 
         return default
 
+    def route_categories(self, categories: Iterable[str], available_accounts: List[str] = None) -> Dict[str, Optional[str]]:
+        """
+        ユニークなカテゴリごとに振り分け先を決定
+
+        Args:
+            categories: カテゴリのリスト（重複可）
+            available_accounts: 利用可能なアカウントIDのリスト
+
+        Returns:
+            Dict[str, Optional[str]]: カテゴリ -> アカウントID（決定できない場合None）
+        """
+        return {
+            category: self.route(category, available_accounts)
+            for category in set(categories)
+        }
+
     def route_batch(self, products: List[Dict[str, Any]], available_accounts: List[str] = None) -> Dict[str, List[str]]:
         """
         複数商品をバッチでルーティング
 
+        商品をカテゴリでグループ化し、ルーティングはユニークなカテゴリごとに1回だけ行う。
+
         Args:
             products: 商品情報のリスト（各商品に 'asin' と 'category' が必要）
             available_accounts: 利用可能なアカウントIDのリスト
@@ -158,21 +226,26 @@ class CategoryRouter:
         Returns:
             Dict[str, List[str]]: アカウントID -> ASINリストのマッピング
         """
-        result = {}
-
+        # カテゴリ別にASINをグループ化（入力順を保持）
+        asins_by_category: Dict[str, List[str]] = {}
         for product in products:
             asin = product.get('asin')
-            category = product.get('category', '')
-
             if not asin:
                 continue
+            asins_by_category.setdefault(product.get('category') or '', []).append(asin)
 
-            account_id = self.route(category, available_accounts)
+        routes = self.route_categories(asins_by_category.keys(), available_accounts)
 
+        result = {}
+        for category, asins in asins_by_category.items():
+            account_id = routes[category]
             if account_id:
-                if account_id not in result:
-                    result[account_id] = []
-                result[account_id].append(asin)
+                result.setdefault(account_id, []).extend(asins)
+
+        logger.info(
+            f"カテゴリルーティング: {sum(len(a) for a in asins_by_category.values())}件 "
+            f"（ユニークカテゴリ {len(asins_by_category)}件）"
+        )
 
         return result
 
@@ -207,18 +280,15 @@ class CategoryRouter:
                 'reason': 'empty_category'
             }
 
-        # ルールを優先順位順にチェック
-        rules = self.get_routing_rules()
-
-        for rule in rules:
-            for keyword in rule['keywords']:
-                if keyword in category:
-                    return {
-                        'account_id': rule['account_id'],
-                        'matched_keyword': keyword,
-                        'is_default': False,
-                        'reason': 'keyword_match'
-                    }
+        matches = self._match_category(category)
+        if matches:
+            account_id, keyword = matches[0]
+            return {
+                'account_id': account_id,
+                'matched_keyword': keyword,
+                'is_default': False,
+                'reason': 'keyword_match'
+            }
 
         return {
             'account_id': self.default_account,
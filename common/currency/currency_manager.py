@@ -10,14 +10,14 @@ yfinance APIを使用してリアルタイムで為替レートを取得しま
 import json
 import logging
 import time
+import importlib.util
 from pathlib import Path
 from typing import Optional, Dict
 
-try:
-    import yfinance as yf
-    YFINANCE_AVAILABLE = True
-except ImportError:
-    YFINANCE_AVAILABLE = False
+# yfinance は pandas 等を読み込むため重い。キャッシュが有効な間は不要なので、
+# ここではインストール有無のみ確認し、実際の読み込みは _fetch_from_api() まで遅延する
+YFINANCE_AVAILABLE = importlib.util.find_spec('yfinance') is not None
+if not YFINANCE_AVAILABLE:
     logging.warning("yfinanceがインストールされていません。固定レートを使用します。")
 
 
@@ -193,6 +193,8 @@ class CurrencyManager:
         self.logger.info("yfinance APIから最新の為替レートを取得中...")
 
         try:
+            import yfinance as yf
+
             ticker = yf.Ticker("USDJPY=X")
             current_rate = ticker.info.get('regularMarketPrice')
 
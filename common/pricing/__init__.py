@@ -20,9 +20,16 @@
     )
 """
 
-from .strategy import PricingStrategy
-from .calculator import PriceCalculator
-from .config_loader import ConfigLoader
+import importlib
+
+# 公開クラスは初回アクセス時に読み込む（PEP 562）
+# common.pricing.strategies 等のサブモジュールだけを使う場合に、
+# PriceCalculator → CurrencyManager・設定ファイル読み込みまで連鎖しないようにするため
+_LAZY_IMPORTS = {
+    'PricingStrategy': '.strategy',
+    'PriceCalculator': '.calculator',
+    'ConfigLoader': '.config_loader',
+}
 
 __all__ = [
     'PricingStrategy',
@@ -30,4 +37,17 @@ __all__ = [
     'ConfigLoader',
 ]
 
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
 __version__ = '1.0.0'
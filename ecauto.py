@@ -0,0 +1,103 @@
+"""
+ecauto コマンド - 各スクリプトの入口
+
+サブコマンド名から対応するスクリプトを実行します。
+起動を速くするため、このファイルでは標準ライブラリの最小限のみ読み込み、
+サブコマンドのスクリプト（と sp_api / requests 等の重い依存）は実行時に初めて読み込みます。
+
+使用例:
+    # サブコマンド一覧
+    python ecauto.py
+
+    # デーモンの状態確認
+    python ecauto.py status
+
+    # キュー確認（以降の引数はそのままスクリプトに渡す）
+    python ecauto.py queue --platform base
+
+    # 在庫同期デーモン
+    python ecauto.py sync-daemon --interval 3600
+
+    # サブコマンドのヘルプ
+    python ecauto.py upload-account --help
+"""
+
+import sys
+import runpy
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+
+# サブコマンド名 → (スクリプトのパス（プロジェクトルートからの相対パス）, 説明)
+COMMANDS = {
+    # デーモン
+    'status': ('check_daemon_status.py', 'デーモンの実行状態・次回実行予定を確認'),
+    'sync-daemon': ('scheduled_tasks/sync_inventory_daemon.py', '在庫同期デーモン（SP-API → Master DB → 各プラットフォーム）'),
+    'upload-daemon': ('scheduler/upload_daemon.py', 'アップロードデーモン（プラットフォーム単位）'),
+    'upload-account': ('scheduler/upload_daemon_account.py', 'アップロードデーモン（アカウント単位）'),
+    'accounts': ('scheduler/multi_account_manager.py', 'マルチアカウントのアップロードデーモン管理（start / stop / status）'),
+    # 出品キュー
+    'queue': ('scheduler/scripts/check_queue.py', 'アップロードキューの状態を確認'),
+    'queue-add': ('scheduler/scripts/add_to_queue.py', 'アップロードキューに追加'),
+    'queue-reschedule': ('scheduler/scripts/reschedule_queue.py', 'キューの実行予定時刻を再設定'),
+    'queue-verify': ('scheduler/scripts/verify_queue_integrity.py', 'キューの整合性を確認'),
+    # Master DB
+    'db-check': ('inventory/scripts/check_master_db.py', 'Master DBの内容を確認'),
+    'db-backup': ('inventory/scripts/backup_db.py', 'Master DBをバックアップ'),
+    'add-products': ('inventory/scripts/add_new_products.py', '新規商品をMaster DBに追加'),
+    'verify-listings': ('inventory/scripts/verify_listings_integrity.py', '出品情報の整合性を確認'),
+    'snapshot': ('inventory/scripts/export_snapshot.py', '分析用スナップショットをエクスポート（master.db → 列指向ファイル）'),
+    # 開発・計測
+    'bench': ('benchmarks/run_benchmarks.py', '合成データによるベンチマーク'),
+    'mock-api': ('benchmarks/mock_api_server.py', 'SP-API / BASE / eBay のローカルモックサーバー'),
+    'import-time': ('benchmarks/import_time.py', 'モジュールの読み込み時間を確認（予算超過で終了コード1）'),
+}
+
+
+def print_commands():
+    """サブコマンド一覧を表示"""
+    print("使用方法: python ecauto.py <サブコマンド> [引数...]")
+    print()
+    print("サブコマンド:")
+    width = max(len(name) for name in COMMANDS)
+    for name, (script, description) in COMMANDS.items():
+        print(f"  {name:<{width}}  {description}")
+        print(f"  {'':<{width}}  ({script})")
+
+
+def main(argv=None) -> int:
+    """
+    サブコマンドを実行
+
+    Args:
+        argv: 引数（指定しない場合は sys.argv[1:]）
+
+    Returns:
+        int: 終了コード
+    """
+    argv = sys.argv[1:] if argv is None else argv
+
+    if not argv or argv[0] in ('-h', '--help', 'help', 'list'):
+        print_commands()
+        return 0
+
+    name, args = argv[0], argv[1:]
+    if name not in COMMANDS:
+        print(f"エラー: 不明なサブコマンド: {name}", file=sys.stderr)
+        print_commands()
+        return 2
+
+    script = PROJECT_ROOT / COMMANDS[name][0]
+    if not script.exists():
+        print(f"エラー: スクリプトが見つかりません: {script}", file=sys.stderr)
+        return 2
+
+    # スクリプトを直接実行した場合と同じ状態（sys.argv・__main__）で実行
+    sys.path.insert(0, str(PROJECT_ROOT))
+    sys.argv = [str(script)] + args
+    runpy.run_path(str(script), run_name='__main__')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
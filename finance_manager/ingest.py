@@ -0,0 +1,301 @@
+"""
+差分取り込みキャッシュ
+
+01_raw_data 配下のCSVを、ファイル単位で正規化済みの行としてキャッシュする。
+
+- manifest.json にファイルごとのハッシュ（sha256）・検出した文字コード・使用したパーサー・行数を記録
+- 正規化済みの行は列指向形式で保存（pyarrowがあればParquet、無ければpickle）
+- 新規・変更ファイルのみをパース（複数ファイルはプロセス並列）
+- サイズ・更新日時が前回と同じファイルはハッシュ計算も省略
+- キャッシュはファイルの相対パスと内容のハッシュの組で保存する（パース結果はファイル名にも依存するため）
+- パーサーのバージョン（main.py の PARSER_VERSION 等から作成）が変わると全件再パースされる
+
+ピボットはキャッシュを結合したDataFrameから作成するため、
+月次の再実行では変更のあった _latest.csv のみがパースされる。
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    CACHE_FORMAT = 'parquet'
+except ImportError:
+    CACHE_FORMAT = 'pickle'
+
+
+# 正規化後の列
+NORMALIZED_COLUMNS = ['date', 'sales', 'cost', 'variable_cost', 'description', 'segment', 'source_file']
+NUMERIC_COLUMNS = ['sales', 'cost', 'variable_cost']
+
+MANIFEST_NAME = 'manifest.json'
+
+
+def file_sha256(filepath: str) -> str:
+    """ファイルのsha256"""
+    h = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def normalize_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """列と型を揃える（キャッシュ形式で保存できるように）"""
+    df = df.reindex(columns=NORMALIZED_COLUMNS)
+    df['date'] = pd.to_datetime(df['date'], errors='coerce')
+    # タイムゾーン付き（Shopify等）は日本時間に揃えてから外す（結合時にobject型にならないように）
+    if isinstance(df['date'].dtype, pd.DatetimeTZDtype):
+        df['date'] = df['date'].dt.tz_convert('Asia/Tokyo').dt.tz_localize(None)
+    for col in NUMERIC_COLUMNS:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    df['description'] = df['description'].astype(str)
+    df['segment'] = df['segment'].astype(str)
+    df['source_file'] = df['source_file'].astype(str)
+    return df.reset_index(drop=True)
+
+
+class IngestCache:
+    """
+    ファイル単位の正規化済みデータキャッシュ
+    """
+
+    def __init__(self, raw_dir: str, cache_dir: str, parser_version: str):
+        """
+        Args:
+            raw_dir: 生データのディレクトリ（01_raw_data）
+            cache_dir: キャッシュディレクトリ（02_cache）
+            parser_version: パーサーのバージョン（前回と異なる場合は全件再パース）
+        """
+        self.raw_dir = raw_dir
+        self.parser_version = str(parser_version)
+        self.cache_dir = cache_dir
+        self.data_dir = os.path.join(cache_dir, 'files')
+        self.manifest_path = os.path.join(cache_dir, MANIFEST_NAME)
+        os.makedirs(self.data_dir, exist_ok=True)
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        if not os.path.exists(self.manifest_path):
+            return {'parser_version': self.parser_version, 'files': {}}
+        with open(self.manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        # パーサー変更時は全件再パース
+        if manifest.get('parser_version') != self.parser_version:
+            return {'parser_version': self.parser_version, 'files': {}}
+        return manifest
+
+    def _save_manifest(self):
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _cache_path(self, relpath: str, sha256: str) -> str:
+        """キャッシュファイルのパス（セグメント・source_file・パーサーはファイル名で決まるため相対パスもキーに含める）"""
+        key = hashlib.sha256(f'{relpath}\0{sha256}'.encode('utf-8')).hexdigest()
+        ext = 'parquet' if CACHE_FORMAT == 'parquet' else 'pkl'
+        return os.path.join(self.data_dir, f'{key[:32]}.{ext}')
+
+    def _write_frame(self, df: pd.DataFrame, path: str):
+        if CACHE_FORMAT == 'parquet':
+            df.to_parquet(path, index=False)
+        else:
+            df.to_pickle(path)
+
+    def _read_frame(self, path: str) -> pd.DataFrame:
+        if path.endswith('.parquet'):
+            return pd.read_parquet(path)
+        return pd.read_pickle(path)
+
+    def list_raw_files(self) -> List[str]:
+        """対象CSVの一覧（raw_dirからの相対パス、隠しファイル除外）"""
+        files = []
+        for root, _, names in os.walk(self.raw_dir):
+            for name in names:
+                if name.lower().endswith('.csv') and not name.startswith('.'):
+                    files.append(os.path.relpath(os.path.join(root, name), self.raw_dir))
+        return sorted(files)
+
+    def find_changed(self, files: List[str], full: bool = False) -> Tuple[List[Tuple[str, str]], int]:
+        """
+        新規・変更ファイルを抽出
+
+        Args:
+            files: 相対パスのリスト
+            full: Trueの場合は全件を対象にする
+
+        Returns:
+            ([(relpath, sha256), ...], unchanged_count)
+        """
+        changed = []
+        unchanged = 0
+
+        for relpath in files:
+            filepath = os.path.join(self.raw_dir, relpath)
+            stat = os.stat(filepath)
+            entry = self.manifest['files'].get(relpath)
+
+            # サイズ・更新日時が同じならハッシュ計算も省略
+            if (not full and entry and entry.get('size') == stat.st_size
+                    and entry.get('mtime') == stat.st_mtime
+                    and self._entry_is_valid(entry)):
+                unchanged += 1
+                continue
+
+            sha256 = file_sha256(filepath)
+            if not full and entry and entry.get('sha256') == sha256 and self._entry_is_valid(entry):
+                # 内容が同じ（コピー・タッチのみ）: 更新日時だけ記録し直す
+                entry['size'] = stat.st_size
+                entry['mtime'] = stat.st_mtime
+                unchanged += 1
+                continue
+
+            changed.append((relpath, sha256))
+
+        return changed, unchanged
+
+    def _entry_is_valid(self, entry: Dict[str, Any]) -> bool:
+        """キャッシュファイルが存在するか（エラー・対象外のファイルはキャッシュ無しで有効）"""
+        cache_file = entry.get('cache_file')
+        return cache_file is None or os.path.exists(os.path.join(self.cache_dir, cache_file))
+
+    def ingest(
+        self,
+        parse_func: Callable[[str], Tuple[Optional[pd.DataFrame], Optional[str], Optional[str]]],
+        workers: Optional[int] = None,
+        full: bool = False
+    ) -> Dict[str, Any]:
+        """
+        新規・変更ファイルをパースしてキャッシュに保存
+
+        Args:
+            parse_func: ファイルパスを受け取り (正規化前のDataFrame or None, 文字コード, パーサー名) を返す関数
+                        （プロセス並列のためモジュールのトップレベル関数であること）
+            workers: 並列数（デフォルト: CPUコア数、1の場合は逐次処理）
+            full: Trueの場合は全件再パース
+
+        Returns:
+            dict: {'total', 'parsed', 'unchanged', 'removed', 'errors': [(file, message), ...]}
+        """
+        files = self.list_raw_files()
+        changed, unchanged = self.find_changed(files, full=full)
+
+        # 削除されたファイルをマニフェストから除去
+        removed = [relpath for relpath in self.manifest['files'] if relpath not in set(files)]
+        for relpath in removed:
+            self._drop_entry(relpath)
+
+        results = []
+        if changed:
+            workers = workers or os.cpu_count() or 1
+            if workers <= 1 or len(changed) == 1:
+                for relpath, sha256 in changed:
+                    results.append((relpath, sha256, _parse_one(parse_func, os.path.join(self.raw_dir, relpath))))
+            else:
+                with ProcessPoolExecutor(max_workers=min(workers, len(changed))) as executor:
+                    futures = {
+                        executor.submit(_parse_one, parse_func, os.path.join(self.raw_dir, relpath)): (relpath, sha256)
+                        for relpath, sha256 in changed
+                    }
+                    for future in as_completed(futures):
+                        relpath, sha256 = futures[future]
+                        results.append((relpath, sha256, future.result()))
+
+        errors = []
+        for relpath, sha256, (df, encoding, parser, error) in sorted(results):
+            self._store(relpath, sha256, df, encoding, parser, error)
+            filename = os.path.basename(relpath)
+            if error:
+                print(f"Error: {filename} -> {error}")
+                errors.append((filename, error))
+            elif parser is None:
+                print(f"Skip (対象外): {filename}")
+            elif df is None or df.empty:
+                print(f"Warning: {filename} からデータが取れませんでした")
+            else:
+                print(f"OK: {filename} ({len(df)} rows, {encoding}, {parser})")
+
+        # 前回エラーで内容が変わっていないファイルも報告する
+        changed_files = {relpath for relpath, _ in changed}
+        for relpath in files:
+            entry = self.manifest['files'].get(relpath, {})
+            if relpath not in changed_files and entry.get('error'):
+                errors.append((os.path.basename(relpath), entry['error']))
+
+        self._save_manifest()
+
+        return {
+            'total': len(files),
+            'parsed': len(changed),
+            'unchanged': unchanged,
+            'removed': len(removed),
+            'errors': errors,
+        }
+
+    def _store(self, relpath, sha256, df, encoding, parser, error):
+        """パース結果を保存してマニフェストを更新"""
+        self._drop_entry(relpath)
+
+        cache_file = None
+        rows = 0
+        if df is not None and not df.empty and not error:
+            path = self._cache_path(relpath, sha256)
+            self._write_frame(df, path)
+            cache_file = os.path.relpath(path, self.cache_dir)
+            rows = len(df)
+
+        stat = os.stat(os.path.join(self.raw_dir, relpath))
+        self.manifest['files'][relpath] = {
+            'sha256': sha256,
+            'size': stat.st_size,
+            'mtime': stat.st_mtime,
+            'encoding': encoding,
+            'parser': parser,
+            'rows': rows,
+            'cache_file': cache_file,
+            'error': error,
+            'processed_at': datetime.now().isoformat(),
+        }
+
+    def _drop_entry(self, relpath: str):
+        """マニフェストのエントリとキャッシュファイルを削除"""
+        entry = self.manifest['files'].pop(relpath, None)
+        if not entry or not entry.get('cache_file'):
+            return
+        path = os.path.join(self.cache_dir, entry['cache_file'])
+        if os.path.exists(path):
+            os.remove(path)
+
+    def load_all(self) -> pd.DataFrame:
+        """キャッシュ済みの全行を結合して返す"""
+        frames = [
+            self._read_frame(os.path.join(self.cache_dir, entry['cache_file']))
+            for _, entry in sorted(self.manifest['files'].items())
+            if entry.get('cache_file')
+        ]
+        if not frames:
+            return pd.DataFrame(columns=NORMALIZED_COLUMNS)
+        return pd.concat(frames, ignore_index=True)
+
+
+def _parse_one(parse_func, filepath: str):
+    """
+    1ファイルをパース（ワーカープロセスで実行）
+
+    Returns:
+        (normalized_df or None, encoding, parser, error)
+    """
+    try:
+        df, encoding, parser = parse_func(filepath)
+        if df is None or df.empty:
+            return None, encoding, parser, None
+        return normalize_frame(df), encoding, parser, None
+    except Exception as e:
+        return None, None, None, str(e)
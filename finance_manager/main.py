@@ -1,9 +1,15 @@
 import pandas as pd
-import glob
+import argparse
+import hashlib
+import json
+import io
 import os
 import datetime
+import time
 import warnings
 
+from ingest import IngestCache, CACHE_FORMAT
+
 # 警告を無視
 warnings.simplefilter('ignore')
 
@@ -21,6 +27,18 @@ SEGMENT_MAP = {
     'ebay': '5_EC_Drop',
 }
 
+# パーサー（process_* / parse_file）のバージョン
+# ロジックを変更した場合は上げると、次回実行時に全件再パースされる（SEGMENT_MAP の変更は自動で反映）
+PARSER_VERSION = 1
+
+
+def parser_version():
+    """キャッシュの有効性を判定するパーサーのバージョン（PARSER_VERSION + SEGMENT_MAP）"""
+    segment_hash = hashlib.sha256(json.dumps(SEGMENT_MAP, sort_keys=True).encode('utf-8')).hexdigest()[:8]
+    return f'{PARSER_VERSION}-{segment_hash}'
+
+RAW_DATA_DIR = './01_raw_data'
+CACHE_DIR = './02_cache'
 OUTPUT_DIR = './03_output'
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
@@ -28,41 +46,44 @@ os.makedirs(OUTPUT_DIR, exist_ok=True)
 # 2. 読み込み・処理ロジック
 # ==========================================
 
-def load_csv_safe(filepath):
-    """エンコーディングを自動判別して読み込む"""
-    filename = os.path.basename(filepath).lower()
+def detect_encoding(raw, filename):
+    """
+    エンコーディングを自動判別（バイト列のデコードのみで判定し、pandasでのパースは1回だけ行う）
 
-    # eBayファイルの場合は特別処理（最初の11行をスキップ）
-    if 'ebay' in filename:
-        encodings = ['utf-8-sig', 'utf-8', 'cp932']
-        for enc in encodings:
-            try:
-                df = pd.read_csv(filepath, encoding=enc, skiprows=11, encoding_errors='strict')
-                return df
-            except UnicodeDecodeError:
-                continue
-            except Exception:
-                continue
-        # 最後の手段
-        return pd.read_csv(filepath, encoding='utf-8-sig', skiprows=11, encoding_errors='ignore')
-
-    # その他のファイル
+    Returns:
+        (text, encoding)
+    """
     # Mercariファイルの場合はshift_jisを優先
-    if 'mercari' in filename:
-        encodings = ['shift_jis', 'utf-8-sig', 'utf-8', 'cp932']
+    if 'mercari' in filename and 'ebay' not in filename:
+        encodings = ['shift_jis', 'utf-8-sig', 'cp932']
     else:
-        encodings = ['utf-8-sig', 'utf-8', 'cp932']
+        encodings = ['utf-8-sig', 'cp932']
 
     for enc in encodings:
         try:
-            df = pd.read_csv(filepath, encoding=enc, encoding_errors='strict')
-            return df
+            return raw.decode(enc), enc
         except UnicodeDecodeError:
             continue
-        except Exception:
-            continue
+
     # 最後の手段（エラー無視して読む）
-    return pd.read_csv(filepath, encoding='cp932', encoding_errors='ignore')
+    fallback = 'utf-8-sig' if 'ebay' in filename else 'cp932'
+    return raw.decode(fallback, errors='ignore'), f'{fallback}(ignore)'
+
+def load_csv_safe(filepath):
+    """
+    エンコーディングを自動判別して読み込む
+
+    Returns:
+        (df, encoding)
+    """
+    filename = os.path.basename(filepath).lower()
+
+    with open(filepath, 'rb') as f:
+        text, encoding = detect_encoding(f.read(), filename)
+
+    # eBayファイルの場合は特別処理（最初の11行をスキップ）
+    skiprows = 11 if 'ebay' in filename else None
+    return pd.read_csv(io.StringIO(text), skiprows=skiprows), encoding
 
 def process_hadient_shopify(df, filename):
     """D2C / Shopify / Subsc用"""
@@ -194,80 +215,82 @@ def process_ebay(df, filename):
             'description': df[order_col].astype(str)
         })
 
+def get_segment(filename):
+    """ファイル名からセグメントを判定"""
+    for key, val in SEGMENT_MAP.items():
+        if key in filename.lower():
+            return val
+    return 'Unknown'
+
+def parse_file(filepath):
+    """
+    1ファイルを読み込んで正規化（ingest.IngestCache からワーカープロセスで呼ばれる）
+
+    Returns:
+        (processed_df or None, encoding, parser_name)  対象外のファイルは (None, None, None)
+    """
+    filename = os.path.basename(filepath)
+    lower = filename.lower()
+
+    # --- 処理分岐 (順序重要) ---
+    # 1. Amazon (hadientが含まれていてもAmazonルールで読むため先頭に)
+    if 'amazon' in lower:
+        parser = process_amazon
+    # 2. eBay
+    elif 'ebay' in lower:
+        parser = process_ebay
+    # 3. Mercari
+    elif 'mercari' in lower:
+        parser = process_mercari
+    # 4. BASE
+    elif 'base' in lower:
+        parser = process_base
+    # 5. D2C / Shopify (最後に判定)
+    elif 'hadient' in lower or 'shopify' in lower:
+        parser = process_hadient_shopify
+    else:
+        return None, None, None
+
+    df, encoding = load_csv_safe(filepath)
+    processed_df = parser(df, filename)
+
+    # 共通処理
+    if processed_df.empty:
+        return None, encoding, parser.__name__
+
+    processed_df['segment'] = get_segment(filename)
+    processed_df['source_file'] = filename
+    return processed_df, encoding, parser.__name__
+
 # ==========================================
 # 3. メイン処理
 # ==========================================
 
 def main():
-    all_data = []
-    files = glob.glob('./01_raw_data/**/*.csv', recursive=True)
-    error_files = []
-    
-    print(f"発見したファイル数: {len(files)}")
-    
-    for filepath in files:
-        filename = os.path.basename(filepath)
-        # 隠しファイルなどはスキップ
-        if filename.startswith('.'): continue
-        
-        try:
-            df = load_csv_safe(filepath)
-            
-            # セグメント判定
-            segment = 'Unknown'
-            for key, val in SEGMENT_MAP.items():
-                if key in filename.lower():
-                    segment = val
-                    break
-            
-            # --- 処理分岐 (順序重要) ---
-            processed_df = pd.DataFrame()
-            
-            # 1. Amazon (hadientが含まれていてもAmazonルールで読むため先頭に)
-            if 'amazon' in filename.lower():
-                processed_df = process_amazon(df, filename)
-                
-            # 2. eBay
-            elif 'ebay' in filename.lower():
-                processed_df = process_ebay(df, filename)
-            
-            # 3. Mercari
-            elif 'mercari' in filename.lower():
-                processed_df = process_mercari(df, filename)
+    parser = argparse.ArgumentParser(description='月次売上レポート作成（差分取り込み）')
+    parser.add_argument('--full', action='store_true', help='キャッシュを使わず全ファイルを再パース')
+    parser.add_argument('--workers', type=int, default=None, help='並列パース数（デフォルト: CPUコア数）')
+    parser.add_argument('--no-raw-data', dest='raw_data', action='store_false',
+                        help="Excelに'Raw_Data'シートを出力しない（行数が多い場合の高速化）")
+    args = parser.parse_args()
 
-            # 4. BASE
-            elif 'base' in filename.lower():
-                processed_df = process_base(df, filename)
+    started = time.perf_counter()
 
-            # 5. D2C / Shopify (最後に判定)
-            elif 'hadient' in filename.lower() or 'shopify' in filename.lower():
-                processed_df = process_hadient_shopify(df, filename)
-            
-            else:
-                print(f"Skip (対象外): {filename}")
-                continue
-
-            # 共通処理
-            if processed_df.empty:
-                print(f"Warning: {filename} からデータが取れませんでした")
-                continue
-                
-            processed_df['segment'] = segment
-            processed_df['source_file'] = filename
-            all_data.append(processed_df)
-            print(f"OK: {filename} ({len(processed_df)} rows)")
-            
-        except Exception as e:
-            print(f"Error: {filename} -> {e}")
-            error_files.append((filename, str(e)))
+    # --- 差分取り込み（新規・変更ファイルのみパース） ---
+    cache = IngestCache(RAW_DATA_DIR, CACHE_DIR, parser_version())
+    result = cache.ingest(parse_file, workers=args.workers, full=args.full)
+    error_files = result['errors']
+
+    print(f"発見したファイル数: {result['total']} "
+          f"(パース: {result['parsed']}, キャッシュ利用: {result['unchanged']}, 削除: {result['removed']}, "
+          f"キャッシュ形式: {CACHE_FORMAT})")
 
     # --- 集計と出力 ---
-    if not all_data:
+    master_df = cache.load_all()
+    if master_df.empty:
         print("データがありません")
         return
 
-    master_df = pd.concat(all_data, ignore_index=True)
-
     # date列を明示的にdatetime型に変換
     master_df['date'] = pd.to_datetime(master_df['date'], errors='coerce')
 
@@ -287,15 +310,18 @@ def main():
     
     with pd.ExcelWriter(output_path) as writer:
         pivot_sales.to_excel(writer, sheet_name='Sales_Summary')
-        master_df.to_excel(writer, sheet_name='Raw_Data', index=False)
+        if args.raw_data:
+            master_df.to_excel(writer, sheet_name='Raw_Data', index=False)
         
         # エラーログも別シートに出す
         if error_files:
             pd.DataFrame(error_files, columns=['File', 'Error']).to_excel(writer, sheet_name='Errors')
             
-    print(f"\n完了！レポートを出力しました: {output_path}")
+    print(f"\n完了！レポートを出力しました: {output_path} ({time.perf_counter() - started:.1f}秒)")
+    if not args.raw_data:
+        print(f"明細データはキャッシュ（{CACHE_DIR}）にあります（--no-raw-data のためExcelには出力していません）。")
     if error_files:
         print("\n⚠️ 読み込みエラーが発生したファイルがあります。Excelの'Errors'シートを確認してください。")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -3,17 +3,20 @@ Amazon SP-API Client
 
 Amazon Selling Partner APIのラッパークライアント
 既存システムから移植
+
+sp_api（全APIモジュールを読み込むため重い）と requests は実際に使うまで読み込まない。
+モジュールを import するだけのスクリプト（状態確認・キュー確認等）の起動を速くするため。
 """
 
 import os
 import time
 import json
 import logging
-import requests
 import threading
 from typing import List, Dict, Any, Optional
-from sp_api.api import CatalogItems, Products
-from sp_api.base import Marketplaces
+
+from shared.utils.metrics import track, record_throttle_wait, set_gauge, caller_name
+from shared.utils.api_endpoints import get_endpoint, apply_sp_api_endpoint
 
 # ロガー設定（ISSUE #011対応）
 logger = logging.getLogger(__name__)
@@ -52,6 +55,7 @@ class AmazonSPAPIClient:
                 threading.Event.wait() はシグナルで即座に中断可能
         """
         import os
+        from sp_api.base import Marketplaces
 
         self.credentials = credentials
         self.marketplace = Marketplaces.JP
@@ -99,6 +103,9 @@ class AmazonSPAPIClient:
         # スレッドセーフなレート制限のためのロック
         self._rate_limit_lock = threading.Lock()
 
+        # メトリクスのアカウントラベル
+        self.metrics_account = credentials.get('account_id') or 'default'
+
     def _interruptible_sleep(self, total_seconds: float) -> bool:
         """
         割り込み可能なsleep（デーモン用）
@@ -158,6 +165,7 @@ class AmazonSPAPIClient:
 
         # ロックの外で待機（シグナル処理を妨げない）
         if wait_time is not None and wait_time > 0:
+            record_throttle_wait('sp_api', caller_name(), self.metrics_account, wait_time)
             if not self._interruptible_sleep(wait_time):
                 # シャットダウン要求で中断された場合
                 return False
@@ -167,6 +175,16 @@ class AmazonSPAPIClient:
             self.last_request_time = time.time()
             return True
 
+    def _record_rate_limit(self, operation: str, response):
+        """レスポンスヘッダーのレート上限（x-amzn-RateLimit-Limit）をメトリクスに記録"""
+        headers = getattr(response, 'headers', None) or {}
+        try:
+            limit = headers.get('x-amzn-RateLimit-Limit')
+            if limit is not None:
+                set_gauge('sp_api_rate_limit', float(limit), operation=operation, account=self.metrics_account)
+        except (AttributeError, TypeError, ValueError):
+            pass
+
     def _notify_quota_exceeded(self, asin: str, error_message: str):
         """
         QuotaExceededエラー発生時に通知を送信
@@ -257,6 +275,23 @@ class AmazonSPAPIClient:
 
         return deduplicated
 
+    def _create_api(self, api_name: str):
+        """
+        SP-APIクライアント（'CatalogItems', 'Products'）を作成
+
+        SP_API_ENDPOINT / SP_API_LWA_URL / ECAUTO_MOCK_API_URL が設定されている場合は
+        接続先をそちら（ローカルのモックサーバー等）に向ける。
+        """
+        import sp_api.api
+
+        api_class = getattr(sp_api.api, api_name)
+        client = api_class(
+            credentials=self.credentials,
+            marketplace=self.marketplace
+        )
+        apply_sp_api_endpoint(client)
+        return client
+
     def _get_access_token(self) -> str:
         """LWAアクセストークンを取得"""
         current_time = time.time()
@@ -265,7 +300,7 @@ class AmazonSPAPIClient:
         if self.access_token and current_time < self.token_expires_at:
             return self.access_token
 
-        url = "https://api.amazon.com/auth/o2/token"
+        url = get_endpoint('sp_api_lwa', "https://api.amazon.com/auth/o2/token")
         payload = {
             "grant_type": "refresh_token",
             "refresh_token": self.credentials["refresh_token"],
@@ -273,6 +308,8 @@ class AmazonSPAPIClient:
             "client_secret": self.credentials["lwa_client_secret"]
         }
 
+        import requests
+
         response = requests.post(url, data=payload)
 
         if response.status_code == 200:
@@ -306,15 +343,14 @@ class AmazonSPAPIClient:
             # レート制限待機（Catalog API: 2.5秒/リクエスト）
             self._wait_for_rate_limit(self.min_interval_catalog)
 
-            catalog_client = CatalogItems(
-                marketplace=self.marketplace,
-                credentials=self.credentials
-            )
+            catalog_client = self._create_api('CatalogItems')
 
-            result = catalog_client.get_catalog_item(
-                asin,
-                includedData=['attributes', 'summaries', 'images', 'salesRanks']
-            )
+            with track('sp_api', 'get_catalog_item', self.metrics_account):
+                result = catalog_client.get_catalog_item(
+                    asin,
+                    includedData=['attributes', 'summaries', 'images', 'salesRanks']
+                )
+            self._record_rate_limit('get_catalog_item', result)
 
             item_data = result() if callable(result) else result
 
@@ -488,15 +524,14 @@ class AmazonSPAPIClient:
                 # レート制限待機（個別処理: 2.5秒/リクエスト）
                 self._wait_for_rate_limit(self.min_interval_catalog)
 
-                products_client = Products(
-                    credentials=self.credentials,
-                    marketplace=self.marketplace
-                )
+                products_client = self._create_api('Products')
 
-                response = products_client.get_item_offers(
-                    asin=asin,
-                    item_condition="New"
-                )
+                with track('sp_api', 'get_item_offers', self.metrics_account):
+                    response = products_client.get_item_offers(
+                        asin=asin,
+                        item_condition="New"
+                    )
+                self._record_rate_limit('get_item_offers', response)
 
                 offers = response.payload.get('Offers', [])
 
@@ -662,10 +697,7 @@ class AmazonSPAPIClient:
         # ASINをバッチに分割
         batches = [asins[i:i + batch_size] for i in range(0, len(asins), batch_size)]
 
-        products_client = Products(
-            credentials=self.credentials,
-            marketplace=self.marketplace
-        )
+        products_client = self._create_api('Products')
 
         for batch_idx, batch_asins in enumerate(batches, 1):
             # レート制限待機（全てのバッチで実行 - ISSUE #005 & #006対応）
@@ -692,7 +724,9 @@ class AmazonSPAPIClient:
 
             try:
                 # バッチリクエストを実行
-                response = products_client.get_item_offers_batch(requests_=requests)
+                with track('sp_api', 'get_item_offers_batch', self.metrics_account):
+                    response = products_client.get_item_offers_batch(requests_=requests)
+                self._record_rate_limit('get_item_offers_batch', response)
 
                 # ISSUE #011対応: バッチ内の成功/失敗をカウント
                 batch_success_count = 0
@@ -945,10 +979,7 @@ class AmazonSPAPIClient:
         # ASINをバッチに分割
         batches = [asins[i:i + batch_size] for i in range(0, len(asins), batch_size)]
 
-        products_client = Products(
-            credentials=self.credentials,
-            marketplace=self.marketplace
-        )
+        products_client = self._create_api('Products')
 
         # レート制限を一時的にgetPricing用に変更
         original_min_interval = self.min_interval
@@ -961,10 +992,12 @@ class AmazonSPAPIClient:
 
                 try:
                     # getPricing APIを呼び出し（正しいメソッド名: get_product_pricing_for_asins）
-                    response = products_client.get_product_pricing_for_asins(
-                        asin_list=batch_asins,
-                        item_condition='New'
-                    )
+                    with track('sp_api', 'get_product_pricing_for_asins', self.metrics_account):
+                        response = products_client.get_product_pricing_for_asins(
+                            asin_list=batch_asins,
+                            item_condition='New'
+                        )
+                    self._record_rate_limit('get_product_pricing_for_asins', response)
 
                     if hasattr(response, 'payload'):
                         payload = response.payload
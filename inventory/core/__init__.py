@@ -6,5 +6,7 @@ Inventory Core Module
 
 from .master_db import MasterDB
 from .cache_manager import AmazonProductCache
+from .price_history_store import PriceHistoryStore
+from .prohibited_scan_store import ProhibitedScanStore
 
-__all__ = ['MasterDB', 'AmazonProductCache']
+__all__ = ['MasterDB', 'AmazonProductCache', 'PriceHistoryStore', 'ProhibitedScanStore']
@@ -0,0 +1,463 @@
+"""
+Listing Integrity
+
+listings / upload_queue / products と、プラットフォーム側の商品一覧（BASEショップ）との整合性を
+まとめて検証するエンジン
+
+ローカルのテーブルは1つの読み取りトランザクションでまとめて読み込み、プラットフォーム側の商品一覧
+（アカウントごとに get_all_items() で一括取得したもの）と辞書・集合の突き合わせで一度に検証する
+（行ごとのDBクエリ・API呼び出しは行わない）。
+
+検出する不整合:
+    orphan_item_ids         プラットフォームにあるが、どの出品（listings）からも参照されていない商品ID
+    listed_but_missing      status='listed' だが商品IDが無い・プラットフォームに存在しない出品
+    queue_status_mismatch   キューと出品のステータスの不整合
+                              - queue_without_listing: 対応する出品が無いキュー
+                                （削除プランは未処理のキューのみ。success/failed 等の履歴は報告のみ）
+                              - pending_but_listed: 出品済みなのに未処理（pending/scheduled）のキュー
+                              - success_not_listed: 最新のキューが success なのに出品が未出品のまま
+    duplicate_asin          同一アカウント・同一ASINの出品が複数ある
+    sku_collisions          SKUの衝突
+                              - local: 表記ゆれ（前後の空白・大文字小文字）を除くと同じSKUの出品が複数ある
+                              - remote: プラットフォーム側で同じSKU（identifier）の商品が複数ある
+    missing_product         products に対応する商品が無い出品（警告のみ）
+
+修正プラン（fix_plans）は操作ごとにまとめ、apply_fix_plans() で一括実行する:
+    delete_queue / cancel_queue / delist_listing / update_item_id / mark_listed / delete_listing
+
+使用例:
+    checker = ListingIntegrityChecker(MasterDB())
+    remote = {'base_account_1': base_client.get_all_items()}
+    report = checker.check(platform='base', remote_items=remote)
+    checker.apply_fix_plans(report['fix_plans'], dry_run=True)
+"""
+
+import json
+import sqlite3
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Iterable
+
+from inventory.core.master_db import MasterDB
+from inventory.core.records import Listing, QueueItem
+
+
+ANOMALY_CLASSES = (
+    'orphan_item_ids',
+    'listed_but_missing',
+    'queue_status_mismatch',
+    'duplicate_asin',
+    'sku_collisions',
+    'missing_product',
+)
+
+# 件数があってもエラーにしない（警告のみ）不整合
+WARNING_CLASSES = ('missing_product',)
+
+# 未処理とみなすキューのステータス
+QUEUE_OPEN_STATUSES = ('pending', 'scheduled')
+
+# 出品前とみなす出品のステータス
+UNLISTED_STATUSES = ('pending', 'queued')
+
+# SQLiteの変数上限を考慮したチャンクサイズ
+CHUNK_SIZE = 500
+
+
+def _normalize_sku(sku: Optional[str]) -> str:
+    return (sku or '').strip().upper()
+
+
+class ListingIntegrityChecker:
+    """
+    出品データの整合性検証エンジン
+    """
+
+    def __init__(self, master_db: MasterDB = None, log_dir: str = None):
+        """
+        Args:
+            master_db: MasterDBインスタンス（省略時はデフォルトパスで作成）
+            log_dir: 修正ログの出力先（デフォルト: logs/）
+        """
+        self.db = master_db or MasterDB()
+        self.log_dir = Path(log_dir) if log_dir else Path(__file__).resolve().parent.parent.parent / 'logs'
+
+    # ==================== 読み込み ====================
+
+    def _load_local(self, platform: str, account_ids: Optional[List[str]]) -> Dict[str, Any]:
+        """listings / upload_queue / products のASIN一覧を1つの読み取りトランザクションで読み込む"""
+        uri = Path(self.db.db_path).resolve().as_uri() + '?mode=ro'
+        conn = sqlite3.connect(uri, uri=True, isolation_level=None)
+        try:
+            conn.execute('BEGIN')
+
+            account_filter = ''
+            params: List[Any] = [platform]
+            if account_ids:
+                account_filter = f" AND account_id IN ({','.join('?' * len(account_ids))})"
+                params.extend(account_ids)
+
+            cursor = conn.cursor()
+            cursor.row_factory = Listing.row_factory
+            cursor.execute(
+                f'SELECT {Listing.select_columns()} FROM listings WHERE platform = ?{account_filter}',
+                params
+            )
+            listings = cursor.fetchall()
+
+            cursor = conn.cursor()
+            cursor.row_factory = QueueItem.row_factory
+            cursor.execute(
+                f'SELECT {QueueItem.select_columns()} FROM upload_queue WHERE platform = ?{account_filter}',
+                params
+            )
+            queue = cursor.fetchall()
+
+            product_asins = {row[0] for row in conn.execute('SELECT asin FROM products')}
+            conn.execute('COMMIT')
+        finally:
+            conn.close()
+
+        return {'listings': listings, 'queue': queue, 'product_asins': product_asins}
+
+    # ==================== 検証 ====================
+
+    def check(
+        self,
+        platform: str = 'base',
+        account_ids: List[str] = None,
+        remote_items: Dict[str, List[Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """
+        整合性を検証
+
+        Args:
+            platform: プラットフォーム名
+            account_ids: 対象アカウント（省略時は全アカウント）
+            remote_items: {アカウントID: プラットフォーム側の商品リスト（item_id, identifier を含む）}
+                          指定したアカウントのみ orphan_item_ids / listed_but_missing（存在確認）を検証する
+
+        Returns:
+            dict: {
+                'generated_at', 'platform', 'accounts', 'remote_accounts',
+                'totals': {'listings', 'queue', 'remote_items'},
+                'counts': {不整合の種類: 件数},
+                'anomalies': {不整合の種類: [詳細]},
+                'fix_plans': [{'action', 'anomaly', 'description', 'items': [...]}],
+                'warnings': [メッセージ],
+                'ok': エラーとなる不整合が無いか
+            }
+        """
+        local = self._load_local(platform, account_ids)
+        listings: List[Listing] = local['listings']
+        queue: List[QueueItem] = local['queue']
+        remote_items = remote_items or {}
+
+        anomalies: Dict[str, List[Dict[str, Any]]] = {name: [] for name in ANOMALY_CLASSES}
+        plans: Dict[str, Dict[str, Any]] = {}
+        warnings: List[str] = []
+
+        def plan(action: str, anomaly: str, description: str, item: Dict[str, Any]):
+            entry = plans.get(action)
+            if entry is None:
+                entry = plans[action] = {'action': action, 'anomaly': anomaly, 'description': description, 'items': []}
+            entry['items'].append(item)
+
+        # ---- インデックス（1回ずつ走査）----
+        listings_by_key: Dict[tuple, List[Listing]] = defaultdict(list)
+        listings_by_sku: Dict[str, List[Listing]] = defaultdict(list)
+        item_ids_by_account: Dict[str, set] = defaultdict(set)
+        for listing in listings:
+            listings_by_key[(listing.account_id, listing.asin)].append(listing)
+            if listing.sku:
+                listings_by_sku[_normalize_sku(listing.sku)].append(listing)
+            if listing.platform_item_id:
+                item_ids_by_account[listing.account_id].add(str(listing.platform_item_id))
+
+        listed_counts: Dict[str, int] = defaultdict(int)
+        for listing in listings:
+            if listing.status == 'listed':
+                listed_counts[listing.account_id] += 1
+
+        remote_ids: Dict[str, set] = {}
+        remote_by_identifier: Dict[str, Dict[str, List[str]]] = {}
+        for account_id, items in remote_items.items():
+            # 商品一覧が空の場合はAPI側の問題の可能性があるため、突き合わせ対象にしない
+            if not items and listed_counts[account_id]:
+                warnings.append(
+                    f"{account_id}: プラットフォームの商品一覧が0件です（出品済み {listed_counts[account_id]}件）。"
+                    "取得失敗の可能性があるため、突き合わせの対象外にしました"
+                )
+                continue
+            ids = set()
+            by_identifier: Dict[str, List[str]] = defaultdict(list)
+            for item in items:
+                item_id = str(item.get('item_id'))
+                ids.add(item_id)
+                identifier = _normalize_sku(item.get('identifier'))
+                if identifier:
+                    by_identifier[identifier].append(item_id)
+            remote_ids[account_id] = ids
+            remote_by_identifier[account_id] = by_identifier
+
+        # ---- listed_but_missing ----
+        relinked_item_ids: Dict[str, set] = defaultdict(set)
+        for listing in listings:
+            if listing.status != 'listed':
+                continue
+            item_id = str(listing.platform_item_id) if listing.platform_item_id else None
+            ids = remote_ids.get(listing.account_id)
+            if item_id and (ids is None or item_id in ids):
+                continue
+
+            reason = 'no_item_id' if not item_id else 'not_found_on_platform'
+            entry = {
+                'listing_id': listing.id,
+                'account_id': listing.account_id,
+                'asin': listing.asin,
+                'sku': listing.sku,
+                'platform_item_id': item_id,
+                'reason': reason,
+            }
+            anomalies['listed_but_missing'].append(entry)
+
+            # SKUが一致する商品がプラットフォームにあれば商品IDを付け替え、無ければ出品停止扱い
+            candidates = remote_by_identifier.get(listing.account_id, {}).get(_normalize_sku(listing.sku), [])
+            if len(candidates) == 1:
+                relinked_item_ids[listing.account_id].add(candidates[0])
+                plan('update_item_id', 'listed_but_missing', 'SKUが一致するプラットフォームの商品IDに付け替え',
+                     {'listing_id': listing.id, 'platform_item_id': candidates[0], 'old_item_id': item_id})
+            elif listing.account_id in remote_ids:
+                plan('delist_listing', 'listed_but_missing', "プラットフォームに存在しない出品を delisted に変更",
+                     {'listing_id': listing.id, 'reason': reason})
+
+        # ---- orphan_item_ids ----
+        for account_id, ids in remote_ids.items():
+            local_ids = item_ids_by_account.get(account_id, set())
+            by_identifier = {
+                item_id: identifier
+                for identifier, item_ids in remote_by_identifier[account_id].items()
+                for item_id in item_ids
+            }
+            for item_id in sorted(ids - local_ids):
+                identifier = by_identifier.get(item_id)
+                anomalies['orphan_item_ids'].append({
+                    'account_id': account_id,
+                    'platform_item_id': item_id,
+                    'identifier': identifier,
+                    'relinked': item_id in relinked_item_ids[account_id],
+                })
+
+        # ---- queue_status_mismatch ----
+        latest_queue: Dict[tuple, QueueItem] = {}
+        for item in queue:
+            key = (item.account_id, item.asin)
+            listings_for_key = listings_by_key.get(key)
+            if not listings_for_key:
+                anomalies['queue_status_mismatch'].append({
+                    'kind': 'queue_without_listing',
+                    'queue_id': item.id,
+                    'account_id': item.account_id,
+                    'asin': item.asin,
+                    'queue_status': item.status,
+                })
+                # 処理済み・処理中のキューは履歴として残す
+                if item.status in QUEUE_OPEN_STATUSES:
+                    plan('delete_queue', 'queue_status_mismatch', '対応する出品が無い未処理キューを削除',
+                         {'queue_id': item.id})
+                continue
+
+            if item.status in QUEUE_OPEN_STATUSES and any(l.status == 'listed' for l in listings_for_key):
+                anomalies['queue_status_mismatch'].append({
+                    'kind': 'pending_but_listed',
+                    'queue_id': item.id,
+                    'account_id': item.account_id,
+                    'asin': item.asin,
+                    'queue_status': item.status,
+                })
+                plan('cancel_queue', 'queue_status_mismatch', '出品済みの商品の未処理キューをキャンセル（二重出品の防止）',
+                     {'queue_id': item.id})
+
+            current = latest_queue.get(key)
+            if current is None or item.id > current.id:
+                latest_queue[key] = item
+
+        for key, item in latest_queue.items():
+            if item.status != 'success':
+                continue
+            for listing in listings_by_key[key]:
+                if listing.status not in UNLISTED_STATUSES:
+                    continue
+                anomalies['queue_status_mismatch'].append({
+                    'kind': 'success_not_listed',
+                    'queue_id': item.id,
+                    'listing_id': listing.id,
+                    'account_id': listing.account_id,
+                    'asin': listing.asin,
+                    'listing_status': listing.status,
+                    'platform_item_id': listing.platform_item_id,
+                })
+                item_id = str(listing.platform_item_id) if listing.platform_item_id else None
+                ids = remote_ids.get(listing.account_id)
+                if item_id and (ids is None or item_id in ids):
+                    plan('mark_listed', 'queue_status_mismatch', 'アップロード済みの出品を listed に変更',
+                         {'listing_id': listing.id})
+
+        # ---- duplicate_asin ----
+        for (account_id, asin), group in listings_by_key.items():
+            if len(group) < 2:
+                continue
+            # 残す出品: 出品済み・商品IDありを優先し、同じなら新しいもの
+            keep = max(group, key=lambda l: (l.status == 'listed', bool(l.platform_item_id), l.id))
+            anomalies['duplicate_asin'].append({
+                'account_id': account_id,
+                'asin': asin,
+                'listing_ids': [l.id for l in group],
+                'keep_listing_id': keep.id,
+            })
+            for listing in group:
+                # 出品済み・商品IDありのものは自動では削除しない
+                if listing is keep or listing.status == 'listed' or listing.platform_item_id:
+                    continue
+                plan('delete_listing', 'duplicate_asin', '重複した未出品の出品を削除',
+                     {'listing_id': listing.id})
+
+        # ---- sku_collisions ----
+        for sku, group in listings_by_sku.items():
+            if len(group) > 1:
+                anomalies['sku_collisions'].append({
+                    'kind': 'local',
+                    'sku': sku,
+                    'listing_ids': [l.id for l in group],
+                    'account_ids': sorted({l.account_id for l in group}),
+                })
+        for account_id, by_identifier in remote_by_identifier.items():
+            for identifier, item_ids in by_identifier.items():
+                if len(item_ids) > 1:
+                    anomalies['sku_collisions'].append({
+                        'kind': 'remote',
+                        'sku': identifier,
+                        'account_id': account_id,
+                        'platform_item_ids': sorted(item_ids),
+                    })
+
+        # ---- missing_product ----
+        product_asins = local['product_asins']
+        for listing in listings:
+            if listing.asin not in product_asins:
+                anomalies['missing_product'].append({
+                    'listing_id': listing.id,
+                    'account_id': listing.account_id,
+                    'asin': listing.asin,
+                })
+
+        counts = {name: len(rows) for name, rows in anomalies.items()}
+        return {
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'platform': platform,
+            'accounts': sorted({l.account_id for l in listings} | {q.account_id for q in queue}),
+            'remote_accounts': sorted(remote_ids),
+            'totals': {
+                'listings': len(listings),
+                'queue': len(queue),
+                'remote_items': sum(len(ids) for ids in remote_ids.values()),
+            },
+            'counts': counts,
+            'anomalies': anomalies,
+            'fix_plans': list(plans.values()),
+            'warnings': warnings,
+            'ok': all(count == 0 for name, count in counts.items() if name not in WARNING_CLASSES),
+        }
+
+    # ==================== 修正 ====================
+
+    def apply_fix_plans(
+        self,
+        fix_plans: List[Dict[str, Any]],
+        actions: Iterable[str] = None,
+        dry_run: bool = False
+    ) -> Dict[str, int]:
+        """
+        修正プランを一括実行（1トランザクション）
+
+        Args:
+            fix_plans: check() の fix_plans
+            actions: 実行する操作（省略時はすべて）
+            dry_run: Trueの場合、件数のみ返して変更しない
+
+        Returns:
+            dict: {操作: 変更した行数}（dry_run の場合は対象件数）
+        """
+        actions = set(actions) if actions else None
+        selected = [p for p in fix_plans if actions is None or p['action'] in actions]
+        if dry_run:
+            return {p['action']: len(p['items']) for p in selected}
+
+        results: Dict[str, int] = {}
+        now = datetime.now().isoformat()
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            for p in selected:
+                action, items = p['action'], p['items']
+                changed = 0
+                if action == 'update_item_id':
+                    cursor.executemany(
+                        'UPDATE listings SET platform_item_id = ?, updated_at = ? WHERE id = ?',
+                        [(item['platform_item_id'], now, item['listing_id']) for item in items]
+                    )
+                    changed = cursor.rowcount
+                elif action in ('delete_queue', 'cancel_queue'):
+                    # チェック後に処理が進んだキューは変更しない
+                    open_marks = ','.join('?' * len(QUEUE_OPEN_STATUSES))
+                    for chunk in self._chunks([item['queue_id'] for item in items]):
+                        marks = ','.join('?' * len(chunk))
+                        if action == 'delete_queue':
+                            cursor.execute(
+                                f'DELETE FROM upload_queue WHERE id IN ({marks}) AND status IN ({open_marks})',
+                                chunk + list(QUEUE_OPEN_STATUSES)
+                            )
+                        else:
+                            cursor.execute(
+                                f"UPDATE upload_queue SET status = 'cancelled', "
+                                f"error_message = 'integrity: already listed', processed_at = ? "
+                                f"WHERE id IN ({marks}) AND status IN ({open_marks})",
+                                [now] + chunk + list(QUEUE_OPEN_STATUSES)
+                            )
+                        changed += cursor.rowcount
+                elif action in ('delist_listing', 'mark_listed'):
+                    status = 'delisted' if action == 'delist_listing' else 'listed'
+                    for chunk in self._chunks([item['listing_id'] for item in items]):
+                        cursor.execute(
+                            f"UPDATE listings SET status = ?, updated_at = ? WHERE id IN ({','.join('?' * len(chunk))})",
+                            [status, now] + chunk
+                        )
+                        changed += cursor.rowcount
+                elif action == 'delete_listing':
+                    for chunk in self._chunks([item['listing_id'] for item in items]):
+                        marks = ','.join('?' * len(chunk))
+                        # キューは (asin, platform, account_id) で紐付くため、残す出品のキューとして残す
+                        cursor.execute(f'DELETE FROM listings WHERE id IN ({marks})', chunk)
+                        changed += cursor.rowcount
+                else:
+                    raise ValueError(f"不明な操作: {action}")
+                results[action] = changed
+
+        self._write_fix_log(selected, results)
+        return results
+
+    @staticmethod
+    def _chunks(values: List[Any]) -> Iterable[List[Any]]:
+        for i in range(0, len(values), CHUNK_SIZE):
+            yield values[i:i + CHUNK_SIZE]
+
+    def _write_fix_log(self, plans: List[Dict[str, Any]], results: Dict[str, int]):
+        """実行した修正をログファイルに記録（logs/integrity_fix_{日時}.json）"""
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        path = self.log_dir / f"integrity_fix_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'applied_at': datetime.now().isoformat(timespec='seconds'),
+                'results': results,
+                'plans': plans,
+            }, f, ensure_ascii=False, indent=2)
@@ -19,7 +19,12 @@ except ImportError:
     NG_KEYWORD_AVAILABLE = False
     print("[WARN] NGキーワードクリーニング機能が利用できません")
 
+from shared.utils.metrics import instrument_methods
+from inventory.core.records import Listing, ProductPrice, QueueItem
 
+
+# 公開メソッドの呼び出し回数・所要時間を計測（get_connection は除外）
+@instrument_methods('master_db', exclude=('get_connection',))
 class MasterDB:
     """
     SQLiteベースのマスタデータベース管理クラス
@@ -185,6 +190,123 @@ class MasterDB:
                 )
             ''')
 
+            # price_history テーブル（出品価格の変化点履歴）
+            #   同じ価格の記録は新しい行を作らず、最新変化点の last_seen_at / observation_count を更新する
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS price_history (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    asin TEXT NOT NULL,
+                    platform TEXT NOT NULL,
+                    account_id TEXT,
+                    old_price REAL,
+                    new_price REAL,
+                    amazon_price_jpy INTEGER,
+                    markup_ratio REAL,
+                    strategy_used TEXT,
+                    changed_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    change_reason TEXT,
+                    recorded_at TIMESTAMP,        -- この価格を最初に記録した時刻
+                    last_seen_at TIMESTAMP,       -- 同じ価格を最後に記録した時刻
+                    observation_count INTEGER DEFAULT 1,
+                    FOREIGN KEY (asin) REFERENCES products(asin)
+                )
+            ''')
+            self._migrate_price_history(cursor)
+
+            # ASIN別の時系列参照用（ORDER BY recorded_at をインデックスで解決）
+            cursor.execute('DROP INDEX IF EXISTS idx_price_history_asin_changed_at')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_price_history_asin_recorded_at
+                ON price_history(asin, recorded_at)
+            ''')
+
+            # orders テーブル（プラットフォームの注文、差分同期で更新）
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS orders (
+                    platform TEXT NOT NULL,
+                    account_id TEXT NOT NULL,
+                    order_key TEXT NOT NULL,  -- BASE unique_key 等
+                    ordered_at INTEGER,       -- UNIXタイム
+                    modified_at INTEGER,      -- UNIXタイム（変更検知用）
+                    dispatch_status TEXT,
+                    total REAL,
+                    synced_at TIMESTAMP,
+                    PRIMARY KEY (platform, account_id, order_key)
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_orders_account_ordered
+                ON orders(platform, account_id, ordered_at)
+            ''')
+
+            # order_items テーブル（注文明細、注文単位で洗い替え）
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS order_items (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    platform TEXT NOT NULL,
+                    account_id TEXT NOT NULL,
+                    order_key TEXT NOT NULL,
+                    platform_item_id TEXT,    -- BASE item_id（listings.platform_item_id と結合）
+                    variation_id TEXT,
+                    title TEXT,
+                    price REAL,
+                    amount INTEGER DEFAULT 1,
+                    status TEXT
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_order_items_order
+                ON order_items(platform, account_id, order_key)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_order_items_item
+                ON order_items(platform, account_id, platform_item_id)
+            ''')
+
+            # order_sync_state テーブル（アカウントごとの同期済み範囲）
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS order_sync_state (
+                    platform TEXT NOT NULL,
+                    account_id TEXT NOT NULL,
+                    synced_from TEXT,         -- 同期済み範囲の開始日（YYYY-MM-DD）
+                    high_water_mark INTEGER,  -- 同期済み注文の最大注文日時（UNIXタイム）
+                    last_synced_at TIMESTAMP,
+                    PRIMARY KEY (platform, account_id)
+                )
+            ''')
+
+    @staticmethod
+    def _migrate_price_history(cursor):
+        """
+        旧形式（1記録1行）の price_history に変化点用の列を追加する
+
+        既存行はそれぞれ1つの変化点として扱う（recorded_at = changed_at）。
+        """
+        cursor.execute('PRAGMA table_info(price_history)')
+        columns = {row[1] for row in cursor.fetchall()}
+
+        if 'recorded_at' in columns:
+            return
+
+        for ddl in (
+            'recorded_at TIMESTAMP',
+            'last_seen_at TIMESTAMP',
+            'observation_count INTEGER DEFAULT 1',
+        ):
+            if ddl.split()[0] not in columns:
+                cursor.execute(f'ALTER TABLE price_history ADD COLUMN {ddl}')
+
+        cursor.execute('''
+            UPDATE price_history
+            SET recorded_at = COALESCE(changed_at, CURRENT_TIMESTAMP)
+            WHERE recorded_at IS NULL
+        ''')
+        cursor.execute('''
+            UPDATE price_history
+            SET last_seen_at = recorded_at
+            WHERE last_seen_at IS NULL
+        ''')
+
     # ==================== Products（商品マスタ）====================
 
     def add_product(self, asin: str, title_ja: str = None, title_en: str = None,
@@ -269,6 +391,41 @@ class MasterDB:
                 return product
             return None
 
+    def get_product_prices(self, asins: List[str]) -> Dict[str, ProductPrice]:
+        """
+        複数ASINの価格・在庫情報をまとめて取得（同期処理用）
+
+        get_product() を1件ずつ呼ぶと、ASINごとに接続を開き全列（images等のJSONを含む）を読み込むため、
+        価格・在庫の列のみを IN 句でまとめて取得する。
+
+        Args:
+            asins: ASINのリスト
+
+        Returns:
+            dict: {ASIN: ProductPrice}（Master DBにない商品は含まない）
+        """
+        prices: Dict[str, ProductPrice] = {}
+        unique_asins = list(dict.fromkeys(asins))
+        if not unique_asins:
+            return prices
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = ProductPrice.row_factory
+            columns = ProductPrice.select_columns()
+
+            # SQLiteのパラメータ数上限（古いバージョンでは999）を超えないよう分割
+            for i in range(0, len(unique_asins), 900):
+                chunk = unique_asins[i:i + 900]
+                cursor.execute(
+                    f"SELECT {columns} FROM products WHERE asin IN ({','.join('?' * len(chunk))})",
+                    chunk
+                )
+                for price in cursor.fetchall():
+                    prices[price.asin] = price
+
+        return prices
+
     def update_amazon_info(self, asin: str, price_jpy: int, in_stock: bool) -> bool:
         """
         Amazon価格・在庫情報を更新
@@ -340,6 +497,31 @@ class MasterDB:
 
             return [dict(row) for row in cursor.fetchall()]
 
+    def get_listing_records(self, platform: str, account_id: str,
+                            status: str = None) -> List[Listing]:
+        """
+        アカウント別に出品一覧を取得（Listing レコード）
+
+        get_listings_by_account() と同じ条件・順序。全出品をメモリに保持する同期処理では
+        辞書より小さい Listing（__slots__）で保持する。
+
+        Returns:
+            list: Listing のリスト
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = Listing.row_factory
+
+            query = f'SELECT {Listing.select_columns()} FROM listings WHERE platform = ? AND account_id = ?'
+            params = [platform, account_id]
+            if status:
+                query += ' AND status = ?'
+                params.append(status)
+            query += ' ORDER BY updated_at DESC'
+
+            cursor.execute(query, params)
+            return cursor.fetchall()
+
     def get_listings_by_asin(self, asin: str) -> List[Dict[str, Any]]:
         """
         ASINで出品情報を取得（複数プラットフォームの可能性あり）
@@ -710,7 +892,7 @@ class MasterDB:
         limit: int = 100,
         platform: str = None,
         account_id: str = None
-    ) -> List[Dict[str, Any]]:
+    ) -> List[QueueItem]:
         """
         scheduled_at が現在時刻を過ぎたアイテムを取得
 
@@ -720,14 +902,15 @@ class MasterDB:
             account_id: アカウントIDフィルタ（オプション）
 
         Returns:
-            list: キューアイテムのリスト
+            list: QueueItem のリスト（item['asin'] / item.get('asin') でも参照可能）
         """
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = QueueItem.row_factory
 
             # SQLiteのdatetime関数を使って正規化して比較（ローカル時間）
-            query = '''
-                SELECT * FROM upload_queue
+            query = f'''
+                SELECT {QueueItem.select_columns()} FROM upload_queue
                 WHERE status = 'pending'
                 AND datetime(scheduled_time) <= datetime('now', 'localtime')
             '''
@@ -745,17 +928,98 @@ class MasterDB:
             params.append(limit)
 
             cursor.execute(query, params)
+            return cursor.fetchall()
 
-            items = []
-            for row in cursor.fetchall():
-                item = dict(row)
-                if item.get('metadata'):
-                    item['metadata'] = json.loads(item['metadata'])
-                if item.get('result_data'):
-                    item['result_data'] = json.loads(item['result_data'])
-                items.append(item)
+    def count_upload_queue_due(self, platform: str = None, account_id: str = None) -> int:
+        """
+        scheduled_at が現在時刻を過ぎた pending アイテムの件数（get_upload_queue_due と同じ条件）
 
-            return items
+        Args:
+            platform: プラットフォームフィルタ（オプション）
+            account_id: アカウントIDフィルタ（オプション）
+
+        Returns:
+            int: 件数
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+
+            query = '''
+                SELECT COUNT(*) FROM upload_queue
+                WHERE status = 'pending'
+                AND datetime(scheduled_time) <= datetime('now', 'localtime')
+            '''
+            params = []
+
+            if platform:
+                query += ' AND platform = ?'
+                params.append(platform)
+
+            if account_id:
+                query += ' AND account_id = ?'
+                params.append(account_id)
+
+            cursor.execute(query, params)
+            return cursor.fetchone()[0]
+
+    def count_upload_queue_by_status(self, platform: str = None, account_id: str = None) -> Dict[str, int]:
+        """
+        ステータス別のキュー件数（GROUP BY で集計、行は読み込まない）
+
+        Args:
+            platform: プラットフォームフィルタ（オプション）
+            account_id: アカウントIDフィルタ（オプション）
+
+        Returns:
+            dict: {ステータス: 件数}
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+
+            query = 'SELECT status, COUNT(*) FROM upload_queue WHERE 1=1'
+            params = []
+
+            if platform:
+                query += ' AND platform = ?'
+                params.append(platform)
+
+            if account_id:
+                query += ' AND account_id = ?'
+                params.append(account_id)
+
+            query += ' GROUP BY status'
+
+            cursor.execute(query, params)
+            return {row[0]: row[1] for row in cursor.fetchall()}
+
+    def count_stale_listed_products(self, older_than: datetime, platforms: List[str] = None) -> int:
+        """
+        出品中（status='listed'）の商品のうち、Amazon情報が古い（未取得を含む）ASINの件数
+
+        Args:
+            older_than: この時刻より前に取得した情報を古いとみなす
+            platforms: 対象プラットフォーム（オプション）
+
+        Returns:
+            int: ASIN数
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+
+            query = '''
+                SELECT COUNT(DISTINCT l.asin) FROM listings l
+                LEFT JOIN products p ON l.asin = p.asin
+                WHERE l.status = 'listed'
+                AND (p.last_fetched_at IS NULL OR datetime(p.last_fetched_at) < datetime(?))
+            '''
+            params = [older_than.isoformat(sep=' ', timespec='seconds')]
+
+            if platforms:
+                query += f" AND l.platform IN ({','.join('?' * len(platforms))})"
+                params.extend(platforms)
+
+            cursor.execute(query, params)
+            return cursor.fetchone()[0]
 
     def update_upload_queue_status(
         self,
@@ -963,10 +1227,65 @@ class MasterDB:
 
         Returns:
             bool: 成功時True
+
+        Note:
+            直前の記録と価格が同じ場合は新しい行を作らず、最新変化点の
+            last_seen_at / observation_count を更新する（この場合もTrue）。
+            変化点が作成されたかどうかは record_price_history() で取得できる。
+        """
+        return self.record_price_history(
+            asin, platform, account_id, old_price, new_price,
+            amazon_price_jpy, markup_ratio, strategy_used, change_reason
+        ) is not None
+
+    def record_price_history(
+        self,
+        asin: str,
+        platform: str,
+        account_id: str,
+        old_price: float,
+        new_price: float,
+        amazon_price_jpy: int,
+        markup_ratio: float,
+        strategy_used: str,
+        change_reason: str = None
+    ) -> Optional[str]:
+        """
+        価格変更履歴を変化点として記録
+
+        同じ (asin, platform, account_id) の最新変化点と new_price / amazon_price_jpy が
+        同じ場合は、その変化点の last_seen_at / observation_count を更新する。
+
+        Args:
+            add_price_history_record() と同じ
+
+        Returns:
+            str: 'changed'（変化点を作成） / 'unchanged'（最新変化点を延長）、失敗時None
         """
+        now = datetime.now().isoformat()
+
         with self.get_connection() as conn:
             cursor = conn.cursor()
 
+            cursor.execute('''
+                SELECT id, new_price, amazon_price_jpy
+                FROM price_history
+                WHERE asin = ? AND platform = ? AND account_id IS ?
+                ORDER BY recorded_at DESC
+                LIMIT 1
+            ''', (asin, platform, account_id))
+            last = cursor.fetchone()
+
+            if (last is not None
+                    and last['new_price'] == new_price
+                    and last['amazon_price_jpy'] == amazon_price_jpy):
+                cursor.execute('''
+                    UPDATE price_history
+                    SET last_seen_at = ?, observation_count = observation_count + 1
+                    WHERE id = ?
+                ''', (now, last['id']))
+                return 'unchanged' if cursor.rowcount > 0 else None
+
             cursor.execute('''
                 INSERT INTO price_history (
                     asin,
@@ -977,8 +1296,11 @@ class MasterDB:
                     amazon_price_jpy,
                     markup_ratio,
                     strategy_used,
-                    change_reason
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    change_reason,
+                    recorded_at,
+                    last_seen_at,
+                    observation_count
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1)
             ''', (
                 asin,
                 platform,
@@ -988,10 +1310,12 @@ class MasterDB:
                 amazon_price_jpy,
                 markup_ratio,
                 strategy_used,
-                change_reason
+                change_reason,
+                now,
+                now
             ))
 
-            return cursor.rowcount > 0
+            return 'changed' if cursor.rowcount > 0 else None
 
     def get_price_history(
         self,
@@ -1001,7 +1325,7 @@ class MasterDB:
         limit: int = 100
     ) -> List[Dict[str, Any]]:
         """
-        価格変更履歴を取得
+        価格変更履歴（変化点）を新しい順に取得
 
         Args:
             asin: 商品ASIN（フィルター、省略時は全商品）
@@ -1010,7 +1334,7 @@ class MasterDB:
             limit: 取得件数上限
 
         Returns:
-            List[dict]: 価格変更履歴のリスト
+            List[dict]: 価格変更履歴のリスト（recorded_at / last_seen_at / observation_count を含む）
         """
         with self.get_connection() as conn:
             cursor = conn.cursor()
@@ -1030,9 +1354,206 @@ class MasterDB:
                 query += ' AND account_id = ?'
                 params.append(account_id)
 
-            query += ' ORDER BY changed_at DESC LIMIT ?'
+            query += ' ORDER BY recorded_at DESC LIMIT ?'
             params.append(limit)
 
             cursor.execute(query, params)
 
             return [dict(row) for row in cursor.fetchall()]
+
+    # ==================== Orders（注文）====================
+
+    def get_order_sync_state(self, platform: str, account_id: str) -> Optional[Dict[str, Any]]:
+        """
+        注文同期の状態を取得
+
+        Args:
+            platform: プラットフォーム名
+            account_id: アカウントID
+
+        Returns:
+            dict: {'synced_from', 'high_water_mark', 'last_synced_at'}（未同期の場合はNone）
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT synced_from, high_water_mark, last_synced_at
+                FROM order_sync_state
+                WHERE platform = ? AND account_id = ?
+            ''', (platform, account_id))
+            row = cursor.fetchone()
+            return dict(row) if row else None
+
+    def update_order_sync_state(self, platform: str, account_id: str,
+                                synced_from: str, high_water_mark: Optional[int]) -> None:
+        """
+        注文同期の状態を更新
+
+        Args:
+            platform: プラットフォーム名
+            account_id: アカウントID
+            synced_from: 同期済み範囲の開始日（YYYY-MM-DD）
+            high_water_mark: 同期済み注文の最大注文日時（UNIXタイム）
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO order_sync_state (platform, account_id, synced_from, high_water_mark, last_synced_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(platform, account_id) DO UPDATE SET
+                    synced_from = excluded.synced_from,
+                    high_water_mark = excluded.high_water_mark,
+                    last_synced_at = excluded.last_synced_at
+            ''', (platform, account_id, synced_from, high_water_mark, datetime.now().isoformat()))
+
+    def get_order_versions(self, platform: str, account_id: str,
+                           since_ts: Optional[int] = None) -> Dict[str, tuple]:
+        """
+        保存済み注文の (modified_at, dispatch_status) を取得（変更検知用）
+
+        Args:
+            platform: プラットフォーム名
+            account_id: アカウントID
+            since_ts: この注文日時（UNIXタイム）以降に絞り込む
+
+        Returns:
+            dict: order_key -> (modified_at, dispatch_status)
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT order_key, modified_at, dispatch_status
+                FROM orders
+                WHERE platform = ? AND account_id = ? AND ordered_at >= ?
+            ''', (platform, account_id, since_ts or 0))
+            return {row['order_key']: (row['modified_at'], row['dispatch_status']) for row in cursor.fetchall()}
+
+    def save_orders(self, platform: str, account_id: str,
+                    orders: List[Dict[str, Any]]) -> int:
+        """
+        注文と明細を保存（明細は注文単位で洗い替え）
+
+        Args:
+            platform: プラットフォーム名
+            account_id: アカウントID
+            orders: [{'order_key', 'ordered_at', 'modified_at', 'dispatch_status', 'total',
+                      'items': [{'platform_item_id', 'variation_id', 'title', 'price', 'amount', 'status'}, ...]}, ...]
+
+        Returns:
+            int: 保存した注文数
+        """
+        if not orders:
+            return 0
+
+        now = datetime.now().isoformat()
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany('''
+                INSERT INTO orders (platform, account_id, order_key, ordered_at, modified_at,
+                                    dispatch_status, total, synced_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(platform, account_id, order_key) DO UPDATE SET
+                    ordered_at = excluded.ordered_at,
+                    modified_at = excluded.modified_at,
+                    dispatch_status = excluded.dispatch_status,
+                    total = excluded.total,
+                    synced_at = excluded.synced_at
+            ''', [
+                (platform, account_id, o['order_key'], o.get('ordered_at'), o.get('modified_at'),
+                 o.get('dispatch_status'), o.get('total'), now)
+                for o in orders
+            ])
+
+            cursor.executemany('''
+                DELETE FROM order_items
+                WHERE platform = ? AND account_id = ? AND order_key = ?
+            ''', [(platform, account_id, o['order_key']) for o in orders])
+
+            cursor.executemany('''
+                INSERT INTO order_items (platform, account_id, order_key, platform_item_id,
+                                         variation_id, title, price, amount, status)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [
+                (platform, account_id, o['order_key'], item.get('platform_item_id'), item.get('variation_id'),
+                 item.get('title'), item.get('price'), item.get('amount', 1), item.get('status'))
+                for o in orders
+                for item in o.get('items', [])
+            ])
+
+        return len(orders)
+
+    def get_orders(self, platform: str, account_id: str,
+                   since_ts: Optional[int] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        保存済み注文を取得（注文日時の新しい順）
+
+        Args:
+            platform: プラットフォーム名
+            account_id: アカウントID
+            since_ts: この注文日時（UNIXタイム）以降に絞り込む
+            limit: 取得件数上限
+
+        Returns:
+            List[dict]: 注文のリスト
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            query = '''
+                SELECT * FROM orders
+                WHERE platform = ? AND account_id = ? AND ordered_at >= ?
+                ORDER BY ordered_at DESC
+            '''
+            params = [platform, account_id, since_ts or 0]
+            if limit:
+                query += ' LIMIT ?'
+                params.append(limit)
+            cursor.execute(query, params)
+            return [dict(row) for row in cursor.fetchall()]
+
+    def get_sold_items_with_zero_stock(self, platform: str, account_id: str,
+                                       since_ts: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        販売済みで出品在庫が0の商品を取得（注文明細 × listings × products の結合）
+
+        キャンセル注文は除外する。listings.in_stock_quantity は
+        inventory/scripts/sync_from_base_api.py 等で同期された値を使用する。
+
+        Args:
+            platform: プラットフォーム名
+            account_id: アカウントID
+            since_ts: この注文日時（UNIXタイム）以降の注文に絞り込む
+
+        Returns:
+            List[dict]: 商品ごとの販売集計（item_id, asin, title, amount, order_count, amazon_in_stock 等）
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT
+                    oi.platform_item_id AS item_id,
+                    l.asin,
+                    l.sku AS identifier,
+                    l.visibility,
+                    l.in_stock_quantity AS current_stock,
+                    MAX(oi.title) AS title,
+                    MAX(oi.price) AS price,
+                    SUM(oi.amount) AS amount,
+                    COUNT(DISTINCT o.order_key) AS order_count,
+                    MAX(o.ordered_at) AS last_ordered_at,
+                    p.amazon_in_stock,
+                    p.amazon_price_jpy AS amazon_price
+                FROM order_items oi
+                JOIN orders o
+                    ON o.platform = oi.platform AND o.account_id = oi.account_id AND o.order_key = oi.order_key
+                JOIN listings l
+                    ON l.platform = oi.platform AND l.account_id = oi.account_id
+                   AND l.platform_item_id = oi.platform_item_id
+                LEFT JOIN products p ON p.asin = l.asin
+                WHERE oi.platform = ? AND oi.account_id = ?
+                  AND o.ordered_at >= ?
+                  AND COALESCE(o.dispatch_status, '') != 'cancelled'
+                  AND l.in_stock_quantity = 0
+                GROUP BY oi.platform_item_id
+                ORDER BY last_ordered_at DESC
+            ''', (platform, account_id, since_ts or 0))
+            return [dict(row) for row in cursor.fetchall()]
@@ -0,0 +1,492 @@
+"""
+Price History Store
+
+Amazon価格・在庫の観測履歴を master.db に圧縮して保存する
+
+- 変化点のみ保存（ランレングス方式）: 直前と同じ価格・在庫の観測は
+  最新変化点の last_seen_at / observation_count を更新するだけ
+- (asin, recorded_at) を主キーとするWITHOUT ROWIDテーブル（カバリングインデックス）
+- 日次・週次ロールアップ（最小/最大/最終価格、在庫切れ率、変化回数）
+- 保持期間ポリシー（retention）
+"""
+
+from datetime import datetime, timedelta
+from typing import Optional, List, Dict, Any, Iterable, Tuple
+
+from inventory.core.master_db import MasterDB
+
+
+class PriceHistoryStore:
+    """
+    Amazon価格履歴ストア
+
+    ボラティリティ等の集計は変化点テーブルとロールアップのみを参照するため、
+    計算量は観測回数ではなく価格変化の回数に比例する。
+    """
+
+    # 保持期間のデフォルト（日）
+    DEFAULT_RETENTION = {
+        'points': 365,      # 変化点
+        'day': 180,         # 日次ロールアップ
+        'week': 730,        # 週次ロールアップ
+    }
+
+    # SQLiteの変数上限を考慮したチャンクサイズ
+    CHUNK_SIZE = 500
+
+    def __init__(self, master_db: MasterDB = None):
+        """
+        Args:
+            master_db: MasterDBインスタンス（省略時はデフォルトパスで作成）
+        """
+        self.db = master_db or MasterDB()
+        self._init_tables()
+
+    def _init_tables(self):
+        """テーブルの初期化"""
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+
+            # 変化点テーブル（主キー = (asin, recorded_at) のカバリングインデックス）
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS amazon_price_points (
+                    asin TEXT NOT NULL,
+                    recorded_at TIMESTAMP NOT NULL,   -- この価格・在庫状態を最初に観測した時刻
+                    price_jpy INTEGER,
+                    in_stock BOOLEAN,
+                    last_seen_at TIMESTAMP NOT NULL,  -- 同じ状態を最後に観測した時刻
+                    observation_count INTEGER DEFAULT 1,
+                    PRIMARY KEY (asin, recorded_at)
+                ) WITHOUT ROWID
+            ''')
+
+            # 日次・週次ロールアップ
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS amazon_price_rollups (
+                    asin TEXT NOT NULL,
+                    period_type TEXT NOT NULL,        -- 'day' or 'week'
+                    period_start TEXT NOT NULL,       -- 'YYYY-MM-DD'（週次は月曜日）
+                    min_price INTEGER,
+                    max_price INTEGER,
+                    last_price INTEGER,
+                    observations INTEGER DEFAULT 0,
+                    out_of_stock_observations INTEGER DEFAULT 0,
+                    change_count INTEGER DEFAULT 0,
+                    updated_at TIMESTAMP,
+                    PRIMARY KEY (asin, period_type, period_start)
+                ) WITHOUT ROWID
+            ''')
+
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_amazon_price_rollups_period
+                ON amazon_price_rollups(period_type, period_start)
+            ''')
+
+    # ==================== 記録 ====================
+
+    def record_observation(self, asin: str, price_jpy: Optional[int], in_stock: bool,
+                           observed_at: datetime = None) -> bool:
+        """
+        1件の観測を記録
+
+        Args:
+            asin: 商品ASIN
+            price_jpy: Amazon価格（円）
+            in_stock: 在庫有無
+            observed_at: 観測時刻（省略時は現在時刻）
+
+        Returns:
+            bool: 新しい変化点が作成された場合True
+        """
+        return self.record_observations([(asin, price_jpy, in_stock)], observed_at) > 0
+
+    def record_observations(self, observations: Iterable[Tuple[str, Optional[int], bool]],
+                            observed_at: datetime = None) -> int:
+        """
+        観測をまとめて記録（Phase 1の一括更新用）
+
+        Args:
+            observations: (asin, price_jpy, in_stock) のリスト
+            observed_at: 観測時刻（省略時は現在時刻）
+
+        Returns:
+            int: 新しく作成された変化点の件数
+        """
+        observed_at = observed_at or datetime.now()
+        now = observed_at.isoformat()
+        day_start = observed_at.date().isoformat()
+        week_start = (observed_at.date() - timedelta(days=observed_at.weekday())).isoformat()
+
+        # 同一ASINが複数回含まれる場合は最後の観測を採用
+        latest_obs = {}
+        for asin, price_jpy, in_stock in observations:
+            latest_obs[asin] = (price_jpy, bool(in_stock))
+
+        if not latest_obs:
+            return 0
+
+        changed = 0
+
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+
+            asins = list(latest_obs.keys())
+            for i in range(0, len(asins), self.CHUNK_SIZE):
+                chunk = asins[i:i + self.CHUNK_SIZE]
+                last_points = self._get_last_points(cursor, chunk)
+
+                new_points = []
+                extend_points = []
+                rollup_rows = []
+
+                for asin in chunk:
+                    price_jpy, in_stock = latest_obs[asin]
+                    last = last_points.get(asin)
+
+                    is_change = (
+                        last is None
+                        or last['price_jpy'] != price_jpy
+                        or bool(last['in_stock']) != in_stock
+                    )
+
+                    if is_change:
+                        new_points.append((asin, now, price_jpy, in_stock, now))
+                    else:
+                        extend_points.append((now, asin, last['recorded_at']))
+
+                    # 最初の観測は変化回数に含めない
+                    change_inc = 1 if (is_change and last is not None) else 0
+                    oos_inc = 0 if in_stock else 1
+                    for period_type, period_start in (('day', day_start), ('week', week_start)):
+                        rollup_rows.append((
+                            asin, period_type, period_start,
+                            price_jpy, price_jpy, price_jpy,
+                            oos_inc, change_inc, now
+                        ))
+
+                cursor.executemany('''
+                    INSERT OR REPLACE INTO amazon_price_points (
+                        asin, recorded_at, price_jpy, in_stock, last_seen_at, observation_count
+                    ) VALUES (?, ?, ?, ?, ?, 1)
+                ''', new_points)
+
+                cursor.executemany('''
+                    UPDATE amazon_price_points
+                    SET last_seen_at = ?, observation_count = observation_count + 1
+                    WHERE asin = ? AND recorded_at = ?
+                ''', extend_points)
+
+                # ロールアップ更新（価格がNULLの観測はmin/maxに影響させない）
+                cursor.executemany('''
+                    INSERT INTO amazon_price_rollups (
+                        asin, period_type, period_start,
+                        min_price, max_price, last_price,
+                        observations, out_of_stock_observations, change_count, updated_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, 1, ?, ?, ?)
+                    ON CONFLICT(asin, period_type, period_start) DO UPDATE SET
+                        min_price = CASE
+                            WHEN excluded.min_price IS NULL THEN min_price
+                            WHEN min_price IS NULL THEN excluded.min_price
+                            ELSE MIN(min_price, excluded.min_price) END,
+                        max_price = CASE
+                            WHEN excluded.max_price IS NULL THEN max_price
+                            WHEN max_price IS NULL THEN excluded.max_price
+                            ELSE MAX(max_price, excluded.max_price) END,
+                        last_price = COALESCE(excluded.last_price, last_price),
+                        observations = observations + 1,
+                        out_of_stock_observations = out_of_stock_observations + excluded.out_of_stock_observations,
+                        change_count = change_count + excluded.change_count,
+                        updated_at = excluded.updated_at
+                ''', rollup_rows)
+
+                changed += len(new_points)
+
+        return changed
+
+    def _get_last_points(self, cursor, asins: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        ASINごとの最新変化点を取得（主キーインデックスのみで解決）
+
+        Args:
+            cursor: DBカーソル
+            asins: ASINのリスト
+
+        Returns:
+            dict: {asin: {'recorded_at', 'price_jpy', 'in_stock'}}
+        """
+        placeholders = ','.join('?' * len(asins))
+        cursor.execute(f'''
+            SELECT p.asin, p.recorded_at, p.price_jpy, p.in_stock
+            FROM amazon_price_points p
+            JOIN (
+                SELECT asin, MAX(recorded_at) AS recorded_at
+                FROM amazon_price_points
+                WHERE asin IN ({placeholders})
+                GROUP BY asin
+            ) latest ON latest.asin = p.asin AND latest.recorded_at = p.recorded_at
+        ''', asins)
+
+        return {
+            row['asin']: {
+                'recorded_at': row['recorded_at'],
+                'price_jpy': row['price_jpy'],
+                'in_stock': row['in_stock'],
+            }
+            for row in cursor.fetchall()
+        }
+
+    # ==================== 参照 ====================
+
+    def get_change_points(self, asin: str, since: datetime = None,
+                          limit: int = None) -> List[Dict[str, Any]]:
+        """
+        ASINの価格変化点を新しい順に取得
+
+        Args:
+            asin: 商品ASIN
+            since: この時刻以降の変化点のみ（省略時は全期間）
+            limit: 取得件数上限
+
+        Returns:
+            List[dict]: 変化点のリスト
+        """
+        query = '''
+            SELECT asin, recorded_at, price_jpy, in_stock, last_seen_at, observation_count
+            FROM amazon_price_points
+            WHERE asin = ?
+        '''
+        params: List[Any] = [asin]
+
+        if since:
+            query += ' AND recorded_at >= ?'
+            params.append(since.isoformat())
+
+        query += ' ORDER BY recorded_at DESC'
+
+        if limit:
+            query += ' LIMIT ?'
+            params.append(limit)
+
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            return [dict(row) for row in cursor.fetchall()]
+
+    def get_rollups(self, asin: str, period_type: str = 'day',
+                    days: int = 30) -> List[Dict[str, Any]]:
+        """
+        ASINのロールアップを古い順に取得
+
+        Args:
+            asin: 商品ASIN
+            period_type: 'day' or 'week'
+            days: 対象期間（日）
+
+        Returns:
+            List[dict]: ロールアップ（stock_out_ratio を含む）
+        """
+        since = (datetime.now().date() - timedelta(days=days)).isoformat()
+
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT *
+                FROM amazon_price_rollups
+                WHERE asin = ? AND period_type = ? AND period_start >= ?
+                ORDER BY period_start
+            ''', (asin, period_type, since))
+
+            rollups = []
+            for row in cursor.fetchall():
+                rollup = dict(row)
+                rollup['stock_out_ratio'] = (
+                    rollup['out_of_stock_observations'] / rollup['observations']
+                    if rollup['observations'] else 0.0
+                )
+                rollups.append(rollup)
+            return rollups
+
+    def get_volatility(self, asins: List[str] = None, days: int = 30) -> Dict[str, Dict[str, Any]]:
+        """
+        ASINごとの価格ボラティリティを取得（日次ロールアップから集計）
+
+        Args:
+            asins: 対象ASIN（省略時は期間内にロールアップがある全ASIN）
+            days: 対象期間（日）
+
+        Returns:
+            dict: {asin: {
+                'change_count': int,     # 期間内の価格・在庫変化回数
+                'min_price': int,
+                'max_price': int,
+                'last_price': int,
+                'price_range_ratio': float,  # (max - min) / min
+                'stock_out_ratio': float,
+                'observations': int
+            }}
+        """
+        since = (datetime.now().date() - timedelta(days=days)).isoformat()
+        base_query = '''
+            SELECT
+                asin,
+                SUM(change_count) AS change_count,
+                MIN(min_price) AS min_price,
+                MAX(max_price) AS max_price,
+                SUM(observations) AS observations,
+                SUM(out_of_stock_observations) AS out_of_stock_observations
+            FROM amazon_price_rollups
+            WHERE period_type = 'day' AND period_start >= ?
+        '''
+
+        rows = []
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+
+            if asins is None:
+                cursor.execute(base_query + ' GROUP BY asin', (since,))
+                rows.extend(cursor.fetchall())
+            else:
+                for i in range(0, len(asins), self.CHUNK_SIZE):
+                    chunk = asins[i:i + self.CHUNK_SIZE]
+                    placeholders = ','.join('?' * len(chunk))
+                    cursor.execute(
+                        base_query + f' AND asin IN ({placeholders}) GROUP BY asin',
+                        (since, *chunk)
+                    )
+                    rows.extend(cursor.fetchall())
+
+            result = {}
+            for row in rows:
+                min_price = row['min_price']
+                max_price = row['max_price']
+                observations = row['observations'] or 0
+                result[row['asin']] = {
+                    'change_count': row['change_count'] or 0,
+                    'min_price': min_price,
+                    'max_price': max_price,
+                    'last_price': None,
+                    'price_range_ratio': (
+                        (max_price - min_price) / min_price
+                        if min_price and max_price is not None else 0.0
+                    ),
+                    'stock_out_ratio': (
+                        (row['out_of_stock_observations'] or 0) / observations
+                        if observations else 0.0
+                    ),
+                    'observations': observations,
+                }
+
+            # 最終価格は最新変化点から取得
+            target_asins = list(result.keys())
+            for i in range(0, len(target_asins), self.CHUNK_SIZE):
+                chunk = target_asins[i:i + self.CHUNK_SIZE]
+                for asin, point in self._get_last_points(cursor, chunk).items():
+                    result[asin]['last_price'] = point['price_jpy']
+
+        return result
+
+    def get_volatile_asins(self, days: int = 7, min_changes: int = 2) -> List[str]:
+        """
+        期間内に一定回数以上価格・在庫が変化したASINを変化回数の多い順に取得
+
+        同期スケジューリング（変動の大きい商品を優先的に更新する等）に使用する。
+
+        Args:
+            days: 対象期間（日）
+            min_changes: 最小変化回数
+
+        Returns:
+            List[str]: ASINのリスト
+        """
+        since = (datetime.now().date() - timedelta(days=days)).isoformat()
+
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT asin, SUM(change_count) AS changes
+                FROM amazon_price_rollups
+                WHERE period_type = 'day' AND period_start >= ?
+                GROUP BY asin
+                HAVING changes >= ?
+                ORDER BY changes DESC
+            ''', (since, min_changes))
+            return [row['asin'] for row in cursor.fetchall()]
+
+    # ==================== 保持期間 ====================
+
+    def apply_retention(self, points_days: int = None, day_rollup_days: int = None,
+                        week_rollup_days: int = None) -> Dict[str, int]:
+        """
+        保持期間を過ぎた履歴を削除
+
+        変化点は各ASINの最新1件を必ず残す（現在の状態を失わないため）。
+
+        Args:
+            points_days: 変化点の保持日数
+            day_rollup_days: 日次ロールアップの保持日数
+            week_rollup_days: 週次ロールアップの保持日数
+
+        Returns:
+            dict: {'points': 削除件数, 'day': 削除件数, 'week': 削除件数}
+        """
+        points_days = points_days or self.DEFAULT_RETENTION['points']
+        day_rollup_days = day_rollup_days or self.DEFAULT_RETENTION['day']
+        week_rollup_days = week_rollup_days or self.DEFAULT_RETENTION['week']
+
+        now = datetime.now()
+        deleted = {}
+
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                DELETE FROM amazon_price_points
+                WHERE last_seen_at < ?
+                  AND (asin, recorded_at) NOT IN (
+                      SELECT asin, MAX(recorded_at)
+                      FROM amazon_price_points
+                      GROUP BY asin
+                  )
+            ''', ((now - timedelta(days=points_days)).isoformat(),))
+            deleted['points'] = cursor.rowcount
+
+            for period_type, keep_days in (('day', day_rollup_days), ('week', week_rollup_days)):
+                cursor.execute('''
+                    DELETE FROM amazon_price_rollups
+                    WHERE period_type = ? AND period_start < ?
+                ''', (period_type, (now.date() - timedelta(days=keep_days)).isoformat()))
+                deleted[period_type] = cursor.rowcount
+
+        return deleted
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        ストアの統計情報を取得
+
+        Returns:
+            dict: {'asins', 'change_points', 'observations', 'compression_ratio', 'rollups'}
+        """
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                SELECT
+                    COUNT(DISTINCT asin) AS asins,
+                    COUNT(*) AS change_points,
+                    COALESCE(SUM(observation_count), 0) AS observations
+                FROM amazon_price_points
+            ''')
+            row = cursor.fetchone()
+
+            cursor.execute('SELECT COUNT(*) FROM amazon_price_rollups')
+            rollups = cursor.fetchone()[0]
+
+        return {
+            'asins': row['asins'],
+            'change_points': row['change_points'],
+            'observations': row['observations'],
+            'compression_ratio': (
+                row['observations'] / row['change_points'] if row['change_points'] else 0.0
+            ),
+            'rollups': rollups,
+        }
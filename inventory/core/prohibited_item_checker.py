@@ -5,6 +5,7 @@ BASEの利用規約に基づいて商品が禁止商品に該当するかをチ
 """
 import json
 import re
+import hashlib
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 
@@ -17,6 +18,9 @@ class ProhibitedItemChecker:
     BASE禁止商品に該当するかを判定し、リスクスコアを算出する
     """
 
+    # スコアリングに使用するフィールド（コンテンツハッシュの対象）
+    SCORED_FIELDS = ('title_ja', 'title_en', 'description_ja', 'description_en', 'category', 'brand')
+
     def __init__(self, config_path: Optional[str] = None):
         """
         Args:
@@ -44,6 +48,41 @@ class ProhibitedItemChecker:
             'auto_approve': 30
         })
 
+        # ルールセットのバージョン（スキャン結果キャッシュの無効化判定に使用）
+        self.rules_version = self._compute_rules_version(self.config)
+
+    @staticmethod
+    def _compute_rules_version(config: Dict[str, Any]) -> str:
+        """
+        ルールセットのバージョンを算出
+
+        ホワイトリスト追加時は 'version' が更新されないため、設定内容そのもののハッシュを使う。
+        （判定に影響しない 'last_updated' は除外）
+
+        Args:
+            config: 設定内容
+
+        Returns:
+            str: 設定内容のSHA-256ハッシュ（先頭16文字）
+        """
+        rules = {k: v for k, v in config.items() if k != 'last_updated'}
+        serialized = json.dumps(rules, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(serialized.encode('utf-8')).hexdigest()[:16]
+
+    @classmethod
+    def compute_content_hash(cls, product_info: Dict[str, Any]) -> str:
+        """
+        スコアリング対象フィールドのハッシュを算出
+
+        Args:
+            product_info: 商品情報（check_productと同じ形式）
+
+        Returns:
+            str: MD5ハッシュ
+        """
+        values = [str(product_info.get(field) or '') for field in cls.SCORED_FIELDS]
+        return hashlib.md5('\x1f'.join(values).encode('utf-8')).hexdigest()
+
     def check_product(self, product_info: Dict[str, Any]) -> Dict[str, Any]:
         """
         商品情報をチェックしてリスクスコアを算出
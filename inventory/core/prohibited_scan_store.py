@@ -0,0 +1,227 @@
+"""
+Prohibited Scan Store
+
+禁止商品スキャン結果を master.db に保存する
+
+- asin を主キーとし、スコアリング対象フィールドのハッシュ（content_hash）と
+  ルールセットのバージョン（rules_version）を併せて保存
+- 両方が一致する商品は再スコアリング不要（前回結果を再利用）
+- ルールセット変更時は全件が不一致となり、自然に全件再スキャンになる
+"""
+
+import json
+from datetime import datetime
+from typing import Dict, Any, Iterable
+
+from inventory.core.master_db import MasterDB
+
+
+class ProhibitedScanStore:
+    """
+    禁止商品スキャン結果ストア
+    """
+
+    # SQLiteの変数上限を考慮したチャンクサイズ
+    CHUNK_SIZE = 500
+
+    def __init__(self, master_db: MasterDB = None):
+        """
+        Args:
+            master_db: MasterDBインスタンス（省略時はデフォルトパスで作成）
+        """
+        self.db = master_db or MasterDB()
+        self._init_tables()
+
+    def _init_tables(self):
+        """テーブルの初期化"""
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS prohibited_scan_results (
+                    asin TEXT PRIMARY KEY,
+                    content_hash TEXT NOT NULL,       -- タイトル/説明文/カテゴリ/ブランドのハッシュ
+                    rules_version TEXT NOT NULL,      -- config/prohibited_items.json のハッシュ
+                    risk_score INTEGER NOT NULL,
+                    risk_level TEXT,
+                    recommendation TEXT,
+                    matched_keywords TEXT,            -- JSON
+                    matched_categories TEXT,          -- JSON
+                    is_whitelisted BOOLEAN,
+                    details TEXT,                     -- JSON
+                    scanned_at TIMESTAMP NOT NULL
+                )
+            ''')
+
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_prohibited_scan_results_score
+                ON prohibited_scan_results(rules_version, risk_score)
+            ''')
+
+    def get_results(self, asins: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        保存済みのスキャン結果を一括取得
+
+        Args:
+            asins: ASINのリスト
+
+        Returns:
+            dict: {asin: スキャン結果（check_productの戻り値形式 + content_hash/rules_version）}
+        """
+        asins = list(dict.fromkeys(asins))
+        results = {}
+
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+
+            for i in range(0, len(asins), self.CHUNK_SIZE):
+                chunk = asins[i:i + self.CHUNK_SIZE]
+                placeholders = ','.join('?' * len(chunk))
+                cursor.execute(f'''
+                    SELECT * FROM prohibited_scan_results
+                    WHERE asin IN ({placeholders})
+                ''', chunk)
+
+                for row in cursor.fetchall():
+                    results[row['asin']] = self._row_to_result(row)
+
+        return results
+
+    def save_results(self, entries: Iterable[tuple]) -> int:
+        """
+        スキャン結果をまとめて保存（upsert）
+
+        Args:
+            entries: (content_hash, rules_version, check_result) のリスト
+
+        Returns:
+            int: 保存件数
+        """
+        now = datetime.now().isoformat()
+        rows = [
+            (
+                result['asin'],
+                content_hash,
+                rules_version,
+                result['risk_score'],
+                result['risk_level'],
+                result['recommendation'],
+                json.dumps(result['matched_keywords'], ensure_ascii=False),
+                json.dumps(result['matched_categories'], ensure_ascii=False),
+                result['is_whitelisted'],
+                json.dumps(result['details'], ensure_ascii=False),
+                now
+            )
+            for content_hash, rules_version, result in entries
+        ]
+
+        if not rows:
+            return 0
+
+        with self.db.get_connection() as conn:
+            conn.executemany('''
+                INSERT INTO prohibited_scan_results (
+                    asin, content_hash, rules_version, risk_score, risk_level,
+                    recommendation, matched_keywords, matched_categories,
+                    is_whitelisted, details, scanned_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(asin) DO UPDATE SET
+                    content_hash = excluded.content_hash,
+                    rules_version = excluded.rules_version,
+                    risk_score = excluded.risk_score,
+                    risk_level = excluded.risk_level,
+                    recommendation = excluded.recommendation,
+                    matched_keywords = excluded.matched_keywords,
+                    matched_categories = excluded.matched_categories,
+                    is_whitelisted = excluded.is_whitelisted,
+                    details = excluded.details,
+                    scanned_at = excluded.scanned_at
+            ''', rows)
+
+        return len(rows)
+
+    def delete_results(self, asins: Iterable[str]) -> int:
+        """
+        スキャン結果を削除（商品削除時用）
+
+        Args:
+            asins: ASINのリスト
+
+        Returns:
+            int: 削除件数
+        """
+        asins = list(asins)
+        deleted = 0
+
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            for i in range(0, len(asins), self.CHUNK_SIZE):
+                chunk = asins[i:i + self.CHUNK_SIZE]
+                placeholders = ','.join('?' * len(chunk))
+                cursor.execute(
+                    f'DELETE FROM prohibited_scan_results WHERE asin IN ({placeholders})',
+                    chunk
+                )
+                deleted += cursor.rowcount
+
+        return deleted
+
+    def purge_orphans(self) -> int:
+        """
+        productsに存在しないASINのスキャン結果を削除
+
+        Returns:
+            int: 削除件数
+        """
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                DELETE FROM prohibited_scan_results
+                WHERE asin NOT IN (SELECT asin FROM products)
+            ''')
+            return cursor.rowcount
+
+    def get_stats(self, rules_version: str = None) -> Dict[str, Any]:
+        """
+        統計情報を取得
+
+        Args:
+            rules_version: 現在のルールセットのバージョン（指定時は一致件数も返す）
+
+        Returns:
+            dict: {'total', 'current_rules', 'high_risk', 'medium_risk'}
+        """
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT
+                    COUNT(*) AS total,
+                    SUM(CASE WHEN rules_version = ? THEN 1 ELSE 0 END) AS current_rules,
+                    SUM(CASE WHEN risk_score >= 80 THEN 1 ELSE 0 END) AS high_risk,
+                    SUM(CASE WHEN risk_score >= 50 AND risk_score < 80 THEN 1 ELSE 0 END) AS medium_risk
+                FROM prohibited_scan_results
+            ''', (rules_version,))
+            row = cursor.fetchone()
+
+        return {
+            'total': row['total'],
+            'current_rules': row['current_rules'] or 0,
+            'high_risk': row['high_risk'] or 0,
+            'medium_risk': row['medium_risk'] or 0,
+        }
+
+    @staticmethod
+    def _row_to_result(row) -> Dict[str, Any]:
+        """DB行をcheck_productの戻り値形式に変換"""
+        return {
+            'asin': row['asin'],
+            'content_hash': row['content_hash'],
+            'rules_version': row['rules_version'],
+            'risk_score': row['risk_score'],
+            'risk_level': row['risk_level'],
+            'recommendation': row['recommendation'],
+            'matched_keywords': json.loads(row['matched_keywords'] or '[]'),
+            'matched_categories': json.loads(row['matched_categories'] or '[]'),
+            'is_whitelisted': bool(row['is_whitelisted']),
+            'details': json.loads(row['details'] or '{}'),
+        }
@@ -0,0 +1,210 @@
+"""
+メモリ上で大量に保持するレコード型
+
+同期デーモンは1サイクルで全出品（数万〜数十万件）と対応する商品価格を保持する。
+sqlite3.Row → dict に変換すると1件あたり数百バイトになるため、
+__slots__ のレコード型にカーソルから直接変換して保持する。
+
+- Listing: listings テーブルの1行
+- ProductPrice: products テーブルの価格・在庫情報（同期に必要な列のみ）
+- QueueItem: upload_queue テーブルの1行
+- ChangeLog: 件数上限付きの変更履歴（古いものから破棄）
+
+レコードは既存コードとの互換のため、辞書と同じ書き方（record['asin'] / record.get('asin')）でも読める。
+
+使用例:
+    cursor = conn.cursor()
+    cursor.row_factory = Listing.row_factory
+    cursor.execute(f'SELECT {Listing.select_columns()} FROM listings WHERE account_id = ?', (account_id,))
+    listings = cursor.fetchall()  # List[Listing]
+"""
+
+from collections import deque
+from typing import Any, Dict, Iterator, Tuple
+
+# ChangeLog のデフォルト保持件数
+DEFAULT_CHANGE_LOG_SIZE = 1000
+
+
+class Record:
+    """
+    __slots__ のレコード型の基底クラス
+
+    サブクラスは __slots__ に列名を（SELECT の列順に）定義し、同じ順の引数を受け取る __init__ を実装する。
+    DBの列名と属性名が異なる場合は _column_exprs に {属性名: SELECT式} を定義する。
+    """
+
+    __slots__ = ()
+    _column_exprs: Dict[str, str] = {}
+
+    @classmethod
+    def select_columns(cls, table_alias: str = None) -> str:
+        """SELECT 句の列リスト（__slots__ の順）"""
+        prefix = f'{table_alias}.' if table_alias else ''
+        columns = []
+        for name in cls.__slots__:
+            expr = cls._column_exprs.get(name)
+            columns.append(f'{prefix}{expr} AS {name}' if expr else f'{prefix}{name}')
+        return ', '.join(columns)
+
+    @classmethod
+    def row_factory(cls, cursor, row: tuple) -> 'Record':
+        """sqlite3 の row_factory（select_columns() で取得した行をレコードに変換）"""
+        return cls(*row)
+
+    @classmethod
+    def from_mapping(cls, mapping) -> 'Record':
+        """辞書・sqlite3.Row からレコードを作成（存在しない列はNone）"""
+        keys = mapping.keys()
+        return cls(*(mapping[name] if name in keys else None for name in cls.__slots__))
+
+    # ---- 辞書互換（既存コードの listing['asin'] / listing.get('asin') 用）----
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in self.__slots__:
+            return default
+        return getattr(self, key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__slots__
+
+    def keys(self) -> Tuple[str, ...]:
+        return self.__slots__
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def _values(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._values() == other._values()
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)
+        return f'{type(self).__name__}({fields})'
+
+
+class Listing(Record):
+    """listings テーブルの1行"""
+
+    __slots__ = (
+        'id', 'asin', 'platform', 'account_id', 'platform_item_id', 'sku',
+        'selling_price', 'currency', 'in_stock_quantity', 'status', 'visibility',
+        'listed_at', 'updated_at',
+    )
+
+    def __init__(
+        self, id=None, asin=None, platform=None, account_id=None, platform_item_id=None, sku=None,
+        selling_price=None, currency=None, in_stock_quantity=None, status=None, visibility=None,
+        listed_at=None, updated_at=None
+    ):
+        self.id = id
+        self.asin = asin
+        self.platform = platform
+        self.account_id = account_id
+        self.platform_item_id = platform_item_id
+        self.sku = sku
+        self.selling_price = selling_price
+        self.currency = currency
+        self.in_stock_quantity = in_stock_quantity
+        self.status = status
+        self.visibility = visibility
+        self.listed_at = listed_at
+        self.updated_at = updated_at
+
+
+class ProductPrice(Record):
+    """products テーブルの価格・在庫情報（amazon_price_jpy / amazon_in_stock）"""
+
+    __slots__ = ('asin', 'price_jpy', 'in_stock', 'last_fetched_at')
+    _column_exprs = {
+        'price_jpy': 'amazon_price_jpy',
+        'in_stock': 'amazon_in_stock',
+    }
+
+    def __init__(self, asin=None, price_jpy=None, in_stock=None, last_fetched_at=None):
+        self.asin = asin
+        self.price_jpy = price_jpy
+        self.in_stock = in_stock
+        self.last_fetched_at = last_fetched_at
+
+
+class QueueItem(Record):
+    """upload_queue テーブルの1行"""
+
+    __slots__ = (
+        'id', 'asin', 'platform', 'account_id', 'scheduled_time', 'priority',
+        'status', 'retry_count', 'error_message', 'created_at', 'processed_at',
+    )
+
+    def __init__(
+        self, id=None, asin=None, platform=None, account_id=None, scheduled_time=None, priority=None,
+        status=None, retry_count=None, error_message=None, created_at=None, processed_at=None
+    ):
+        self.id = id
+        self.asin = asin
+        self.platform = platform
+        self.account_id = account_id
+        self.scheduled_time = scheduled_time
+        self.priority = priority
+        self.status = status
+        self.retry_count = retry_count
+        self.error_message = error_message
+        self.created_at = created_at
+        self.processed_at = processed_at
+
+
+class ChangeLog:
+    """
+    件数上限付きの変更履歴（リングバッファ）
+
+    デーモンでは同じ同期インスタンスをサイクルをまたいで使うため、リストに追加し続けると
+    メモリが増え続ける。最新の maxlen 件のみ保持し、総件数は total で数える。
+    """
+
+    def __init__(self, maxlen: int = DEFAULT_CHANGE_LOG_SIZE):
+        self._items = deque(maxlen=maxlen)
+        self.total = 0
+
+    @property
+    def maxlen(self) -> int:
+        return self._items.maxlen
+
+    @property
+    def dropped(self) -> int:
+        """上限を超えて破棄した件数"""
+        return self.total - len(self._items)
+
+    def append(self, item: Any):
+        self._items.append(item)
+        self.total += 1
+
+    def clear(self):
+        self._items.clear()
+        self.total = 0
+
+    def __len__(self) -> int:
+        """保持している件数（総件数は total）"""
+        return len(self._items)
+
+    def __bool__(self) -> bool:
+        return bool(self._items)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self._items)[index]
+        return self._items[index]
+
+    def __repr__(self) -> str:
+        return f'ChangeLog(total={self.total}, kept={len(self._items)}, maxlen={self.maxlen})'
@@ -0,0 +1,493 @@
+"""
+Snapshot Store
+
+分析用に master.db の主要テーブルを列指向ファイルに書き出すスナップショット
+
+分析スクリプトが稼働中の master.db に直接クエリすると、デーモンの書き込みと競合する
+（ロック待ち・読み込み中の不整合）。スナップショットに書き出しておき、分析はそちらを読む。
+
+- 対象: products / listings / upload_queue / price_history
+- 1つの読み取りトランザクションで全テーブルを読み込む（テーブル間で整合した状態）
+- 差分エクスポート: 前回以降に更新された行（updated_at、price_history は last_seen_at）のみを追記
+    - 削除された行はキー一覧（keys ファイル）で除外する
+    - updated_at を更新しない書き込みは差分では拾えないため、
+      最後の全件エクスポートから full_refresh_hours を過ぎると自動で全件エクスポートする
+    - updated_at はローカル時刻（MasterDB の datetime.now()）と UTC（CURRENT_TIMESTAMP）の
+      書き込みが混在し、行ごとにどちらか判別できない。差分の重複範囲をローカル時刻とUTCの差
+      （JSTなら9時間）だけ広げて取りこぼしを防ぐ（その分、差分エクスポートの行数は増える）
+- 形式: pyarrowがあれば Arrow IPC（メモリマップで読み込み可能）または Parquet、無ければpickle
+- テーブルごとの状態（形式・パーツ・ウォーターマーク）は manifest.json に記録
+
+使用例:
+    store = SnapshotStore(MasterDB())
+    store.export()                      # 差分エクスポート
+
+    reader = SnapshotReader()
+    listings = reader.table('listings', columns=['asin', 'account_id', 'status'])
+    listed = listings[listings['status'] == 'listed']
+"""
+
+import json
+import os
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+from inventory.core.master_db import MasterDB
+
+
+# 出力形式 → 拡張子
+FORMATS = {
+    'arrow': 'arrow',      # Arrow IPC（Feather v2、非圧縮 = メモリマップで読み込み可能）
+    'parquet': 'parquet',  # 圧縮率優先
+    'pickle': 'pkl',       # pyarrowが無い環境用
+}
+DEFAULT_FORMAT = 'arrow' if PYARROW_AVAILABLE else 'pickle'
+
+# テーブル → キー列と差分抽出に使う列
+#   incremental: 'updated_at' / 'last_seen_at' = その日時列で抽出、
+#                'id' = 追記のみのテーブル（id が前回の最大値より大きい行）、
+#                None = 毎回全件
+TABLES: Dict[str, Dict[str, Any]] = {
+    'products': {'key': 'asin', 'incremental': 'updated_at'},
+    'listings': {'key': 'id', 'incremental': 'updated_at'},
+    # updated_at 列が無く、ステータス変更で更新日時が記録されないため毎回全件
+    'upload_queue': {'key': 'id', 'incremental': None},
+    # 変化点の延長（last_seen_at / observation_count の更新）があるため追記のみではない
+    'price_history': {'key': 'id', 'incremental': 'last_seen_at'},
+}
+
+MANIFEST_NAME = 'manifest.json'
+
+# 差分エクスポートの重複範囲（前回の最終更新日時からさかのぼる時間）
+# エクスポート中にコミットされた書き込みの取りこぼしを防ぐ（重複分はキーで除去）
+# 実際にはローカル時刻とUTCの差を加える（_overlap()）
+OVERLAP = timedelta(minutes=10)
+
+# パーツ数がこれを超えたら1ファイルにまとめる
+MAX_PARTS = 20
+
+
+def _overlap() -> timedelta:
+    """
+    差分エクスポートの重複範囲
+
+    updated_at にローカル時刻とUTC（CURRENT_TIMESTAMP）が混在するため、
+    ウォーターマークと各行の時刻のずれ（UTCオフセット）の分だけさかのぼる。
+    """
+    offset = datetime.now().astimezone().utcoffset() or timedelta(0)
+    return OVERLAP + abs(offset)
+
+
+def _default_snapshot_dir() -> Path:
+    return Path(__file__).resolve().parent.parent / 'data' / 'snapshots'
+
+
+def _read_manifest(snapshot_dir: Path) -> Dict[str, Any]:
+    path = snapshot_dir / MANIFEST_NAME
+    if not path.exists():
+        return {'tables': {}}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_frame(df: pd.DataFrame, path: Path, fmt: str):
+    """DataFrameを保存（一時ファイルに書き込んでから置き換え）"""
+    tmp_path = path.with_name(path.name + '.tmp')
+    if fmt == 'arrow':
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        with pa.OSFile(str(tmp_path), 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+    elif fmt == 'parquet':
+        df.to_parquet(tmp_path, index=False)
+    else:
+        df.to_pickle(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _read_frame(path: Path, fmt: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """保存したDataFrameを読み込み（arrow はメモリマップ）"""
+    if fmt == 'arrow':
+        with pa.memory_map(str(path), 'r') as source:
+            table = pa.ipc.open_file(source).read_all()
+        if columns:
+            table = table.select(columns)
+        return table.to_pandas()
+    if fmt == 'parquet':
+        return pd.read_parquet(path, columns=columns)
+    df = pd.read_pickle(path)
+    return df[columns] if columns else df
+
+
+class SnapshotStore:
+    """
+    master.db → 列指向スナップショットのエクスポート
+    """
+
+    def __init__(
+        self,
+        master_db: MasterDB = None,
+        snapshot_dir: str = None,
+        fmt: str = None,
+        full_refresh_hours: float = 24
+    ):
+        """
+        Args:
+            master_db: MasterDBインスタンス（省略時はデフォルトパスで作成）
+            snapshot_dir: 出力先（デフォルト: inventory/data/snapshots）
+            fmt: 'arrow' / 'parquet' / 'pickle'（デフォルト: pyarrowがあれば arrow、無ければ pickle）
+            full_refresh_hours: 最後の全件エクスポートからこの時間を過ぎたら全件エクスポートする
+        """
+        self.db = master_db or MasterDB()
+        self.snapshot_dir = Path(snapshot_dir) if snapshot_dir else _default_snapshot_dir()
+        self.fmt = fmt or DEFAULT_FORMAT
+        if self.fmt not in FORMATS:
+            raise ValueError(f"不明な形式: {self.fmt}（{', '.join(FORMATS)}）")
+        if self.fmt in ('arrow', 'parquet') and not PYARROW_AVAILABLE:
+            raise ValueError(f"{self.fmt} 形式には pyarrow が必要です（pip install pyarrow）")
+        self.full_refresh_hours = full_refresh_hours
+
+    def _connect(self) -> sqlite3.Connection:
+        """読み取り専用の接続（自動トランザクションなし、BEGIN で明示的に開始）"""
+        uri = Path(self.db.db_path).resolve().as_uri() + '?mode=ro'
+        return sqlite3.connect(uri, uri=True, isolation_level=None)
+
+    def export(self, tables: List[str] = None, full: bool = False) -> Dict[str, Dict[str, Any]]:
+        """
+        スナップショットをエクスポート
+
+        Args:
+            tables: 対象テーブル（省略時は TABLES すべて）
+            full: Trueの場合、差分ではなく全件エクスポート
+
+        Returns:
+            dict: {テーブル名: {'mode': 'full'/'incremental', 'rows': 書き出した行数, 'total_rows': 全行数, 'parts': パーツ数}}
+        """
+        tables = tables or list(TABLES)
+        unknown = [t for t in tables if t not in TABLES]
+        if unknown:
+            raise ValueError(f"不明なテーブル: {', '.join(unknown)}")
+
+        self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+        manifest = _read_manifest(self.snapshot_dir)
+        now = datetime.now()
+        results = {}
+        written: Dict[str, pd.DataFrame] = {}
+        key_frames: Dict[str, pd.DataFrame] = {}
+        plans: Dict[str, Dict[str, Any]] = {}
+
+        conn = self._connect()
+        try:
+            # 1つの読み取りトランザクションで全テーブルを読み込む
+            conn.execute('BEGIN')
+            for table in tables:
+                spec = TABLES[table]
+                state = manifest['tables'].get(table)
+                mode = 'full' if self._needs_full(state, spec, full, now) else 'incremental'
+                plans[table] = {'mode': mode, 'state': state}
+
+                column_types = self._column_types(conn, table)
+                if mode == 'full':
+                    df = self._query(conn, f'SELECT * FROM {table}', [], column_types)
+                else:
+                    query, params = self._incremental_query(table, spec, state)
+                    df = self._query(conn, query, params, column_types)
+                    # 削除された行の除外用
+                    key_frames[table] = self._query(
+                        conn, f"SELECT {spec['key']} FROM {table}", [], column_types
+                    )
+                written[table] = df
+            conn.execute('COMMIT')
+        finally:
+            conn.close()
+
+        # ファイルへの書き込みはトランザクションの外で行う（DBの読み取りを早く終える）
+        old_files: List[Path] = []
+        for table, df in written.items():
+            results[table], replaced = self._write_table(
+                table, df, key_frames.get(table), plans[table]['mode'], plans[table]['state'], manifest, now
+            )
+            old_files.extend(replaced)
+
+        self._save_manifest(manifest)
+
+        # manifest の更新後に古いファイルを削除（manifest を先に読んだ SnapshotReader は古いファイルを使う）
+        for path in old_files:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+        return results
+
+    def _needs_full(self, state: Optional[Dict[str, Any]], spec: Dict[str, Any], full: bool, now: datetime) -> bool:
+        if full or not state or spec['incremental'] is None:
+            return True
+        if state.get('format') != self.fmt or state.get('watermark') is None:
+            return True
+        if spec['incremental'] == 'id':
+            # 追記のみのテーブルは差分で取りこぼさない（削除はキー一覧で除外）
+            return False
+        if not isinstance(state['watermark'], str):
+            # 差分抽出の列が変わった（id → 日時列）
+            return True
+        last_full = datetime.fromisoformat(state['last_full_at'])
+        return now - last_full >= timedelta(hours=self.full_refresh_hours)
+
+    @staticmethod
+    def _incremental_query(table: str, spec: Dict[str, Any], state: Dict[str, Any]):
+        if spec['incremental'] == 'id':
+            return f'SELECT * FROM {table} WHERE id > ?', [state['watermark']]
+        since = datetime.fromisoformat(state['watermark']) - _overlap()
+        return (
+            f"SELECT * FROM {table} WHERE datetime({spec['incremental']}) >= datetime(?)",
+            [since.isoformat(sep=' ', timespec='seconds')]
+        )
+
+    @staticmethod
+    def _column_types(conn: sqlite3.Connection, table: str) -> Dict[str, str]:
+        """宣言された列の型（パーツ間で列の型を揃えるために使う）"""
+        return {row[1]: (row[2] or '').upper() for row in conn.execute(f'PRAGMA table_info({table})')}
+
+    @staticmethod
+    def _query(conn: sqlite3.Connection, query: str, params: list, column_types: Dict[str, str]) -> pd.DataFrame:
+        cursor = conn.execute(query, params)
+        columns = [d[0] for d in cursor.description]
+        df = pd.DataFrame.from_records(cursor.fetchall(), columns=columns)
+
+        # SQLiteは列ごとに型が混在しうるため、宣言された型に揃える
+        for column in columns:
+            declared = column_types.get(column, '')
+            if declared == 'BOOLEAN':
+                df[column] = pd.to_numeric(df[column], errors='coerce').astype('boolean')
+            elif 'INT' in declared:
+                df[column] = pd.to_numeric(df[column], errors='coerce').astype('Int64')
+            elif declared in ('REAL', 'FLOAT', 'DOUBLE'):
+                df[column] = pd.to_numeric(df[column], errors='coerce').astype('float64')
+            else:
+                df[column] = df[column].astype('string')
+        return df
+
+    def _write_table(
+        self,
+        table: str,
+        df: pd.DataFrame,
+        keys: Optional[pd.DataFrame],
+        mode: str,
+        state: Optional[Dict[str, Any]],
+        manifest: Dict[str, Any],
+        now: datetime
+    ):
+        """
+        テーブルのパーツを書き込み、manifest の状態を更新
+
+        Returns:
+            tuple: (結果, 不要になったファイルのリスト)
+        """
+        spec = TABLES[table]
+        ext = FORMATS[self.fmt]
+        table_dir = self.snapshot_dir / table
+        table_dir.mkdir(parents=True, exist_ok=True)
+
+        if mode == 'full':
+            old_files = [table_dir / name for name in (state or {}).get('parts', [])]
+            if state and state.get('keys'):
+                old_files.append(table_dir / state['keys'])
+            seq = (state or {}).get('seq', 0) + 1
+            part = f'part-{seq:06d}.{ext}'
+            _write_frame(df, table_dir / part, self.fmt)
+            new_state = {
+                'format': self.fmt,
+                'key': spec['key'],
+                'parts': [part],
+                'keys': None,
+                'seq': seq,
+                'last_full_at': now.isoformat(timespec='seconds'),
+                'total_rows': len(df),
+            }
+        else:
+            seq = state['seq'] + 1
+            parts = list(state['parts'])
+            old_files = []
+            if len(df):
+                part = f'part-{seq:06d}.{ext}'
+                _write_frame(df, table_dir / part, self.fmt)
+                parts.append(part)
+            keys_name = f'keys-{seq:06d}.{ext}'
+            _write_frame(keys, table_dir / keys_name, self.fmt)
+            if state.get('keys'):
+                old_files.append(table_dir / state['keys'])
+            new_state = dict(state, parts=parts, keys=keys_name, seq=seq, total_rows=len(keys))
+
+        new_state['watermark'] = self._watermark(df, spec, state if mode == 'incremental' else None)
+        new_state['exported_at'] = now.isoformat(timespec='seconds')
+        manifest['tables'][table] = new_state
+
+        if len(new_state['parts']) > MAX_PARTS:
+            old_files.extend(self._compact(table, new_state))
+
+        result = {
+            'mode': mode,
+            'rows': len(df),
+            'total_rows': new_state['total_rows'],
+            'parts': len(new_state['parts']),
+        }
+        return result, old_files
+
+    @staticmethod
+    def _watermark(df: pd.DataFrame, spec: Dict[str, Any], state: Optional[Dict[str, Any]]):
+        """次回の差分抽出の起点（今回読み込んだ行の最大値、行が無ければ前回の値）"""
+        previous = state.get('watermark') if state else None
+        column = spec['incremental']
+        if column is None or df.empty:
+            return previous
+        if column == 'id':
+            value = int(df['id'].max())
+            return max(value, previous or 0)
+        # 形式の異なる日時（'T'区切り・空白区切り）が混在するため datetime に変換して比較
+        latest = pd.to_datetime(df[column], errors='coerce', format='mixed').max()
+        if pd.isna(latest):
+            return previous
+        value = latest.to_pydatetime().replace(tzinfo=None).isoformat(timespec='seconds')
+        return max(value, previous) if previous else value
+
+    def _compact(self, table: str, state: Dict[str, Any]) -> List[Path]:
+        """パーツを1ファイルにまとめる（古いファイルのパスを返す）"""
+        table_dir = self.snapshot_dir / table
+        df = SnapshotReader(self.snapshot_dir)._load(table, state, None)
+        old_files = [table_dir / name for name in state['parts']]
+        if state.get('keys'):
+            old_files.append(table_dir / state['keys'])
+
+        state['seq'] += 1
+        part = f"part-{state['seq']:06d}.{FORMATS[state['format']]}"
+        _write_frame(df, table_dir / part, state['format'])
+        state['parts'] = [part]
+        state['keys'] = None
+        state['total_rows'] = len(df)
+        return old_files
+
+    def _save_manifest(self, manifest: Dict[str, Any]):
+        manifest['updated_at'] = datetime.now().isoformat(timespec='seconds')
+        path = self.snapshot_dir / MANIFEST_NAME
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+
+class SnapshotReader:
+    """
+    スナップショットの読み込み
+
+    差分パーツはキーで重複を除き（後のパーツを優先）、キー一覧に無い行（削除済み）を除外して返す。
+    """
+
+    def __init__(self, snapshot_dir: str = None):
+        """
+        Args:
+            snapshot_dir: スナップショットのディレクトリ（デフォルト: inventory/data/snapshots）
+        """
+        self.snapshot_dir = Path(snapshot_dir) if snapshot_dir else _default_snapshot_dir()
+        self.manifest = _read_manifest(self.snapshot_dir)
+        self._listings = None
+
+    def tables(self) -> List[str]:
+        """エクスポート済みのテーブル"""
+        return list(self.manifest['tables'])
+
+    def info(self, table: str) -> Dict[str, Any]:
+        """テーブルの状態（行数・最終エクスポート日時・ウォーターマーク等）"""
+        if table not in self.manifest['tables']:
+            raise KeyError(f"スナップショットにテーブルがありません: {table}（export_snapshot.py を実行してください）")
+        return self.manifest['tables'][table]
+
+    def table(self, table: str, columns: List[str] = None) -> pd.DataFrame:
+        """
+        テーブルを DataFrame で取得
+
+        Args:
+            table: テーブル名
+            columns: 読み込む列（省略時は全列。列を絞ると読み込みが速い）
+
+        Returns:
+            DataFrame
+        """
+        return self._load(table, self.info(table), columns)
+
+    def _load(self, table: str, state: Dict[str, Any], columns: Optional[List[str]]) -> pd.DataFrame:
+        table_dir = self.snapshot_dir / table
+        fmt = state['format']
+        key = state['key']
+        read_columns = None
+        if columns:
+            read_columns = list(columns) if key in columns else [key] + list(columns)
+
+        frames = [_read_frame(table_dir / part, fmt, read_columns) for part in state['parts']]
+        df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+
+        if len(frames) > 1:
+            df = df.drop_duplicates(subset=[key], keep='last')
+        if state.get('keys'):
+            keys = _read_frame(table_dir / state['keys'], fmt)[key]
+            df = df[df[key].isin(keys)]
+        df = df.reset_index(drop=True)
+
+        if columns and key not in columns:
+            df = df.drop(columns=[key])
+        return df
+
+    def get_listings_by_account(self, platform: str, account_id: str,
+                                status: str = None) -> List[Dict[str, Any]]:
+        """
+        アカウントの出品を取得（MasterDB.get_listings_by_account と同じ形の dict のリスト）
+
+        listings は初回の呼び出しで読み込み、以降は同じ DataFrame を使う。
+
+        Args:
+            platform: プラットフォーム名
+            account_id: アカウントID
+            status: ステータス（省略時は全ステータス）
+
+        Returns:
+            List[dict]: 出品のリスト
+        """
+        if self._listings is None:
+            self._listings = self.table('listings')
+
+        df = self._listings
+        mask = (df['platform'] == platform) & (df['account_id'] == account_id)
+        if status:
+            mask &= df['status'] == status
+
+        rows = df[mask]
+        return rows.astype(object).where(rows.notna(), None).to_dict('records')
+
+    def to_sqlite(self, tables: List[str]) -> sqlite3.Connection:
+        """
+        テーブルをメモリ上の SQLite に読み込んだ接続を返す
+
+        master.db と同じ SQL をスナップショットに対して実行する分析スクリプト用。
+
+        Args:
+            tables: 読み込むテーブル名
+
+        Returns:
+            sqlite3.Connection（row_factory = sqlite3.Row）
+        """
+        conn = sqlite3.connect(':memory:')
+        conn.row_factory = sqlite3.Row
+        for table in tables:
+            df = self.table(table)
+            df.astype(object).where(df.notna(), None).to_sql(table, conn, index=False)
+        return conn
@@ -0,0 +1,115 @@
+"""
+分析用スナップショットのエクスポート
+
+master.db の products / listings / upload_queue / price_history を列指向ファイル
+（pyarrowがあれば Arrow IPC / Parquet、無ければpickle）に書き出します。
+分析スクリプトは稼働中の master.db ではなくスナップショットを読むことで、デーモンの書き込みと競合しません。
+
+使用例:
+    # 差分エクスポート（初回・前回の全件エクスポートから24時間後は全件）
+    python inventory/scripts/export_snapshot.py
+
+    # 全件エクスポート
+    python inventory/scripts/export_snapshot.py --full
+
+    # 一部のテーブルのみ
+    python inventory/scripts/export_snapshot.py --tables listings,upload_queue
+
+    # スナップショットの状態を表示
+    python inventory/scripts/export_snapshot.py --info
+
+分析スクリプトからの読み込み:
+    from inventory.core.snapshot_store import SnapshotReader
+    listings = SnapshotReader().table('listings', columns=['asin', 'account_id', 'status'])
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# パスを追加
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from inventory.core.master_db import MasterDB
+from inventory.core.snapshot_store import SnapshotStore, SnapshotReader, TABLES, FORMATS
+
+
+def print_info(snapshot_dir: str = None):
+    """スナップショットの状態を表示"""
+    reader = SnapshotReader(snapshot_dir)
+    print(f"スナップショット: {reader.snapshot_dir}")
+    if not reader.tables():
+        print("  エクスポート済みのテーブルはありません")
+        return
+
+    print(f"{'テーブル':<16}{'行数':>10}{'パーツ':>8}  {'形式':<8}{'最終エクスポート':<22}{'最終全件':<22}")
+    print("-" * 90)
+    for table in reader.tables():
+        info = reader.info(table)
+        print(
+            f"{table:<16}{info['total_rows']:>10,}{len(info['parts']):>8}  {info['format']:<8}"
+            f"{info['exported_at']:<22}{info['last_full_at']:<22}"
+        )
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='分析用スナップショットのエクスポート（master.db → 列指向ファイル）'
+    )
+    parser.add_argument('--tables', type=str, help=f"対象テーブル（カンマ区切り: {', '.join(TABLES)}）")
+    parser.add_argument('--full', action='store_true', help='差分ではなく全件エクスポート')
+    parser.add_argument('--format', choices=list(FORMATS), help='出力形式（デフォルト: pyarrowがあれば arrow、無ければ pickle）')
+    parser.add_argument('--full-refresh-hours', type=float, default=24,
+                        help='最後の全件エクスポートからこの時間を過ぎたら全件エクスポート（デフォルト: 24）')
+    parser.add_argument('--dir', type=str, help='出力先（デフォルト: inventory/data/snapshots）')
+    parser.add_argument('--db', type=str, help='master.db のパス（デフォルト: inventory/data/master.db）')
+    parser.add_argument('--info', action='store_true', help='スナップショットの状態を表示して終了')
+
+    args = parser.parse_args()
+
+    if args.info:
+        print_info(args.dir)
+        return
+
+    tables = [t.strip() for t in args.tables.split(',')] if args.tables else None
+
+    try:
+        store = SnapshotStore(
+            MasterDB(args.db),
+            snapshot_dir=args.dir,
+            fmt=args.format,
+            full_refresh_hours=args.full_refresh_hours
+        )
+    except ValueError as e:
+        print(f"エラー: {e}")
+        sys.exit(1)
+
+    print("=" * 70)
+    print("分析用スナップショットのエクスポート")
+    print("=" * 70)
+    print(f"出力先: {store.snapshot_dir}")
+    print(f"形式: {store.fmt}")
+    print()
+
+    start = time.perf_counter()
+    try:
+        results = store.export(tables=tables, full=args.full)
+    except ValueError as e:
+        print(f"エラー: {e}")
+        sys.exit(1)
+    elapsed = time.perf_counter() - start
+
+    mode_labels = {'full': '全件', 'incremental': '差分'}
+    for table, result in results.items():
+        print(
+            f"  {table:<16}{mode_labels[result['mode']]}: {result['rows']:,}行 "
+            f"（合計 {result['total_rows']:,}行 / パーツ {result['parts']}）"
+        )
+    print()
+    print(f"完了（{elapsed:.1f}秒）")
+
+
+if __name__ == '__main__':
+    main()
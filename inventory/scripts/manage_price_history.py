@@ -0,0 +1,109 @@
+"""
+価格履歴管理スクリプト
+
+Amazon価格履歴（amazon_price_points / amazon_price_rollups）の
+統計表示・保持期間の適用・ボラティリティ確認を行います。
+
+使用例:
+    # 統計表示
+    python inventory/scripts/manage_price_history.py --stats
+
+    # 保持期間を適用（デフォルト: 変化点365日 / 日次180日 / 週次730日）
+    python inventory/scripts/manage_price_history.py --apply-retention
+
+    # 直近7日で2回以上変動したASIN
+    python inventory/scripts/manage_price_history.py --volatile --days 7 --min-changes 2
+
+    # 特定ASINの変化点・日次ロールアップ
+    python inventory/scripts/manage_price_history.py --asin B0XXXXXXXX
+"""
+
+import sys
+from pathlib import Path
+
+# パスを追加
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from inventory.core.master_db import MasterDB
+from inventory.core.price_history_store import PriceHistoryStore
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Amazon価格履歴の管理'
+    )
+    parser.add_argument('--stats', action='store_true', help='統計情報を表示')
+    parser.add_argument('--apply-retention', action='store_true', help='保持期間を過ぎた履歴を削除')
+    parser.add_argument('--points-days', type=int, default=None, help='変化点の保持日数（デフォルト: 365）')
+    parser.add_argument('--day-rollup-days', type=int, default=None, help='日次ロールアップの保持日数（デフォルト: 180）')
+    parser.add_argument('--week-rollup-days', type=int, default=None, help='週次ロールアップの保持日数（デフォルト: 730）')
+    parser.add_argument('--volatile', action='store_true', help='変動の大きいASINを表示')
+    parser.add_argument('--days', type=int, default=7, help='集計対象期間（日、デフォルト: 7）')
+    parser.add_argument('--min-changes', type=int, default=2, help='最小変化回数（デフォルト: 2）')
+    parser.add_argument('--limit', type=int, default=20, help='表示件数（デフォルト: 20）')
+    parser.add_argument('--asin', help='特定ASINの履歴を表示')
+
+    args = parser.parse_args()
+
+    store = PriceHistoryStore(MasterDB())
+
+    print("=" * 70)
+    print("Amazon価格履歴")
+    print("=" * 70)
+
+    if args.apply_retention:
+        deleted = store.apply_retention(
+            points_days=args.points_days,
+            day_rollup_days=args.day_rollup_days,
+            week_rollup_days=args.week_rollup_days
+        )
+        print(f"\n保持期間を適用しました:")
+        print(f"  変化点: {deleted['points']}件削除")
+        print(f"  日次ロールアップ: {deleted['day']}件削除")
+        print(f"  週次ロールアップ: {deleted['week']}件削除")
+
+    if args.volatile:
+        asins = store.get_volatile_asins(days=args.days, min_changes=args.min_changes)
+        print(f"\n直近{args.days}日で{args.min_changes}回以上変動: {len(asins)}件")
+
+        volatility = store.get_volatility(asins[:args.limit], days=args.days)
+        for asin in asins[:args.limit]:
+            v = volatility.get(asin, {})
+            print(
+                f"  {asin}: 変化 {v.get('change_count', 0)}回 / "
+                f"価格 {v.get('min_price')}〜{v.get('max_price')}円 "
+                f"(幅 {v.get('price_range_ratio', 0) * 100:.1f}%) / "
+                f"在庫切れ率 {v.get('stock_out_ratio', 0) * 100:.1f}%"
+            )
+
+    if args.asin:
+        print(f"\n{args.asin} の変化点（新しい順）:")
+        for point in store.get_change_points(args.asin, limit=args.limit):
+            stock = '在庫あり' if point['in_stock'] else '在庫切れ'
+            print(
+                f"  {point['recorded_at'][:19]} 〜 {point['last_seen_at'][:19]}: "
+                f"{point['price_jpy']}円 {stock}（{point['observation_count']}回観測）"
+            )
+
+        print(f"\n{args.asin} の日次ロールアップ（直近{args.days}日）:")
+        for rollup in store.get_rollups(args.asin, 'day', days=args.days):
+            print(
+                f"  {rollup['period_start']}: 最小 {rollup['min_price']} / 最大 {rollup['max_price']} / "
+                f"最終 {rollup['last_price']}円, 在庫切れ率 {rollup['stock_out_ratio'] * 100:.1f}%"
+            )
+
+    if args.stats or not (args.apply_retention or args.volatile or args.asin):
+        stats = store.get_stats()
+        print(f"\nASIN数: {stats['asins']}件")
+        print(f"変化点: {stats['change_points']}件")
+        print(f"観測回数: {stats['observations']}回")
+        print(f"圧縮率: {stats['compression_ratio']:.1f}観測/変化点")
+        print(f"ロールアップ: {stats['rollups']}件")
+
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
@@ -52,6 +52,7 @@ project_root = Path(__file__).resolve().parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from inventory.core.master_db import MasterDB
+from inventory.core.prohibited_scan_store import ProhibitedScanStore
 
 
 def load_asins_from_csv(csv_path: str, delete_column: str = 'delete') -> tuple:
@@ -127,6 +128,39 @@ def load_asins_from_list(asins: List[str]) -> List[Dict[str, Any]]:
     return [{'asin': asin, 'title_ja': '', 'risk_score': 0, 'matched_keywords': '', 'platforms': [], 'accounts': [], 'platform_item_ids': {}} for asin in asins]
 
 
+def fetch_listings_by_asin(db: MasterDB, asins: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    対象ASINの出品状況をまとめて取得
+
+    Args:
+        db: MasterDB instance
+        asins: ASINのリスト
+
+    Returns:
+        dict: {asin: [{'platform', 'account_id', 'status', 'platform_item_id'}, ...]}
+    """
+    listings_by_asin = {asin: [] for asin in asins}
+    unique_asins = list(listings_by_asin.keys())
+
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+
+        # SQLiteの変数上限を考慮して分割
+        for i in range(0, len(unique_asins), 500):
+            chunk = unique_asins[i:i + 500]
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(f"""
+                SELECT asin, platform, account_id, status, platform_item_id
+                FROM listings
+                WHERE asin IN ({placeholders})
+            """, chunk)
+
+            for row in cursor.fetchall():
+                listings_by_asin[row['asin']].append(dict(row))
+
+    return listings_by_asin
+
+
 def delete_from_platform(asin: str, platform: str, account_id: str, platform_item_id: Optional[str] = None, dry_run: bool = False) -> bool:
     """
     プラットフォームAPIで商品を削除
@@ -429,6 +463,10 @@ def remove_prohibited_items(
         'errors': 0
     }
 
+    # 出品状況を一括取得
+    listings_by_asin = fetch_listings_by_asin(db, [d['asin'] for d in asins_data])
+    deleted_product_asins = []
+
     for i, asin_data in enumerate(asins_data, 1):
         asin = asin_data['asin']
         title = asin_data.get('title_ja', '')
@@ -443,15 +481,8 @@ def remove_prohibited_items(
             print(f"  キーワード: {matched_keywords[:60]}")
 
         try:
-            # 出品状況を確認
-            with db.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT platform, account_id, status, platform_item_id
-                    FROM listings
-                    WHERE asin = ?
-                """, (asin,))
-                listings = cursor.fetchall()
+            # 出品状況
+            listings = listings_by_asin.get(asin, [])
 
             # プラットフォーム削除の成功フラグ
             platform_deletion_success = True
@@ -539,6 +570,7 @@ def remove_prohibited_items(
                 stats['listings_deleted'] += 1
             if db_result['products']:
                 stats['products_deleted'] += 1
+                deleted_product_asins.append(asin)
 
             # ブロックリストに追加
             if add_to_blocklist_flag:
@@ -558,6 +590,10 @@ def remove_prohibited_items(
             import traceback
             traceback.print_exc()
 
+    # 削除した商品のスキャン結果も削除
+    if deleted_product_asins and not dry_run:
+        ProhibitedScanStore(db).delete_results(deleted_product_asins)
+
     return stats
 
 
@@ -13,6 +13,13 @@
 
     # 特定プラットフォーム・アカウントのみスキャン
     python inventory/scripts/scan_prohibited_items.py --platform base --account-id base_account_2
+
+    # 前回結果を使わずに全件を再スコアリング
+    python inventory/scripts/scan_prohibited_items.py --full-rescan
+
+スキャン結果は master.db の prohibited_scan_results に保存され、次回以降は
+タイトル/説明文/カテゴリ/ブランドまたは config/prohibited_items.json が
+変更された商品のみ再スコアリングされます。
 """
 
 import sys
@@ -28,6 +35,94 @@ sys.path.insert(0, str(project_root))
 
 from inventory.core.master_db import MasterDB
 from inventory.core.prohibited_item_checker import ProhibitedItemChecker
+from inventory.core.prohibited_scan_store import ProhibitedScanStore
+
+
+def fetch_products_with_listings(
+    db: MasterDB,
+    platform: Optional[str] = None,
+    account_id: Optional[str] = None,
+    limit: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    商品情報と出品状況のサマリーを1クエリで取得
+
+    Args:
+        db: MasterDB instance
+        platform: プラットフォームフィルタ（オプション）
+        account_id: アカウントIDフィルタ（オプション）
+        limit: 取得する最大件数（オプション）
+
+    Returns:
+        list: 商品情報 + 出品状況（listing_count, listing_statuses, platforms, accounts, platform_item_ids）
+    """
+    query = """
+        SELECT
+            p.asin,
+            p.title_ja,
+            p.title_en,
+            p.description_ja,
+            p.description_en,
+            p.category,
+            p.brand,
+            p.images,
+            p.amazon_price_jpy,
+            COALESCE(l.listing_count, 0) AS listing_count,
+            l.statuses,
+            l.platforms,
+            l.accounts,
+            l.platform_item_ids
+        FROM products p
+        LEFT JOIN (
+            SELECT
+                asin,
+                COUNT(*) AS listing_count,
+                GROUP_CONCAT(status, '|') AS statuses,
+                GROUP_CONCAT(platform, '|') AS platforms,
+                GROUP_CONCAT(account_id, '|') AS accounts,
+                GROUP_CONCAT(
+                    CASE WHEN platform_item_id IS NOT NULL AND platform_item_id != ''
+                         THEN platform || ':' || platform_item_id END,
+                    ', '
+                ) AS platform_item_ids
+            FROM listings
+            GROUP BY asin
+        ) l ON p.asin = l.asin
+    """
+    params = []
+
+    # プラットフォーム/アカウントフィルタ（該当する出品を持つ商品のみ）
+    if platform or account_id:
+        conditions = ["f.asin = p.asin"]
+        if platform:
+            conditions.append("f.platform = ?")
+            params.append(platform)
+        if account_id:
+            conditions.append("f.account_id = ?")
+            params.append(account_id)
+        query += f" WHERE EXISTS (SELECT 1 FROM listings f WHERE {' AND '.join(conditions)})"
+
+    if limit:
+        query += " LIMIT ?"
+        params.append(limit)
+
+    def _distinct(value: Optional[str]) -> str:
+        return ', '.join(sorted(set(value.split('|')))) if value else ''
+
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(query, params)
+
+        products = []
+        for row in cursor.fetchall():
+            product = dict(row)
+            product['listing_statuses'] = _distinct(product.pop('statuses'))
+            product['platforms'] = _distinct(product['platforms'])
+            product['accounts'] = _distinct(product['accounts'])
+            product['platform_item_ids'] = product['platform_item_ids'] or ''
+            products.append(product)
+
+    return products
 
 
 def scan_products(
@@ -37,11 +132,15 @@ def scan_products(
     threshold: int = 50,
     platform: Optional[str] = None,
     account_id: Optional[str] = None,
-    limit: Optional[int] = None
+    limit: Optional[int] = None,
+    full_rescan: bool = False
 ) -> List[Dict[str, Any]]:
     """
     商品をスキャンして禁止商品をチェック
 
+    前回のスキャン結果（prohibited_scan_results）とコンテンツハッシュ・
+    ルールセットのバージョンが一致する商品は再スコアリングせず前回結果を使う。
+
     Args:
         db: MasterDB instance
         checker: ProhibitedItemChecker instance
@@ -50,6 +149,7 @@ def scan_products(
         platform: プラットフォームフィルタ（オプション）
         account_id: アカウントIDフィルタ（オプション）
         limit: 処理する最大件数（オプション）
+        full_rescan: Trueの場合は前回結果を使わず全件を再スコアリング
 
     Returns:
         list: スキャン結果のリスト
@@ -66,118 +166,76 @@ def scan_products(
 
     min_score = risk_thresholds.get(risk_level, threshold)
 
-    # productsテーブルから全商品を取得
-    with db.get_connection() as conn:
-        cursor = conn.cursor()
-
-        # クエリ構築
-        query = """
-            SELECT DISTINCT
-                p.asin,
-                p.title_ja,
-                p.title_en,
-                p.description_ja,
-                p.description_en,
-                p.category,
-                p.brand,
-                p.images,
-                p.amazon_price_jpy
-            FROM products p
-        """
-
-        # プラットフォーム/アカウントフィルタがある場合はlistingsと結合
-        if platform or account_id:
-            query += " LEFT JOIN listings l ON p.asin = l.asin"
-            conditions = []
-            if platform:
-                conditions.append(f"l.platform = '{platform}'")
-            if account_id:
-                conditions.append(f"l.account_id = '{account_id}'")
-            if conditions:
-                query += " WHERE " + " AND ".join(conditions)
-
-        if limit:
-            query += f" LIMIT {limit}"
-
-        cursor.execute(query)
-        products = cursor.fetchall()
-
-        print(f"\n[INFO] スキャン対象: {len(products)}件の商品")
-        print(f"[INFO] 最小リスクスコア: {min_score}")
-        print()
-
-        # 各商品をチェック
-        for i, product in enumerate(products, 1):
-            asin = product['asin']
-
-            # 進捗表示
-            if i % 100 == 0:
-                print(f"  処理中... {i}/{len(products)} ({i/len(products)*100:.1f}%)")
-
-            # 禁止商品チェック
-            check_result = checker.check_product({
+    scan_store = ProhibitedScanStore(db)
+
+    # 商品と出品状況を1クエリで取得
+    products = fetch_products_with_listings(db, platform=platform, account_id=account_id, limit=limit)
+
+    # 前回のスキャン結果
+    cached_results = {} if full_rescan else scan_store.get_results(p['asin'] for p in products)
+
+    print(f"\n[INFO] スキャン対象: {len(products)}件の商品")
+    print(f"[INFO] 最小リスクスコア: {min_score}")
+    print(f"[INFO] ルールセットバージョン: {checker.rules_version}")
+    print()
+
+    rescored = []
+
+    for i, product in enumerate(products, 1):
+        asin = product['asin']
+
+        # 進捗表示
+        if i % 1000 == 0:
+            print(f"  処理中... {i}/{len(products)} ({i/len(products)*100:.1f}%)")
+
+        product_info = {
+            'asin': asin,
+            'title_ja': product['title_ja'] or '',
+            'title_en': product['title_en'] or '',
+            'description_ja': product['description_ja'] or '',
+            'description_en': product['description_en'] or '',
+            'category': product['category'] or '',
+            'brand': product['brand'] or '',
+            'images': product['images'] or []
+        }
+        content_hash = checker.compute_content_hash(product_info)
+
+        # コンテンツ・ルールセットとも変更がなければ前回結果を再利用
+        check_result = cached_results.get(asin)
+        if (check_result is None
+                or check_result['content_hash'] != content_hash
+                or check_result['rules_version'] != checker.rules_version):
+            check_result = checker.check_product(product_info)
+            rescored.append((content_hash, checker.rules_version, check_result))
+
+        # 閾値以上の場合のみ結果に追加
+        if check_result['risk_score'] >= min_score:
+            results.append({
                 'asin': asin,
                 'title_ja': product['title_ja'] or '',
-                'title_en': product['title_en'] or '',
                 'description_ja': product['description_ja'] or '',
                 'description_en': product['description_en'] or '',
                 'category': product['category'] or '',
                 'brand': product['brand'] or '',
-                'images': product['images'] or []
+                'amazon_price_jpy': product['amazon_price_jpy'],
+                'risk_score': check_result['risk_score'],
+                'risk_level': check_result['risk_level'],
+                'recommendation': check_result['recommendation'],
+                'matched_keywords': ', '.join([kw['keyword'] for kw in check_result['matched_keywords']]),
+                'matched_categories': ', '.join(check_result['matched_categories']),
+                'is_whitelisted': check_result['is_whitelisted'],
+                'listing_count': product['listing_count'],
+                'listing_statuses': product['listing_statuses'],
+                'platforms': product['platforms'],
+                'accounts': product['accounts'],
+                'platform_item_ids': product['platform_item_ids'],
+                'details': check_result['details']
             })
 
-            # 閾値以上の場合のみ結果に追加
-            if check_result['risk_score'] >= min_score:
-                # 出品状況を取得
-                cursor.execute("""
-                    SELECT
-                        platform,
-                        account_id,
-                        status,
-                        visibility,
-                        platform_item_id,
-                        sku
-                    FROM listings
-                    WHERE asin = ?
-                """, (asin,))
-                listings = cursor.fetchall()
-
-                # 出品状況のサマリー
-                listing_statuses = []
-                platforms = []
-                accounts = []
-                platform_item_ids = []
-
-                for listing in listings:
-                    listing_statuses.append(listing['status'])
-                    platforms.append(listing['platform'])
-                    accounts.append(listing['account_id'])
-                    if listing['platform_item_id']:
-                        platform_item_ids.append(f"{listing['platform']}:{listing['platform_item_id']}")
-
-                # 結果に追加
-                results.append({
-                    'asin': asin,
-                    'title_ja': product['title_ja'] or '',
-                    'description_ja': product['description_ja'] or '',
-                    'description_en': product['description_en'] or '',
-                    'category': product['category'] or '',
-                    'brand': product['brand'] or '',
-                    'amazon_price_jpy': product['amazon_price_jpy'],
-                    'risk_score': check_result['risk_score'],
-                    'risk_level': check_result['risk_level'],
-                    'recommendation': check_result['recommendation'],
-                    'matched_keywords': ', '.join([kw['keyword'] for kw in check_result['matched_keywords']]),
-                    'matched_categories': ', '.join(check_result['matched_categories']),
-                    'is_whitelisted': check_result['is_whitelisted'],
-                    'listing_count': len(listings),
-                    'listing_statuses': ', '.join(set(listing_statuses)),
-                    'platforms': ', '.join(set(platforms)),
-                    'accounts': ', '.join(set(accounts)),
-                    'platform_item_ids': ', '.join(platform_item_ids),
-                    'details': check_result['details']
-                })
+    # 再スコアリングした結果を保存
+    scan_store.save_results(rescored)
 
+    print(f"[INFO] 再スコアリング: {len(rescored)}件 / 前回結果を再利用: {len(products) - len(rescored)}件")
     print(f"\n[INFO] スキャン完了: {len(results)}件の問題商品候補を検出")
     return results
 
@@ -270,6 +328,11 @@ def main():
         type=int,
         help='処理する最大件数（テスト用）'
     )
+    parser.add_argument(
+        '--full-rescan',
+        action='store_true',
+        help='前回のスキャン結果を使わず全件を再スコアリング'
+    )
     parser.add_argument(
         '--output',
         type=str,
@@ -296,7 +359,8 @@ def main():
         threshold=args.threshold,
         platform=args.platform,
         account_id=args.account_id,
-        limit=args.limit
+        limit=args.limit,
+        full_rescan=args.full_rescan
     )
 
     # 結果サマリー
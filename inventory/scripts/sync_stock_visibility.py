@@ -41,6 +41,7 @@ project_root = Path(__file__).resolve().parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from inventory.core.master_db import MasterDB
+from inventory.core.records import ChangeLog, Listing, ProductPrice
 from platforms.base.accounts.manager import AccountManager
 from platforms.base.core.api_client import BaseAPIClient
 
@@ -77,7 +78,8 @@ class StockVisibilitySync:
             'stock_restored': 0,  # 販売済商品の在庫を1に復活させた件数
             'no_stock_info': 0,
             'errors': 0,
-            'errors_detail': []
+            # デーモンでサイクルをまたいで増え続けないよう最新の一定件数のみ保持（総件数は .total）
+            'errors_detail': ChangeLog()
         }
 
     def sync_all_listings(self, platform: str = 'base', dry_run: bool = False):
@@ -118,8 +120,8 @@ class StockVisibilitySync:
             logger.info(f"\n--- アカウント: {account_name} ({account_id}) ---")
 
             try:
-                # アカウント別の出品一覧を取得
-                listings = self.master_db.get_listings_by_account(
+                # アカウント別の出品一覧を取得（Listing レコード）
+                listings = self.master_db.get_listing_records(
                     platform=platform,
                     account_id=account_id,
                     status='listed'  # 出品済みのみ
@@ -137,6 +139,9 @@ class StockVisibilitySync:
                     account_manager=self.account_manager
                 )
 
+                # Amazon在庫状況（マスタDBからまとめて取得）
+                products = self.master_db.get_product_prices([listing.asin for listing in listings])
+
                 # 各出品をチェック
                 for listing in listings:
                     # シャットダウン要求チェック
@@ -144,7 +149,7 @@ class StockVisibilitySync:
                         logger.info("シャットダウン要求を検出しました（出品ループ中断）")
                         break
 
-                    self._sync_listing(listing, base_client, dry_run)
+                    self._sync_listing(listing, base_client, dry_run, products.get(listing.asin))
 
             except Exception as e:
                 logger.error(f"エラー: アカウント {account_id} の処理中にエラー: {e}")
@@ -159,7 +164,7 @@ class StockVisibilitySync:
 
         return self.stats
 
-    def _sync_listing(self, listing: dict, base_client: BaseAPIClient, dry_run: bool):
+    def _sync_listing(self, listing: Listing, base_client: BaseAPIClient, dry_run: bool, product: ProductPrice = None):
         """
         1つの出品の在庫状況を同期
 
@@ -167,25 +172,25 @@ class StockVisibilitySync:
             listing: 出品情報
             base_client: BASE APIクライアント
             dry_run: Trueの場合、実際の更新は行わない
+            product: マスタDBの価格・在庫情報（Noneの場合は商品情報なしとしてスキップ）
         """
-        asin = listing['asin']
-        listing_id = listing['id']
-        platform_item_id = listing['platform_item_id']
-        current_visibility = listing['visibility']
+        asin = listing.asin
+        listing_id = listing.id
+        platform_item_id = listing.platform_item_id
+        current_visibility = listing.visibility
 
         # ログプレフィックス（プラットフォーム/アカウントID）
         log_prefix = f"[BASE/{base_client.account_id}]"
 
         self.stats['total_products'] += 1
 
-        # 商品情報を取得（マスタDBから）
-        product = self.master_db.get_product(asin)
+        # 商品情報（マスタDB）
         if not product:
             logger.info(f"  {log_prefix} [SKIP] {asin} - 商品情報が見つかりません")
             return
 
-        # Amazon在庫状況をチェック（マスタDBから直接取得）
-        amazon_in_stock = product.get('amazon_in_stock')
+        # Amazon在庫状況をチェック
+        amazon_in_stock = product.in_stock
         if amazon_in_stock is None:
             logger.debug(f"  {log_prefix} [SKIP] {asin} - 在庫情報がありません")
             self.stats['no_stock_info'] += 1
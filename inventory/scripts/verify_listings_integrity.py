@@ -2,16 +2,39 @@
 Issue #013: listingsのデータ整合性を検証するスクリプト
 
 以下の項目をチェックします:
-1. upload_queueとlistingsの整合性（欠損チェック）
-2. UNIQUE制約の有効性（重複チェック）
-3. listingsとproductsの整合性（孤立レコードチェック）
+1. UNIQUE制約の有効性
+2. 整合性エンジン（inventory.core.listing_integrity）による一括検証
+   - プラットフォームにあるが出品に紐付いていない商品ID（--with-base / --remote-file 指定時）
+   - 出品済みだがプラットフォームに存在しない出品
+   - upload_queueとlistingsのステータス不整合（欠損・二重出品の恐れ等）
+   - 同一アカウント内のASIN重複
+   - SKUの衝突
+   - listingsとproductsの整合性（警告のみ）
+3. listingsの統計情報
+
+BASEの商品一覧はアカウントごとに get_all_items() で一括取得し、ローカルのデータとまとめて突き合わせます
+（商品ごとのAPI呼び出しは行いません）。
 
 実行方法:
     python inventory/scripts/verify_listings_integrity.py
+
+    # BASEの商品一覧と突き合わせ
+    python inventory/scripts/verify_listings_integrity.py --with-base
+
+    # 取得した商品一覧を保存し、2回目以降は保存したファイルで検証
+    python inventory/scripts/verify_listings_integrity.py --with-base --save-remote base_items.json
+    python inventory/scripts/verify_listings_integrity.py --remote-file base_items.json
+
+    # 修正プランを実行（確認あり。--dry-run で件数のみ表示）
+    python inventory/scripts/verify_listings_integrity.py --with-base --fix
+    python inventory/scripts/verify_listings_integrity.py --fix --actions delete_queue,cancel_queue --yes
+
+    # レポートをJSONで出力
+    python inventory/scripts/verify_listings_integrity.py --json report.json
 """
 
 import sys
-import os
+import json
 from pathlib import Path
 import io
 
@@ -23,28 +46,60 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from inventory.core.master_db import MasterDB
+from inventory.core.listing_integrity import ListingIntegrityChecker, WARNING_CLASSES
+
+
+ANOMALY_LABELS = {
+    'orphan_item_ids': 'プラットフォームにあるが出品に紐付いていない商品ID',
+    'listed_but_missing': '出品済みだがプラットフォームに存在しない出品',
+    'queue_status_mismatch': 'upload_queueとlistingsのステータス不整合',
+    'duplicate_asin': '同一アカウント内のASIN重複',
+    'sku_collisions': 'SKUの衝突',
+    'missing_product': 'productsに対応するレコードがないlistings',
+}
 
+SAMPLE_SIZE = 5
 
-def verify_listings_integrity():
+
+def fetch_base_items(account_ids=None):
     """
-    listingsのデータ整合性を検証
+    BASEの商品一覧をアカウントごとに一括取得
 
     Returns:
-        bool: 全てのチェックが成功した場合True
+        dict: {アカウントID: 商品リスト}（取得に失敗したアカウントは含まない）
     """
-    print("=" * 70)
-    print("Issue #013: listingsデータ整合性検証")
-    print("=" * 70)
-    print()
-
-    db = MasterDB()
-    all_checks_passed = True
+    from platforms.base.core.api_client import BaseAPIClient
+    from platforms.base.accounts.manager import AccountManager
+
+    account_manager = AccountManager()
+    if not account_ids:
+        account_ids = [acc['id'] for acc in account_manager.get_active_accounts()]
+
+    remote_items = {}
+    for account_id in account_ids:
+        print(f"  [{account_id}] BASE APIから商品一覧を取得中...")
+        try:
+            client = BaseAPIClient(account_id=account_id, account_manager=account_manager)
+            items = client.get_all_items()
+        except Exception as e:
+            print(f"    ❌ 取得に失敗しました（このアカウントは突き合わせ対象外）: {e}")
+            continue
+        remote_items[account_id] = [
+            {'item_id': item.get('item_id'), 'identifier': item.get('identifier')}
+            for item in items
+        ]
+        print(f"    取得完了: {len(items)}件")
+    return remote_items
+
+
+def check_unique_indexes(db: MasterDB):
+    """
+    UNIQUE制約の確認
 
+    Returns:
+        tuple: (期待される制約があるか, 古い制約が残っているか)
+    """
     with db.get_connection() as conn:
-        # チェック1: UNIQUE制約の確認
-        print("[チェック1/5] UNIQUE制約の確認")
-        print("-" * 70)
-
         cursor = conn.execute("""
             SELECT name, sql
             FROM sqlite_master
@@ -70,7 +125,6 @@ def verify_listings_integrity():
             print(f"  ✓ 期待されるUNIQUE制約が存在します: {expected_index}")
         else:
             print(f"  ❌ 期待されるUNIQUE制約が見つかりません: {expected_index}")
-            all_checks_passed = False
 
         # 旧制約の確認
         old_index = 'idx_listings_asin_platform_unique'
@@ -81,146 +135,62 @@ def verify_listings_integrity():
               AND tbl_name='listings'
               AND name = ?
         """, (old_index,))
-        old_index_exists = cursor.fetchone()
+        old_index_exists = cursor.fetchone() is not None
 
         if old_index_exists:
             print(f"  ⚠️  警告: 古いUNIQUE制約がまだ存在します: {old_index}")
-            all_checks_passed = False
         else:
             print(f"  ✓ 古いUNIQUE制約は削除されています: {old_index}")
 
-        print()
+    return has_expected_index, old_index_exists
 
-        # チェック2: listingsの重複チェック
-        print("[チェック2/5] listingsの重複チェック")
-        print("-" * 70)
 
-        cursor = conn.execute("""
-            SELECT asin, platform, account_id, COUNT(*) as count
-            FROM listings
-            GROUP BY asin, platform, account_id
-            HAVING COUNT(*) > 1
-        """)
-        duplicates = cursor.fetchall()
-
-        print(f"  重複レコード数: {len(duplicates)}件")
-
-        if len(duplicates) == 0:
-            print("  ✓ 重複レコードはありません")
-        else:
-            print("  ❌ 重複レコードが見つかりました:")
-            for asin, platform, account_id, count in duplicates[:10]:
-                print(f"    - {asin} ({platform}, {account_id}): {count}件")
-            if len(duplicates) > 10:
-                print(f"    ... 他 {len(duplicates) - 10}件")
-            all_checks_passed = False
-
-        print()
-
-        # チェック3: upload_queueとlistingsの整合性チェック
-        print("[チェック3/5] upload_queueとlistingsの整合性チェック")
-        print("-" * 70)
-
-        # account_1で欠損しているASIN
-        cursor = conn.execute("""
-            SELECT COUNT(DISTINCT q.asin)
-            FROM upload_queue q
-            LEFT JOIN listings l ON q.asin = l.asin
-                AND q.account_id = l.account_id
-                AND q.platform = l.platform
-            WHERE q.platform = 'base'
-              AND q.account_id = 'base_account_1'
-              AND l.asin IS NULL
-        """)
-        missing_account_1 = cursor.fetchone()[0]
-
-        # account_2で欠損しているASIN
-        cursor = conn.execute("""
-            SELECT COUNT(DISTINCT q.asin)
-            FROM upload_queue q
-            LEFT JOIN listings l ON q.asin = l.asin
-                AND q.account_id = l.account_id
-                AND q.platform = l.platform
-            WHERE q.platform = 'base'
-              AND q.account_id = 'base_account_2'
-              AND l.asin IS NULL
-        """)
-        missing_account_2 = cursor.fetchone()[0]
-
-        total_missing = missing_account_1 + missing_account_2
-
-        print(f"  欠損しているlistings:")
-        print(f"    - account_1: {missing_account_1}件")
-        print(f"    - account_2: {missing_account_2}件")
-        print(f"    - 合計: {total_missing}件")
-
-        if total_missing == 0:
-            print("  ✓ upload_queueとlistingsは整合しています")
-        else:
-            print("  ❌ listingsが欠損しています")
-            all_checks_passed = False
-
-            # サンプル表示
-            if total_missing > 0:
-                print("\n  サンプル（最初の5件）:")
-                cursor = conn.execute("""
-                    SELECT DISTINCT q.asin, q.account_id
-                    FROM upload_queue q
-                    LEFT JOIN listings l ON q.asin = l.asin
-                        AND q.account_id = l.account_id
-                        AND q.platform = l.platform
-                    WHERE q.platform = 'base'
-                      AND l.asin IS NULL
-                    LIMIT 5
-                """)
-                for asin, account_id in cursor.fetchall():
-                    print(f"    - {asin} ({account_id})")
-
-        print()
-
-        # チェック4: listingsとproductsの整合性チェック
-        print("[チェック4/5] listingsとproductsの整合性チェック")
-        print("-" * 70)
-
-        cursor = conn.execute("""
-            SELECT COUNT(*)
-            FROM listings l
-            LEFT JOIN products p ON l.asin = p.asin
-            WHERE p.asin IS NULL
-        """)
-        orphaned_listings = cursor.fetchone()[0]
-
-        print(f"  孤立したlistings（productsに対応するレコードがない）: {orphaned_listings}件")
+def print_report(report):
+    """整合性エンジンの結果を表示"""
+    totals = report['totals']
+    print(f"  対象: listings {totals['listings']}件 / upload_queue {totals['queue']}件")
+    if report['remote_accounts']:
+        print(f"  突き合わせ: {', '.join(report['remote_accounts'])}（商品 {totals['remote_items']}件）")
+    else:
+        print("  突き合わせ: なし（--with-base / --remote-file 指定時のみプラットフォームと照合）")
+    for warning in report['warnings']:
+        print(f"  ⚠️  {warning}")
+    print()
 
-        if orphaned_listings == 0:
-            print("  ✓ すべてのlistingsに対応するproductsが存在します")
-        else:
-            print("  ⚠️  警告: 一部のlistingsに対応するproductsがありません")
-            # これは警告のみで、エラーとはしない（productsが削除された可能性があるため）
-
-            # サンプル表示
-            print("\n  サンプル（最初の5件）:")
-            cursor = conn.execute("""
-                SELECT l.asin, l.account_id
-                FROM listings l
-                LEFT JOIN products p ON l.asin = p.asin
-                WHERE p.asin IS NULL
-                LIMIT 5
-            """)
-            for asin, account_id in cursor.fetchall():
-                print(f"    - {asin} ({account_id})")
+    for name, label in ANOMALY_LABELS.items():
+        rows = report['anomalies'][name]
+        if not rows:
+            print(f"  ✓ {label}: 0件")
+            continue
+
+        mark = '⚠️ ' if name in WARNING_CLASSES else '❌'
+        print(f"  {mark} {label}: {len(rows)}件")
+        kinds = {}
+        for row in rows:
+            if 'kind' in row:
+                kinds[row['kind']] = kinds.get(row['kind'], 0) + 1
+        for kind, count in kinds.items():
+            print(f"      {kind}: {count}件")
+        for row in rows[:SAMPLE_SIZE]:
+            print(f"      - {json.dumps(row, ensure_ascii=False)}")
+        if len(rows) > SAMPLE_SIZE:
+            print(f"      ... 他 {len(rows) - SAMPLE_SIZE}件")
+    print()
 
-        print()
+    if report['fix_plans']:
+        print("  修正プラン:")
+        for plan in report['fix_plans']:
+            print(f"    - {plan['action']}: {len(plan['items'])}件（{plan['description']}）")
+    else:
+        print("  修正プラン: なし")
 
-        # チェック5: listingsの統計情報
-        print("[チェック5/5] listingsの統計情報")
-        print("-" * 70)
 
-        # 全体のレコード数
+def print_statistics(db: MasterDB):
+    """listingsの統計情報を表示"""
+    with db.get_connection() as conn:
         cursor = conn.execute("SELECT COUNT(*) FROM listings")
         total_listings = cursor.fetchone()[0]
 
-        # account_id別のレコード数
         cursor = conn.execute("""
             SELECT account_id, status, COUNT(*) as count
             FROM listings
@@ -229,60 +199,180 @@ def verify_listings_integrity():
         """)
         account_stats = cursor.fetchall()
 
-        print(f"  総レコード数: {total_listings}件")
-        print()
-        print("  アカウント別統計:")
+    print(f"  総レコード数: {total_listings}件")
+    print()
+    print("  アカウント別統計:")
+
+    current_account = None
+    account_total = 0
+
+    for account_id, status, count in account_stats:
+        if current_account != account_id:
+            if current_account is not None:
+                print(f"      小計: {account_total}件")
+            current_account = account_id
+            account_total = 0
+            print(f"    {account_id}:")
+
+        print(f"      - {status}: {count}件")
+        account_total += count
+
+    if current_account is not None:
+        print(f"      小計: {account_total}件")
+
+
+def verify_listings_integrity(
+    platform='base',
+    account_ids=None,
+    remote_items=None,
+    json_path=None,
+    fix=False,
+    actions=None,
+    dry_run=False,
+    yes=False,
+    db_path=None
+):
+    """
+    listingsのデータ整合性を検証
 
-        current_account = None
-        account_total = 0
+    Returns:
+        bool: 全てのチェックが成功した場合True
+    """
+    print("=" * 70)
+    print("Issue #013: listingsデータ整合性検証")
+    print("=" * 70)
+    print()
 
-        for account_id, status, count in account_stats:
-            if current_account != account_id:
-                if current_account is not None:
-                    print(f"      小計: {account_total}件")
-                current_account = account_id
-                account_total = 0
-                print(f"    {account_id}:")
+    db = MasterDB(db_path)
 
-            print(f"      - {status}: {count}件")
-            account_total += count
+    # チェック1: UNIQUE制約の確認
+    print("[チェック1/3] UNIQUE制約の確認")
+    print("-" * 70)
+    has_expected_index, old_index_exists = check_unique_indexes(db)
+    print()
 
-        if current_account is not None:
-            print(f"      小計: {account_total}件")
+    # チェック2: 整合性エンジンによる一括検証
+    print("[チェック2/3] listings / upload_queue / プラットフォームの整合性")
+    print("-" * 70)
+    checker = ListingIntegrityChecker(db)
+    report = checker.check(platform=platform, account_ids=account_ids, remote_items=remote_items)
+    print_report(report)
+    print()
 
+    if json_path:
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"  レポートを保存しました: {json_path}")
         print()
 
-        # まとめ
+    # チェック3: listingsの統計情報
+    print("[チェック3/3] listingsの統計情報")
+    print("-" * 70)
+    print_statistics(db)
+    print()
+
+    # 修正
+    if fix and report['fix_plans']:
         print("=" * 70)
-        print("検証結果まとめ")
+        print("修正プランの実行" + ("（DRY RUN）" if dry_run else ""))
         print("=" * 70)
-
-        if all_checks_passed:
-            print("✓ すべてのチェックが成功しました")
+        targets = checker.apply_fix_plans(report['fix_plans'], actions=actions, dry_run=True)
+        for action, count in targets.items():
+            print(f"  {action}: {count}件")
+
+        if not targets:
+            print("  対象の修正プランはありません")
+        elif not dry_run:
+            if not yes:
+                response = input("\n上記の修正を実行しますか？ (yes/no): ")
+                if response.lower() not in ['yes', 'y']:
+                    print("キャンセルしました")
+                    return False
+            results = checker.apply_fix_plans(report['fix_plans'], actions=actions)
             print()
-            print("Issue #013の修正は正常に完了しています。")
-        else:
-            print("❌ 一部のチェックが失敗しました")
+            for action, count in results.items():
+                print(f"  ✓ {action}: {count}件を更新しました")
+            print(f"  修正ログ: {checker.log_dir}")
+            print("  ※ 以下のまとめは修正前の検証結果です。修正後の状態は再実行して確認してください")
+        print()
+
+    # まとめ
+    all_checks_passed = has_expected_index and not old_index_exists and report['ok']
+
+    print("=" * 70)
+    print("検証結果まとめ")
+    print("=" * 70)
+
+    if all_checks_passed:
+        print("✓ すべてのチェックが成功しました")
+    else:
+        print("❌ 一部のチェックが失敗しました")
+        print()
+        print("以下の項目を確認してください:")
+        if not has_expected_index:
+            print("  - UNIQUE制約が正しく設定されていません")
+        if old_index_exists:
+            print("  - 古いUNIQUE制約が削除されていません")
+        for name, count in report['counts'].items():
+            if count and name not in WARNING_CLASSES:
+                print(f"  - {ANOMALY_LABELS[name]}: {count}件")
+
+    print("=" * 70)
+
+    return all_checks_passed
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='listingsのデータ整合性を検証')
+    parser.add_argument('--platform', default='base', help='プラットフォーム（デフォルト: base）')
+    parser.add_argument('--account-id', type=str, help='対象アカウント（カンマ区切り、省略時は全アカウント）')
+    parser.add_argument('--with-base', action='store_true', help='BASE APIから商品一覧を取得して突き合わせる')
+    parser.add_argument('--remote-file', type=str, help='保存済みの商品一覧（JSON: {アカウントID: [商品]}）で突き合わせる')
+    parser.add_argument('--save-remote', type=str, help='--with-base で取得した商品一覧をJSONに保存')
+    parser.add_argument('--json', type=str, help='レポートをJSONに保存')
+    parser.add_argument('--fix', action='store_true', help='修正プランを実行')
+    parser.add_argument('--actions', type=str, help='実行する修正（カンマ区切り、省略時はすべて）')
+    parser.add_argument('--dry-run', action='store_true', help='修正の対象件数のみ表示')
+    parser.add_argument('--yes', action='store_true', help='確認なしで修正を実行')
+    parser.add_argument('--db', type=str, help='master.db のパス（デフォルト: inventory/data/master.db）')
+
+    args = parser.parse_args()
+
+    account_ids = [a.strip() for a in args.account_id.split(',')] if args.account_id else None
+    actions = [a.strip() for a in args.actions.split(',')] if args.actions else None
+
+    remote_items = None
+    if args.remote_file:
+        with open(args.remote_file, 'r', encoding='utf-8') as f:
+            remote_items = json.load(f)
+        if account_ids:
+            remote_items = {k: v for k, v in remote_items.items() if k in account_ids}
+    elif args.with_base:
+        print("BASEの商品一覧を取得します")
+        remote_items = fetch_base_items(account_ids)
+        print()
+        if args.save_remote:
+            with open(args.save_remote, 'w', encoding='utf-8') as f:
+                json.dump(remote_items, f, ensure_ascii=False)
+            print(f"商品一覧を保存しました: {args.save_remote}")
             print()
-            print("以下の項目を確認してください:")
-            if not has_expected_index:
-                print("  - UNIQUE制約が正しく設定されていません")
-            if old_index_exists:
-                print("  - 古いUNIQUE制約が削除されていません")
-            if len(duplicates) > 0:
-                print("  - listingsに重複レコードが存在します")
-            if total_missing > 0:
-                print("  - upload_queueとlistingsの整合性が取れていません")
 
-        print("=" * 70)
+    success = verify_listings_integrity(
+        platform=args.platform,
+        account_ids=account_ids,
+        remote_items=remote_items,
+        json_path=args.json,
+        fix=args.fix or args.dry_run,
+        actions=actions,
+        dry_run=args.dry_run,
+        yes=args.yes,
+        db_path=args.db
+    )
 
-        return all_checks_passed
+    sys.exit(0 if success else 1)
 
 
 if __name__ == "__main__":
-    success = verify_listings_integrity()
-
-    if success:
-        sys.exit(0)
-    else:
-        sys.exit(1)
+    main()
@@ -5,5 +5,6 @@ APIクライアント等の基盤コンポーネント
 """
 
 from .api_client import BlastmailAPIClient, BlastmailAuthenticator
+from .message_cache import MessageResultCache
 
-__all__ = ['BlastmailAPIClient', 'BlastmailAuthenticator']
+__all__ = ['BlastmailAPIClient', 'BlastmailAuthenticator', 'MessageResultCache']
@@ -7,6 +7,8 @@ API Documentation: https://blastmail.jp/api/recent_https.html
 
 import requests
 import logging
+import threading
+from requests.adapters import HTTPAdapter
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timedelta
 
@@ -41,6 +43,8 @@ class BlastmailAuthenticator:
         self.api_key = api_key
         self._access_token: Optional[str] = None
         self._token_acquired_at: Optional[datetime] = None
+        # 並列取得時に再認証が重複しないように
+        self._lock = threading.Lock()
 
     def login(self) -> str:
         """
@@ -118,9 +122,14 @@ class BlastmailAuthenticator:
         if self._is_token_valid():
             return self._access_token
 
-        # トークンが無効または期限切れの場合は再認証
-        logger.info("トークン期限切れのため再認証")
-        return self.login()
+        with self._lock:
+            # 待機中に別スレッドが再認証済みの場合
+            if self._is_token_valid():
+                return self._access_token
+
+            # トークンが無効または期限切れの場合は再認証
+            logger.info("トークン期限切れのため再認証")
+            return self.login()
 
     def _is_token_valid(self) -> bool:
         """トークンが有効かどうかを判定"""
@@ -145,6 +154,7 @@ class BlastmailAPIClient:
     """
 
     BASE_URL = "https://api.bme.jp/rest/1.0"
+    POOL_MAXSIZE = 10  # コネクションプールの上限（並列取得数以上にする）
 
     def __init__(
         self,
@@ -172,6 +182,12 @@ class BlastmailAPIClient:
         if not access_token and not authenticator:
             raise ValueError("access_token または authenticator が必要です")
 
+        # HTTPセッション（Keep-Aliveで接続を再利用）
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.POOL_MAXSIZE)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
     @classmethod
     def from_credentials(
         cls,
@@ -263,9 +279,9 @@ class BlastmailAPIClient:
         logger.debug(f"API Request: {method} {url}")
 
         if method.upper() == 'GET':
-            response = requests.get(url, params=params, timeout=timeout)
+            response = self.session.get(url, params=params, timeout=timeout)
         elif method.upper() == 'POST':
-            response = requests.post(url, params=params, data=data, timeout=timeout)
+            response = self.session.post(url, params=params, data=data, timeout=timeout)
         else:
             raise ValueError(f"Unsupported HTTP method: {method}")
 
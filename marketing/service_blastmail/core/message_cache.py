@@ -0,0 +1,120 @@
+"""
+Blastmail 配信結果キャッシュ
+
+メッセージごとの取得結果（遷移先URL・開封数）をローカルに保存する。
+
+- 遷移先URL: 配信後にメール本文は変わらないため、一度取得すれば再取得しない
+- 開封数: 配信から final_days 日を過ぎて取得した値は確定扱いとし、再取得しない
+          （それ以内に取得した値は次回実行時に再取得する）
+
+キャッシュファイル形式（JSON）:
+    {
+        "1101": {
+            "delivery_date": "2025-12-09",
+            "urls": ["https://example.com/"],
+            "open_count": 5952,
+            "final": true,
+            "fetched_at": "2025-12-13T06:00:12"
+        },
+        ...
+    }
+"""
+
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class MessageResultCache:
+    """
+    メッセージIDをキーとした配信結果キャッシュ
+    """
+
+    def __init__(self, cache_path: Path, final_days: int = 3):
+        """
+        Args:
+            cache_path: キャッシュファイルのパス
+            final_days: 配信からこの日数を過ぎて取得した開封数を確定扱いにする
+        """
+        self.cache_path = Path(cache_path)
+        self.final_days = final_days
+        self._entries: Dict[str, Dict[str, Any]] = self._load()
+        self._dirty = False
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not self.cache_path.exists():
+            return {}
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"配信結果キャッシュの読み込みに失敗（再取得します）: {e}")
+            return {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, message_id: str) -> Optional[Dict[str, Any]]:
+        """キャッシュ済みの結果（無ければNone）"""
+        return self._entries.get(message_id)
+
+    def is_final(self, message_id: str) -> bool:
+        """再取得不要か（URL・開封数とも確定済み）"""
+        entry = self._entries.get(message_id)
+        return bool(entry and entry.get('final') and entry.get('urls') is not None)
+
+    def has_urls(self, message_id: str) -> bool:
+        """遷移先URLを取得済みか"""
+        entry = self._entries.get(message_id)
+        return bool(entry and entry.get('urls') is not None)
+
+    def put(
+        self,
+        message_id: str,
+        delivery_date: str,
+        urls: List[str],
+        open_count: int
+    ):
+        """
+        取得結果を保存
+
+        Args:
+            message_id: メッセージID
+            delivery_date: 配信日（YYYY-MM-DD）
+            urls: 遷移先URLリスト
+            open_count: 開封数
+        """
+        self._entries[message_id] = {
+            'delivery_date': delivery_date,
+            'urls': urls,
+            'open_count': open_count,
+            'final': self._is_past_final(delivery_date),
+            'fetched_at': datetime.now().strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+        self._dirty = True
+
+    def _is_past_final(self, delivery_date: str) -> bool:
+        """配信日から final_days 日を過ぎているか"""
+        try:
+            item_date = datetime.strptime(delivery_date, '%Y-%m-%d')
+        except ValueError:
+            return False
+        return item_date < datetime.now() - timedelta(days=self.final_days)
+
+    def save(self):
+        """変更があればファイルに保存"""
+        if not self._dirty:
+            return
+
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._entries, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.cache_path)
+        self._dirty = False
+        logger.debug(f"配信結果キャッシュ保存: {self.cache_path} ({len(self._entries)} 件)")
@@ -8,6 +8,7 @@ Blastmail APIから配信データを取得し、CSVレポートを生成する
 - アカウントごとに1CSVファイル
 - 実行ごとに新規配信を追記
 - 配信から3日以内のデータは更新（開封数等が変動するため）
+- メッセージ詳細・開封ログは並列取得し、確定済みの結果は data/cache にキャッシュ
 
 使用例:
     # 全アカウントのレポートを生成
@@ -31,9 +32,10 @@ import csv
 import logging
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from urllib.parse import urlparse
 
 # プロジェクトルートをパスに追加
@@ -42,10 +44,14 @@ sys.path.insert(0, str(PROJECT_ROOT))
 
 from marketing.service_blastmail.core.api_client import BlastmailAPIClient
 from marketing.service_blastmail.accounts.manager import AccountManager
+from marketing.service_blastmail.core.message_cache import MessageResultCache
 
 # 定数
 DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+CACHE_DIR = DATA_DIR / "cache"
 UPDATE_DAYS = 3  # 配信からN日以内のデータは更新対象
+DEFAULT_CONCURRENCY = 4  # メッセージ詳細・開封ログの同時取得数
+DEFAULT_METRICS_DAYS = 90  # GA/Shopifyの取得期間（--begin-date未指定時）
 
 # Google Analytics設定
 GA_CREDENTIALS_PATH = Path(__file__).resolve().parent.parent.parent / "service_google_analytics" / "hadient-customers-562d9269b575.json"
@@ -131,11 +137,14 @@ class GoogleAnalyticsClient:
         self.client = BetaAnalyticsDataClient()
         self.property_id = property_id
         self._cache: Dict[str, Dict[str, Any]] = {}
+        self._fetched_ranges: Dict[Tuple[str, str], Dict[str, Dict[str, Any]]] = {}
 
     def fetch_daily_metrics(self, start_date: str, end_date: str) -> Dict[str, Dict[str, Any]]:
         """
         日付別のメトリクスを取得
 
+        同じ期間は1回だけ取得する（複数アカウントで共有）
+
         Args:
             start_date: 開始日（YYYY-MM-DD または "30daysAgo"）
             end_date: 終了日（YYYY-MM-DD または "today"）
@@ -157,6 +166,12 @@ class GoogleAnalyticsClient:
         )
 
         logger = logging.getLogger(__name__)
+
+        range_key = (start_date, end_date)
+        if range_key in self._fetched_ranges:
+            logger.debug(f"GA4: 取得済みの期間を再利用 ({start_date} 〜 {end_date})")
+            return self._fetched_ranges[range_key]
+
         results = {}
 
         # 基本メトリクス取得
@@ -218,7 +233,8 @@ class GoogleAnalyticsClient:
         except Exception as e:
             logger.warning(f"GA4 メルマガセッション取得エラー: {e}")
 
-        self._cache = results
+        self._cache.update(results)
+        self._fetched_ranges[range_key] = results
         logger.info(f"GA4: {len(results)} 日分のデータを取得")
         return results
 
@@ -261,24 +277,42 @@ class ShopifyClient:
         self.access_token = config['access_token']
         self.shop_name = config.get('name', '')
         self._cache: Dict[str, Dict[str, Any]] = {}
-
-    def fetch_daily_orders(self, days: int = 90) -> Dict[str, Dict[str, Any]]:
+        self._fetched_ranges: Dict[Tuple[str, Optional[str]], Dict[str, Dict[str, Any]]] = {}
+
+    def fetch_daily_orders(
+        self,
+        days: int = 90,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> Dict[str, Dict[str, Any]]:
         """
         日付別の注文データを取得
 
+        同じ期間は1回だけ取得する（複数アカウントで共有）
+
         Args:
-            days: 取得する日数
+            days: 取得する日数（start_date未指定時）
+            start_date: 開始日（YYYY-MM-DD）
+            end_date: 終了日（YYYY-MM-DD、Noneの場合は現在まで）
 
         Returns:
             dict: 日付をキーとした注文データ辞書
         """
         import requests
-        from datetime import timedelta
 
         logger = logging.getLogger(__name__)
+
+        if start_date is None:
+            start_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+
+        range_key = (start_date, end_date)
+        if range_key in self._fetched_ranges:
+            logger.debug(f"Shopify: 取得済みの期間を再利用 ({start_date} 〜 {end_date or '現在'})")
+            return self._fetched_ranges[range_key]
+
         results = {}
 
-        since_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%dT00:00:00+09:00')
+        since_date = f"{start_date}T00:00:00+09:00"
 
         headers = {
             "X-Shopify-Access-Token": self.access_token,
@@ -291,8 +325,10 @@ class ShopifyClient:
             "status": "any",
             "limit": 250
         }
+        if end_date:
+            params["created_at_max"] = f"{end_date}T23:59:59+09:00"
 
-        logger.debug(f"Shopify: 注文データを取得中 (過去{days}日)")
+        logger.debug(f"Shopify: 注文データを取得中 ({start_date} 〜 {end_date or '現在'})")
 
         try:
             response = requests.get(orders_url, headers=headers, params=params, timeout=60)
@@ -330,7 +366,8 @@ class ShopifyClient:
         except Exception as e:
             logger.warning(f"Shopify データ取得エラー: {e}")
 
-        self._cache = results
+        self._cache.update(results)
+        self._fetched_ranges[range_key] = results
         return results
 
     def get_orders_for_date(self, date: str) -> Dict[str, Any]:
@@ -556,6 +593,125 @@ def save_report(
     logging.info(f"レポート保存完了: {csv_path} ({len(sorted_data)} 件)")
 
 
+def resolve_metrics_range(
+    begin_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None
+) -> Tuple[str, Optional[str]]:
+    """
+    GA/Shopifyの取得期間を決定
+
+    Args:
+        begin_date: 取得開始日（Noneの場合は DEFAULT_METRICS_DAYS 日前）
+        end_date: 取得終了日（Noneの場合は現在まで）
+
+    Returns:
+        tuple: (開始日, 終了日 or None) のYYYY-MM-DD文字列
+    """
+    if begin_date is None:
+        begin_date = datetime.now() - timedelta(days=DEFAULT_METRICS_DAYS)
+    return (
+        begin_date.strftime('%Y-%m-%d'),
+        end_date.strftime('%Y-%m-%d') if end_date else None
+    )
+
+
+def fetch_message_result(
+    client: BlastmailAPIClient,
+    message_id: str,
+    cached_urls: Optional[List[str]] = None
+) -> Tuple[List[str], int]:
+    """
+    メッセージの遷移先URLと開封数を取得（ワーカースレッドで実行）
+
+    Args:
+        client: BlastmailAPIClient
+        message_id: メッセージID
+        cached_urls: キャッシュ済みの遷移先URL（指定時は詳細取得を省略）
+
+    Returns:
+        tuple: (遷移先URLリスト, 開封数)
+    """
+    if cached_urls is not None:
+        urls = cached_urls
+    else:
+        # メッセージ詳細を取得（遷移先URL抽出用）
+        detail = client.get_message_detail(message_id)
+        urls = extract_urls_from_content(detail.get('textPart', ''), detail.get('htmlPart', ''))
+
+    # 開封ログを取得
+    open_log = client.export_open_log(message_id)
+    return urls, count_opens_from_log(open_log)
+
+
+def build_record(
+    item: Dict[str, Any],
+    message_id: str,
+    delivery_date: str,
+    delivery_time: str,
+    urls: List[str],
+    open_count: int,
+    ga_client: Optional['GoogleAnalyticsClient'] = None,
+    shopify_client: Optional['ShopifyClient'] = None
+) -> Dict[str, Any]:
+    """
+    CSVレコードを作成
+
+    Args:
+        item: 配信履歴の1件
+        message_id: メッセージID
+        delivery_date: 配信日（YYYY-MM-DD）
+        delivery_time: 配信時間
+        urls: 遷移先URLリスト
+        open_count: 開封数
+        ga_client: GoogleAnalyticsClient（GA連携時）
+        shopify_client: ShopifyClient（Shopify連携時）
+
+    Returns:
+        dict: CSVレコード
+    """
+    # 数値データ
+    total = int(item.get('total', 0))
+    success = int(item.get('success', 0))
+    failure = int(item.get('failure', 0))
+
+    # 計算項目
+    error_rate = round((failure / total * 100), 2) if total > 0 else 0
+    open_rate = round((open_count / success * 100), 2) if success > 0 else 0
+
+    record = {
+        'message_id': message_id,
+        'delivery_date': delivery_date,
+        'delivery_time': delivery_time,
+        'subject': item.get('subject', ''),
+        'total': total,
+        'success': success,
+        'failure': failure,
+        'open_count': open_count,
+        'error_rate': error_rate,
+        'open_rate': open_rate,
+        'destination_urls': ';'.join(urls),
+        'updated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+    }
+
+    # GA4データを追加（有効時）
+    if ga_client:
+        ga_metrics = ga_client.get_metrics_for_date(delivery_date)
+        record['ga_pageviews'] = ga_metrics['pageviews']
+        record['ga_sessions'] = ga_metrics['sessions']
+        record['ga_purchases'] = ga_metrics['purchases']
+        record['ga_revenue'] = round(ga_metrics['revenue'], 2)
+        record['ga_mail_sessions'] = ga_metrics['mail_sessions']
+
+    # Shopifyデータを追加（有効時）
+    if shopify_client:
+        shopify_data = shopify_client.get_orders_for_date(delivery_date)
+        record['shopify_orders'] = shopify_data['orders']
+        record['shopify_revenue'] = round(shopify_data['revenue'], 2)
+        record['shopify_products'] = ';'.join(shopify_data['products'])
+
+    return record
+
+
 def generate_report_for_account(
     client: BlastmailAPIClient,
     account_id: str,
@@ -564,11 +720,17 @@ def generate_report_for_account(
     dry_run: bool = False,
     logger: logging.Logger = None,
     ga_client: Optional['GoogleAnalyticsClient'] = None,
-    shopify_client: Optional['ShopifyClient'] = None
+    shopify_client: Optional['ShopifyClient'] = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    use_cache: bool = True
 ) -> Dict[str, Any]:
     """
     単一アカウントのレポートを生成
 
+    メッセージ詳細・開封ログは concurrency 件ずつ並列に取得する。
+    確定済み（配信から UPDATE_DAYS 日経過後に取得済み）のメッセージは
+    キャッシュの結果を使い、APIを呼ばない。
+
     Args:
         client: BlastmailAPIClient
         account_id: アカウントID
@@ -578,12 +740,14 @@ def generate_report_for_account(
         logger: ロガー
         ga_client: GoogleAnalyticsClient（GA連携時）
         shopify_client: ShopifyClient（Shopify連携時）
+        concurrency: 同時取得数
+        use_cache: Falseの場合はキャッシュを使わず全件再取得（結果は保存する）
 
     Returns:
         dict: 処理結果の統計情報
     """
     logger = logger or logging.getLogger(__name__)
-    stats = {'new': 0, 'updated': 0, 'skipped': 0, 'errors': 0}
+    stats = {'new': 0, 'updated': 0, 'skipped': 0, 'cached': 0, 'errors': 0}
     with_ga = ga_client is not None
     with_shopify = shopify_client is not None
 
@@ -594,6 +758,10 @@ def generate_report_for_account(
     existing_data = load_existing_report(csv_path)
     logger.info(f"既存レコード数: {len(existing_data)}")
 
+    # 配信結果キャッシュ
+    cache = MessageResultCache(CACHE_DIR / f"message_results_{account_id}.json", final_days=UPDATE_DAYS)
+    logger.info(f"キャッシュ済みメッセージ: {len(cache)} 件")
+
     # 更新対象の日付閾値（N日前）
     update_threshold = datetime.now() - timedelta(days=UPDATE_DAYS)
 
@@ -605,7 +773,8 @@ def generate_report_for_account(
     )
     logger.info(f"取得した配信履歴: {len(history_items)} 件")
 
-    # 各配信のデータを処理
+    # 処理対象を決定（message_id -> (item, 配信日, 配信時間, 既存か)）
+    targets: Dict[str, Tuple[Dict[str, Any], str, str, bool]] = {}
     for item in history_items:
         message_id = str(item.get('messageID', ''))
         if not message_id:
@@ -617,14 +786,12 @@ def generate_report_for_account(
 
         # 更新判定
         is_existing = message_id in existing_data
-        should_update = False
 
         if is_existing:
             # 既存レコード: N日以内なら更新
             try:
                 item_date = datetime.strptime(delivery_date, '%Y-%m-%d')
                 if item_date >= update_threshold:
-                    should_update = True
                     logger.debug(f"更新対象: {message_id} (配信日: {delivery_date})")
                 else:
                     stats['skipped'] += 1
@@ -632,77 +799,64 @@ def generate_report_for_account(
             except ValueError:
                 stats['skipped'] += 1
                 continue
-        else:
-            should_update = True  # 新規は常に追加
-
-        try:
-            # メッセージ詳細を取得（遷移先URL抽出用）
-            detail = client.get_message_detail(message_id)
-            text_part = detail.get('textPart', '')
-            html_part = detail.get('htmlPart', '')
-            urls = extract_urls_from_content(text_part, html_part)
-
-            # 開封ログを取得
-            open_log = client.export_open_log(message_id)
-            open_count = count_opens_from_log(open_log)
-
-            # 数値データ
-            total = int(item.get('total', 0))
-            success = int(item.get('success', 0))
-            failure = int(item.get('failure', 0))
-
-            # 計算項目
-            error_rate = round((failure / total * 100), 2) if total > 0 else 0
-            open_rate = round((open_count / success * 100), 2) if success > 0 else 0
-
-            # レコード作成
-            record = {
-                'message_id': message_id,
-                'delivery_date': delivery_date,
-                'delivery_time': delivery_time,
-                'subject': item.get('subject', ''),
-                'total': total,
-                'success': success,
-                'failure': failure,
-                'open_count': open_count,
-                'error_rate': error_rate,
-                'open_rate': open_rate,
-                'destination_urls': ';'.join(urls),
-                'updated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            }
 
-            # GA4データを追加（有効時）
-            if with_ga and ga_client:
-                ga_metrics = ga_client.get_metrics_for_date(delivery_date)
-                record['ga_pageviews'] = ga_metrics['pageviews']
-                record['ga_sessions'] = ga_metrics['sessions']
-                record['ga_purchases'] = ga_metrics['purchases']
-                record['ga_revenue'] = round(ga_metrics['revenue'], 2)
-                record['ga_mail_sessions'] = ga_metrics['mail_sessions']
-
-            # Shopifyデータを追加（有効時）
-            if with_shopify and shopify_client:
-                shopify_data = shopify_client.get_orders_for_date(delivery_date)
-                record['shopify_orders'] = shopify_data['orders']
-                record['shopify_revenue'] = round(shopify_data['revenue'], 2)
-                record['shopify_products'] = ';'.join(shopify_data['products'])
-
-            existing_data[message_id] = record
-
-            if is_existing:
-                stats['updated'] += 1
-                logger.debug(f"更新: {message_id} - {item.get('subject', '')[:30]}")
-            else:
-                stats['new'] += 1
-                logger.debug(f"新規: {message_id} - {item.get('subject', '')[:30]}")
+        # 新規は常に追加
+        targets[message_id] = (item, delivery_date, delivery_time, is_existing)
 
+    def apply_result(message_id: str, urls: List[str], open_count: int):
+        item, delivery_date, delivery_time, is_existing = targets[message_id]
+        try:
+            existing_data[message_id] = build_record(
+                item, message_id, delivery_date, delivery_time, urls, open_count,
+                ga_client=ga_client, shopify_client=shopify_client
+            )
         except Exception as e:
             stats['errors'] += 1
             logger.warning(f"メッセージ {message_id} の処理でエラー: {e}")
+            return
+
+        if is_existing:
+            stats['updated'] += 1
+            logger.debug(f"更新: {message_id} - {item.get('subject', '')[:30]}")
+        else:
+            stats['new'] += 1
+            logger.debug(f"新規: {message_id} - {item.get('subject', '')[:30]}")
+
+    # 確定済みはキャッシュから反映、それ以外は並列取得
+    to_fetch = []
+    for message_id in targets:
+        if use_cache and cache.is_final(message_id):
+            entry = cache.get(message_id)
+            apply_result(message_id, entry['urls'], entry['open_count'])
+            stats['cached'] += 1
+        else:
+            cached_urls = cache.get(message_id)['urls'] if use_cache and cache.has_urls(message_id) else None
+            to_fetch.append((message_id, cached_urls))
+
+    if to_fetch:
+        logger.info(f"メッセージ詳細・開封ログを取得中: {len(to_fetch)} 件（同時 {concurrency} 件）")
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            futures = {
+                executor.submit(fetch_message_result, client, message_id, cached_urls): message_id
+                for message_id, cached_urls in to_fetch
+            }
+            for future in as_completed(futures):
+                message_id = futures[future]
+                try:
+                    urls, open_count = future.result()
+                except Exception as e:
+                    stats['errors'] += 1
+                    logger.warning(f"メッセージ {message_id} の処理でエラー: {e}")
+                    continue
+
+                cache.put(message_id, targets[message_id][1], urls, open_count)
+                apply_result(message_id, urls, open_count)
 
     # 保存（GA連携有無でカラムを切り替え）
     columns = get_csv_columns(with_ga=with_ga, with_shopify=with_shopify)
     save_report(csv_path, existing_data, dry_run=dry_run, columns=columns)
+    if not dry_run:
+        cache.save()
 
     return stats
 
@@ -764,6 +918,19 @@ def main():
         help='Shopify連携を有効化（日付別注文数/売上/商品を追加）'
     )
 
+    # 取得オプション
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f'メッセージ詳細・開封ログの同時取得数（デフォルト: {DEFAULT_CONCURRENCY}）'
+    )
+    parser.add_argument(
+        '--refresh-cache',
+        action='store_true',
+        help='配信結果キャッシュを使わずに全件再取得'
+    )
+
     # 実行オプション
     parser.add_argument(
         '--dry-run',
@@ -814,6 +981,9 @@ def main():
             logger.error("処理対象のアカウントがありません")
             return 1
 
+        # GA/Shopifyの取得期間（全アカウントで共有）
+        metrics_start, metrics_end = resolve_metrics_range(begin_date, end_date)
+
         # Google Analytics クライアント初期化（オプション）
         ga_client = None
         if args.with_ga:
@@ -821,8 +991,8 @@ def main():
                 logger.info("Google Analytics連携を初期化中...")
                 try:
                     ga_client = GoogleAnalyticsClient(GA_CREDENTIALS_PATH, GA_PROPERTY_ID)
-                    # 90日分のデータを事前取得してキャッシュ
-                    ga_client.fetch_daily_metrics("90daysAgo", "today")
+                    # 対象期間のデータを事前取得してキャッシュ
+                    ga_client.fetch_daily_metrics(metrics_start, metrics_end or "today")
                 except Exception as e:
                     logger.warning(f"GA4初期化エラー（GA連携なしで続行）: {e}")
                     ga_client = None
@@ -837,8 +1007,8 @@ def main():
                 logger.info("Shopify連携を初期化中...")
                 try:
                     shopify_client = ShopifyClient(SHOPIFY_CONFIG_PATH)
-                    # 90日分の注文データを事前取得してキャッシュ
-                    shopify_client.fetch_daily_orders(days=90)
+                    # 対象期間の注文データを事前取得してキャッシュ
+                    shopify_client.fetch_daily_orders(start_date=metrics_start, end_date=metrics_end)
                 except Exception as e:
                     logger.warning(f"Shopify初期化エラー（Shopify連携なしで続行）: {e}")
                     shopify_client = None
@@ -847,7 +1017,7 @@ def main():
                 logger.warning("Shopify連携なしで続行します")
 
         # 各アカウントを処理
-        total_stats = {'new': 0, 'updated': 0, 'skipped': 0, 'errors': 0}
+        total_stats = {'new': 0, 'updated': 0, 'skipped': 0, 'cached': 0, 'errors': 0}
 
         for account in accounts:
             account_id = account['id']
@@ -869,12 +1039,15 @@ def main():
                     dry_run=args.dry_run,
                     logger=logger,
                     ga_client=ga_client,
-                    shopify_client=shopify_client
+                    shopify_client=shopify_client,
+                    concurrency=args.concurrency,
+                    use_cache=not args.refresh_cache
                 )
 
                 # 統計表示
                 logger.info(f"処理結果: 新規={stats['new']}, 更新={stats['updated']}, "
-                           f"スキップ={stats['skipped']}, エラー={stats['errors']}")
+                           f"スキップ={stats['skipped']}, キャッシュ利用={stats['cached']}, "
+                           f"エラー={stats['errors']}")
 
                 for key in total_stats:
                     total_stats[key] += stats[key]
@@ -890,7 +1063,8 @@ def main():
             logger.info("全体統計")
             logger.info(f"{'='*60}")
             logger.info(f"新規: {total_stats['new']}, 更新: {total_stats['updated']}, "
-                       f"スキップ: {total_stats['skipped']}, エラー: {total_stats['errors']}")
+                       f"スキップ: {total_stats['skipped']}, キャッシュ利用: {total_stats['cached']}, "
+                       f"エラー: {total_stats['errors']}")
 
         return 0
 
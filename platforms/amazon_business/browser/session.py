@@ -21,6 +21,8 @@ import sys
 sys.path.append(str(Path(__file__).parent.parent.parent.parent))
 
 from common.browser import ProfileManager
+from common.browser.context_pool import attach_pooled_context
+from common.browser.request_filter import RequestFilter
 
 
 class AmazonBusinessSession:
@@ -39,6 +41,11 @@ class AmazonBusinessSession:
         self.platform = "amazon_business"
         self.profile_manager = ProfileManager()
 
+        # 常駐プールに接続中かどうか（close_browser で使用）
+        self._pooled = False
+        self._pooled_pages = []
+        self.request_filter: Optional[RequestFilter] = None
+
         # アカウント設定を読み込む
         self.config = self._load_account_config()
 
@@ -79,14 +86,23 @@ class AmazonBusinessSession:
     async def launch_browser(
         self,
         headless: bool = False,
-        viewport: Optional[dict] = None
+        viewport: Optional[dict] = None,
+        use_pool: bool = True,
+        block_resources: bool = False
     ) -> Tuple[Playwright, BrowserContext, Page]:
         """
         ブラウザを起動
 
+        常駐プール（common/browser/context_pool.py）が起動済みの場合は、
+        Chromiumを起動せずにウォームなコンテキストへ接続する。
+        終了時は close_browser() を使用すること。
+
         Args:
             headless: ヘッドレスモード（デフォルト: False）
             viewport: ビューポートサイズ（デフォルト: 1920x1080）
+            use_pool: 常駐プールへの接続を試みる（デフォルト: True）
+            block_resources: 画像・フォント・解析タグ等を遮断する（config/request_filter_profiles.json、
+                             デフォルト: False。画像が不要なタスクで有効にする）
 
         Returns:
             tuple: (playwright, context, page)
@@ -94,6 +110,24 @@ class AmazonBusinessSession:
         if viewport is None:
             viewport = {"width": 1920, "height": 1080}
 
+        # Playwrightを起動
+        playwright = await async_playwright().start()
+
+        self.request_filter = RequestFilter.for_platform(self.platform) if block_resources else None
+
+        # 常駐プールに接続（プロファイルは常駐プロセスが使用中のため、新しいタブで作業する）
+        if use_pool:
+            context = await attach_pooled_context(playwright, self.platform, self.account_id)
+            if context is not None:
+                self._pooled = True
+                print("[OK] 常駐ブラウザに接続しました")
+                print()
+                page = await context.new_page()
+                self._pooled_pages = [page]
+                if self.request_filter:
+                    await self.request_filter.install(page)
+                return playwright, context, page
+
         # プロファイルディレクトリを作成（存在しない場合）
         profile_path = self.profile_manager.create_profile(
             self.platform,
@@ -104,9 +138,6 @@ class AmazonBusinessSession:
         print(f"プロファイル存在: {self.profile_exists()}")
         print()
 
-        # Playwrightを起動
-        playwright = await async_playwright().start()
-
         # launch_persistent_context でChromeプロファイルを永続化
         context = await playwright.chromium.launch_persistent_context(
             user_data_dir=str(profile_path),
@@ -123,6 +154,9 @@ class AmazonBusinessSession:
             ignore_default_args=["--enable-automation"],
         )
 
+        if self.request_filter:
+            await self.request_filter.install(context)
+
         # 保存されたCookieを読み込む（プロファイルが既存の場合）
         if self.profile_exists():
             await self._load_cookies(context, profile_path)
@@ -130,8 +164,30 @@ class AmazonBusinessSession:
         # ページを取得（既存ページがあればそれを使用）
         page = context.pages[0] if context.pages else await context.new_page()
 
+        self._pooled = False
         return playwright, context, page
 
+    async def close_browser(self, playwright: Playwright, context: BrowserContext):
+        """
+        ブラウザを終了
+
+        常駐プールに接続している場合は、作業用のタブを閉じて接続のみ切断する
+        （常駐ブラウザ・コンテキストは終了しない）。
+        リクエスト遮断を有効にしていた場合は、遮断統計を記録する。
+        """
+        if self.request_filter:
+            self.request_filter.record()
+
+        if self._pooled:
+            for page in self._pooled_pages:
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+        else:
+            await context.close()
+        await playwright.stop()
+
     async def check_login_status(self, page: Page) -> bool:
         """
         ログイン状態を確認
@@ -265,7 +321,8 @@ class AmazonBusinessSession:
         print(f"アカウント名: {self.config['name']}")
         print()
 
-        playwright, context, page = await self.launch_browser(headless=headless)
+        # 手動ログインではログイン画面の画像・スクリプトが必要なため遮断しない
+        playwright, context, page = await self.launch_browser(headless=headless, block_resources=False)
 
         try:
             # ログインページにアクセス
@@ -352,12 +409,12 @@ class AmazonBusinessSession:
             return False
 
         finally:
-            await context.close()
-            await playwright.stop()
+            await self.close_browser(playwright, context)
 
     async def get_authenticated_context(
         self,
-        headless: bool = False
+        headless: bool = False,
+        block_resources: bool = False
     ) -> Optional[Tuple[Playwright, BrowserContext, Page]]:
         """
         認証済みコンテキストを取得
@@ -367,6 +424,7 @@ class AmazonBusinessSession:
 
         Args:
             headless: ヘッドレスモード
+            block_resources: 画像・フォント・解析タグ等を遮断する（launch_browser() と同じ）
 
         Returns:
             tuple: (playwright, context, page) または None
@@ -387,7 +445,10 @@ class AmazonBusinessSession:
         print()
 
         # ブラウザを起動（プロファイルから自動復元）
-        playwright, context, page = await self.launch_browser(headless=headless)
+        playwright, context, page = await self.launch_browser(
+            headless=headless,
+            block_resources=block_resources
+        )
 
         # ログイン状態を確認
         print("ログイン状態を確認中...")
@@ -403,7 +464,6 @@ class AmazonBusinessSession:
             print()
 
             # クリーンアップ
-            await context.close()
-            await playwright.stop()
+            await self.close_browser(playwright, context)
 
             return None
@@ -74,6 +74,12 @@ async def main():
         action="store_true",
         help="ヘッドレスモードで実行"
     )
+    parser.add_argument(
+        "--no-block-resources",
+        dest="block_resources",
+        action="store_false",
+        help="画像・フォント・解析タグ等の遮断を無効にする（デフォルト: 遮断する）"
+    )
     parser.add_argument(
         "--max-attempts",
         type=int,
@@ -99,7 +105,11 @@ async def main():
     session = AmazonBusinessSession(account_id="amazon_business_main")
 
     # 認証済みコンテキストを取得
-    result = await session.get_authenticated_context(headless=args.headless)
+    # 住所録の操作に画像等は不要なため、リクエストフィルタを有効にする
+    result = await session.get_authenticated_context(
+        headless=args.headless,
+        block_resources=args.block_resources
+    )
 
     if result is None:
         print()
@@ -159,8 +169,7 @@ async def main():
 
     finally:
         # クリーンアップ
-        await context.close()
-        await playwright.stop()
+        await session.close_browser(playwright, context)
 
 
 if __name__ == "__main__":
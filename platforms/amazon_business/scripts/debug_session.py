@@ -85,8 +85,7 @@ async def main():
         await asyncio.sleep(30)
 
     finally:
-        await context.close()
-        await playwright.stop()
+        await session.close_browser(playwright, context)
 
 
 if __name__ == "__main__":
@@ -5,6 +5,7 @@ BASE APIを操作するクライアントクラス（プロキシ対応版）
 """
 
 import requests
+import threading
 import time
 import logging
 from typing import Dict, Any, Optional, TYPE_CHECKING
@@ -18,6 +19,8 @@ if TYPE_CHECKING:
 # common/proxy をインポート可能にする
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent))
 from common.proxy.proxy_manager import ProxyManager
+from shared.utils.metrics import track, caller_name
+from shared.utils.api_endpoints import get_endpoint
 
 # ロガー取得
 logger = logging.getLogger(__name__)
@@ -58,6 +61,10 @@ class BaseAPIClient:
         self.account_id = account_id
         self.account_manager = account_manager
         self.access_token = access_token
+        # 接続先（BASE_API_URL / ECAUTO_MOCK_API_URL でモックサーバー等に差し替え可能）
+        self.BASE_URL = get_endpoint('base', self.BASE_URL)
+        # 並列リクエスト時にトークン更新が重複しないように
+        self._token_lock = threading.Lock()
 
         # プロキシ設定の初期化
         self.proxies = None
@@ -107,16 +114,17 @@ class BaseAPIClient:
             # 自動更新が無効の場合はスキップ
             return True
 
-        # トークンを自動更新（必要な場合のみ）
-        token_data = self.account_manager.get_token_with_auto_refresh(self.account_id)
-        if not token_data:
-            return False
+        with self._token_lock:
+            # トークンを自動更新（必要な場合のみ）
+            token_data = self.account_manager.get_token_with_auto_refresh(self.account_id)
+            if not token_data:
+                return False
 
-        # アクセストークンとヘッダーを更新
-        new_access_token = token_data['access_token']
-        if new_access_token != self.access_token:
-            self.access_token = new_access_token
-            self.headers['Authorization'] = f'Bearer {new_access_token}'
+            # アクセストークンとヘッダーを更新
+            new_access_token = token_data['access_token']
+            if new_access_token != self.access_token:
+                self.access_token = new_access_token
+                self.headers['Authorization'] = f'Bearer {new_access_token}'
 
         return True
 
@@ -159,7 +167,11 @@ class BaseAPIClient:
         if self.proxies:
             kwargs['proxies'] = self.proxies
 
-        return requests.request(method, url, **kwargs)
+        # 呼び出し元のメソッド名を操作名として計測
+        with track('base', caller_name(), self.account_id) as call:
+            response = requests.request(method, url, **kwargs)
+            call.set_status(response.status_code)
+        return response
 
     def create_item(self, item_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -336,6 +348,68 @@ class BaseAPIClient:
 
         return response.json()
 
+    def get_orders(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        start_ordered: Optional[str] = None,
+        end_ordered: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        注文一覧を取得（read_ordersスコープが必要）
+
+        Args:
+            limit: 取得件数（最大100）
+            offset: オフセット
+            start_ordered: 注文日の開始（yyyy-mm-dd形式）
+            end_ordered: 注文日の終了（yyyy-mm-dd形式）
+
+        Returns:
+            dict: API応答データ
+
+        Raises:
+            requests.exceptions.HTTPError: API呼び出しエラー
+        """
+        # トークン自動更新チェック
+        self._refresh_token_if_needed()
+
+        url = f"{self.BASE_URL}/orders"
+
+        params = {'limit': limit, 'offset': offset}
+        if start_ordered:
+            params['start_ordered'] = start_ordered
+        if end_ordered:
+            params['end_ordered'] = end_ordered
+
+        response = self._request('GET', url, params=params)
+        response.raise_for_status()
+
+        return response.json()
+
+    def get_order_detail(self, unique_key: str) -> Dict[str, Any]:
+        """
+        注文詳細を取得（read_ordersスコープが必要）
+
+        Args:
+            unique_key: 注文のunique_key
+
+        Returns:
+            dict: API応答データ
+
+        Raises:
+            requests.exceptions.HTTPError: API呼び出しエラー
+        """
+        # トークン自動更新チェック
+        self._refresh_token_if_needed()
+
+        # 公式API仕様: GET /1/orders/detail/:unique_key
+        url = f"{self.BASE_URL}/orders/detail/{unique_key}"
+
+        response = self._request('GET', url)
+        response.raise_for_status()
+
+        return response.json()
+
     def delete_item(self, item_id: str) -> Dict[str, Any]:
         """
         商品を削除
@@ -9,6 +9,8 @@ import time
 from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
 
+from shared.utils.api_endpoints import get_override
+
 
 class BaseOAuthClient:
     """
@@ -30,6 +32,11 @@ class BaseOAuthClient:
         self.client_secret = client_secret
         self.redirect_uri = redirect_uri
 
+        # トークンエンドポイントの差し替え（BASE_API_URL / ECAUTO_MOCK_API_URL）
+        base_url = get_override('base')
+        if base_url:
+            self.TOKEN_URL = f"{base_url}/oauth/token"
+
     def get_authorization_url(self, state: str = None) -> str:
         """
         認証URLを生成
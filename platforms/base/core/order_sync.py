@@ -0,0 +1,262 @@
+"""
+BASE注文の差分同期
+
+BASE APIの注文を master.db の orders / order_items テーブルに同期する。
+
+- アカウントごとに同期済み範囲（synced_from）と最大注文日時（high_water_mark）を記録
+- 2回目以降は high_water_mark の REVISIT_DAYS 日前から注文一覧を取得し、
+  新規注文と、modified / dispatch_status が変わった注文のみ詳細を取得
+- 注文詳細は複数スレッドで並列取得（RequestQuota で1時間あたりの上限と最小間隔を守る）
+
+販売済み・在庫0の商品は MasterDB.get_sold_items_with_zero_stock() で
+ローカルの結合により求める（商品カタログの全件取得は不要）。
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PLATFORM = 'base'
+
+
+class RequestQuota:
+    """
+    リクエスト数の制御（スレッドセーフ）
+
+    直近1時間のリクエスト数が hourly_limit を超えないように、
+    また連続するリクエストの間隔が min_interval 秒以上になるように待機する。
+    """
+
+    def __init__(self, hourly_limit: int = 1000, min_interval: float = 0.1):
+        """
+        Args:
+            hourly_limit: 1時間あたりの上限
+            min_interval: リクエスト間の最小間隔（秒）
+        """
+        self.hourly_limit = hourly_limit
+        self.min_interval = min_interval
+        self._timestamps = deque()
+        self._last = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """リクエスト可能になるまで待機"""
+        with self._lock:
+            while True:
+                now = time.monotonic()
+                while self._timestamps and self._timestamps[0] <= now - 3600:
+                    self._timestamps.popleft()
+
+                wait = self._last + self.min_interval - now
+                if len(self._timestamps) >= self.hourly_limit:
+                    wait = max(wait, self._timestamps[0] + 3600 - now)
+
+                if wait <= 0:
+                    break
+                time.sleep(wait)
+
+            self._timestamps.append(now)
+            self._last = now
+
+
+class OrderSync:
+    """
+    BASE注文の差分同期クラス（1アカウント = 1インスタンス）
+    """
+
+    PAGE_SIZE = 100            # 注文一覧の1ページの件数（API上限）
+    REVISIT_DAYS = 14          # ステータス変更を拾うために遡る日数
+    DEFAULT_WORKERS = 4        # 注文詳細の並列取得数
+    DEFAULT_HOURLY_QUOTA = 1000  # BASE APIの上限（5000req/h）のうち本同期で使う分
+    SAVE_BATCH_SIZE = 100      # 注文の保存単位
+
+    def __init__(
+        self,
+        account_id: str,
+        client,
+        master_db,
+        workers: int = DEFAULT_WORKERS,
+        quota: Optional[RequestQuota] = None
+    ):
+        """
+        Args:
+            account_id: アカウントID
+            client: BaseAPIClient
+            master_db: MasterDB
+            workers: 注文詳細の並列取得数
+            quota: RequestQuota（省略時は DEFAULT_HOURLY_QUOTA で作成）
+        """
+        self.account_id = account_id
+        self.client = client
+        self.master_db = master_db
+        self.workers = max(1, workers)
+        self.quota = quota or RequestQuota(hourly_limit=self.DEFAULT_HOURLY_QUOTA)
+
+    def sync(self, days: int = 30, full: bool = False) -> Dict[str, Any]:
+        """
+        注文を差分同期
+
+        Args:
+            days: 最低限同期しておく日数（同期済み範囲より古い場合は遡って取得）
+            full: Trueの場合は days 日前から全注文の詳細を取得し直す
+
+        Returns:
+            dict: {'start_date', 'listed', 'new', 'changed', 'unchanged', 'saved', 'errors'}
+        """
+        requested_from = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+        state = self.master_db.get_order_sync_state(PLATFORM, self.account_id)
+
+        # 取得開始日を決定
+        if full or not state or not state.get('synced_from'):
+            start_date = requested_from
+        elif requested_from < state['synced_from']:
+            # 同期済み範囲より前が必要な場合は遡って取得
+            start_date = requested_from
+        elif state.get('high_water_mark'):
+            revisit_from = datetime.fromtimestamp(state['high_water_mark']) - timedelta(days=self.REVISIT_DAYS)
+            start_date = max(revisit_from.strftime('%Y-%m-%d'), state['synced_from'])
+        else:
+            start_date = state['synced_from']
+
+        stats = {
+            'start_date': start_date,
+            'listed': 0, 'new': 0, 'changed': 0, 'unchanged': 0, 'saved': 0, 'errors': 0,
+        }
+
+        logger.info(f"[{self.account_id}] 注文一覧を取得中（{start_date} 〜）")
+        try:
+            listed = self._list_orders(start_date)
+        except Exception as e:
+            logger.error(f"[{self.account_id}] 注文一覧の取得に失敗しました: {e}")
+            stats['errors'] += 1
+            return stats
+        stats['listed'] = len(listed)
+
+        # 変更検知
+        start_ts = int(datetime.strptime(start_date, '%Y-%m-%d').timestamp())
+        known = {} if full else self.master_db.get_order_versions(PLATFORM, self.account_id, since_ts=start_ts)
+        targets = []
+        for order in listed:
+            order_key = order.get('unique_key')
+            if not order_key:
+                continue
+            version = known.get(order_key)
+            if version is None:
+                stats['new'] += 1
+            elif version != (order.get('modified'), order.get('dispatch_status')):
+                stats['changed'] += 1
+            else:
+                stats['unchanged'] += 1
+                continue
+            targets.append(order)
+
+        logger.info(
+            f"[{self.account_id}] 注文 {stats['listed']}件（新規 {stats['new']} / "
+            f"変更 {stats['changed']} / 変更なし {stats['unchanged']}）"
+        )
+
+        failed_ordered = self._fetch_and_save(targets, stats)
+
+        # 同期状態を更新（取得に失敗した注文は次回の取得範囲に含まれるようにする）
+        previous_mark = (state or {}).get('high_water_mark') or 0
+        high_water_mark = max([o.get('ordered') or 0 for o in listed] + [previous_mark]) or None
+        if failed_ordered:
+            failed_times = [ts for ts in failed_ordered if ts]
+            if failed_times:
+                high_water_mark = min(high_water_mark or 0, min(failed_times) - 1)
+            else:
+                # 注文日時が不明な失敗のみの場合は前回の位置から進めない
+                high_water_mark = previous_mark or None
+            # 前回の位置から再確認期間より前には戻さない（0・負の値で取得範囲がエポックまで戻るのを防ぐ）
+            if previous_mark:
+                high_water_mark = max(high_water_mark or 0, previous_mark - self.REVISIT_DAYS * 86400)
+            elif high_water_mark is not None and high_water_mark <= 0:
+                high_water_mark = None
+
+        synced_from = start_date
+        if state and state.get('synced_from') and not full:
+            synced_from = min(start_date, state['synced_from'])
+        self.master_db.update_order_sync_state(PLATFORM, self.account_id, synced_from, high_water_mark)
+
+        return stats
+
+    def _list_orders(self, start_date: str) -> List[Dict[str, Any]]:
+        """注文一覧を全ページ取得"""
+        orders = []
+        offset = 0
+        while True:
+            self.quota.acquire()
+            response = self.client.get_orders(
+                limit=self.PAGE_SIZE,
+                offset=offset,
+                start_ordered=start_date
+            )
+            page = response.get('orders', [])
+            orders.extend(page)
+            if len(page) < self.PAGE_SIZE:
+                break
+            offset += self.PAGE_SIZE
+        return orders
+
+    def _fetch_detail(self, order: Dict[str, Any]) -> Dict[str, Any]:
+        """注文詳細を取得して保存形式に変換（ワーカースレッドで実行）"""
+        self.quota.acquire()
+        detail = self.client.get_order_detail(order['unique_key']).get('order') or {}
+
+        return {
+            'order_key': order['unique_key'],
+            'ordered_at': detail.get('ordered', order.get('ordered')),
+            'modified_at': order.get('modified', detail.get('modified')),
+            'dispatch_status': order.get('dispatch_status', detail.get('dispatch_status')),
+            'total': detail.get('total', order.get('total')),
+            'items': [
+                {
+                    'platform_item_id': str(item.get('item_id')) if item.get('item_id') is not None else None,
+                    'variation_id': str(item.get('variation_id')) if item.get('variation_id') is not None else None,
+                    'title': item.get('title', ''),
+                    'price': item.get('price'),
+                    'amount': item.get('amount', 1),
+                    'status': item.get('status'),
+                }
+                for item in detail.get('order_items', [])
+            ],
+        }
+
+    def _fetch_and_save(self, targets: List[Dict[str, Any]], stats: Dict[str, Any]) -> List[int]:
+        """
+        注文詳細を並列取得して保存
+
+        Returns:
+            list: 取得に失敗した注文の注文日時（UNIXタイム）
+        """
+        if not targets:
+            return []
+
+        logger.info(f"[{self.account_id}] 注文詳細を取得中: {len(targets)}件（同時 {self.workers}件）")
+
+        failed_ordered = []
+        batch = []
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(self._fetch_detail, order): order for order in targets}
+            for future in as_completed(futures):
+                order = futures[future]
+                try:
+                    batch.append(future.result())
+                except Exception as e:
+                    stats['errors'] += 1
+                    failed_ordered.append(order.get('ordered') or 0)
+                    logger.error(f"[{self.account_id}] 注文詳細取得エラー ({order.get('unique_key')}): {e}")
+                    continue
+
+                if len(batch) >= self.SAVE_BATCH_SIZE:
+                    stats['saved'] += self.master_db.save_orders(PLATFORM, self.account_id, batch)
+                    batch = []
+
+        stats['saved'] += self.master_db.save_orders(PLATFORM, self.account_id, batch)
+        return failed_ordered
@@ -2,15 +2,18 @@
 BASE注文一覧取得スクリプト
 
 BASE APIから注文情報を取得し、販売された商品の在庫状況を確認する
+
+注文は master.db（orders / order_items）に差分同期される。
+2回目以降の実行では新規・変更された注文のみ詳細を取得する。
 """
 
 import sys
 import logging
 import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
-import requests
 import time
 
 # パスを追加
@@ -19,6 +22,7 @@ sys.path.insert(0, str(project_root))
 
 from platforms.base.accounts.manager import AccountManager
 from platforms.base.core.api_client import BaseAPIClient
+from platforms.base.core.order_sync import OrderSync, RequestQuota
 from inventory.core.master_db import MasterDB
 
 # ロガー設定
@@ -32,132 +36,74 @@ logger = logging.getLogger(__name__)
 class OrdersFetcher:
     """
     BASE注文取得クラス
-    """
 
-    BASE_URL = "https://api.thebase.in/1"
+    注文は master.db の orders / order_items に差分同期し、
+    一覧表示・在庫0商品の特定はローカルDBから行う。
+    """
 
-    def __init__(self):
+    def __init__(self, workers: int = OrderSync.DEFAULT_WORKERS, hourly_quota: int = OrderSync.DEFAULT_HOURLY_QUOTA):
+        """
+        Args:
+            workers: 注文詳細の並列取得数
+            hourly_quota: 本スクリプトで使う1時間あたりのリクエスト上限（アカウント単位）
+        """
         self.account_manager = AccountManager()
         self.master_db = MasterDB()
+        self.workers = workers
+        self.hourly_quota = hourly_quota
+        self._clients: Dict[str, BaseAPIClient] = {}
+
+    def _get_client(self, account_id: str) -> BaseAPIClient:
+        """アカウントのAPIクライアント（同一実行内で使い回す）"""
+        if account_id not in self._clients:
+            self._clients[account_id] = BaseAPIClient(
+                account_id=account_id,
+                account_manager=self.account_manager
+            )
+        return self._clients[account_id]
 
-    def get_orders(
-        self,
-        account_id: str,
-        start_date: Optional[str] = None,
-        end_date: Optional[str] = None,
-        limit: int = 100,
-        max_orders: Optional[int] = None
-    ) -> List[Dict[str, Any]]:
+    def sync_orders(self, account_id: str, days: int = 30, full: bool = False) -> Dict[str, Any]:
         """
-        注文一覧を取得
+        注文を差分同期（新規・変更された注文のみ詳細を取得）
 
         Args:
             account_id: アカウントID
-            start_date: 開始日（yyyy-mm-dd形式）
-            end_date: 終了日（yyyy-mm-dd形式）
-            limit: 1回のリクエストで取得する件数（最大100）
-            max_orders: 最大取得件数（Noneの場合は全件）
+            days: 最低限同期しておく日数
+            full: Trueの場合は全注文の詳細を取得し直す
 
         Returns:
-            list: 注文リスト
+            dict: 同期結果の統計
         """
-        # APIクライアント作成
-        base_client = BaseAPIClient(
+        order_sync = OrderSync(
             account_id=account_id,
-            account_manager=self.account_manager
+            client=self._get_client(account_id),
+            master_db=self.master_db,
+            workers=self.workers,
+            quota=RequestQuota(hourly_limit=self.hourly_quota)
         )
+        stats = order_sync.sync(days=days, full=full)
 
-        all_orders = []
-        offset = 0
-
-        while True:
-            params = {
-                'limit': limit,
-                'offset': offset
-            }
-
-            if start_date:
-                params['start_ordered'] = start_date
-            if end_date:
-                params['end_ordered'] = end_date
-
-            try:
-                # トークン自動更新
-                base_client._refresh_token_if_needed()
-
-                url = f"{self.BASE_URL}/orders"
-                response = requests.get(
-                    url,
-                    headers=base_client.headers,
-                    params=params,
-                    timeout=30
-                )
-                response.raise_for_status()
-
-                data = response.json()
-                orders = data.get('orders', [])
-
-                if not orders:
-                    break
-
-                all_orders.extend(orders)
-
-                # 最大件数チェック
-                if max_orders and len(all_orders) >= max_orders:
-                    all_orders = all_orders[:max_orders]
-                    break
-
-                # 取得件数がlimitより少ない場合は終了
-                if len(orders) < limit:
-                    break
-
-                offset += limit
-                time.sleep(0.1)  # レート制限対策
-
-            except requests.exceptions.HTTPError as e:
-                if e.response.status_code == 401:
-                    logger.error(f"認証エラー: read_ordersスコープが必要です")
-                else:
-                    logger.error(f"注文取得エラー: {e}")
-                break
-            except Exception as e:
-                logger.error(f"注文取得エラー: {e}")
-                break
-
-        return all_orders
+        logger.info(
+            f"注文同期: 取得範囲 {stats['start_date']}〜, 一覧 {stats['listed']}件, "
+            f"新規 {stats['new']}件, 変更 {stats['changed']}件, 保存 {stats['saved']}件, "
+            f"エラー {stats['errors']}件"
+        )
+        return stats
 
-    def get_order_detail(self, account_id: str, unique_key: str) -> Optional[Dict[str, Any]]:
+    def get_orders(self, account_id: str, days: int = 30, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """
-        注文詳細を取得
+        同期済みの注文一覧を取得（ローカルDB）
 
         Args:
             account_id: アカウントID
-            unique_key: 注文のunique_key
+            days: 遡る日数
+            limit: 最大取得件数
 
         Returns:
-            dict: 注文詳細
+            list: 注文リスト（新しい順）
         """
-        base_client = BaseAPIClient(
-            account_id=account_id,
-            account_manager=self.account_manager
-        )
-
-        try:
-            base_client._refresh_token_if_needed()
-
-            url = f"{self.BASE_URL}/orders/detail/{unique_key}"
-            response = requests.get(
-                url,
-                headers=base_client.headers,
-                timeout=30
-            )
-            response.raise_for_status()
-
-            return response.json().get('order')
-
-        except Exception as e:
-            logger.error(f"注文詳細取得エラー ({unique_key}): {e}")
-            return None
+        since_ts = int((datetime.now() - timedelta(days=days)).timestamp())
+        return self.master_db.get_orders('base', account_id, since_ts=since_ts, limit=limit)
 
     def get_sold_items_with_zero_stock(
         self,
@@ -165,7 +111,9 @@ class OrdersFetcher:
         days: int = 30
     ) -> List[Dict[str, Any]]:
         """
-        販売済みで在庫0になっている商品を取得
+        販売済みで在庫0になっている商品を取得（ローカルDBの結合）
+
+        在庫数は listings.in_stock_quantity（inventory/scripts/sync_from_base_api.py で同期）を使用する。
 
         Args:
             account_id: アカウントID
@@ -174,93 +122,49 @@ class OrdersFetcher:
         Returns:
             list: 販売済みで在庫0の商品リスト
         """
-        # 日付範囲を設定
-        end_date = datetime.now().strftime('%Y-%m-%d')
-        start_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
-
-        logger.info(f"注文を取得中: {account_id} ({start_date} ~ {end_date})")
-
-        # 注文一覧を取得
-        orders = self.get_orders(
-            account_id=account_id,
-            start_date=start_date,
-            end_date=end_date
-        )
-
-        logger.info(f"取得した注文数: {len(orders)}件")
+        since_ts = int((datetime.now() - timedelta(days=days)).timestamp())
+        zero_stock_sold = self.master_db.get_sold_items_with_zero_stock('base', account_id, since_ts=since_ts)
 
-        # 注文詳細から商品情報を収集
-        sold_items = {}  # item_id -> 商品情報
+        for item in zero_stock_sold:
+            item['title'] = (item.get('title') or '')[:50]
+            item['amazon_in_stock'] = bool(item.get('amazon_in_stock'))
 
-        for order in orders:
-            unique_key = order.get('unique_key')
-            dispatch_status = order.get('dispatch_status')
+        return zero_stock_sold
 
-            # キャンセル以外の注文を対象
-            if dispatch_status == 'cancelled':
-                continue
+    def verify_zero_stock(self, account_id: str, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        BASE API上の現在の在庫が0であることを確認（在庫復活の直前に使用）
 
-            # 注文詳細を取得
-            detail = self.get_order_detail(account_id, unique_key)
-            if not detail:
-                continue
+        Args:
+            account_id: アカウントID
+            items: get_sold_items_with_zero_stock() の結果
 
-            # 注文商品を処理
-            order_items = detail.get('order_items', [])
-            for item in order_items:
-                item_id = str(item.get('item_id'))
-                if item_id not in sold_items:
-                    sold_items[item_id] = {
-                        'item_id': item_id,
-                        'title': item.get('title', '')[:50],
-                        'variation_id': item.get('variation_id'),
-                        'price': item.get('price'),
-                        'amount': item.get('amount', 1),
-                        'order_count': 1,
-                        'order_dates': [order.get('ordered')]
-                    }
+        Returns:
+            list: 在庫0が確認できた商品
+        """
+        client = self._get_client(account_id)
+        quota = RequestQuota(hourly_limit=self.hourly_quota)
+
+        def fetch_stock(item):
+            quota.acquire()
+            return client.get_item(item['item_id']).get('item', {}).get('stock')
+
+        verified = []
+        with ThreadPoolExecutor(max_workers=max(1, self.workers)) as executor:
+            futures = {executor.submit(fetch_stock, item): item for item in items}
+            for future in as_completed(futures):
+                item = futures[future]
+                try:
+                    stock = future.result()
+                except Exception as e:
+                    logger.warning(f"在庫確認エラー (item_id: {item['item_id']}): {e}")
+                    continue
+                if stock == 0:
+                    verified.append(item)
                 else:
-                    sold_items[item_id]['amount'] += item.get('amount', 1)
-                    sold_items[item_id]['order_count'] += 1
-                    sold_items[item_id]['order_dates'].append(order.get('ordered'))
-
-            time.sleep(0.1)  # レート制限対策
-
-        logger.info(f"販売された商品種類: {len(sold_items)}件")
-
-        # 現在の在庫状況を確認
-        base_client = BaseAPIClient(
-            account_id=account_id,
-            account_manager=self.account_manager
-        )
-
-        all_items = base_client.get_all_items(max_items=2000)
-        items_map = {str(item.get('item_id')): item for item in all_items}
-
-        # 在庫0の商品を抽出
-        zero_stock_sold = []
-        for item_id, sold_info in sold_items.items():
-            current_item = items_map.get(item_id)
-            if current_item and current_item.get('stock') == 0:
-                sold_info['current_stock'] = 0
-                sold_info['identifier'] = current_item.get('identifier', '')
-                sold_info['visible'] = current_item.get('visible')
-
-                # ASINを抽出
-                identifier = sold_info['identifier']
-                if identifier.startswith('b-') and '-' in identifier[2:]:
-                    asin = identifier.split('-')[1]
-                    sold_info['asin'] = asin
-
-                    # Amazon在庫状況を確認
-                    product = self.master_db.get_product(asin)
-                    if product:
-                        sold_info['amazon_in_stock'] = product.get('amazon_in_stock', False)
-                        sold_info['amazon_price'] = product.get('amazon_price_jpy')
+                    logger.info(f"在庫0ではないため対象外: item_id={item['item_id']} (stock={stock})")
 
-                zero_stock_sold.append(sold_info)
-
-        return zero_stock_sold
+        return verified
 
 
 def main():
@@ -297,10 +201,32 @@ def main():
         action='store_true',
         help='DRY RUNモード（実際の更新なし）'
     )
+    parser.add_argument(
+        '--no-sync',
+        action='store_true',
+        help='APIから注文を同期せず、ローカルDBのみで集計'
+    )
+    parser.add_argument(
+        '--full-sync',
+        action='store_true',
+        help='同期済みの注文も含めて全注文の詳細を取得し直す'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=OrderSync.DEFAULT_WORKERS,
+        help=f'注文詳細の並列取得数（デフォルト: {OrderSync.DEFAULT_WORKERS}）'
+    )
+    parser.add_argument(
+        '--hourly-quota',
+        type=int,
+        default=OrderSync.DEFAULT_HOURLY_QUOTA,
+        help=f'1時間あたりのAPIリクエスト上限（デフォルト: {OrderSync.DEFAULT_HOURLY_QUOTA}）'
+    )
 
     args = parser.parse_args()
 
-    fetcher = OrdersFetcher()
+    fetcher = OrdersFetcher(workers=args.workers, hourly_quota=args.hourly_quota)
     account_manager = AccountManager()
 
     # アカウント一覧を取得
@@ -319,27 +245,24 @@ def main():
         print(f"アカウント: {account_id}")
         print("=" * 70)
 
+        # 注文を差分同期
+        if not args.no_sync:
+            fetcher.sync_orders(account_id, days=args.days, full=args.full_sync)
+
         if args.list_orders:
             # 注文一覧を表示
-            end_date = datetime.now().strftime('%Y-%m-%d')
-            start_date = (datetime.now() - timedelta(days=args.days)).strftime('%Y-%m-%d')
-
-            orders = fetcher.get_orders(
-                account_id=account_id,
-                start_date=start_date,
-                end_date=end_date
-            )
+            orders = fetcher.get_orders(account_id=account_id, days=args.days)
 
             print(f"\n注文一覧（過去{args.days}日間）: {len(orders)}件")
             print("-" * 70)
 
             for order in orders[:20]:  # 最大20件表示
-                ordered_ts = order.get('ordered', 0)
+                ordered_ts = order.get('ordered_at', 0)
                 ordered_date = datetime.fromtimestamp(ordered_ts).strftime('%Y-%m-%d %H:%M') if ordered_ts else 'N/A'
-                status = order.get('dispatch_status', 'N/A')
-                total = order.get('total', 0)
+                status = order.get('dispatch_status') or 'N/A'
+                total = int(order.get('total') or 0)
 
-                print(f"  {ordered_date} | {status:<12} | {total:>8}円 | {order.get('unique_key', '')[:20]}")
+                print(f"  {ordered_date} | {status:<12} | {total:>8}円 | {order.get('order_key', '')[:20]}")
 
             if len(orders) > 20:
                 print(f"  ... 他 {len(orders) - 20}件")
@@ -362,8 +285,8 @@ def main():
             print("-" * 100)
 
             for i, item in enumerate(zero_stock_sold, 1):
-                asin = item.get('asin', 'N/A')
-                item_id = item.get('item_id', 'N/A')
+                asin = item.get('asin') or 'N/A'
+                item_id = item.get('item_id') or 'N/A'
                 amount = item.get('amount', 0)
                 amazon_stock = '在庫あり' if item.get('amazon_in_stock') else '在庫なし'
                 title = item.get('title', '')[:40]
@@ -377,6 +300,15 @@ def main():
         # Amazon在庫ありの商品のみ対象
         restore_targets = [item for item in all_zero_stock_sold if item.get('amazon_in_stock')]
 
+        # ローカルの在庫数が古い可能性があるため、対象商品のみAPIで在庫0を確認
+        verified_targets = []
+        for account_id in sorted({item['account_id'] for item in restore_targets}):
+            verified_targets.extend(fetcher.verify_zero_stock(
+                account_id,
+                [item for item in restore_targets if item['account_id'] == account_id]
+            ))
+        restore_targets = verified_targets
+
         print()
         print("=" * 70)
         print(f"在庫復活対象: {len(restore_targets)}件（Amazon在庫あり）")
@@ -391,7 +323,7 @@ def main():
         for item in restore_targets:
             account_id = item['account_id']
             item_id = item['item_id']
-            asin = item.get('asin', 'N/A')
+            asin = item.get('asin') or 'N/A'
 
             print(f"  [{account_id}] {asin} (item_id: {item_id})")
 
@@ -50,6 +50,7 @@ project_root = Path(__file__).resolve().parent.parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from inventory.core.master_db import MasterDB
+from inventory.core.records import ChangeLog, Listing, ProductPrice
 from platforms.base.accounts.manager import AccountManager
 from platforms.base.core.api_client import BaseAPIClient
 from platforms.base.core.listing_validator import ListingValidator
@@ -120,10 +121,11 @@ class PriceSync:
             'price_updated': 0,
             'no_update_needed': 0,
             'errors': 0,
-            'errors_detail': [],
+            # 詳細はデーモンでサイクルをまたいで増え続けないよう最新の一定件数のみ保持（総件数は .total）
+            'errors_detail': ChangeLog(),
             # 変動検知用の統計（ISSUE #005対応）
-            'price_changes': [],  # {'asin': str, 'old': int, 'new': int, 'diff': int}
-            'stock_changes': [],  # {'asin': str, 'old': bool, 'new': bool}
+            'price_changes': ChangeLog(),  # {'asin': str, 'old': int, 'new': int, 'diff': int}
+            'stock_changes': ChangeLog(),  # {'asin': str, 'old': bool, 'new': bool}
             # ISSUE #022対応: 価格取得失敗の詳細分類
             'price_fetch_success': 0,  # 成功
             'price_fetch_api_error': 0,  # APIエラー
@@ -288,8 +290,8 @@ class PriceSync:
         logger.info(f"│ 【BASE価格同期】アカウント: {account['name']} ({account_id})" + " " * (68 - len(f" 【BASE価格同期】アカウント: {account['name']} ({account_id})") - 2) + "│")
         logger.info("└" + "─" * 68 + "┘")
 
-        # 出品一覧を取得（出品済みのみ）
-        listings = self.master_db.get_listings_by_account(
+        # 出品一覧を取得（出品済みのみ、Listing レコード）
+        listings = self.master_db.get_listing_records(
             platform='base',
             account_id=account_id,
             status='listed'
@@ -317,8 +319,12 @@ class PriceSync:
             self.stats['errors'] += 1
             return self.stats
 
-        asins = [listing['asin'] for listing in listings]
-        price_map = {}  # ASIN -> 価格情報のマップ
+        asins = [listing.asin for listing in listings]
+        price_map: Dict[str, ProductPrice] = {}  # ASIN -> 価格情報のマップ
+
+        # Master DBの価格・在庫情報（まとめて取得）
+        # skip_cache_update の場合は価格情報として、それ以外は変動検知・フォールバック用に使う
+        db_prices = self.master_db.get_product_prices(asins)
 
         if skip_cache_update:
             # 既存Master DBから価格情報を取得（SP-API処理をスキップ）
@@ -326,12 +332,9 @@ class PriceSync:
             logger.info(f"  対象商品数: {len(listings)}件")
 
             for asin in asins:
-                product = self.master_db.get_product(asin)
-                if product and product.get('amazon_price_jpy'):
-                    price_map[asin] = {
-                        'price_jpy': product['amazon_price_jpy'],
-                        'in_stock': product.get('amazon_in_stock', False)
-                    }
+                product = db_prices.get(asin)
+                if product and product.price_jpy:
+                    price_map[asin] = product
                     self.stats['cache_hits'] += 1
                 else:
                     logger.debug(f"  [WARN] Master DBに価格情報なし: {asin}")
@@ -382,9 +385,9 @@ class PriceSync:
                         self.stats['price_fetch_success'] += 1
 
                         # 旧データを取得（変動検知用）
-                        old_product = self.master_db.get_product(asin)
-                        old_price = old_product.get('amazon_price_jpy') if old_product else None
-                        old_stock = old_product.get('amazon_in_stock') if old_product else None
+                        old_product = db_prices.get(asin)
+                        old_price = old_product.price_jpy if old_product else None
+                        old_stock = old_product.in_stock if old_product else None
 
                         new_price = int(price_info['price'])
                         new_stock = price_info.get('in_stock', False)
@@ -397,10 +400,7 @@ class PriceSync:
                         )
 
                         # price_mapに追加（後続の処理で使用）
-                        price_map[asin] = {
-                            'price_jpy': new_price,
-                            'in_stock': new_stock
-                        }
+                        price_map[asin] = ProductPrice(asin, new_price, new_stock)
 
                         # 価格変動検知
                         if old_price and abs(new_price - old_price) >= 100:
@@ -430,18 +430,13 @@ class PriceSync:
                         logger.warning(f"  [API_ERROR] {asin} - {error_msg}")
 
                         # Master DBからフォールバック
-                        product = self.master_db.get_product(asin)
-                        if product and product.get('amazon_price_jpy'):
-                            fallback_price = product['amazon_price_jpy']
-                            fallback_stock = product.get('amazon_in_stock', False)
-                            logger.info(f"    → Master DBからフォールバック: {fallback_price:,}円")
+                        product = db_prices.get(asin)
+                        if product and product.price_jpy:
+                            logger.info(f"    → Master DBからフォールバック: {product.price_jpy:,}円")
 
                             # フォールバック成功
                             self.stats['price_fetch_fallback_success'] += 1
-                            price_map[asin] = {
-                                'price_jpy': fallback_price,
-                                'in_stock': fallback_stock
-                            }
+                            price_map[asin] = product
                         else:
                             # フォールバック失敗
                             self.stats['price_fetch_fallback_failed'] += 1
@@ -486,7 +481,7 @@ class PriceSync:
                 logger.info("シャットダウン要求を検出しました（出品ループ中断）")
                 break
 
-            asin = listing['asin']
+            asin = listing.asin
             amazon_info = price_map.get(asin)
 
             if amazon_info:
@@ -500,7 +495,7 @@ class PriceSync:
 
         return self.stats
 
-    def _sync_listing_price_with_info(self, listing: dict, base_client: BaseAPIClient, amazon_info: dict, dry_run: bool):
+    def _sync_listing_price_with_info(self, listing: Listing, base_client: BaseAPIClient, amazon_info: ProductPrice, dry_run: bool):
         """
         1つの出品の価格を同期（価格情報を引数で受け取る）
 
@@ -510,21 +505,21 @@ class PriceSync:
             amazon_info: Amazon価格情報
             dry_run: Trueの場合、実際の更新は行わない
         """
-        asin = listing['asin']
-        listing_id = listing['id']
-        platform_item_id = listing['platform_item_id']
-        current_price = listing['selling_price']
+        asin = listing.asin
+        listing_id = listing.id
+        platform_item_id = listing.platform_item_id
+        current_price = listing.selling_price
 
         # ログプレフィックス（プラットフォーム/アカウントID）
         log_prefix = f"[BASE/{base_client.account_id}]"
 
         self.stats['total_listings'] += 1
 
-        if not amazon_info or not amazon_info.get('price_jpy'):
+        if not amazon_info or not amazon_info.price_jpy:
             logger.info(f"  {log_prefix} [SKIP] {asin} - 価格情報が取得できません")
             return
 
-        amazon_price = amazon_info['price_jpy']
+        amazon_price = amazon_info.price_jpy
 
         # 販売価格を計算
         new_price = self.calculate_selling_price(amazon_price)
@@ -607,7 +602,7 @@ class PriceSync:
 
     def _handle_bad_item_id(
         self,
-        listing: dict,
+        listing: Listing,
         base_client: BaseAPIClient,
         error_detail: dict,
         dry_run: bool
@@ -621,8 +616,8 @@ class PriceSync:
             error_detail: エラー詳細
             dry_run: DRY RUNモード
         """
-        listing_id = listing['id']
-        platform_item_id = listing['platform_item_id']
+        listing_id = listing.id
+        platform_item_id = listing.platform_item_id
 
         logger.info(f"    [検証開始] 商品の存在確認を行います...")
 
@@ -819,14 +814,14 @@ class PriceSync:
 
         # ISSUE #005対応: 価格・在庫変動検知の統計
         logger.info(f"変動検知（ISSUE #005）:")
-        logger.info(f"  - 価格変動検出: {len(self.stats['price_changes'])}件")
+        logger.info(f"  - 価格変動検出: {self.stats['price_changes'].total}件")
         if self.stats['price_changes']:
             logger.info(f"    変動詳細（最大10件）:")
             for change in self.stats['price_changes'][:10]:
                 diff_sign = "+" if change['diff'] > 0 else ""
                 logger.info(f"      {change['asin']}: {change['old']:,}円 → {change['new']:,}円 ({diff_sign}{change['diff']:,}円)")
 
-        logger.info(f"  - 在庫状態変動検出: {len(self.stats['stock_changes'])}件")
+        logger.info(f"  - 在庫状態変動検出: {self.stats['stock_changes'].total}件")
         if self.stats['stock_changes']:
             logger.info(f"    変動詳細（最大10件）:")
             for change in self.stats['stock_changes'][:10]:
@@ -11,6 +11,8 @@ import logging
 from typing import Dict, Optional, List, Any
 from pathlib import Path
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 # ロガー設定
 logger = logging.getLogger(__name__)
@@ -20,6 +22,13 @@ project_root = Path(__file__).resolve().parents[3]
 sys.path.insert(0, str(project_root))
 
 from platforms.ebay.core.auth import EbayTokenManager
+from platforms.ebay.core.http_session import get_session, DEFAULT_TIMEOUT, MAX_WORKERS_PER_ACCOUNT
+from shared.utils.metrics import track, caller_name
+from shared.utils.api_endpoints import get_endpoint
+
+
+class InventoryFetchError(Exception):
+    """Inventory Itemsのページ取得に失敗した（一部のページだけの結果を返さないために送出）"""
 
 
 class EbayAPIClient:
@@ -38,16 +47,26 @@ class EbayAPIClient:
     MARKETPLACE_UK = "EBAY_GB"
     MARKETPLACE_AU = "EBAY_AU"
 
-    def __init__(self, account_id: str, credentials: Dict[str, str], environment: str = 'production'):
+    # ページ単位の取得試行回数（429/5xxのリトライはセッション側で別途行われる）
+    PAGE_FETCH_ATTEMPTS = 3
+    PAGE_RETRY_WAIT = 2.0  # 秒（試行ごとに倍増）
+
+    def __init__(self, account_id: str, credentials: Dict[str, str], environment: str = 'production',
+                 timeout=DEFAULT_TIMEOUT):
         """
         Args:
             account_id: アカウントID
             credentials: 認証情報 {'app_id', 'cert_id', 'redirect_uri'}
             environment: 'sandbox' or 'production'
+            timeout: リクエストタイムアウト（秒、または(接続, 読み取り)のタプル）
         """
         self.account_id = account_id
         self.environment = environment
         self.is_sandbox = (environment == 'sandbox')
+        self.timeout = timeout
+
+        # アカウント単位の共有セッション（Keep-Alive + 429/5xxリトライ）
+        self.session = get_session(account_id)
 
         # トークンマネージャー初期化
         self.token_manager = EbayTokenManager(
@@ -56,11 +75,11 @@ class EbayAPIClient:
             environment=environment
         )
 
-        # API URL設定
+        # API URL設定（EBAY_API_URL / ECAUTO_MOCK_API_URL でモックサーバー等に差し替え可能）
         if self.is_sandbox:
-            self.base_url = "https://api.sandbox.ebay.com"
+            self.base_url = get_endpoint('ebay', "https://api.sandbox.ebay.com")
         else:
-            self.base_url = "https://api.ebay.com"
+            self.base_url = get_endpoint('ebay', "https://api.ebay.com")
 
     def _get_headers(self) -> Dict[str, str]:
         """
@@ -81,6 +100,30 @@ class EbayAPIClient:
             "X-EBAY-C-MARKETPLACE-ID": self.MARKETPLACE_US
         }
 
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        共通HTTPリクエストメソッド
+
+        全てのAPIコールはこのメソッドを経由し、共有セッション・タイムアウトを適用する。
+        429/5xxのリトライはセッション側（HTTPAdapter）で行われる。
+
+        Args:
+            method: HTTPメソッド（'GET', 'PUT'等）
+            url: リクエストURL
+            **kwargs: requests に渡す追加引数（params, json等）
+
+        Returns:
+            requests.Response: レスポンスオブジェクト
+        """
+        kwargs.setdefault('headers', self._get_headers())
+        kwargs.setdefault('timeout', self.timeout)
+
+        # 呼び出し元のメソッド名を操作名として計測
+        with track('ebay', caller_name(), self.account_id) as call:
+            response = self.session.request(method, url, **kwargs)
+            call.set_status(response.status_code)
+        return response
+
     # =========================================================================
     # Inventory Item 操作
     # =========================================================================
@@ -112,7 +155,7 @@ class EbayAPIClient:
         url = f"{self.base_url}/sell/inventory/v1/inventory_item/{sku}"
 
         try:
-            response = requests.put(url, headers=self._get_headers(), json=item_data)
+            response = self._request('PUT', url, json=item_data)
 
             if response.status_code in [200, 201, 204]:
                 return {'success': True, 'sku': sku}
@@ -136,7 +179,7 @@ class EbayAPIClient:
         url = f"{self.base_url}/sell/inventory/v1/inventory_item/{sku}"
 
         try:
-            response = requests.get(url, headers=self._get_headers())
+            response = self._request('GET', url)
 
             if response.status_code == 200:
                 return response.json()
@@ -171,7 +214,7 @@ class EbayAPIClient:
         url = f"{self.base_url}/sell/inventory/v1/inventory_item/{sku}"
 
         try:
-            response = requests.delete(url, headers=self._get_headers())
+            response = self._request('DELETE', url)
             return response.status_code in [200, 204]
 
         except requests.exceptions.RequestException:
@@ -201,6 +244,20 @@ class EbayAPIClient:
                     ...
                 ]
         """
+        data = self._get_inventory_items_page(limit=limit, offset=offset)
+        return data.get('inventoryItems', []) if data else []
+
+    def _get_inventory_items_page(self, limit: int = 100, offset: int = 0) -> Optional[Dict[str, Any]]:
+        """
+        Inventory Itemsを1ページ取得（レスポンス全体を返す）
+
+        Args:
+            limit: 1ページあたりの取得件数（最大100）
+            offset: オフセット（取得開始位置）
+
+        Returns:
+            dict or None: APIレスポンス {'inventoryItems': [...], 'total': int, ...}
+        """
         url = f"{self.base_url}/sell/inventory/v1/inventory_item"
 
         params = {
@@ -209,49 +266,97 @@ class EbayAPIClient:
         }
 
         try:
-            response = requests.get(url, headers=self._get_headers(), params=params)
+            response = self._request('GET', url, params=params)
 
             if response.status_code == 200:
-                data = response.json()
-                return data.get('inventoryItems', [])
+                return response.json()
             else:
-                return []
+                return None
 
         except requests.exceptions.RequestException:
-            return []
+            return None
+
+    def _fetch_inventory_items_page(self, limit: int, offset: int) -> Dict[str, Any]:
+        """
+        Inventory Itemsを1ページ取得（失敗時はリトライし、それでも失敗したら例外）
+
+        Args:
+            limit: 1ページあたりの取得件数（最大100）
+            offset: オフセット（取得開始位置）
+
+        Returns:
+            dict: APIレスポンス {'inventoryItems': [...], 'total': int, ...}
+
+        Raises:
+            InventoryFetchError: PAGE_FETCH_ATTEMPTS 回試行しても取得できなかった場合
+        """
+        for attempt in range(1, self.PAGE_FETCH_ATTEMPTS + 1):
+            data = self._get_inventory_items_page(limit=limit, offset=offset)
+            if data is not None:
+                return data
+
+            if attempt < self.PAGE_FETCH_ATTEMPTS:
+                wait = self.PAGE_RETRY_WAIT * (2 ** (attempt - 1))
+                logger.warning(
+                    f"[{self.account_id}] Inventory Items取得失敗 (offset={offset}) "
+                    f"- {wait:.0f}秒後にリトライ ({attempt}/{self.PAGE_FETCH_ATTEMPTS})"
+                )
+                time.sleep(wait)
+
+        raise InventoryFetchError(
+            f"[{self.account_id}] Inventory Itemsの取得に失敗しました "
+            f"(offset={offset}, {self.PAGE_FETCH_ATTEMPTS}回試行)"
+        )
 
-    def get_all_inventory_items_paginated(self, max_items: int = None) -> List[Dict[str, Any]]:
+    def get_all_inventory_items_paginated(self, max_items: int = None,
+                                          max_workers: int = MAX_WORKERS_PER_ACCOUNT) -> List[Dict[str, Any]]:
         """
         全Inventory Itemsを取得（自動ページネーション）
 
+        1ページ目のレスポンスに含まれる total から残りのオフセットを算出し、
+        2ページ目以降は max_workers 件まで並列に取得する。
+        どれか1ページでもリトライ後に取得できなければ InventoryFetchError を送出する
+        （一部のページが欠けた一覧で同期を進めないため）。
+
         Args:
             max_items: 最大取得件数（Noneの場合は全件取得）
+            max_workers: ページ取得の並列数（1の場合は順次取得）
 
         Returns:
             list: Inventory Itemsのリスト
+
+        Raises:
+            InventoryFetchError: ページの取得に失敗した場合
         """
-        all_items = []
-        offset = 0
         limit = 100
 
-        while True:
-            items = self.get_all_inventory_items(limit=limit, offset=offset)
+        first_page = self._fetch_inventory_items_page(limit=limit, offset=0)
 
-            if not items:
-                break
+        all_items = list(first_page.get('inventoryItems', []))
+        total = first_page.get('total', len(all_items))
+        if max_items:
+            total = min(total, max_items)
 
-            all_items.extend(items)
+        offsets = list(range(limit, total, limit))
 
-            # 最大件数チェック
-            if max_items and len(all_items) >= max_items:
-                all_items = all_items[:max_items]
-                break
+        if offsets:
+            def fetch(offset):
+                return self._fetch_inventory_items_page(limit=limit, offset=offset).get('inventoryItems', [])
+
+            if max_workers > 1:
+                # 例外は結果を取り出す時点で再送出される
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    pages = list(executor.map(fetch, offsets))
+            else:
+                pages = [fetch(offset) for offset in offsets]
 
-            # 次のページがない場合は終了
-            if len(items) < limit:
-                break
+            # オフセット順に結合（executor.map は入力順を保持する）
+            for items in pages:
+                all_items.extend(items)
 
-            offset += limit
+        # 最大件数チェック
+        if max_items and len(all_items) > max_items:
+            all_items = all_items[:max_items]
 
         return all_items
 
@@ -300,7 +405,7 @@ class EbayAPIClient:
         }
 
         try:
-            response = requests.post(url, headers=self._get_headers(), json=offer_data)
+            response = self._request('POST', url, json=offer_data)
 
             if response.status_code in [200, 201]:
                 offer = response.json()
@@ -324,7 +429,7 @@ class EbayAPIClient:
         url = f"{self.base_url}/sell/inventory/v1/offer/{offer_id}/publish"
 
         try:
-            response = requests.post(url, headers=self._get_headers())
+            response = self._request('POST', url)
 
             if response.status_code in [200, 201]:
                 result = response.json()
@@ -352,7 +457,7 @@ class EbayAPIClient:
             print(f"[DEBUG] Request URL: {url}")
             print(f"[DEBUG] Request Params: {params}")
 
-            response = requests.get(url, headers=self._get_headers(), params=params)
+            response = self._request('GET', url, params=params)
 
             print(f"[DEBUG] Actual Request URL: {response.url}")
             print(f"[DEBUG] API Response Status: {response.status_code}")
@@ -387,7 +492,7 @@ class EbayAPIClient:
         params = {'sku': sku, 'limit': 10}
 
         try:
-            response = requests.get(url, headers=self._get_headers(), params=params)
+            response = self._request('GET', url, params=params)
 
             if response.status_code == 200:
                 data = response.json()
@@ -411,7 +516,7 @@ class EbayAPIClient:
         url = f"{self.base_url}/sell/inventory/v1/offer/{offer_id}"
 
         try:
-            response = requests.get(url, headers=self._get_headers())
+            response = self._request('GET', url)
 
             if response.status_code == 200:
                 return response.json()
@@ -434,7 +539,7 @@ class EbayAPIClient:
         url = f"{self.base_url}/sell/inventory/v1/offer/{offer_id}"
 
         try:
-            response = requests.delete(url, headers=self._get_headers())
+            response = self._request('DELETE', url)
             return response.status_code in [200, 204]
 
         except requests.exceptions.RequestException:
@@ -484,7 +589,7 @@ class EbayAPIClient:
             url = f"{self.base_url}/sell/inventory/v1/offer/{offer_id}"
 
             try:
-                response = requests.put(url, headers=self._get_headers(), json=update_offer)
+                response = self._request('PUT', url, json=update_offer)
 
                 if response.status_code not in [200, 204]:
                     print(f"  [ERROR] relist_offer: Offer更新失敗 status={response.status_code}")
@@ -568,7 +673,7 @@ class EbayAPIClient:
         logger.debug(f"[eBay/{self.account_id}] pricingSummary={offer.get('pricingSummary')}")
 
         try:
-            response = requests.put(url, headers=self._get_headers(), json=offer)
+            response = self._request('PUT', url, json=offer)
 
             if response.status_code in [200, 204]:
                 return True
@@ -652,7 +757,7 @@ class EbayAPIClient:
 
         try:
             # PUTメソッドでロケーション作成/更新
-            response = requests.put(url, headers=self._get_headers(), json=location_data)
+            response = self._request('PUT', url, json=location_data)
             return response.status_code in [200, 201, 204]
 
         except requests.exceptions.RequestException:
@@ -13,11 +13,15 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 import sys
+import threading
 
 # プロジェクトルートをパスに追加
 project_root = Path(__file__).resolve().parents[3]
 sys.path.insert(0, str(project_root))
 
+from platforms.ebay.core.http_session import get_session, DEFAULT_TIMEOUT
+from shared.utils.api_endpoints import get_endpoint
+
 
 class EbayAuthClient:
     """
@@ -42,26 +46,31 @@ class EbayAuthClient:
         "https://api.ebay.com/oauth/api_scope/commerce.taxonomy.readonly",
     ]
 
-    def __init__(self, app_id: str, cert_id: str, redirect_uri: str, environment: str = 'production'):
+    def __init__(self, app_id: str, cert_id: str, redirect_uri: str, environment: str = 'production',
+                 session: Optional[requests.Session] = None, timeout=DEFAULT_TIMEOUT):
         """
         Args:
             app_id: eBay App ID (Client ID)
             cert_id: eBay Cert ID (Client Secret)
             redirect_uri: OAuth Redirect URI
             environment: 'sandbox' or 'production'
+            session: 共有HTTPセッション（Noneの場合はApp ID単位の共有セッション）
+            timeout: リクエストタイムアウト（秒）
         """
         self.app_id = app_id
         self.cert_id = cert_id
         self.redirect_uri = redirect_uri
         self.environment = environment
         self.is_sandbox = (environment == 'sandbox')
+        self.session = session or get_session(f"app:{app_id}")
+        self.timeout = timeout
 
         # API URL設定
         if self.is_sandbox:
-            self.base_url = "https://api.sandbox.ebay.com"
+            self.base_url = get_endpoint('ebay', "https://api.sandbox.ebay.com")
             self.auth_base_url = "https://auth.sandbox.ebay.com"
         else:
-            self.base_url = "https://api.ebay.com"
+            self.base_url = get_endpoint('ebay', "https://api.ebay.com")
             self.auth_base_url = "https://auth.ebay.com"
 
         # トークンキャッシュ
@@ -104,7 +113,7 @@ class EbayAuthClient:
         }
 
         try:
-            response = requests.post(url, headers=headers, data=data)
+            response = self.session.post(url, headers=headers, data=data, timeout=self.timeout)
             response.raise_for_status()
 
             token_data = response.json()
@@ -183,7 +192,7 @@ class EbayAuthClient:
         }
 
         try:
-            response = requests.post(url, headers=headers, data=data)
+            response = self.session.post(url, headers=headers, data=data, timeout=self.timeout)
             response.raise_for_status()
 
             token_data = response.json()
@@ -237,7 +246,7 @@ class EbayAuthClient:
         }
 
         try:
-            response = requests.post(url, headers=headers, data=data)
+            response = self.session.post(url, headers=headers, data=data, timeout=self.timeout)
             response.raise_for_status()
 
             token_data = response.json()
@@ -332,14 +341,18 @@ class EbayTokenManager:
         self.account_id = account_id
         self.environment = environment
 
-        # OAuth クライアント初期化
+        # OAuth クライアント初期化（アカウント単位の共有セッションを使用）
         self.auth_client = EbayAuthClient(
             app_id=credentials['app_id'],
             cert_id=credentials['cert_id'],
             redirect_uri=credentials['redirect_uri'],
-            environment=environment
+            environment=environment,
+            session=get_session(account_id)
         )
 
+        # 並列ワーカーからの同時更新を防ぐロック
+        self._lock = threading.Lock()
+
         # トークンファイルパス
         tokens_dir = Path(__file__).parent.parent / 'accounts' / 'tokens'
         tokens_dir.mkdir(parents=True, exist_ok=True)
@@ -352,6 +365,11 @@ class EbayTokenManager:
         Returns:
             str or None: アクセストークン
         """
+        with self._lock:
+            return self._get_valid_token()
+
+    def _get_valid_token(self) -> Optional[str]:
+        """get_valid_token の本体（ロック取得済みで呼び出す）"""
         # トークンファイル読み込み
         if not self.token_file.exists():
             print(f"トークンが見つかりません: {self.token_file}")
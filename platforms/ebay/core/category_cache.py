@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+"""
+eBay カテゴリ推薦キャッシュ（SQLite）
+
+Taxonomy API（get_category_suggestions）の結果を正規化タイトル単位で保存する。
+- 有効期限（TTL）付き
+- ヒット数・最終ヒット日時の記録（ヒット統計）
+"""
+
+import sqlite3
+import hashlib
+import re
+import threading
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional, Any, Iterable
+from contextlib import contextmanager
+
+# ロガー設定
+logger = logging.getLogger(__name__)
+
+
+# 連続する空白をまとめるための正規表現
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_title(title: str) -> str:
+    """
+    キャッシュキー用にタイトルを正規化
+
+    Taxonomy APIにはタイトル先頭300文字のみを渡すため、同じ条件で切り詰める。
+
+    Args:
+        title: 商品タイトル
+
+    Returns:
+        str: 正規化済みタイトル（小文字・空白圧縮・最大300文字）
+    """
+    if not title:
+        return ''
+    return _WHITESPACE_RE.sub(' ', title[:300]).strip().lower()
+
+
+class CategoryCache:
+    """
+    カテゴリ推薦結果のSQLiteキャッシュ
+
+    テーブル category_suggestions に正規化タイトルのハッシュをキーとして保存する。
+    """
+
+    DEFAULT_TTL_DAYS = 30
+
+    def __init__(self, db_path: str = None, ttl_days: int = DEFAULT_TTL_DAYS):
+        """
+        Args:
+            db_path: キャッシュDBのパス（デフォルト: platforms/ebay/data/category_cache.db）
+            ttl_days: キャッシュ有効期限（日）
+        """
+        if db_path is None:
+            db_path = Path(__file__).resolve().parent.parent / 'data' / 'category_cache.db'
+
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_days = ttl_days
+
+        # 書き込みの直列化（並列プリフェッチ用）
+        self._write_lock = threading.Lock()
+
+        self._init_tables()
+
+    @contextmanager
+    def get_connection(self):
+        """データベース接続のコンテキストマネージャー"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise e
+        finally:
+            conn.close()
+
+    def _init_tables(self):
+        """テーブルの初期化"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS category_suggestions (
+                    query_hash TEXT PRIMARY KEY,
+                    normalized_title TEXT,
+                    category_id TEXT NOT NULL,
+                    category_name TEXT,
+                    confidence REAL,
+                    fetched_at TIMESTAMP NOT NULL,
+                    expires_at TIMESTAMP NOT NULL,
+                    hit_count INTEGER DEFAULT 0,
+                    last_hit_at TIMESTAMP
+                )
+            ''')
+
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_category_suggestions_expires
+                ON category_suggestions(expires_at)
+            ''')
+
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_category_suggestions_category
+                ON category_suggestions(category_id)
+            ''')
+
+    # =========================================================================
+    # キー生成
+    # =========================================================================
+
+    @staticmethod
+    def make_key(title: str) -> str:
+        """
+        タイトルからキャッシュキーを生成
+
+        Args:
+            title: 商品タイトル（正規化前でも可）
+
+        Returns:
+            str: 正規化タイトルのMD5ハッシュ
+        """
+        return hashlib.md5(normalize_title(title).encode()).hexdigest()
+
+    # =========================================================================
+    # 読み書き
+    # =========================================================================
+
+    def get(self, title: str) -> Optional[Dict[str, Any]]:
+        """
+        キャッシュからカテゴリを取得（期限切れは除外、ヒット数を加算）
+
+        Args:
+            title: 商品タイトル
+
+        Returns:
+            dict or None: {'category_id', 'category_name', 'confidence'}
+        """
+        return self.get_many([title]).get(self.make_key(title))
+
+    def get_many(self, titles: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        複数タイトルのキャッシュを一括取得
+
+        Args:
+            titles: 商品タイトルのリスト
+
+        Returns:
+            dict: {キャッシュキー: カテゴリ情報}（ヒットしたもののみ）
+        """
+        keys = list({self.make_key(title) for title in titles})
+        if not keys:
+            return {}
+
+        now = datetime.now().isoformat()
+        results = {}
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+
+            # SQLiteの変数上限を考慮して分割
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                placeholders = ','.join('?' * len(chunk))
+                cursor.execute(f'''
+                    SELECT query_hash, category_id, category_name, confidence
+                    FROM category_suggestions
+                    WHERE query_hash IN ({placeholders}) AND expires_at > ?
+                ''', (*chunk, now))
+
+                for row in cursor.fetchall():
+                    results[row['query_hash']] = {
+                        'category_id': row['category_id'],
+                        'category_name': row['category_name'],
+                        'confidence': row['confidence'],
+                    }
+
+            # ヒット統計を更新
+            if results:
+                with self._write_lock:
+                    cursor.executemany('''
+                        UPDATE category_suggestions
+                        SET hit_count = hit_count + 1, last_hit_at = ?
+                        WHERE query_hash = ?
+                    ''', [(now, key) for key in results])
+
+        return results
+
+    def put(self, title: str, category_info: Dict[str, Any]):
+        """
+        カテゴリ推薦結果を保存
+
+        Args:
+            title: 商品タイトル
+            category_info: {'category_id', 'category_name', 'confidence'}
+        """
+        now = datetime.now()
+        expires_at = now + timedelta(days=self.ttl_days)
+
+        with self._write_lock:
+            with self.get_connection() as conn:
+                conn.execute('''
+                    INSERT INTO category_suggestions (
+                        query_hash, normalized_title, category_id, category_name,
+                        confidence, fetched_at, expires_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(query_hash) DO UPDATE SET
+                        category_id = excluded.category_id,
+                        category_name = excluded.category_name,
+                        confidence = excluded.confidence,
+                        fetched_at = excluded.fetched_at,
+                        expires_at = excluded.expires_at
+                ''', (
+                    self.make_key(title),
+                    normalize_title(title),
+                    category_info['category_id'],
+                    category_info.get('category_name'),
+                    category_info.get('confidence', 1.0),
+                    now.isoformat(),
+                    expires_at.isoformat()
+                ))
+
+    # =========================================================================
+    # メンテナンス
+    # =========================================================================
+
+    def purge_expired(self) -> int:
+        """
+        期限切れエントリを削除
+
+        Returns:
+            int: 削除件数
+        """
+        with self._write_lock:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    'DELETE FROM category_suggestions WHERE expires_at <= ?',
+                    (datetime.now().isoformat(),)
+                )
+                return cursor.rowcount
+
+    def clear(self):
+        """全エントリを削除"""
+        with self._write_lock:
+            with self.get_connection() as conn:
+                conn.execute('DELETE FROM category_suggestions')
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        キャッシュ統計を取得
+
+        Returns:
+            dict: {'total', 'expired', 'total_hits', 'categories', 'top_categories'}
+        """
+        now = datetime.now().isoformat()
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                SELECT
+                    COUNT(*) AS total,
+                    SUM(CASE WHEN expires_at <= ? THEN 1 ELSE 0 END) AS expired,
+                    COALESCE(SUM(hit_count), 0) AS total_hits,
+                    COUNT(DISTINCT category_id) AS categories
+                FROM category_suggestions
+            ''', (now,))
+            row = cursor.fetchone()
+
+            cursor.execute('''
+                SELECT category_id, category_name, COUNT(*) AS titles, SUM(hit_count) AS hits
+                FROM category_suggestions
+                GROUP BY category_id
+                ORDER BY hits DESC
+                LIMIT 10
+            ''')
+            top_categories = [dict(r) for r in cursor.fetchall()]
+
+        return {
+            'total': row['total'],
+            'expired': row['expired'] or 0,
+            'total_hits': row['total_hits'],
+            'categories': row['categories'],
+            'top_categories': top_categories,
+        }
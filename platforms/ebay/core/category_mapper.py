@@ -6,17 +6,25 @@ eBay カテゴリ自動推薦モジュール
 """
 
 import requests
-import json
-from typing import Dict, Optional, List, Any
+import logging
+from typing import Dict, Optional, List, Any, Iterable
 from pathlib import Path
 import sys
-import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+# ロガー設定
+logger = logging.getLogger(__name__)
 
 # プロジェクトルートをパスに追加
 project_root = Path(__file__).resolve().parents[3]
 sys.path.insert(0, str(project_root))
 
 from platforms.ebay.core.auth import EbayAuthClient
+from platforms.ebay.core.http_session import DEFAULT_TIMEOUT, MAX_WORKERS_PER_ACCOUNT
+from platforms.ebay.core.category_cache import CategoryCache
+
+# プリフェッチ結果として保持するカテゴリ情報の取得元
+PREFETCH_SOURCES = ('api', 'cache')
 
 
 class CategoryMapper:
@@ -26,7 +34,8 @@ class CategoryMapper:
     機能:
     - Taxonomy APIでカテゴリ推薦
     - カテゴリ別必須Item Specifics取得
-    - カテゴリ推薦結果のキャッシュ
+    - カテゴリ推薦結果のキャッシュ（SQLite、TTL付き）
+    - アップロードバッチ単位のカテゴリ事前解決（プリフェッチ）
     """
 
     # デフォルトフォールバックカテゴリ
@@ -53,24 +62,33 @@ class CategoryMapper:
             environment=environment
         )
 
+        # Taxonomy APIもトークン取得と同じ共有セッションを使用
+        self.session = self.auth_client.session
+        self.timeout = DEFAULT_TIMEOUT
+
         # API URL設定
         if self.is_sandbox:
             self.base_url = "https://api.sandbox.ebay.com"
         else:
             self.base_url = "https://api.ebay.com"
 
-        # キャッシュディレクトリ
-        self.cache_dir = Path(__file__).parent.parent / 'data' / 'category_cache'
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # カテゴリ推薦キャッシュ（SQLite、TTL・ヒット統計付き）
+        self.cache = CategoryCache()
+
+        # プリフェッチ結果 / Item Specifics のインスタンス内メモ
+        self._prefetched: Dict[str, Dict[str, Any]] = {}
+        self._specifics_cache: Dict[str, List[Dict[str, Any]]] = {}
 
     def get_recommended_category(self, title: str, description: str = None,
                                 use_cache: bool = True) -> Optional[Dict[str, Any]]:
         """
         Taxonomy APIでカテゴリ推薦
 
+        prefetch_categories() で事前解決済みのタイトルはAPIを呼ばずに返す。
+
         Args:
             title: 商品タイトル
-            description: 商品説明（オプション）
+            description: 商品説明（オプション、Taxonomy APIには送信されないためキャッシュキーにも含めない）
             use_cache: キャッシュを使用するか
 
         Returns:
@@ -78,20 +96,92 @@ class CategoryMapper:
                 'category_id': str,
                 'category_name': str,
                 'confidence': float,
-                'source': 'api' | 'cache' | 'fallback'
+                'source': 'api' | 'cache' | 'prefetch' | 'fallback'
             }
         """
-        # クエリ文字列
-        query = f"{title} {description}" if description else title
+        key = CategoryCache.make_key(title)
 
-        # キャッシュチェック
         if use_cache:
-            cached = self._get_cached_category(query)
+            # プリフェッチ済み（同一バッチ内）
+            prefetched = self._prefetched.get(key)
+            if prefetched:
+                return dict(prefetched, source='prefetch')
+
+            # SQLiteキャッシュ
+            cached = self.cache.get(title)
             if cached:
                 cached['source'] = 'cache'
                 return cached
 
-        # Taxonomy API呼び出し
+        return self._fetch_category_suggestion(title)
+
+    def prefetch_categories(self, titles: Iterable[str],
+                            max_workers: int = MAX_WORKERS_PER_ACCOUNT) -> Dict[str, Dict[str, Any]]:
+        """
+        アップロードバッチ全体のカテゴリを事前に解決
+
+        正規化タイトルで重複排除し、キャッシュにないものだけを並列にTaxonomy APIへ問い合わせる。
+        結果（API・キャッシュで解決できたもののみ）は次のプリフェッチまでインスタンス内に保持され、
+        以降の get_recommended_category() はAPIを待たずに返る。フォールバックになったタイトルは
+        get_recommended_category() で改めてAPIに問い合わせる。
+
+        Args:
+            titles: 商品タイトルのリスト
+            max_workers: Taxonomy APIの同時リクエスト数
+
+        Returns:
+            dict: {キャッシュキー: カテゴリ情報}
+        """
+        # 正規化タイトルで重複排除（キー → 元タイトル）
+        unique_titles = {}
+        for title in titles:
+            if title:
+                unique_titles.setdefault(CategoryCache.make_key(title), title)
+
+        if not unique_titles:
+            return {}
+
+        # キャッシュヒット分を取得
+        resolved = {
+            key: dict(info, source='cache')
+            for key, info in self.cache.get_many(unique_titles.values()).items()
+        }
+
+        missing = [title for key, title in unique_titles.items() if key not in resolved]
+
+        if missing:
+            if max_workers > 1 and len(missing) > 1:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    fetched = list(executor.map(self._fetch_category_suggestion, missing))
+            else:
+                fetched = [self._fetch_category_suggestion(title) for title in missing]
+
+            for title, info in zip(missing, fetched):
+                resolved[CategoryCache.make_key(title)] = info
+
+        # プリフェッチ結果はバッチ単位（前のバッチの結果は破棄）
+        # フォールバック結果は保持しない（一時的なAPI障害で以降ずっとフォールバックになるのを防ぐ）
+        self._prefetched = {
+            key: info for key, info in resolved.items()
+            if info and info.get('source') in PREFETCH_SOURCES
+        }
+
+        logger.info(
+            f"[eBay] カテゴリ事前解決: {len(unique_titles)}件（キャッシュ {len(unique_titles) - len(missing)}件 / API {len(missing)}件）"
+        )
+
+        return resolved
+
+    def _fetch_category_suggestion(self, title: str) -> Dict[str, Any]:
+        """
+        Taxonomy APIを呼び出してカテゴリ推薦を取得（成功時はキャッシュに保存）
+
+        Args:
+            title: 商品タイトル
+
+        Returns:
+            dict: カテゴリ情報（失敗時はフォールバックカテゴリ）
+        """
         app_token_data = self.auth_client.get_application_token()
         if not app_token_data:
             # Application Token取得失敗時はフォールバック
@@ -107,7 +197,7 @@ class CategoryMapper:
         params = {"q": title[:300]}  # タイトルのみ使用（最大300文字）
 
         try:
-            response = requests.get(url, headers=headers, params=params)
+            response = self.session.get(url, headers=headers, params=params, timeout=self.timeout)
 
             if response.status_code == 200:
                 data = response.json()
@@ -121,13 +211,15 @@ class CategoryMapper:
                         'category_id': category_info['categoryId'],
                         'category_name': category_info.get('categoryName', 'Unknown'),
                         'confidence': 1.0,  # eBay APIは信頼度を返さないため固定値
-                        'source': 'api'
                     }
 
                     # キャッシュに保存
-                    self._save_cache(query, result)
+                    try:
+                        self.cache.put(title, result)
+                    except Exception as e:
+                        logger.warning(f"[eBay] カテゴリキャッシュ保存失敗: {e}")
 
-                    return result
+                    return dict(result, source='api')
 
             # API呼び出し失敗またはカテゴリなし
             return self._get_fallback_category()
@@ -157,6 +249,24 @@ class CategoryMapper:
             現在は簡易実装（API未実装）
             将来的にはGetCategorySpecifics APIを使用
         """
+        # カテゴリID単位でメモ化（同一バッチ内の同カテゴリは再取得しない）
+        if category_id in self._specifics_cache:
+            return self._specifics_cache[category_id]
+
+        specifics = self._fetch_category_specifics(category_id)
+        self._specifics_cache[category_id] = specifics
+        return specifics
+
+    def _fetch_category_specifics(self, category_id: str) -> List[Dict[str, Any]]:
+        """
+        カテゴリ別Item Specificsを取得（メモ化なし）
+
+        Args:
+            category_id: eBayカテゴリID
+
+        Returns:
+            list: Item Specificsのリスト
+        """
         # TODO: GetCategorySpecifics API実装
         # 現在は基本的なItem Specificsのみ返す
         return [
@@ -181,57 +291,6 @@ class CategoryMapper:
     # キャッシュ管理
     # =========================================================================
 
-    def _get_cache_key(self, query: str) -> str:
-        """
-        クエリ文字列からキャッシュキー生成
-
-        Args:
-            query: 検索クエリ
-
-        Returns:
-            str: ハッシュ化されたキャッシュキー
-        """
-        return hashlib.md5(query.lower().encode()).hexdigest()
-
-    def _get_cached_category(self, query: str) -> Optional[Dict[str, Any]]:
-        """
-        キャッシュからカテゴリ取得
-
-        Args:
-            query: 検索クエリ
-
-        Returns:
-            dict or None: キャッシュされたカテゴリ情報
-        """
-        cache_key = self._get_cache_key(query)
-        cache_file = self.cache_dir / f'{cache_key}.json'
-
-        if not cache_file.exists():
-            return None
-
-        try:
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except:
-            return None
-
-    def _save_cache(self, query: str, category_info: Dict[str, Any]):
-        """
-        カテゴリ情報をキャッシュに保存
-
-        Args:
-            query: 検索クエリ
-            category_info: カテゴリ情報
-        """
-        cache_key = self._get_cache_key(query)
-        cache_file = self.cache_dir / f'{cache_key}.json'
-
-        try:
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(category_info, f, ensure_ascii=False, indent=2)
-        except:
-            pass  # キャッシュ保存失敗は無視
-
     def _get_fallback_category(self) -> Dict[str, Any]:
         """
         フォールバックカテゴリ取得
@@ -251,11 +310,19 @@ class CategoryMapper:
     # =========================================================================
 
     def clear_cache(self):
-        """キャッシュをクリア"""
-        import shutil
-        if self.cache_dir.exists():
-            shutil.rmtree(self.cache_dir)
-            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        """キャッシュをクリア（SQLiteキャッシュ・プリフェッチ結果・Item Specifics）"""
+        self.cache.clear()
+        self._prefetched.clear()
+        self._specifics_cache.clear()
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        カテゴリキャッシュの統計を取得
+
+        Returns:
+            dict: CategoryCache.get_stats() の結果
+        """
+        return self.cache.get_stats()
 
 
 # テスト実行
@@ -283,7 +350,7 @@ def main():
         )
         print("[OK] CategoryMapper インスタンス作成成功")
         print(f"     環境: {mapper.environment}")
-        print(f"     キャッシュディレクトリ: {mapper.cache_dir}")
+        print(f"     キャッシュDB: {mapper.cache.db_path}")
 
         # フォールバックカテゴリ取得テスト
         fallback = mapper._get_fallback_category()
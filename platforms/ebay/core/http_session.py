@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+eBay HTTPセッション管理モジュール
+
+アカウント単位で requests.Session を共有し、Keep-Alive・タイムアウト・
+429/5xx時のリトライ（指数バックオフ）を一元的に提供する。
+
+EbayAPIClient / EbayAuthClient / CategoryMapper は同じアカウントであれば
+同一のセッション（= 同一のコネクションプール）を使用する。
+"""
+
+import threading
+import logging
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# ロガー設定
+logger = logging.getLogger(__name__)
+
+
+# 接続タイムアウト / 読み取りタイムアウト（秒）
+DEFAULT_TIMEOUT: Tuple[int, int] = (10, 60)
+
+# 1アカウントあたりの同時リクエスト数
+# eBay Sell Inventory APIの呼び出し上限（アプリ単位で日次200万回）に対しては十分小さく、
+# 短時間の集中アクセスで429を誘発しない値に抑える
+MAX_WORKERS_PER_ACCOUNT = 4
+
+# リトライ設定
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 1.0  # 1秒, 2秒, 4秒...
+RETRY_STATUS_FORCELIST = (429, 500, 502, 503, 504)
+
+# リトライ対象メソッド
+# POST（Offer作成・公開）は二重作成の恐れがあるため対象外とする
+# （トークン取得のPOSTも同様に1回のみ）
+RETRY_ALLOWED_METHODS = frozenset(['GET', 'PUT', 'DELETE', 'HEAD', 'OPTIONS'])
+
+
+_sessions: Dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def create_session(pool_maxsize: int = MAX_WORKERS_PER_ACCOUNT) -> requests.Session:
+    """
+    リトライ・Keep-Alive設定済みのセッションを作成
+
+    Args:
+        pool_maxsize: コネクションプールの最大接続数
+
+    Returns:
+        requests.Session: 設定済みセッション
+    """
+    retry = Retry(
+        total=RETRY_TOTAL,
+        connect=RETRY_TOTAL,
+        read=RETRY_TOTAL,
+        status=RETRY_TOTAL,
+        backoff_factor=RETRY_BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUS_FORCELIST,
+        allowed_methods=RETRY_ALLOWED_METHODS,
+        respect_retry_after_header=True,
+        raise_on_status=False  # 最終的なレスポンスは呼び出し元でステータス判定する
+    )
+
+    adapter = HTTPAdapter(
+        max_retries=retry,
+        pool_connections=4,
+        pool_maxsize=pool_maxsize
+    )
+
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_session(key: Optional[str] = None) -> requests.Session:
+    """
+    キー（通常はアカウントID）単位の共有セッションを取得
+
+    同一キーに対しては常に同じセッションを返す（スレッドセーフ）。
+
+    Args:
+        key: セッションキー（Noneの場合は 'default'）
+
+    Returns:
+        requests.Session: 共有セッション
+    """
+    key = key or 'default'
+
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = create_session()
+            _sessions[key] = session
+            logger.debug(f"[eBay] HTTPセッションを作成: key={key}")
+        return session
+
+
+def close_all_sessions():
+    """全ての共有セッションをクローズ（プロセス終了時用）"""
+    with _sessions_lock:
+        for session in _sessions.values():
+            try:
+                session.close()
+            except Exception:
+                pass
+        _sessions.clear()
@@ -23,6 +23,8 @@ import logging
 from pathlib import Path
 from typing import Dict, Any, List
 import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Windows環境対応
 if sys.platform == 'win32':
@@ -37,6 +39,7 @@ sys.path.insert(0, str(project_root))
 from inventory.core.master_db import MasterDB
 from platforms.ebay.accounts.manager import EbayAccountManager
 from platforms.ebay.core.api_client import EbayAPIClient
+from platforms.ebay.core.http_session import MAX_WORKERS_PER_ACCOUNT
 
 # ロガー設定
 logging.basicConfig(
@@ -70,13 +73,28 @@ class EbayInventorySync:
             'errors_detail': [],
         }
 
-    def sync_account_inventory(self, account_id: str, max_items: int = None):
+        # アカウント並列処理用ロック（統計情報の更新）
+        self._stats_lock = threading.Lock()
+
+    def _increment_stat(self, key: str, amount: int = 1):
+        """統計カウンタをスレッドセーフに加算"""
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def _add_error_detail(self, detail: Dict[str, Any]):
+        """エラー詳細をスレッドセーフに追加"""
+        with self._stats_lock:
+            self.stats['errors_detail'].append(detail)
+
+    def sync_account_inventory(self, account_id: str, max_items: int = None,
+                               max_workers: int = MAX_WORKERS_PER_ACCOUNT):
         """
         1アカウントの全商品を同期
 
         Args:
             account_id: eBayアカウントID
             max_items: 最大取得件数（Noneの場合は全件）
+            max_workers: Inventory Itemsのページ取得の並列数（1の場合は順次取得）
         """
         account = self.account_manager.get_account(account_id)
         if not account:
@@ -92,7 +110,7 @@ class EbayInventorySync:
         credentials = self.account_manager.get_credentials(account_id)
         if not credentials:
             logger.error(f"eBayアカウント認証情報が見つかりません: {account_id}")
-            self.stats['errors'] += 1
+            self._increment_stat('errors')
             return
 
         environment = self.account_manager.get_environment(account_id)
@@ -105,24 +123,26 @@ class EbayInventorySync:
             )
         except Exception as e:
             logger.error(f"eBay APIクライアントの初期化に失敗: {e}")
-            self.stats['errors'] += 1
+            self._increment_stat('errors')
             return
 
         # 全Inventory Itemsを取得
         logger.info("\neBay Inventory APIから全商品を取得中...")
         try:
-            inventory_items = ebay_client.get_all_inventory_items_paginated(max_items=max_items)
+            inventory_items = ebay_client.get_all_inventory_items_paginated(
+                max_items=max_items, max_workers=max_workers
+            )
             logger.info(f"取得完了: {len(inventory_items)}件")
         except Exception as e:
             logger.error(f"Inventory Items取得エラー: {e}")
-            self.stats['errors'] += 1
+            self._increment_stat('errors')
             return
 
         if not inventory_items:
             logger.warning("商品が見つかりませんでした")
             return
 
-        self.stats['total_items'] = len(inventory_items)
+        self._increment_stat('total_items', len(inventory_items))
 
         # 各商品をMaster DBに同期
         logger.info("\nMaster DBに同期中...")
@@ -143,7 +163,7 @@ class EbayInventorySync:
         sku = item.get('sku')
         if not sku:
             logger.warning("SKUが見つかりません、スキップ")
-            self.stats['errors'] += 1
+            self._increment_stat('errors')
             return
 
         # 在庫数を取得
@@ -151,13 +171,13 @@ class EbayInventorySync:
 
         # 在庫0の商品をカウント
         if quantity == 0:
-            self.stats['zero_stock_items'] += 1
+            self._increment_stat('zero_stock_items')
 
         # SKUからASINを抽出（s-ASIN-timestamp形式を想定）
         asin = self._extract_asin_from_sku(sku)
         if not asin:
             logger.warning(f"SKU {sku} からASINを抽出できません、スキップ")
-            self.stats['errors'] += 1
+            self._increment_stat('errors')
             return
 
         # Master DBに既存レコードがあるか確認（SKUで検索）
@@ -166,15 +186,15 @@ class EbayInventorySync:
         if existing_listing:
             # 更新
             self._update_listing(existing_listing['id'], quantity)
-            self.stats['updated_items'] += 1
+            self._increment_stat('updated_items')
         else:
             # 新規登録（同じASINで既にlistingがある場合はスキップ）
             if self._asin_already_listed(asin, account_id):
                 logger.debug(f"  [SKIP] ASIN {asin} は既に別のSKUで登録済み、スキップ")
-                self.stats['updated_items'] += 1  # 既存として扱う
+                self._increment_stat('updated_items')  # 既存として扱う
             else:
                 self._create_listing(asin, sku, account_id, quantity, item)
-                self.stats['new_items'] += 1
+                self._increment_stat('new_items')
 
     def _extract_asin_from_sku(self, sku: str) -> str:
         """
@@ -320,12 +340,15 @@ class EbayInventorySync:
 
         logger.info("=" * 70)
 
-    def sync_all_accounts(self, max_items: int = None):
+    def sync_all_accounts(self, max_items: int = None, parallel: bool = True, max_workers: int = None):
         """
         全アカウントの商品を同期
 
         Args:
             max_items: 最大取得件数（Noneの場合は全件）
+            parallel: 並列処理を有効にするか（デフォルト: True）
+                      Falseの場合はアカウント・ページ取得とも1件ずつ順に処理する
+            max_workers: 同時に処理するアカウント数（Noneの場合はアクティブアカウント数）
         """
         logger.info("\n" + "=" * 70)
         logger.info("eBay全商品同期処理を開始")
@@ -342,19 +365,45 @@ class EbayInventorySync:
 
         logger.info(f"アクティブアカウント数: {len(accounts)}件")
 
-        # 各アカウントを処理
-        for account in accounts:
-            account_id = account['id']
-
-            try:
-                self.sync_account_inventory(account_id, max_items)
-            except Exception as e:
-                logger.error(f"エラー: アカウント {account_id} の処理中にエラー: {e}")
-                self.stats['errors'] += 1
-                self.stats['errors_detail'].append({
-                    'account_id': account_id,
-                    'error': str(e)
-                })
+        if parallel and len(accounts) > 1:
+            # アカウント単位で並列処理（全体の所要時間 ≒ 最も遅いアカウントの処理時間）
+            workers = max_workers or len(accounts)
+            logger.info(f"並列処理モード: {min(len(accounts), workers)}アカウントを同時処理")
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                future_to_account = {
+                    executor.submit(self.sync_account_inventory, account['id'], max_items): account
+                    for account in accounts
+                }
+
+                for future in as_completed(future_to_account):
+                    account_id = future_to_account[future]['id']
+
+                    try:
+                        future.result()
+                    except Exception as e:
+                        logger.error(f"エラー: アカウント {account_id} の処理中にエラー: {e}")
+                        self._increment_stat('errors')
+                        self._add_error_detail({
+                            'account_id': account_id,
+                            'error': str(e)
+                        })
+        else:
+            # 各アカウントを順次処理
+            # 並列処理無効の場合はページ取得も順に行う
+            page_workers = MAX_WORKERS_PER_ACCOUNT if parallel else 1
+            for account in accounts:
+                account_id = account['id']
+
+                try:
+                    self.sync_account_inventory(account_id, max_items, max_workers=page_workers)
+                except Exception as e:
+                    logger.error(f"エラー: アカウント {account_id} の処理中にエラー: {e}")
+                    self._increment_stat('errors')
+                    self._add_error_detail({
+                        'account_id': account_id,
+                        'error': str(e)
+                    })
 
         # 統計表示
         self.print_summary()
@@ -380,6 +429,18 @@ def main():
         default=None,
         help='テスト用：最大取得件数（省略時は全件）'
     )
+    parser.add_argument(
+        '--no-parallel',
+        dest='parallel',
+        action='store_false',
+        help='並列処理を無効にする（アカウント・ページ取得とも逐次処理）'
+    )
+    parser.add_argument(
+        '--max-workers',
+        type=int,
+        default=None,
+        help='同時に処理するアカウント数（省略時はアクティブアカウント数）'
+    )
 
     args = parser.parse_args()
 
@@ -390,12 +451,17 @@ def main():
         # 特定アカウントのみ
         sync.sync_account_inventory(
             account_id=args.account,
-            max_items=args.max_items
+            max_items=args.max_items,
+            max_workers=MAX_WORKERS_PER_ACCOUNT if args.parallel else 1
         )
         sync.print_summary()
     else:
         # 全アカウント
-        sync.sync_all_accounts(max_items=args.max_items)
+        sync.sync_all_accounts(
+            max_items=args.max_items,
+            parallel=args.parallel,
+            max_workers=args.max_workers
+        )
 
     # 終了コード
     if sync.stats['errors'] > 0:
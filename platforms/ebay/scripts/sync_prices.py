@@ -11,6 +11,8 @@ import logging
 from pathlib import Path
 from datetime import datetime
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, Any, Optional
 
 # Windows環境対応
@@ -26,6 +28,7 @@ sys.path.insert(0, str(project_root))
 from inventory.core.master_db import MasterDB
 from platforms.ebay.accounts.manager import EbayAccountManager
 from platforms.ebay.core.api_client import EbayAPIClient
+from platforms.ebay.core.http_session import MAX_WORKERS_PER_ACCOUNT
 from integrations.amazon.sp_api_client import AmazonSPAPIClient
 from integrations.amazon.config import SP_API_CREDENTIALS
 from common.pricing.calculator import PriceCalculator
@@ -101,6 +104,20 @@ class EbayPriceSync:
             'errors_detail': [],
         }
 
+        # 並列処理用ロック（統計情報の更新 / SP-APIのレート制限）
+        self._stats_lock = threading.Lock()
+        self._sp_api_lock = threading.Lock()
+
+    def _increment_stat(self, key: str, amount: int = 1):
+        """統計カウンタをスレッドセーフに加算"""
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def _add_error_detail(self, detail: Dict[str, Any]):
+        """エラー詳細をスレッドセーフに追加"""
+        with self._stats_lock:
+            self.stats['errors_detail'].append(detail)
+
     def calculate_selling_price_usd(self, amazon_price_jpy: int) -> float:
         """
         販売価格を計算（USD）
@@ -166,6 +183,12 @@ class EbayPriceSync:
             logger.warning(f"  [WARN] {asin} - SP-APIクライアントが利用できません")
             return None
 
+        # SP-APIのレート制限はプロセス全体で共有されるため、並列ワーカー間で直列化する
+        with self._sp_api_lock:
+            return self._fill_cache_for_asin_locked(asin)
+
+    def _fill_cache_for_asin_locked(self, asin: str) -> Optional[Dict[str, Any]]:
+        """fill_cache_for_asin の本体（_sp_api_lock 取得済みで呼び出す）"""
         try:
             logger.info(f"  [SP-API] {asin} - Amazon価格を取得中...")
 
@@ -185,7 +208,7 @@ class EbayPriceSync:
             )
 
             logger.info(f"  [SP-API] {asin} - 取得成功: {price_jpy:,}円")
-            self.stats['sp_api_fetched'] += 1
+            self._increment_stat('sp_api_fetched')
 
             # レート制限（2.1秒待機）
             time.sleep(2.1)
@@ -197,14 +220,15 @@ class EbayPriceSync:
 
         except Exception as e:
             logger.error(f"  [SP-API] {asin} - 取得エラー: {e}")
-            self.stats['errors'] += 1
-            self.stats['errors_detail'].append({
+            self._increment_stat('errors')
+            self._add_error_detail({
                 'asin': asin,
                 'error': f'SP-API取得エラー: {str(e)}'
             })
             return None
 
-    def sync_account_prices(self, account_id: str, dry_run: bool = False, max_items: int = None, stock_check_only: bool = False):
+    def sync_account_prices(self, account_id: str, dry_run: bool = False, max_items: int = None, stock_check_only: bool = False,
+                            max_workers: int = MAX_WORKERS_PER_ACCOUNT):
         """
         1アカウントの価格を同期
 
@@ -213,6 +237,7 @@ class EbayPriceSync:
             dry_run: Trueの場合、実際の更新は行わない
             max_items: テスト用：処理する最大商品数（省略時は全件）
             stock_check_only: Trueの場合、在庫復活・再公開のみ実行（価格計算はスキップ）
+            max_workers: アカウント内で同時に処理する出品数（eBay APIの呼び出し上限に合わせて制限）
         """
         account = self.account_manager.get_account(account_id)
         if not account:
@@ -252,7 +277,7 @@ class EbayPriceSync:
         credentials = self.account_manager.get_credentials(account_id)
         if not credentials:
             logger.error(f"eBayアカウント認証情報が見つかりません: {account_id}")
-            self.stats['errors'] += 1
+            self._increment_stat('errors')
             return
 
         environment = self.account_manager.get_environment(account_id)
@@ -265,7 +290,7 @@ class EbayPriceSync:
             )
         except Exception as e:
             logger.error(f"eBay APIクライアントの初期化に失敗: {e}")
-            self.stats['errors'] += 1
+            self._increment_stat('errors')
             return
 
         # 各出品を処理
@@ -273,8 +298,32 @@ class EbayPriceSync:
             logger.info("\n在庫チェック中（価格更新はスキップ）...")
         else:
             logger.info("\n価格を更新中...")
-        for listing in listings:
-            self._sync_listing_price(listing, ebay_client, dry_run, stock_check_only)
+
+        if max_workers <= 1:
+            for listing in listings:
+                self._sync_listing_price(listing, ebay_client, dry_run, stock_check_only)
+            return
+
+        # アカウント内の出品を上限付きワーカーで並列処理
+        # （HTTPセッションはアカウント単位で共有され、プールサイズも同じ値に揃えている）
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            future_to_listing = {
+                executor.submit(self._sync_listing_price, listing, ebay_client, dry_run, stock_check_only): listing
+                for listing in listings
+            }
+
+            for future in as_completed(future_to_listing):
+                listing = future_to_listing[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.error(f"  [eBay/{account_id}] [ERROR] {listing.get('asin')} - 処理中にエラー: {e}")
+                    self._increment_stat('errors')
+                    self._add_error_detail({
+                        'asin': listing.get('asin'),
+                        'sku': listing.get('sku'),
+                        'error': str(e)
+                    })
 
     def _sync_listing_price(self, listing: dict, ebay_client: EbayAPIClient, dry_run: bool, stock_check_only: bool = False):
         """
@@ -293,13 +342,13 @@ class EbayPriceSync:
         # ログプレフィックス（プラットフォーム/アカウントID）
         log_prefix = f"[eBay/{ebay_client.account_id}]"
 
-        self.stats['total_listings'] += 1
+        self._increment_stat('total_listings')
 
         # eBayメタデータを取得（offer_id取得用）
         ebay_metadata = self.master_db.get_ebay_metadata(sku)
         if not ebay_metadata or not ebay_metadata.get('offer_id'):
             logger.info(f"  {log_prefix} [SKIP] {asin} - eBayメタデータ（offer_id）が見つかりません")
-            self.stats['skipped_no_offer_id'] += 1
+            self._increment_stat('skipped_no_offer_id')
             return
 
         offer_id = ebay_metadata['offer_id']
@@ -321,11 +370,11 @@ class EbayPriceSync:
 
                     if not amazon_info or not amazon_info.get('price_jpy'):
                         logger.info(f"  {log_prefix} [SKIP] {asin} - SP-APIからも価格情報を取得できませんでした")
-                        self.stats['skipped_no_amazon_info'] += 1
+                        self._increment_stat('skipped_no_amazon_info')
                         return
                 else:
                     logger.info(f"  {log_prefix} [SKIP] {asin} - キャッシュに価格情報がありません（SP-API自動取得: 無効）")
-                    self.stats['skipped_no_amazon_info'] += 1
+                    self._increment_stat('skipped_no_amazon_info')
                     return
 
             amazon_price_jpy = amazon_info['price_jpy']
@@ -337,7 +386,7 @@ class EbayPriceSync:
 
             if dry_run:
                 logger.info(f"    {log_prefix} → DRY RUN: 実際の更新はスキップ")
-                self.stats['out_of_stock_updated'] += 1
+                self._increment_stat('out_of_stock_updated')
                 return
 
             # 在庫数を0に更新
@@ -346,14 +395,14 @@ class EbayPriceSync:
 
                 if success:
                     logger.info(f"    {log_prefix} → 在庫数0に更新成功")
-                    self.stats['out_of_stock_updated'] += 1
+                    self._increment_stat('out_of_stock_updated')
                 else:
                     logger.error(f"    {log_prefix} → 在庫数更新失敗")
-                    self.stats['errors'] += 1
+                    self._increment_stat('errors')
             except Exception as e:
                 logger.error(f"    {log_prefix} → 在庫数更新エラー: {e}")
-                self.stats['errors'] += 1
-                self.stats['errors_detail'].append({
+                self._increment_stat('errors')
+                self._add_error_detail({
                     'asin': asin,
                     'sku': sku,
                     'error': f'在庫数更新エラー: {str(e)}'
@@ -374,7 +423,7 @@ class EbayPriceSync:
 
                     if dry_run:
                         logger.info(f"    {log_prefix} → DRY RUN: 実際の更新はスキップ")
-                        self.stats['stock_restored'] += 1
+                        self._increment_stat('stock_restored')
                     else:
                         # リトライ付き在庫復活処理
                         max_retries = 3
@@ -385,7 +434,7 @@ class EbayPriceSync:
 
                             if success:
                                 logger.info(f"    {log_prefix} → 在庫数1に復活成功")
-                                self.stats['stock_restored'] += 1
+                                self._increment_stat('stock_restored')
                                 break
                             else:
                                 if attempt < max_retries:
@@ -393,7 +442,7 @@ class EbayPriceSync:
                                     time.sleep(retry_delay)
                                 else:
                                     logger.error(f"    {log_prefix} → 在庫数復活失敗 (全{max_retries}回試行)")
-                                    self.stats['errors'] += 1
+                                    self._increment_stat('errors')
 
             # Offerの状態を確認（UNPUBLISHED なら再公開）
             offers = ebay_client.get_offers_by_sku(sku)
@@ -407,10 +456,10 @@ class EbayPriceSync:
 
                     if not offer_id_for_relist:
                         logger.error(f"    {log_prefix} → offerIdが取得できません")
-                        self.stats['errors'] += 1
+                        self._increment_stat('errors')
                     elif dry_run:
                         logger.info(f"    {log_prefix} → DRY RUN: 実際の再公開はスキップ")
-                        self.stats['relisted'] += 1
+                        self._increment_stat('relisted')
                     else:
                         # リトライ付き再公開処理
                         max_retries = 3
@@ -421,7 +470,7 @@ class EbayPriceSync:
 
                             if listing_id:
                                 logger.info(f"    {log_prefix} → 再公開成功! listingId={listing_id}")
-                                self.stats['relisted'] += 1
+                                self._increment_stat('relisted')
                                 break
                             else:
                                 if attempt < max_retries:
@@ -429,7 +478,7 @@ class EbayPriceSync:
                                     time.sleep(retry_delay)
                                 else:
                                     logger.error(f"    {log_prefix} → 再公開失敗 (全{max_retries}回試行)")
-                                    self.stats['errors'] += 1
+                                    self._increment_stat('errors')
 
         except Exception as e:
             # 在庫復活処理のエラーは警告扱い（価格同期は継続）
@@ -437,7 +486,7 @@ class EbayPriceSync:
 
         # 在庫チェックのみモードの場合、価格計算・更新はスキップ
         if stock_check_only:
-            self.stats['no_update_needed'] += 1
+            self._increment_stat('no_update_needed')
             return
 
         # 販売価格を計算（USD）
@@ -448,7 +497,7 @@ class EbayPriceSync:
 
         if price_diff_usd < self.MIN_PRICE_DIFF_USD:
             # 変更不要
-            self.stats['no_update_needed'] += 1
+            self._increment_stat('no_update_needed')
             return
 
         # 変更が必要
@@ -457,7 +506,7 @@ class EbayPriceSync:
 
         if dry_run:
             logger.info(f"    {log_prefix} → DRY RUN: 実際の更新はスキップ")
-            self.stats['price_updated'] += 1
+            self._increment_stat('price_updated')
             return
 
         # eBay APIで価格更新
@@ -472,11 +521,11 @@ class EbayPriceSync:
                 )
 
                 logger.info(f"    {log_prefix} → 更新成功")
-                self.stats['price_updated'] += 1
+                self._increment_stat('price_updated')
             else:
                 logger.error(f"    {log_prefix} → 更新失敗")
-                self.stats['errors'] += 1
-                self.stats['errors_detail'].append({
+                self._increment_stat('errors')
+                self._add_error_detail({
                     'asin': asin,
                     'sku': sku,
                     'error': 'eBay API update_offer_price() failed'
@@ -484,21 +533,28 @@ class EbayPriceSync:
 
         except Exception as e:
             logger.error(f"    {log_prefix} → 更新エラー: {e}")
-            self.stats['errors'] += 1
-            self.stats['errors_detail'].append({
+            self._increment_stat('errors')
+            self._add_error_detail({
                 'asin': asin,
                 'sku': sku,
                 'error': str(e)
             })
 
-    def sync_all_accounts(self, dry_run: bool = False, max_items: int = None, stock_check_only: bool = False):
+    def sync_all_accounts(self, dry_run: bool = False, max_items: int = None, stock_check_only: bool = False,
+                          parallel: bool = True, max_workers: int = None):
         """
-        全アカウントの価格を同期
+        全アカウントの価格を同期（並列処理対応）
+
+        アカウント単位の処理を並列に実行するため、全体の所要時間は
+        最も時間のかかるアカウントの処理時間とほぼ等しくなる。
 
         Args:
             dry_run: Trueの場合、実際の更新は行わない
             max_items: テスト用：処理する最大商品数（省略時は全件）
             stock_check_only: Trueの場合、在庫復活・再公開のみ実行（価格計算はスキップ）
+            parallel: 並列処理を有効にするか（デフォルト: True）
+                      Falseの場合はアカウント・出品とも1件ずつ順に処理する
+            max_workers: 同時に処理するアカウント数（Noneの場合はアクティブアカウント数）
         """
         logger.info("\n" + "=" * 70)
         logger.info("eBay価格同期処理を開始")
@@ -518,19 +574,48 @@ class EbayPriceSync:
 
         logger.info(f"アクティブアカウント数: {len(accounts)}件\n")
 
-        # 各アカウントを処理
-        for account in accounts:
-            account_id = account['id']
+        if parallel and len(accounts) > 1:
+            workers = max_workers or len(accounts)
+            logger.info(f"並列処理モード: {min(len(accounts), workers)}アカウントを同時処理"
+                        f"（アカウント内 {MAX_WORKERS_PER_ACCOUNT}ワーカー）\n")
 
-            try:
-                self.sync_account_prices(account_id, dry_run, max_items, stock_check_only)
-            except Exception as e:
-                logger.error(f"エラー: アカウント {account_id} の処理中にエラー: {e}")
-                self.stats['errors'] += 1
-                self.stats['errors_detail'].append({
-                    'account_id': account_id,
-                    'error': str(e)
-                })
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                future_to_account = {
+                    executor.submit(self.sync_account_prices, account['id'], dry_run, max_items, stock_check_only): account
+                    for account in accounts
+                }
+
+                # 完了したものから処理
+                for future in as_completed(future_to_account):
+                    account_id = future_to_account[future]['id']
+
+                    try:
+                        future.result()
+                        logger.info(f"[完了] アカウント {account_id} の処理完了")
+                    except Exception as e:
+                        logger.error(f"エラー: アカウント {account_id} の処理中にエラー: {e}")
+                        self._increment_stat('errors')
+                        self._add_error_detail({
+                            'account_id': account_id,
+                            'error': str(e)
+                        })
+        else:
+            # 順次処理（並列処理無効、または1アカウントのみ）
+            # 並列処理無効の場合はアカウント内の出品も順に処理する
+            per_account_workers = MAX_WORKERS_PER_ACCOUNT if parallel else 1
+            for account in accounts:
+                account_id = account['id']
+
+                try:
+                    self.sync_account_prices(account_id, dry_run, max_items, stock_check_only,
+                                             max_workers=per_account_workers)
+                except Exception as e:
+                    logger.error(f"エラー: アカウント {account_id} の処理中にエラー: {e}")
+                    self._increment_stat('errors')
+                    self._add_error_detail({
+                        'account_id': account_id,
+                        'error': str(e)
+                    })
 
         # 統計表示
         self._print_summary()
@@ -617,6 +702,18 @@ def main():
         action='store_true',
         help='在庫復活・再公開処理のみ実行（SP-API同期・価格計算はスキップ）'
     )
+    parser.add_argument(
+        '--no-parallel',
+        dest='parallel',
+        action='store_false',
+        help='並列処理を無効にする（アカウント・出品とも1件ずつ逐次処理）'
+    )
+    parser.add_argument(
+        '--max-workers',
+        type=int,
+        default=None,
+        help='同時に処理するアカウント数（省略時はアクティブアカウント数）'
+    )
 
     args = parser.parse_args()
 
@@ -635,7 +732,8 @@ def main():
             account_id=args.account,
             dry_run=args.dry_run,
             max_items=args.max_items,
-            stock_check_only=args.stock_check_only
+            stock_check_only=args.stock_check_only,
+            max_workers=MAX_WORKERS_PER_ACCOUNT if args.parallel else 1
         )
         sync._print_summary()
     else:
@@ -643,7 +741,9 @@ def main():
         stats = sync.sync_all_accounts(
             dry_run=args.dry_run,
             max_items=args.max_items,
-            stock_check_only=args.stock_check_only
+            stock_check_only=args.stock_check_only,
+            parallel=args.parallel,
+            max_workers=args.max_workers
         )
 
     # 終了コード
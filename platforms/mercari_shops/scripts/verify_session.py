@@ -129,8 +129,7 @@ async def main():
 
     finally:
         # クリーンアップ
-        await context.close()
-        await playwright.stop()
+        await session.close_browser(playwright, context)
 
 
 if __name__ == "__main__":
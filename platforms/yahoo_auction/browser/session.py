@@ -17,6 +17,8 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent))
 
 from common.proxy.proxy_manager import ProxyManager
 from common.browser.profile_manager import ProfileManager
+from common.browser.context_pool import BrowserPoolRegistry
+from common.browser.request_filter import RequestFilter
 
 # ロガー設定
 logger = logging.getLogger(__name__)
@@ -67,7 +69,9 @@ class YahooAuctionSession:
         account_id: str,
         proxy_id: Optional[str] = None,
         headless: bool = True,
-        slow_mo: int = 0
+        slow_mo: int = 0,
+        use_pool: bool = True,
+        block_resources: bool = False
     ):
         """
         Args:
@@ -75,11 +79,16 @@ class YahooAuctionSession:
             proxy_id: プロキシID（config/proxies.json で定義、Noneの場合はプロキシなし）
             headless: ヘッドレスモード（True=バックグラウンド実行、False=ブラウザ表示）
             slow_mo: 操作間の遅延（ミリ秒、デバッグ用）
+            use_pool: 常駐プール（common/browser/context_pool.py）への接続を試みる
+            block_resources: 画像・フォント・解析タグ等を遮断する（config/request_filter_profiles.json、
+                             デフォルト: False。画像が不要なタスクで有効にする）
         """
         self.account_id = account_id
         self.proxy_id = proxy_id
         self.headless = headless
         self.slow_mo = slow_mo
+        self.use_pool = use_pool
+        self.block_resources = block_resources
 
         # マネージャー初期化
         self.profile_manager = ProfileManager()
@@ -90,6 +99,8 @@ class YahooAuctionSession:
         self._browser: Optional[Browser] = None
         self._context: Optional[BrowserContext] = None
         self._page: Optional[Page] = None
+        self._pooled = False  # 常駐プールに接続中（stop()でコンテキストを閉じない）
+        self.request_filter: Optional[RequestFilter] = None
 
         logger.info(f"YahooAuctionSession 初期化: account_id={account_id}, proxy_id={proxy_id}")
 
@@ -155,6 +166,7 @@ class YahooAuctionSession:
 
         プロファイルディレクトリを作成し、Playwrightブラウザを起動する。
         launch_persistent_context を使用してセッション情報を永続化する。
+        常駐プールが起動済みの場合は、Chromiumを起動せずに接続して新しいタブで作業する。
 
         Returns:
             Page: Playwrightページオブジェクト
@@ -174,6 +186,14 @@ class YahooAuctionSession:
             # Playwright起動
             self._playwright = sync_playwright().start()
 
+            if self.block_resources:
+                self.request_filter = RequestFilter.for_platform(self.PLATFORM)
+
+            # 常駐プールに接続
+            if self.use_pool and self._attach_pool():
+                logger.info(f"セッション開始成功（常駐ブラウザ）: account_id={self.account_id}")
+                return self._page
+
             # 起動オプション
             launch_options = {
                 "headless": self.headless,
@@ -202,6 +222,9 @@ class YahooAuctionSession:
                 **context_options,
             )
 
+            if self.request_filter:
+                self.request_filter.install_sync(self._context)
+
             # 既存のページがあれば使用、なければ新規作成
             if self._context.pages:
                 self._page = self._context.pages[0]
@@ -218,6 +241,34 @@ class YahooAuctionSession:
             self.stop()
             raise RuntimeError(f"ブラウザセッションの開始に失敗しました: {e}")
 
+    def _attach_pool(self) -> bool:
+        """
+        常駐プールのコンテキストに接続
+
+        Returns:
+            bool: 接続できた場合True
+        """
+        endpoint = BrowserPoolRegistry().find_endpoint(self.PLATFORM, self.account_id, self.proxy_id)
+        if not endpoint:
+            return False
+
+        try:
+            browser = self._playwright.chromium.connect_over_cdp(endpoint)
+        except Exception as e:
+            logger.warning(f"常駐ブラウザへの接続に失敗しました（通常起動します）: {e}")
+            return False
+
+        if not browser.contexts:
+            return False
+
+        self._context = browser.contexts[0]
+        self._page = self._context.new_page()
+        self._pooled = True
+        if self.request_filter:
+            self.request_filter.install_sync(self._page)
+        logger.info(f"常駐ブラウザに接続しました: {endpoint}")
+        return True
+
     def stop(self):
         """
         ブラウザセッションを終了
@@ -225,8 +276,17 @@ class YahooAuctionSession:
         コンテキストを閉じ、Playwrightを停止する。
         プロファイルデータは自動的に保存される。
         """
+        if self.request_filter:
+            self.request_filter.record()
+            self.request_filter = None
+
         try:
-            if self._context:
+            if self._pooled:
+                # 常駐ブラウザは終了せず、作業用のタブのみ閉じる
+                if self._page:
+                    self._page.close()
+                logger.info("常駐ブラウザから切断しました")
+            elif self._context:
                 self._context.close()
                 logger.info("コンテキストを閉じました")
             if self._playwright:
@@ -238,6 +298,7 @@ class YahooAuctionSession:
             self._context = None
             self._playwright = None
             self._page = None
+            self._pooled = False
             logger.info(f"セッション終了: account_id={self.account_id}")
 
     def __enter__(self) -> Page:
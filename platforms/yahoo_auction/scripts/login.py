@@ -78,7 +78,8 @@ def main():
     session = YahooAuctionSession(
         account_id=args.account_id,
         proxy_id=args.proxy_id,
-        headless=False  # ブラウザを表示
+        headless=False,  # ブラウザを表示
+        block_resources=False  # ログイン画面の画像・スクリプトが必要なため遮断しない
     )
 
     try:
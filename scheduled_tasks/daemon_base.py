@@ -9,13 +9,19 @@
 - Graceful shutdown（SIGINT/SIGTERM対応）
 - 構造化ログ（ファイル出力 + ローテーション）
 - エラーリトライ機能
+- APIメトリクスの公開（HTTP /metrics: Prometheusテキスト形式 + メトリクスファイル）
+- 処理時間の内訳（with self.stage('phase1.fetch'): ...）と次サイクルのプロファイル取得
+- スケジュールポリシー（fixed-delay / fixed-rate / backlog / 休止時間帯）とステータスファイル
 """
 
 import sys
 from pathlib import Path
+import json
+import logging
 import time
 import signal
 import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
@@ -25,7 +31,10 @@ import os
 # パスを追加
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-from shared.utils.logger import setup_logger
+from shared.utils.logger import setup_logger, FlushingRotatingFileHandler
+from shared.utils.metrics import get_registry
+from shared.utils.profiling import CycleReport, CycleProfiler, PROFILE_MODES
+from scheduled_tasks.scheduling import SchedulePolicy, FixedDelayPolicy
 
 # 通知機能（オプショナル）
 try:
@@ -60,7 +69,15 @@ class DaemonBase(ABC):
         log_file: Optional[Path] = None,
         max_retries: int = 3,
         retry_delay_seconds: int = 60,
-        enable_notifications: bool = True
+        enable_notifications: bool = True,
+        metrics_port: Optional[int] = None,
+        metrics_file: Optional[Path] = None,
+        metrics_interval_seconds: Optional[int] = None,
+        queued_logging: bool = False,
+        log_sample_rates: Optional[Dict[str, float]] = None,
+        profile_dir: Optional[Path] = None,
+        schedule_policy: Optional[SchedulePolicy] = None,
+        status_file: Optional[Path] = None
     ):
         """
         Args:
@@ -70,12 +87,59 @@ class DaemonBase(ABC):
             max_retries: タスク失敗時の最大リトライ回数（デフォルト: 3）
             retry_delay_seconds: リトライ時の待機時間（秒、デフォルト: 60）
             enable_notifications: 通知機能を有効にするか（デフォルト: True）
+            metrics_port: メトリクスHTTPエンドポイントのポート（127.0.0.1、
+                          指定しない場合は環境変数 ECAUTO_METRICS_PORT、どちらも無ければ無効）
+            metrics_file: メトリクスファイルのパス（metrics_interval_seconds のみ指定した場合は
+                          logs/metrics/{name}.jsonl）
+            metrics_interval_seconds: メトリクスファイルへの書き出し間隔（秒、指定しない場合は環境変数
+                                      ECAUTO_METRICS_INTERVAL、metrics_file のみ指定した場合は60）
+                                      ファイル・間隔のどちらも指定しない場合はファイルへの書き出しを行わない
+            queued_logging: ログの書き込みをバックグラウンドスレッドで行うか（デフォルト: False、
+                            出品ごとにログを出す高頻度のデーモンで有効にする）
+            log_sample_rates: INFO以下を間引くロガー名と残す割合
+                              （例: {'common.pricing.calculator': 0.1}、queued_logging時のみ有効）
+            profile_dir: プロファイルの出力先・要求ファイルの置き場所（指定しない場合は logs/profile）
+            schedule_policy: 次回実行時刻の決め方（指定しない場合は FixedDelayPolicy(interval_seconds)）
+            status_file: 実行状態・次回実行予定を書き出すファイル（指定しない場合は logs/status/{name}.json）
         """
         self.name = name
         self.interval_seconds = interval_seconds
         self.max_retries = max_retries
         self.retry_delay_seconds = retry_delay_seconds
 
+        # メトリクス設定
+        if metrics_port is None and os.getenv('ECAUTO_METRICS_PORT'):
+            metrics_port = int(os.getenv('ECAUTO_METRICS_PORT'))
+        self.metrics_port = metrics_port
+        if metrics_interval_seconds is None and os.getenv('ECAUTO_METRICS_INTERVAL'):
+            metrics_interval_seconds = int(os.getenv('ECAUTO_METRICS_INTERVAL'))
+        if metrics_interval_seconds is None and metrics_file is not None:
+            metrics_interval_seconds = 60
+        self.metrics_interval_seconds = metrics_interval_seconds
+        self.metrics_file = (metrics_file or (
+            Path(__file__).resolve().parent.parent / 'logs' / 'metrics' / f'{name}.jsonl'
+        )) if metrics_interval_seconds else None
+        self.metrics = get_registry()
+        self._metrics_server: Optional[ThreadingHTTPServer] = None
+        self._metrics_writer: Optional[logging.Logger] = None
+
+        # 処理時間の内訳・プロファイル
+        self.profile_dir = profile_dir or (Path(__file__).resolve().parent.parent / 'logs' / 'profile')
+        self._cycle_report: Optional[CycleReport] = None
+        self.last_cycle_report: Optional[CycleReport] = None
+        # 次のサイクルで取得するプロファイル（'cprofile' / 'sample'、環境変数でも指定可能）
+        self._profile_request: Optional[str] = os.getenv('ECAUTO_PROFILE_NEXT_CYCLE') or None
+
+        # スケジュール・実行状態
+        self.schedule_policy = schedule_policy or FixedDelayPolicy(interval_seconds)
+        self.status_file = status_file or (
+            Path(__file__).resolve().parent.parent / 'logs' / 'status' / f'{name}.json'
+        )
+        self.next_run_time: Optional[datetime] = None
+        self._cycle_started: Optional[datetime] = None
+        self._last_pending: Optional[int] = None
+        self._status: Dict[str, Any] = {}
+
         # フラグ
         self.running = False
         self.shutdown_requested = False
@@ -85,7 +149,9 @@ class DaemonBase(ABC):
         self.logger = setup_logger(
             name=name,
             log_file=log_file,
-            console_output=True
+            console_output=True,
+            queued=queued_logging,
+            sample_rates=log_sample_rates
         )
 
         # 通知機能のセットアップ
@@ -102,6 +168,10 @@ class DaemonBase(ABC):
         # シグナルハンドラの設定
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
+        # プロファイル要求（SIGUSR1: cProfile, SIGUSR2: サンプリング、Windowsでは要求ファイルを使用）
+        if hasattr(signal, 'SIGUSR1'):
+            signal.signal(signal.SIGUSR1, self._profile_signal_handler)
+            signal.signal(signal.SIGUSR2, self._profile_signal_handler)
 
     def _signal_handler(self, signum, frame):
         """
@@ -127,6 +197,10 @@ class DaemonBase(ABC):
         except:
             pass  # シグナルハンドラ内ではエラーを無視
 
+    def _profile_signal_handler(self, signum, frame):
+        """プロファイル要求のシグナルハンドラ（フラグ操作のみ）"""
+        self._profile_request = 'sample' if signum == getattr(signal, 'SIGUSR2', None) else 'cprofile'
+
     def _interruptible_sleep(self, total_seconds: float) -> bool:
         """
         割り込み可能なsleep（シグナル応答性を向上）
@@ -164,6 +238,277 @@ class DaemonBase(ABC):
 
         return True
 
+    # ==================== メトリクス ====================
+
+    def _start_metrics(self):
+        """メトリクスのHTTPエンドポイントと定期書き出しスレッドを開始（設定されている場合のみ）"""
+        if self.metrics_file:
+            self._start_metrics_writer()
+
+        if not self.metrics_port:
+            return
+
+        registry = self.metrics
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                body = registry.render_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # アクセスログは出力しない
+
+        try:
+            self._metrics_server = ThreadingHTTPServer(('127.0.0.1', self.metrics_port), MetricsHandler)
+            self._metrics_server.daemon_threads = True
+            threading.Thread(
+                target=self._metrics_server.serve_forever,
+                name=f'{self.name}-metrics-http',
+                daemon=True
+            ).start()
+            self.logger.info(f"メトリクス: http://127.0.0.1:{self.metrics_port}/metrics")
+        except OSError as e:
+            self.logger.warning(f"メトリクスエンドポイントを開始できません（ポート {self.metrics_port}）: {e}")
+            self._metrics_server = None
+
+    def _start_metrics_writer(self):
+        """メトリクスファイルの定期書き出しスレッドを開始"""
+        # メトリクスファイル（ローテーションあり、1行1スナップショット）
+        try:
+            self.metrics_file.parent.mkdir(parents=True, exist_ok=True)
+            writer = logging.getLogger(f'metrics.{self.name}')
+            writer.propagate = False
+            writer.setLevel(logging.INFO)
+            if not writer.handlers:
+                handler = FlushingRotatingFileHandler(
+                    self.metrics_file,
+                    maxBytes=5 * 1024 * 1024,
+                    backupCount=5,
+                    encoding='utf-8'
+                )
+                handler.setFormatter(logging.Formatter('%(message)s'))
+                writer.addHandler(handler)
+            self._metrics_writer = writer
+        except Exception as e:
+            self.logger.warning(f"メトリクスファイルの初期化に失敗: {e}")
+            return
+
+        threading.Thread(
+            target=self._metrics_write_loop,
+            name=f'{self.name}-metrics-writer',
+            daemon=True
+        ).start()
+
+    def _metrics_write_loop(self):
+        """メトリクスを定期的にファイルへ書き出す"""
+        while not self._shutdown_event.wait(timeout=self.metrics_interval_seconds):
+            self.write_metrics()
+
+    def write_metrics(self):
+        """現在のメトリクスをメトリクスファイルに1行追記"""
+        if not self._metrics_writer:
+            return
+        try:
+            record = {
+                'timestamp': datetime.now().isoformat(timespec='seconds'),
+                'daemon': self.name,
+                **self.metrics.snapshot(),
+            }
+            self._metrics_writer.info(json.dumps(record, ensure_ascii=False))
+        except Exception as e:
+            self.logger.warning(f"メトリクスの書き出しに失敗: {e}")
+
+    def _stop_metrics(self):
+        """メトリクスの最終書き出しとHTTPエンドポイントの停止"""
+        self.write_metrics()
+        if self._metrics_server:
+            self._metrics_server.shutdown()
+            self._metrics_server.server_close()
+            self._metrics_server = None
+
+    # ==================== 処理時間の内訳・プロファイル ====================
+
+    def stage(self, name: str, items: int = 0):
+        """
+        処理段階（ステージ）の時間を計測するコンテキストマネージャ
+
+        経過時間・CPU時間・処理件数をサイクルごとに集計し、
+        サイクル終了時のログと完了通知（send_completion_report）に内訳として出力する。
+
+        使用例:
+            with self.stage('phase1.fetch') as stage:
+                results = self.sp_api_client.get_prices_batch(asins)
+                stage.add_items(len(results))
+
+        Args:
+            name: ステージ名（'.' 区切りで階層を表す慣例、例: 'phase2.base'）
+            items: 処理件数
+        """
+        if self._cycle_report is None:
+            # run() 以外（単発実行等）から呼ばれた場合
+            self._cycle_report = CycleReport()
+        return self._cycle_report.stage(name, items)
+
+    def request_profile(self, mode: str = 'cprofile'):
+        """
+        次のサイクルのプロファイル取得を要求
+
+        Args:
+            mode: 'cprofile'（メインスレッドの関数単位）または 'sample'（全スレッドのサンプリング）
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"不明なプロファイルモード: {mode}")
+        self._profile_request = mode
+
+    def _profile_request_file(self) -> Path:
+        return self.profile_dir / f'{self.name}.request'
+
+    def _start_profiler(self) -> Optional[CycleProfiler]:
+        """
+        プロファイル要求があればプロファイラを開始
+
+        要求方法:
+        - SIGUSR1（cProfile）/ SIGUSR2（サンプリング）
+        - 要求ファイル logs/profile/{name}.request を作成（内容に 'sample' と書けばサンプリング）
+        - 環境変数 ECAUTO_PROFILE_NEXT_CYCLE=cprofile|sample（起動直後のサイクル）
+        """
+        mode = self._profile_request
+        request_file = self._profile_request_file()
+        try:
+            if request_file.exists():
+                content = request_file.read_text(encoding='utf-8').strip()
+                mode = content if content in PROFILE_MODES else (mode or 'cprofile')
+                request_file.unlink()
+        except OSError as e:
+            self.logger.warning(f"プロファイル要求ファイルを処理できません: {e}")
+
+        self._profile_request = None
+        if not mode:
+            return None
+        if mode not in PROFILE_MODES:
+            self.logger.warning(f"不明なプロファイルモードのため無視します: {mode}")
+            return None
+
+        profiler = CycleProfiler(mode)
+        profiler.start()
+        self.logger.info(f"このサイクルのプロファイルを取得します（{mode}）")
+        return profiler
+
+    def _stop_profiler(self, profiler: Optional[CycleProfiler]):
+        """プロファイラを停止してファイルに保存"""
+        if profiler is None:
+            return
+        profiler.stop()
+        try:
+            path_base = self.profile_dir / f"{self.name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            for path in profiler.write(path_base):
+                self.logger.info(f"プロファイルを保存しました: {path}")
+        except Exception as e:
+            self.logger.warning(f"プロファイルの保存に失敗: {e}")
+
+    def _finish_cycle_report(self):
+        """サイクルの内訳を確定してログ・メトリクスに出力"""
+        report = self._cycle_report
+        self._cycle_report = None
+        if report is None:
+            return
+        report.finish()
+        self.last_cycle_report = report
+        if not report.has_stages:
+            return
+
+        self.logger.info("処理時間の内訳:")
+        for line in report.format_lines():
+            self.logger.info(f"  {line}")
+        for stage_name, values in report.to_dict()['stages'].items():
+            self.metrics.set_gauge('stage_seconds', values['wall_seconds'], daemon=self.name, stage=stage_name)
+            self.metrics.set_gauge('stage_cpu_seconds', values['cpu_seconds'], daemon=self.name, stage=stage_name)
+            self.metrics.set_gauge('stage_items', values['items'], daemon=self.name, stage=stage_name)
+
+    # ==================== スケジュール・ステータス ====================
+
+    def get_pending_work(self) -> Optional[int]:
+        """
+        未処理件数（サブクラスで必要に応じて実装）
+
+        サイクル終了後に呼ばれ、BacklogPolicy 等の次回実行時刻の計算と
+        ステータスファイルに使われる。軽いクエリ（COUNT等）で返すこと。
+
+        Returns:
+            int or None: 未処理件数（不明な場合はNone）
+        """
+        return None
+
+    def _measure_pending_work(self) -> Optional[int]:
+        """get_pending_work() を呼び出し、失敗しても None として扱う"""
+        try:
+            pending = self.get_pending_work()
+        except Exception as e:
+            self.logger.warning(f"未処理件数の取得に失敗: {e}")
+            return None
+        if pending is not None:
+            self.metrics.set_gauge('daemon_pending_work', pending, daemon=self.name)
+        self._last_pending = pending
+        return pending
+
+    def _schedule_next_run(self, cycle_started: datetime, cycle_seconds: float):
+        """
+        サイクルの所要時間と未処理件数から次回実行時刻を決める
+
+        Returns:
+            tuple: (次回実行時刻, 理由, 未処理件数)
+        """
+        pending = self._measure_pending_work()
+        now = datetime.now()
+        try:
+            next_run_time, reason = self.schedule_policy.next_run(cycle_started, cycle_seconds, pending, now)
+        except Exception as e:
+            self.logger.error(f"次回実行時刻の計算に失敗（{self.interval_seconds}秒後に実行）: {e}")
+            next_run_time, reason = now + timedelta(seconds=self.interval_seconds), 'ポリシーのエラー'
+        return max(next_run_time, now), reason, pending
+
+    def _wait_until(self, next_run_time: datetime) -> bool:
+        """
+        次回実行時刻まで待機
+
+        Returns:
+            bool: 正常に待機完了した場合True、シグナルで中断された場合False
+        """
+        self.next_run_time = next_run_time
+        self.metrics.set_gauge('daemon_next_run_timestamp', next_run_time.timestamp(), daemon=self.name)
+        wait_seconds = (next_run_time - datetime.now()).total_seconds()
+        if wait_seconds <= 0:
+            return not self.shutdown_requested
+        return self._interruptible_sleep(wait_seconds)
+
+    def _write_status(self, **fields):
+        """
+        実行状態をステータスファイル（JSON）に書き出す
+
+        check_daemon_status.py 等の外部から、実行中か・次回実行はいつかを確認するために使う。
+        """
+        self._status.update(fields)
+        self._status.update({
+            'daemon': self.name,
+            'pid': os.getpid(),
+            'schedule': self.schedule_policy.describe(),
+            'updated_at': datetime.now().isoformat(timespec='seconds'),
+        })
+        try:
+            self.status_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.status_file.with_suffix('.tmp')
+            tmp_path.write_text(json.dumps(self._status, ensure_ascii=False, indent=2), encoding='utf-8')
+            os.replace(tmp_path, self.status_file)
+        except Exception as e:
+            self.logger.warning(f"ステータスファイルの書き出しに失敗: {e}")
+
     @abstractmethod
     def execute_task(self) -> bool:
         """
@@ -264,6 +609,7 @@ class DaemonBase(ABC):
         self.logger.info(f"{self.name} デーモン起動")
         self.logger.info("="*60)
         self.logger.info(f"実行間隔: {self.interval_seconds}秒 ({self.interval_seconds / 3600:.1f}時間)")
+        self.logger.info(f"スケジュール: {self.schedule_policy.describe()}")
         self.logger.info(f"最大リトライ回数: {self.max_retries}")
         self.logger.info("停止するには Ctrl+C を押してください")
         self.logger.info("="*60)
@@ -278,6 +624,19 @@ class DaemonBase(ABC):
             )
 
         self.running = True
+        self._start_metrics()
+
+        # 初回実行時刻（休止時間帯に起動した場合は延期）
+        first_run_time, reason = self.schedule_policy.initial_run(datetime.now())
+        if first_run_time > datetime.now():
+            self.logger.info(f"初回実行: {first_run_time.strftime('%Y-%m-%d %H:%M:%S')}（{reason}）")
+            self._write_status(
+                state='waiting',
+                next_run_at=first_run_time.isoformat(timespec='seconds'),
+                next_run_reason=reason
+            )
+            if not self._wait_until(first_run_time):
+                self.shutdown_requested = True
 
         # レガシーシステムと同じ while True パターン
         while True:
@@ -291,10 +650,28 @@ class DaemonBase(ABC):
                 self.logger.info("")
                 self.logger.info(f"--- タスク実行開始 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ---")
                 start_time = datetime.now()
+                self._cycle_started = start_time
+                self._write_status(
+                    state='running',
+                    last_started_at=start_time.isoformat(timespec='seconds'),
+                    next_run_at=None,
+                    next_run_reason=None
+                )
 
-                success = self._execute_with_retry()
+                self._cycle_report = CycleReport()
+                profiler = self._start_profiler()
+                try:
+                    success = self._execute_with_retry()
+                finally:
+                    self._stop_profiler(profiler)
+                    self._finish_cycle_report()
 
                 elapsed_seconds = (datetime.now() - start_time).total_seconds()
+                self.metrics.record_call(
+                    'daemon', 'execute_task', self.name, elapsed_seconds,
+                    error_class=None if success else 'task_failed'
+                )
+                self.write_metrics()
 
                 if success:
                     self.logger.info(
@@ -305,18 +682,28 @@ class DaemonBase(ABC):
                         f"--- タスク失敗 （所要時間: {elapsed_seconds:.1f}秒） ---"
                     )
 
-                # 次回実行時刻を計算
-                next_run_time = datetime.now() + timedelta(seconds=self.interval_seconds)
+                # 次回実行時刻を計算（所要時間・未処理件数・スケジュールポリシーから）
+                next_run_time, reason, pending = self._schedule_next_run(start_time, elapsed_seconds)
+                wait_seconds = (next_run_time - datetime.now()).total_seconds()
 
                 self.logger.info(
-                    f"次回実行: {next_run_time.strftime('%Y-%m-%d %H:%M:%S')} ごろ"
+                    f"次回実行: {next_run_time.strftime('%Y-%m-%d %H:%M:%S')} ごろ（{reason}）"
                 )
                 self.logger.info(
-                    f"({self.interval_seconds}秒待機...)"
+                    f"({wait_seconds:.0f}秒待機...)"
+                )
+                self._write_status(
+                    state='waiting',
+                    last_finished_at=datetime.now().isoformat(timespec='seconds'),
+                    last_duration_seconds=round(elapsed_seconds, 1),
+                    last_success=success,
+                    pending_work=pending,
+                    next_run_at=next_run_time.isoformat(timespec='seconds'),
+                    next_run_reason=reason
                 )
 
                 # 待機（短い間隔で分割してシグナル応答性を向上）
-                if not self._interruptible_sleep(self.interval_seconds):
+                if not self._wait_until(next_run_time):
                     # シグナルで中断された場合
                     break
 
@@ -335,8 +722,15 @@ class DaemonBase(ABC):
                 self.logger.info(
                     f"{self.interval_seconds}秒後にタスクを再実行します..."
                 )
+                next_run_time = datetime.now() + timedelta(seconds=self.interval_seconds)
+                self._write_status(
+                    state='waiting',
+                    last_error=str(e),
+                    next_run_at=next_run_time.isoformat(timespec='seconds'),
+                    next_run_reason='重大なエラー後の再実行'
+                )
 
-                if not self._interruptible_sleep(self.interval_seconds):
+                if not self._wait_until(next_run_time):
                     # シグナルで中断された場合
                     break
 
@@ -347,6 +741,8 @@ class DaemonBase(ABC):
         self.logger.info("="*60)
 
         self.running = False
+        self._write_status(state='stopped', next_run_at=None, next_run_reason=None)
+        self._stop_metrics()
 
         # 通知: デーモン停止
         if self.notifier:
@@ -356,6 +752,8 @@ class DaemonBase(ABC):
                 f'デーモンが正常に停止しました。',
                 'INFO'
             )
+            # 未送信の通知を送信してから終了
+            self.notifier.close()
 
         self.logger.info(f"{self.name} デーモンを停止しました")
         self.logger.info("お疲れ様でした")
@@ -374,12 +772,22 @@ class DaemonBase(ABC):
             stats: 統計情報（辞書）
             next_run_time: 次回実行予定時刻（オプション）
         """
+        # 数値の統計はメトリクス（ゲージ）にも記録
+        self._record_task_stats(task_name, stats)
+
         if not self.notifier or not self.notifier.is_enabled('task_completion'):
             return
 
-        # 次回実行時刻の計算（引数で渡されていない場合）
+        # 次回実行時刻の見込み（引数で渡されていない場合、未処理件数は前回の値を使用）
         if next_run_time is None:
-            next_run_time = datetime.now() + timedelta(seconds=self.interval_seconds)
+            now = datetime.now()
+            cycle_started = self._cycle_started or now
+            try:
+                next_run_time, _ = self.schedule_policy.next_run(
+                    cycle_started, (now - cycle_started).total_seconds(), self._last_pending, now
+                )
+            except Exception:
+                next_run_time = now + timedelta(seconds=self.interval_seconds)
 
         # レポートメッセージを作成
         message_lines = []
@@ -398,6 +806,11 @@ class DaemonBase(ABC):
                 elif isinstance(value, (int, float)) and key != 'duration_seconds':
                     message_lines.append(f"{key}: {value:,}")
 
+        # 処理時間の内訳（このサイクルで self.stage() を使った場合）
+        if self._cycle_report is not None and self._cycle_report.has_stages:
+            message_lines.append("【処理時間の内訳】")
+            message_lines.extend(self._cycle_report.format_lines())
+
         # 次回実行時刻
         message_lines.append(f"\n次回実行予定: {next_run_time.strftime('%Y-%m-%d %H:%M:%S')}")
 
@@ -411,6 +824,14 @@ class DaemonBase(ABC):
             level='INFO'
         )
 
+    def _record_task_stats(self, task_name: str, stats: Dict[str, Any], prefix: str = ''):
+        """統計情報（ネストした辞書も可）の数値をゲージ task_stat として記録"""
+        for key, value in (stats or {}).items():
+            if isinstance(value, dict):
+                self._record_task_stats(task_name, value, prefix=f'{prefix}{key}.')
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                self.metrics.set_gauge('task_stat', value, daemon=self.name, task=task_name, key=f'{prefix}{key}')
+
     def stop(self):
         """
         デーモンを停止（外部から呼び出す場合）
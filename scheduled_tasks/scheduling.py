@@ -0,0 +1,268 @@
+"""
+デーモンの実行スケジュール（次回実行時刻の決め方）
+
+DaemonBase はサイクル終了ごとに、計測したサイクル所要時間と未処理件数（get_pending_work()）を
+スケジュールポリシーに渡して次回実行時刻を決める。
+
+- FixedDelayPolicy: 終了から一定時間後（従来の動作、デフォルト）
+- FixedRatePolicy: 開始から一定間隔（start-to-start、処理時間が長くても周期がずれない）
+- BacklogPolicy: 未処理件数が多いほど間隔を短くする（min_interval〜max_interval）
+- QuietHoursPolicy: 他のポリシーを包み、休止時間帯（例: 23時〜6時）は実行しない
+
+使用例:
+    policy = QuietHoursPolicy(FixedDelayPolicy(60), start_hour=23, end_hour=6)
+    daemon = MyDaemon('my_daemon', interval_seconds=60, schedule_policy=policy)
+"""
+
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+
+class SchedulePolicy(ABC):
+    """
+    スケジュールポリシーの基底クラス
+
+    サブクラスで next_run() を実装する。戻り値の reason はログ・ステータス表示用。
+    """
+
+    name = 'base'
+
+    @abstractmethod
+    def next_run(
+        self,
+        cycle_started: datetime,
+        cycle_seconds: float,
+        pending: Optional[int],
+        now: datetime
+    ) -> Tuple[datetime, str]:
+        """
+        次回実行時刻を計算
+
+        Args:
+            cycle_started: 今回のサイクルの開始時刻
+            cycle_seconds: 今回のサイクルの所要時間（秒、リトライ待機を含む）
+            pending: 未処理件数（取得できない場合はNone）
+            now: 現在時刻
+
+        Returns:
+            tuple: (次回実行時刻, 理由)
+        """
+        pass
+
+    def initial_run(self, now: datetime) -> Tuple[datetime, str]:
+        """起動直後の初回実行時刻（デフォルト: 即時）"""
+        return now, '起動直後'
+
+    def describe(self) -> str:
+        """ログ・ステータス表示用の説明"""
+        return self.name
+
+
+class FixedDelayPolicy(SchedulePolicy):
+    """サイクル終了から interval_seconds 後に実行（従来の動作）"""
+
+    name = 'fixed-delay'
+
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+
+    def next_run(self, cycle_started, cycle_seconds, pending, now):
+        return now + timedelta(seconds=self.interval_seconds), f'終了から{self.interval_seconds:.0f}秒後'
+
+    def describe(self) -> str:
+        return f'{self.name}（終了から{self.interval_seconds:.0f}秒）'
+
+
+class FixedRatePolicy(SchedulePolicy):
+    """
+    サイクル開始から interval_seconds ごとに実行（start-to-start）
+
+    処理が間隔より長引いた場合は、次の周期まで待たずに min_delay_seconds 後に実行する
+    （連続実行でAPIクォータを使い切らないための最小間隔）。
+    """
+
+    name = 'fixed-rate'
+
+    def __init__(self, interval_seconds: float, min_delay_seconds: float = 60):
+        self.interval_seconds = interval_seconds
+        self.min_delay_seconds = min_delay_seconds
+
+    def next_run(self, cycle_started, cycle_seconds, pending, now):
+        return _start_to_start(cycle_started, self.interval_seconds, self.min_delay_seconds, now)
+
+    def describe(self) -> str:
+        return f'{self.name}（開始から{self.interval_seconds:.0f}秒ごと）'
+
+
+class BacklogPolicy(SchedulePolicy):
+    """
+    未処理件数に応じて実行間隔（start-to-start）を変える
+
+    - pending = 0: max_interval_seconds
+    - pending >= high_watermark: min_interval_seconds
+    - その間は線形に補間
+    - pending が取得できない場合は max_interval_seconds
+    """
+
+    name = 'backlog'
+
+    def __init__(
+        self,
+        min_interval_seconds: float,
+        max_interval_seconds: float,
+        high_watermark: int,
+        min_delay_seconds: float = 60
+    ):
+        """
+        Args:
+            min_interval_seconds: 未処理件数が多いときの間隔（秒）
+            max_interval_seconds: 未処理がないときの間隔（秒）
+            high_watermark: 最短間隔にする未処理件数
+            min_delay_seconds: 処理が間隔より長引いた場合の最小待機時間（秒）
+        """
+        if min_interval_seconds > max_interval_seconds:
+            raise ValueError(
+                f"min_interval_seconds（{min_interval_seconds}）は "
+                f"max_interval_seconds（{max_interval_seconds}）以下にしてください"
+            )
+        self.min_interval_seconds = min_interval_seconds
+        self.max_interval_seconds = max_interval_seconds
+        self.high_watermark = max(1, high_watermark)
+        self.min_delay_seconds = min_delay_seconds
+
+    def interval_for(self, pending: Optional[int]) -> float:
+        """未処理件数に対応する実行間隔（秒）"""
+        if not pending or pending <= 0:
+            return self.max_interval_seconds
+        ratio = min(1.0, pending / self.high_watermark)
+        return self.max_interval_seconds - (self.max_interval_seconds - self.min_interval_seconds) * ratio
+
+    def next_run(self, cycle_started, cycle_seconds, pending, now):
+        interval = self.interval_for(pending)
+        next_time, reason = _start_to_start(cycle_started, interval, self.min_delay_seconds, now)
+        pending_text = '不明' if pending is None else f'{pending:,}件'
+        return next_time, f'未処理{pending_text} → 間隔{interval:.0f}秒、{reason}'
+
+    def describe(self) -> str:
+        return (
+            f'{self.name}（{self.min_interval_seconds:.0f}〜{self.max_interval_seconds:.0f}秒、'
+            f'{self.high_watermark:,}件以上で最短）'
+        )
+
+
+class QuietHoursPolicy(SchedulePolicy):
+    """
+    休止時間帯を避けるポリシー（他のポリシーを包む）
+
+    inner が決めた次回実行時刻が休止時間帯に入る場合は、休止時間帯の終了時刻に延期する。
+    start_hour > end_hour の場合は日付をまたぐ（例: 23〜6 は 23:00〜翌5:59）。
+    """
+
+    name = 'quiet-hours'
+
+    def __init__(self, inner: SchedulePolicy, start_hour: int, end_hour: int):
+        """
+        Args:
+            inner: 休止時間帯以外で使うポリシー
+            start_hour: 休止開始時（0-23、この時刻から休止）
+            end_hour: 休止終了時（0-23、この時刻から再開）
+        """
+        if not (0 <= start_hour <= 23 and 0 <= end_hour <= 23):
+            raise ValueError(f"時刻は0〜23で指定してください: {start_hour}, {end_hour}")
+        self.inner = inner
+        self.start_hour = start_hour
+        self.end_hour = end_hour
+
+    def is_quiet(self, moment: datetime) -> bool:
+        """指定時刻が休止時間帯か"""
+        if self.start_hour == self.end_hour:
+            return False
+        if self.start_hour < self.end_hour:
+            return self.start_hour <= moment.hour < self.end_hour
+        return moment.hour >= self.start_hour or moment.hour < self.end_hour
+
+    def quiet_end(self, moment: datetime) -> datetime:
+        """休止時間帯中の時刻に対して、その休止時間帯の終了時刻を返す"""
+        end = moment.replace(hour=self.end_hour, minute=0, second=0, microsecond=0)
+        if end <= moment:
+            end += timedelta(days=1)
+        return end
+
+    def _defer(self, next_time: datetime, reason: str) -> Tuple[datetime, str]:
+        if not self.is_quiet(next_time):
+            return next_time, reason
+        resume = self.quiet_end(next_time)
+        return resume, f'休止時間帯（{self.start_hour}時〜{self.end_hour}時）のため{resume.strftime("%H:%M")}まで延期'
+
+    def next_run(self, cycle_started, cycle_seconds, pending, now):
+        next_time, reason = self.inner.next_run(cycle_started, cycle_seconds, pending, now)
+        return self._defer(next_time, reason)
+
+    def initial_run(self, now: datetime) -> Tuple[datetime, str]:
+        next_time, reason = self.inner.initial_run(now)
+        return self._defer(next_time, reason)
+
+    def describe(self) -> str:
+        return f'{self.inner.describe()} + 休止{self.start_hour}時〜{self.end_hour}時'
+
+
+def _start_to_start(
+    cycle_started: datetime,
+    interval_seconds: float,
+    min_delay_seconds: float,
+    now: datetime
+) -> Tuple[datetime, str]:
+    """開始時刻 + 間隔。既に過ぎている場合は now + min_delay_seconds"""
+    target = cycle_started + timedelta(seconds=interval_seconds)
+    earliest = now + timedelta(seconds=min_delay_seconds)
+    if target >= earliest:
+        return target, f'開始から{interval_seconds:.0f}秒後'
+    overrun = (now - target).total_seconds()
+    if overrun > 0:
+        return earliest, f'処理が間隔を{overrun:.0f}秒超過、{min_delay_seconds:.0f}秒後に実行'
+    return earliest, f'最小間隔{min_delay_seconds:.0f}秒'
+
+
+SCHEDULE_CHOICES = ('fixed-delay', 'fixed-rate', 'backlog')
+
+
+def create_policy(
+    schedule: str,
+    interval_seconds: float,
+    min_interval_seconds: Optional[float] = None,
+    high_watermark: int = 100,
+    quiet_hours: Optional[Tuple[int, int]] = None
+) -> SchedulePolicy:
+    """
+    コマンドライン引数からポリシーを作成
+
+    Args:
+        schedule: 'fixed-delay' / 'fixed-rate' / 'backlog'
+        interval_seconds: 実行間隔（秒、backlog では未処理がないときの間隔）
+        min_interval_seconds: backlog の最短間隔（秒、省略時は interval_seconds の1/4）
+        high_watermark: backlog で最短間隔にする未処理件数
+        quiet_hours: 休止時間帯 (開始時, 終了時)（省略時は休止なし）
+
+    Returns:
+        SchedulePolicy
+    """
+    if schedule == 'fixed-delay':
+        policy = FixedDelayPolicy(interval_seconds)
+    elif schedule == 'fixed-rate':
+        policy = FixedRatePolicy(interval_seconds, min_delay_seconds=min(60, interval_seconds))
+    elif schedule == 'backlog':
+        if min_interval_seconds is None:
+            min_interval_seconds = interval_seconds / 4
+        policy = BacklogPolicy(
+            min_interval_seconds,
+            interval_seconds,
+            high_watermark,
+            min_delay_seconds=min(60, min_interval_seconds)
+        )
+    else:
+        raise ValueError(f"不明なスケジュール: {schedule}（{', '.join(SCHEDULE_CHOICES)}）")
+
+    if quiet_hours:
+        policy = QuietHoursPolicy(policy, quiet_hours[0], quiet_hours[1])
+    return policy
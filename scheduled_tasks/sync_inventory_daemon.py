@@ -26,6 +26,9 @@
 
     # 少量テスト（5件のみ処理）
     python scheduled_tasks/sync_inventory_daemon.py --skip-cache-update --dry-run --max-items 5
+
+    # 古いASINが多いときは間隔を短縮（45分〜3時間）
+    python scheduled_tasks/sync_inventory_daemon.py --schedule backlog --min-interval 2700
 """
 
 import sys
@@ -33,7 +36,8 @@ from pathlib import Path
 import argparse
 import os
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Dict, Any
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional
 import time
 
 # プラットフォーム別のファイルロックモジュールをインポート
@@ -57,11 +61,13 @@ if sys.stdout.encoding != 'utf-8':
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from scheduled_tasks.daemon_base import DaemonBase
+from scheduled_tasks.scheduling import create_policy, SCHEDULE_CHOICES
 from inventory.scripts.sync_inventory import InventorySync
 from platforms.ebay.scripts.sync_prices import EbayPriceSync
 from integrations.amazon.sp_api_client import AmazonSPAPIClient
 from integrations.amazon.config import SP_API_CREDENTIALS
 from inventory.core.master_db import MasterDB
+from inventory.core.price_history_store import PriceHistoryStore
 
 
 class SyncInventoryDaemon(DaemonBase):
@@ -85,7 +91,10 @@ class SyncInventoryDaemon(DaemonBase):
         dry_run: bool = False,
         skip_cache_update: bool = False,
         max_items: int = None,
-        stock_check_only: bool = False
+        stock_check_only: bool = False,
+        schedule: str = 'fixed-rate',
+        min_interval_seconds: int = None,
+        backlog_high_watermark: int = 1000
     ):
         """
         Args:
@@ -95,6 +104,11 @@ class SyncInventoryDaemon(DaemonBase):
             skip_cache_update: キャッシュ更新をスキップ（既存キャッシュを使用、テスト用）
             max_items: テスト用：処理する最大商品数（省略時は全件）
             stock_check_only: 在庫チェックのみ実行（SP-API同期・価格計算をスキップ）
+            schedule: スケジュール（'fixed-rate': 開始から interval_seconds ごと（デフォルト）、
+                      'fixed-delay': 終了から interval_seconds 後、
+                      'backlog': 情報が古い出品中ASINが多いほど間隔を短くする）
+            min_interval_seconds: backlog の最短間隔（秒、省略時は interval_seconds の1/4）
+            backlog_high_watermark: backlog で最短間隔にする古いASIN数（デフォルト: 1000）
         """
         # ロックファイルで単一インスタンスを保証
         lock_dir = Path(__file__).parent.parent / 'logs'
@@ -125,7 +139,14 @@ class SyncInventoryDaemon(DaemonBase):
             interval_seconds=interval_seconds,
             max_retries=3,
             retry_delay_seconds=60,
-            enable_notifications=False  # デバッグ: 通知を完全に無効化
+            enable_notifications=False,  # デバッグ: 通知を完全に無効化
+            queued_logging=True,  # 出品ごとの価格計算・在庫更新ログを書き込み待ちにしない
+            schedule_policy=create_policy(
+                schedule,
+                interval_seconds,
+                min_interval_seconds=min_interval_seconds,
+                high_watermark=backlog_high_watermark
+            )
         )
 
         # プラットフォームリストの設定
@@ -162,6 +183,9 @@ class SyncInventoryDaemon(DaemonBase):
         # Master DBの初期化（Phase 1用）
         self.master_db = MasterDB()
 
+        # Amazon価格履歴（Phase 1の観測を変化点のみ記録）
+        self.price_history = PriceHistoryStore(self.master_db)
+
         # プラットフォーム別のSyncインスタンスを事前作成
         self.sync_instances = {}
 
@@ -183,6 +207,15 @@ class SyncInventoryDaemon(DaemonBase):
         if max_items:
             self.logger.info(f"処理件数制限: {max_items}件（テストモード）")
 
+    def get_pending_work(self) -> Optional[int]:
+        """
+        未処理件数: 出品中のASINのうち、Amazon情報が interval_seconds 以上更新されていない件数
+        """
+        if self.stock_check_only:
+            return None
+        older_than = datetime.now() - timedelta(seconds=self.interval_seconds)
+        return self.master_db.count_stale_listed_products(older_than, platforms=self.platforms)
+
     def execute_task(self) -> bool:
         """
         在庫同期タスクを実行（マルチプラットフォーム並列処理）
@@ -225,7 +258,8 @@ class SyncInventoryDaemon(DaemonBase):
                 self.logger.info("\n" + "=" * 70)
                 self.logger.info("【Phase 1】SP-API → Master DB同期（全プラットフォーム共通）")
                 self.logger.info("=" * 70)
-                self._run_phase1_sp_api_sync()
+                with self.stage('phase1'):
+                    self._run_phase1_sp_api_sync()
 
             # シャットダウン要求チェック（Phase 1後、Phase 2前）
             if self.shutdown_requested:
@@ -239,7 +273,7 @@ class SyncInventoryDaemon(DaemonBase):
 
             # ThreadPoolExecutorで並列実行
             platform_stats = {}
-            with ThreadPoolExecutor(max_workers=len(self.platforms)) as executor:
+            with self.stage('phase2'), ThreadPoolExecutor(max_workers=len(self.platforms)) as executor:
                 # 各プラットフォームの同期タスクを投入
                 future_to_platform = {
                     executor.submit(self._sync_platform, platform): platform
@@ -354,32 +388,33 @@ class SyncInventoryDaemon(DaemonBase):
         start_time = time.time()
 
         try:
-            if platform == 'base':
-                # BASE: 統合同期を実行
-                # Phase 2では常にskip_cache_update=Trueを渡す
-                # （Phase 1で既にMaster DBを更新済み、またはユーザーが明示的にスキップを指定）
-                # これにより、InventorySyncの内部SP-APIクライアントによる重複呼び出しを防ぐ
-                stats = self.sync_instances[platform].run_full_sync(
-                    platform=platform,
-                    skip_cache_update=True,  # ISSUE_028: 常にTrue（Phase 1で更新済み）
-                    max_items=self.max_items,
-                    stock_check_only=self.stock_check_only  # 在庫チェックモード対応
-                )
-            elif platform == 'ebay':
-                # eBay: 価格同期（stock_check_onlyの場合は在庫復活・再公開のみ）
-                price_stats = self.sync_instances[platform].sync_all_accounts(
-                    dry_run=self.dry_run,
-                    max_items=self.max_items,
-                    stock_check_only=self.stock_check_only  # 在庫チェックモード対応
-                )
-                duration = time.time() - start_time
-                stats = {
-                    'duration_seconds': duration,
-                    'price_sync': price_stats,
-                    'stock_sync': {}  # eBayは価格同期のみ
-                }
-            else:
-                raise ValueError(f"未対応のプラットフォーム: {platform}")
+            with self.stage(f'phase2.{platform}'):
+                if platform == 'base':
+                    # BASE: 統合同期を実行
+                    # Phase 2では常にskip_cache_update=Trueを渡す
+                    # （Phase 1で既にMaster DBを更新済み、またはユーザーが明示的にスキップを指定）
+                    # これにより、InventorySyncの内部SP-APIクライアントによる重複呼び出しを防ぐ
+                    stats = self.sync_instances[platform].run_full_sync(
+                        platform=platform,
+                        skip_cache_update=True,  # ISSUE_028: 常にTrue（Phase 1で更新済み）
+                        max_items=self.max_items,
+                        stock_check_only=self.stock_check_only  # 在庫チェックモード対応
+                    )
+                elif platform == 'ebay':
+                    # eBay: 価格同期（stock_check_onlyの場合は在庫復活・再公開のみ）
+                    price_stats = self.sync_instances[platform].sync_all_accounts(
+                        dry_run=self.dry_run,
+                        max_items=self.max_items,
+                        stock_check_only=self.stock_check_only  # 在庫チェックモード対応
+                    )
+                    duration = time.time() - start_time
+                    stats = {
+                        'duration_seconds': duration,
+                        'price_sync': price_stats,
+                        'stock_sync': {}  # eBayは価格同期のみ
+                    }
+                else:
+                    raise ValueError(f"未対応のプラットフォーム: {platform}")
 
             return stats
 
@@ -406,7 +441,7 @@ class SyncInventoryDaemon(DaemonBase):
             all_asins = set()
 
             # listingsテーブルから直接取得
-            with self.master_db.get_connection() as conn:
+            with self.stage('phase1.collect'), self.master_db.get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     SELECT DISTINCT asin
@@ -435,7 +470,8 @@ class SyncInventoryDaemon(DaemonBase):
             estimated_seconds = batch_count * 12
             self.logger.info(f"  予想処理時間: {estimated_seconds:.0f}秒 ({estimated_seconds/60:.1f}分)")
 
-            price_results = self.sp_api_client.get_prices_batch(asins_list, batch_size=20)
+            with self.stage('phase1.fetch', items=len(asins_list)):
+                price_results = self.sp_api_client.get_prices_batch(asins_list, batch_size=20)
 
             # シャットダウン要求チェック（SP-API処理後）
             if self.shutdown_requested:
@@ -446,26 +482,39 @@ class SyncInventoryDaemon(DaemonBase):
             self.logger.info(f"\nMaster DBに価格・在庫情報を保存中...")
             success_count = 0
             error_count = 0
+            observations = []
 
-            for asin, price_info in price_results.items():
-                # シャットダウン要求チェック（DB保存ループ内）
-                if self.shutdown_requested:
-                    self.logger.info(f"シャットダウン要求を検出（Master DB保存中断 - {success_count}件保存済み）")
-                    break
+            with self.stage('phase1.save') as stage:
+                for asin, price_info in price_results.items():
+                    # シャットダウン要求チェック（DB保存ループ内）
+                    if self.shutdown_requested:
+                        self.logger.info(f"シャットダウン要求を検出（Master DB保存中断 - {success_count}件保存済み）")
+                        break
+
+                    try:
+                        if price_info and price_info.get('price') is not None:
+                            self.master_db.update_amazon_info(
+                                asin=asin,
+                                price_jpy=int(price_info['price']),
+                                in_stock=price_info.get('in_stock', False)
+                            )
+                            observations.append((asin, int(price_info['price']), price_info.get('in_stock', False)))
+                            success_count += 1
+                        else:
+                            error_count += 1
+                    except Exception as e:
+                        self.logger.error(f"Master DB更新エラー ({asin}): {e}")
+                        error_count += 1
+                stage.add_items(success_count)
 
+            # 4. 価格履歴に記録（変化点のみ保存、失敗しても同期は継続）
+            if observations:
                 try:
-                    if price_info and price_info.get('price') is not None:
-                        self.master_db.update_amazon_info(
-                            asin=asin,
-                            price_jpy=int(price_info['price']),
-                            in_stock=price_info.get('in_stock', False)
-                        )
-                        success_count += 1
-                    else:
-                        error_count += 1
+                    with self.stage('phase1.history', items=len(observations)):
+                        changed = self.price_history.record_observations(observations)
+                    self.logger.info(f"価格履歴: {len(observations)}件観測 / 変化点 {changed}件")
                 except Exception as e:
-                    self.logger.error(f"Master DB更新エラー ({asin}): {e}")
-                    error_count += 1
+                    self.logger.warning(f"価格履歴の記録に失敗しました: {e}")
 
             self.logger.info(f"\n【Phase 1完了】")
             self.logger.info(f"  成功: {success_count}件")
@@ -604,6 +653,25 @@ def main():
         action='store_true',
         help='在庫チェックのみ実行（SP-API同期・価格計算をスキップ）'
     )
+    parser.add_argument(
+        '--schedule',
+        choices=SCHEDULE_CHOICES,
+        default='fixed-rate',
+        help='スケジュール（fixed-rate: 開始から--intervalごと（デフォルト）、'
+             'fixed-delay: 終了から--interval後、backlog: 古いASINが多いほど間隔を短縮）'
+    )
+    parser.add_argument(
+        '--min-interval',
+        type=int,
+        default=None,
+        help='backlog の最短間隔（秒）省略時は --interval の1/4'
+    )
+    parser.add_argument(
+        '--backlog-high',
+        type=int,
+        default=1000,
+        help='backlog で最短間隔にする古いASIN数（デフォルト: 1000）'
+    )
 
     args = parser.parse_args()
 
@@ -614,7 +682,10 @@ def main():
         dry_run=args.dry_run,
         skip_cache_update=args.skip_cache_update,
         max_items=args.max_items,
-        stock_check_only=args.stock_check_only
+        stock_check_only=args.stock_check_only,
+        schedule=args.schedule,
+        min_interval_seconds=args.min_interval,
+        backlog_high_watermark=args.backlog_high
     )
 
     daemon.run()
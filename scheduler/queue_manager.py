@@ -586,10 +586,10 @@ class UploadQueueManager:
             'total': 0
         }
 
+        counts = self.db.count_upload_queue_by_status(platform=platform, account_id=account_id)
         for status in [self.STATUS_PENDING, self.STATUS_SCHEDULED,
                        self.STATUS_UPLOADING, self.STATUS_SUCCESS, self.STATUS_FAILED]:
-            items = self.db.get_upload_queue(status=status, platform=platform, account_id=account_id, limit=10000)
-            count = len(items)
+            count = counts.get(status, 0)
             stats[status] = count
             stats['total'] += count
 
@@ -27,6 +27,7 @@ import time
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from scheduled_tasks.daemon_base import DaemonBase
+from scheduled_tasks.scheduling import create_policy, SCHEDULE_CHOICES
 from scheduler.platform_uploaders.uploader_factory import UploaderFactory
 from scheduler.queue_manager import UploadQueueManager
 from inventory.core.master_db import MasterDB
@@ -53,7 +54,9 @@ class UploadSchedulerAccountDaemon(DaemonBase):
         interval_seconds: int = 60,
         batch_size: int = 10,
         business_hours_start: int = 6,
-        business_hours_end: int = 23
+        business_hours_end: int = 23,
+        schedule: str = 'fixed-delay',
+        max_interval_seconds: int = None
     ):
         """
         Args:
@@ -63,6 +66,10 @@ class UploadSchedulerAccountDaemon(DaemonBase):
             batch_size: 1回の処理件数
             business_hours_start: 営業開始時刻（時）
             business_hours_end: 営業終了時刻（時）
+            schedule: スケジュール（'fixed-delay': 終了から interval_seconds 後（デフォルト）、
+                      'backlog': 実行待ちのキューが多いほど間隔を短くする）
+                      いずれも営業時間外は実行せず、営業開始時刻まで待機する
+            max_interval_seconds: backlog でキューが空のときの間隔（秒、省略時は interval_seconds の10倍）
         """
         # プラットフォーム対応チェック
         supported = UploaderFactory.get_supported_platforms()
@@ -78,7 +85,11 @@ class UploadSchedulerAccountDaemon(DaemonBase):
             interval_seconds=interval_seconds,
             max_retries=3,
             retry_delay_seconds=60,
-            enable_notifications=True
+            enable_notifications=True,
+            schedule_policy=self._create_schedule_policy(
+                schedule, interval_seconds, max_interval_seconds,
+                batch_size, business_hours_start, business_hours_end
+            )
         )
 
         self.platform = platform
@@ -99,6 +110,35 @@ class UploadSchedulerAccountDaemon(DaemonBase):
         self.logger.info(f"営業時間: {business_hours_start}:00 - {business_hours_end}:00")
         self.logger.info(f"バッチサイズ: {batch_size}")
 
+    @staticmethod
+    def _create_schedule_policy(
+        schedule: str,
+        interval_seconds: int,
+        max_interval_seconds: Optional[int],
+        batch_size: int,
+        business_hours_start: int,
+        business_hours_end: int
+    ):
+        """スケジュールポリシーを作成（営業時間外を休止時間帯とする）"""
+        if schedule == 'backlog':
+            # キューが空なら max_interval_seconds、1バッチ分以上溜まっていれば interval_seconds
+            return create_policy(
+                'backlog',
+                max_interval_seconds or interval_seconds * 10,
+                min_interval_seconds=interval_seconds,
+                high_watermark=batch_size,
+                quiet_hours=(business_hours_end % 24, business_hours_start)
+            )
+        return create_policy(
+            schedule,
+            interval_seconds,
+            quiet_hours=(business_hours_end % 24, business_hours_start)
+        )
+
+    def get_pending_work(self) -> Optional[int]:
+        """未処理件数: 実行予定時刻を過ぎた pending のキュー件数"""
+        return self.db.count_upload_queue_due(platform=self.platform, account_id=self.account_id)
+
     def _is_business_hours(self) -> bool:
         """営業時間内かチェック"""
         now = datetime.now()
@@ -492,6 +532,18 @@ if __name__ == '__main__':
         default=23,
         help='営業終了時刻（時）'
     )
+    parser.add_argument(
+        '--schedule',
+        choices=SCHEDULE_CHOICES,
+        default='fixed-delay',
+        help='スケジュール（backlog: キューが多いほど間隔を短縮、営業時間外はいずれも待機）'
+    )
+    parser.add_argument(
+        '--max-interval',
+        type=int,
+        default=None,
+        help='backlog でキューが空のときの間隔（秒）省略時は --interval の10倍'
+    )
 
     args = parser.parse_args()
 
@@ -501,7 +553,9 @@ if __name__ == '__main__':
         interval_seconds=args.interval,
         batch_size=args.batch_size,
         business_hours_start=args.start_hour,
-        business_hours_end=args.end_hour
+        business_hours_end=args.end_hour,
+        schedule=args.schedule,
+        max_interval_seconds=args.max_interval
     )
 
     daemon.run()
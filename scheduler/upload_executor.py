@@ -7,7 +7,7 @@ scheduled_at が到来したアイテムを実際にアップロードする実
 import sys
 from pathlib import Path
 import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List
 from datetime import datetime
 
 # パスを追加
@@ -60,6 +60,7 @@ class UploadExecutor:
         # eBay プラットフォーム用マネージャー
         self.ebay_account_manager = EbayAccountManager()
         self.ebay_policy_manager = PolicyManager()
+        self._ebay_category_mappers: Dict[str, CategoryMapper] = {}  # account_id -> CategoryMapper
 
         self.rate_limit_seconds = rate_limit_seconds
         self.max_retries = max_retries
@@ -85,6 +86,60 @@ class UploadExecutor:
 
         self.last_api_call_time = time.time()
 
+    def _get_category_mapper(self, account_id: str) -> Optional[CategoryMapper]:
+        """
+        アカウント単位のCategoryMapperを取得（プリフェッチ結果を保持するため再利用する）
+
+        Args:
+            account_id: eBayアカウントID
+
+        Returns:
+            CategoryMapper or None: 認証情報がない場合None
+        """
+        if account_id in self._ebay_category_mappers:
+            return self._ebay_category_mappers[account_id]
+
+        credentials = self.ebay_account_manager.get_credentials(account_id)
+        if not credentials:
+            return None
+
+        mapper = CategoryMapper(
+            credentials=credentials,
+            environment=self.ebay_account_manager.get_environment(account_id)
+        )
+        self._ebay_category_mappers[account_id] = mapper
+        return mapper
+
+    def _prefetch_ebay_categories(self, items: List[Dict[str, Any]]):
+        """
+        バッチ内のeBayアイテムのカテゴリを事前解決
+
+        アップロードループ中にTaxonomy APIを待たないよう、処理開始前に
+        アカウント単位でタイトルをまとめて解決しておく。
+
+        Args:
+            items: キューアイテムのリスト
+        """
+        titles_by_account: Dict[str, List[str]] = {}
+
+        for item in items:
+            product = self.db.get_product(item['asin'])
+            if not product:
+                continue
+            title = product.get('title_en') or product.get('title_ja', '')
+            if title:
+                titles_by_account.setdefault(item['account_id'], []).append(title)
+
+        for account_id, titles in titles_by_account.items():
+            mapper = self._get_category_mapper(account_id)
+            if not mapper:
+                continue
+            try:
+                mapper.prefetch_categories(titles)
+            except Exception as e:
+                # 事前解決の失敗はアップロード時の個別取得にフォールバック
+                print(f"[WARN] カテゴリ事前解決に失敗しました ({account_id}): {e}")
+
     def _prepare_item_data(self, asin: str, listing_info: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         BASE API用のアイテムデータを準備
@@ -288,6 +343,10 @@ class UploadExecutor:
 
         print(f"処理対象: {len(due_items)}件\n")
 
+        # eBay: カテゴリをバッチ単位で事前解決
+        if platform == 'ebay':
+            self._prefetch_ebay_categories(due_items)
+
         # 各アイテムを処理
         results = []
         success_count = 0
@@ -376,6 +435,10 @@ class UploadExecutor:
         print(f"処理対象: {len(pending_items)}件")
         print(f"注意: scheduled_timeを無視して処理します\n")
 
+        # eBay: カテゴリをバッチ単位で事前解決
+        if platform == 'ebay':
+            self._prefetch_ebay_categories(pending_items)
+
         # 各アイテムを処理
         results = []
         success_count = 0
@@ -559,10 +622,7 @@ class UploadExecutor:
 
                 # 4. カテゴリ推薦を取得
                 print(f"  カテゴリ推薦を取得中... (試行 {retry_count + 1}/{self.max_retries})")
-                category_mapper = CategoryMapper(
-                    credentials=credentials,
-                    environment=environment
-                )
+                category_mapper = self._get_category_mapper(account_id)
 
                 title = product.get('title_en') or product.get('title_ja', '')
                 description = product.get('description_en') or product.get('description_ja', '')
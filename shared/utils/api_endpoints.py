@@ -0,0 +1,89 @@
+"""
+APIエンドポイントの切り替え
+
+SP-API / BASE / eBay の接続先を環境変数（.env）で差し替えられるようにする。
+ローカルのモックサーバー（benchmarks/mock_api_server.py）に向けて、
+認証情報やネットワークなしでデーモンの負荷試験を行うために使う。
+
+優先順位:
+1. サービスごとの環境変数（SP_API_ENDPOINT, SP_API_LWA_URL, BASE_API_URL, EBAY_API_URL）
+2. ECAUTO_MOCK_API_URL（モックサーバーのルートURL。各サービスはその配下のパス）
+3. 各クライアントの本番URL
+
+使用例:
+    ECAUTO_MOCK_API_URL=http://127.0.0.1:8800 python scheduled_tasks/sync_inventory_daemon.py
+"""
+
+import os
+from typing import Optional
+from urllib.parse import urlsplit
+
+# サービスごとの環境変数
+ENDPOINT_ENV_VARS = {
+    'sp_api': 'SP_API_ENDPOINT',
+    'sp_api_lwa': 'SP_API_LWA_URL',
+    'base': 'BASE_API_URL',
+    'ebay': 'EBAY_API_URL',
+}
+
+# ECAUTO_MOCK_API_URL 配下の各サービスのパス
+MOCK_PATHS = {
+    'sp_api': '/sp-api',
+    'sp_api_lwa': '/lwa/auth/o2/token',
+    'base': '/base/1',
+    'ebay': '/ebay',
+}
+
+MOCK_ROOT_ENV = 'ECAUTO_MOCK_API_URL'
+
+
+def get_endpoint(service: str, default: str) -> str:
+    """
+    サービスの接続先URLを取得
+
+    Args:
+        service: 'sp_api' / 'sp_api_lwa' / 'base' / 'ebay'
+        default: 上書きがない場合のURL（本番URL）
+
+    Returns:
+        str: 接続先URL（末尾の / は除く）
+    """
+    override = get_override(service)
+    return override if override else default
+
+
+def get_override(service: str) -> Optional[str]:
+    """
+    環境変数による接続先の上書きを取得
+
+    Returns:
+        str or None: 上書きされている場合はURL、されていない場合はNone
+    """
+    value = os.getenv(ENDPOINT_ENV_VARS[service], '').strip()
+    if value:
+        return value.rstrip('/')
+
+    root = os.getenv(MOCK_ROOT_ENV, '').strip()
+    if root:
+        return root.rstrip('/') + MOCK_PATHS[service]
+
+    return None
+
+
+def apply_sp_api_endpoint(client) -> None:
+    """
+    python-amazon-sp-api のクライアント（CatalogItems, Products等）の接続先を上書き
+
+    上書きがない場合は何もしない。
+    SP-API本体は client.endpoint、LWAトークンは client._auth の scheme/host/path で決まる。
+    """
+    endpoint = get_override('sp_api')
+    if endpoint:
+        client.endpoint = endpoint
+
+    token_url = get_override('sp_api_lwa')
+    if token_url:
+        parts = urlsplit(token_url)
+        client._auth.scheme = f'{parts.scheme}://'
+        client._auth.host = parts.netloc
+        client._auth.path = parts.path or '/'
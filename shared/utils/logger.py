@@ -2,12 +2,22 @@
 ログユーティリティ
 
 構造化ログ、ファイルローテーション、コンソール出力を提供
+
+キューモード（setup_logger(queued=True)）:
+    ログ呼び出し側はレコードをキューに積むだけで、フォーマットとファイル書き込みは
+    バックグラウンドスレッド（QueueListener）で行う。flushは件数・経過時間ごとにまとめて行い、
+    WARNING以上のレコードとシャットダウン時は即座にflushする。
+    sample_rates を指定すると、ロガー名ごとにINFO以下のレコードを間引ける（商品ごとのログ等）。
 """
 
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+import threading
+import time
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional
 import sys
 
 
@@ -30,13 +40,180 @@ class FlushingRotatingFileHandler(RotatingFileHandler):
             pass
 
 
+class BatchingRotatingFileHandler(RotatingFileHandler):
+    """
+    まとめてflushするRotatingFileHandler（キューモード用）
+
+    flush_records 件ごと・flush_interval 秒ごとにflushし、
+    flush_level 以上のレコードは即座にflushする。
+    QueueListener のスレッドからのみ呼ばれる前提。
+    """
+
+    def __init__(self, *args, flush_records: int = 100, flush_interval: float = 1.0,
+                 flush_level: int = logging.WARNING, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.flush_records = flush_records
+        self.flush_interval = flush_interval
+        self.flush_level = flush_level
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def emit(self, record):
+        """ログレコードを出力し、条件を満たした場合のみflushする"""
+        super().emit(record)
+        self._pending += 1
+        if (record.levelno >= self.flush_level
+                or self._pending >= self.flush_records
+                or time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        try:
+            super().flush()
+        except Exception:
+            # flush失敗時もログ出力自体は継続
+            pass
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+
+class SamplingFilter(logging.Filter):
+    """
+    ロガー名ごとにレコードを間引くフィルター
+
+    sample_rates のキーはロガー名（前方一致、最長一致を優先）、値は残す割合（0〜1）。
+    例: {'common.pricing.calculator': 0.01} → 価格計算ログを100件に1件だけ出力
+    max_level より上のレベル（デフォルト: WARNING以上）は間引かない。
+    """
+
+    def __init__(self, sample_rates: Dict[str, float], max_level: int = logging.INFO):
+        super().__init__()
+        # 最長一致のため長い順に並べる
+        self.sample_rates = sorted(sample_rates.items(), key=lambda item: len(item[0]), reverse=True)
+        self.max_level = max_level
+        self.dropped: Dict[str, int] = {}
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _rate_for(self, name: str) -> Optional[float]:
+        for prefix, rate in self.sample_rates:
+            if name == prefix or name.startswith(prefix + '.'):
+                return rate
+        return None
+
+    def filter(self, record) -> bool:
+        if record.levelno > self.max_level:
+            return True
+        rate = self._rate_for(record.name)
+        if rate is None or rate >= 1:
+            return True
+
+        # 一定間隔で残す（乱数を使わず、件数の比率を保つ）
+        with self._lock:
+            count = self._counters.get(record.name, 0)
+            self._counters[record.name] = count + 1
+            keep = rate > 0 and int((count + 1) * rate) > int(count * rate)
+            if not keep:
+                self.dropped[record.name] = self.dropped.get(record.name, 0) + 1
+        return keep
+
+
+class _FlushingQueueListener(QueueListener):
+    """キューが空の間も flush_interval ごとにハンドラをflushするQueueListener"""
+
+    def __init__(self, log_queue, *handlers, flush_interval: float = 1.0):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.flush_interval = flush_interval
+
+    def dequeue(self, block):
+        if not block:
+            return self.queue.get(block=False)
+        while True:
+            try:
+                return self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                for handler in self.handlers:
+                    handler.flush()
+
+    def stop(self):
+        super().stop()
+        for handler in self.handlers:
+            handler.flush()
+
+
+# キューモードで起動したリスナー（ロガー名 → リスナー、シャットダウン時に停止してflushする）
+_listeners: Dict[str, QueueListener] = {}
+_listeners_lock = threading.Lock()
+
+
+def _stop_listener(listener: QueueListener):
+    """リスナーを停止し、残りのレコードを書き込んでハンドラを閉じる"""
+    try:
+        listener.stop()
+    except Exception:
+        pass
+    for handler in listener.handlers:
+        try:
+            handler.close()
+        except Exception:
+            pass
+
+
+def _start_queue_listener(name: str, handlers: List[logging.Handler], flush_interval: float,
+                          sample_rates: Optional[Dict[str, float]]) -> QueueHandler:
+    """
+    handlers をバックグラウンドスレッドで処理するQueueHandlerを作成
+
+    同じロガーのリスナーが残っている場合（ハンドラを外して再設定した場合など）は、
+    先に停止してから新しいリスナーを起動する（同じファイルへの二重書き込みを防ぐ）。
+    """
+    with _listeners_lock:
+        old_listener = _listeners.pop(name, None)
+    if old_listener is not None:
+        _stop_listener(old_listener)
+
+    log_queue = queue.SimpleQueue()
+    listener = _FlushingQueueListener(log_queue, *handlers, flush_interval=flush_interval)
+    listener.start()
+    with _listeners_lock:
+        _listeners[name] = listener
+
+    queue_handler = QueueHandler(log_queue)
+    if sample_rates:
+        queue_handler.addFilter(SamplingFilter(sample_rates))
+    return queue_handler
+
+
+def shutdown_queued_logging():
+    """
+    キューモードのリスナーを停止し、残りのレコードを書き込んでflushする
+
+    プロセス終了時（atexit）にも自動で呼ばれる。
+    """
+    with _listeners_lock:
+        listeners = list(_listeners.values())
+        _listeners.clear()
+    for listener in listeners:
+        try:
+            listener.stop()
+        except Exception:
+            pass
+
+
+atexit.register(shutdown_queued_logging)
+
+
 def setup_logger(
     name: str,
     log_file: Optional[Path] = None,
     level: int = logging.INFO,
     max_bytes: int = 5 * 1024 * 1024,  # 5MB（ローテーション問題防止のため小さめに設定）
     backup_count: int = 5,
-    console_output: bool = True
+    console_output: bool = True,
+    queued: bool = False,
+    flush_interval: float = 1.0,
+    flush_records: int = 100,
+    sample_rates: Optional[Dict[str, float]] = None
 ) -> logging.Logger:
     """
     構造化ログを設定する
@@ -48,6 +225,11 @@ def setup_logger(
         max_bytes: ログファイルの最大サイズ（デフォルト: 5MB）
         backup_count: ローテーションで保持する古いログファイル数（デフォルト: 5）
         console_output: コンソールにも出力するか（デフォルト: True）
+        queued: キューモード（書き込みをバックグラウンドスレッドで行う、デフォルト: False）
+        flush_interval: キューモードのflush間隔（秒、デフォルト: 1.0）
+        flush_records: キューモードでflushするまでの最大件数（デフォルト: 100）
+        sample_rates: キューモードでINFO以下を間引くロガー名と残す割合
+                      （例: {'common.pricing.calculator': 0.1}、子ロガーの出力にも適用）
 
     Returns:
         logging.Logger: 設定済みのロガー
@@ -83,16 +265,27 @@ def setup_logger(
         datefmt='%Y-%m-%d %H:%M:%S'
     )
 
-    # ファイルハンドラ（ローテーション付き、即時フラッシュ対応）
-    file_handler = FlushingRotatingFileHandler(
-        log_file,
-        maxBytes=max_bytes,
-        backupCount=backup_count,
-        encoding='utf-8'
-    )
+    # ファイルハンドラ（ローテーション付き）
+    # 通常モード: 即時フラッシュ / キューモード: まとめてフラッシュ
+    if queued:
+        file_handler = BatchingRotatingFileHandler(
+            log_file,
+            maxBytes=max_bytes,
+            backupCount=backup_count,
+            encoding='utf-8',
+            flush_records=flush_records,
+            flush_interval=flush_interval
+        )
+    else:
+        file_handler = FlushingRotatingFileHandler(
+            log_file,
+            maxBytes=max_bytes,
+            backupCount=backup_count,
+            encoding='utf-8'
+        )
     file_handler.setLevel(level)
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    handlers = [file_handler]
 
     # ログの二重出力を防ぐため、ルートロガーへの伝播を無効化
     # 理由: 下記でルートロガーにもハンドラーを追加しているため、
@@ -104,7 +297,14 @@ def setup_logger(
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(level)
         console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
+        handlers.append(console_handler)
+
+    if queued:
+        # 呼び出し側はキューに積むだけ（フォーマット・書き込みはリスナースレッド）
+        logger.addHandler(_start_queue_listener(name, handlers, flush_interval, sample_rates))
+    else:
+        for handler in handlers:
+            logger.addHandler(handler)
 
     # ISSUE #011対応（修正版）: ルートloggerへのハンドラ設定
     # 注意: 同一ファイルへの複数RotatingFileHandlerは、ローテーション時に
@@ -116,14 +316,21 @@ def setup_logger(
     # コンソールハンドラのみ追加（重複チェック付き）
     if console_output:
         has_console_handler = any(
-            isinstance(h, logging.StreamHandler) and not isinstance(h, logging.FileHandler)
+            (isinstance(h, logging.StreamHandler) and not isinstance(h, logging.FileHandler))
+            or isinstance(h, QueueHandler)
             for h in root_logger.handlers
         )
         if not has_console_handler:
             root_console_handler = logging.StreamHandler(sys.stdout)
             root_console_handler.setLevel(level)
             root_console_handler.setFormatter(formatter)
-            root_logger.addHandler(root_console_handler)
+            if queued:
+                # 子ロガー（価格計算等）の出力もキュー経由にする
+                root_logger.addHandler(
+                    _start_queue_listener('', [root_console_handler], flush_interval, sample_rates)
+                )
+            else:
+                root_logger.addHandler(root_console_handler)
 
     return logger
 
@@ -0,0 +1,379 @@
+"""
+API呼び出しメトリクス
+
+SP-API / BASE / eBay / MasterDB の呼び出し回数・レイテンシ分布・
+レート制限による待機・エラー種別を、サービス・操作・アカウント単位で集計する。
+集計はプロセス内で共有され、DaemonBase が HTTP（Prometheusテキスト形式）と
+メトリクスファイル（JSONL、ローテーションあり）で公開する。
+
+使用例:
+    from shared.utils.metrics import track, record_throttle_wait
+
+    with track('base', 'get_items', account_id) as call:
+        response = requests.get(...)
+        call.set_status(response.status_code)   # 4xx/5xx はエラーとして集計
+
+    record_throttle_wait('sp_api', 'get_prices_batch', 'default', wait_seconds)
+
+    @instrument_methods('master_db')
+    class MasterDB: ...
+"""
+
+import functools
+import math
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Tuple, List
+
+# レイテンシのヒストグラム境界（秒）
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+METRIC_PREFIX = 'ecauto'
+
+SeriesKey = Tuple[str, str, str]  # (service, operation, account)
+
+
+def classify_error(exc: BaseException) -> str:
+    """
+    例外をエラー種別に分類（ラベルの種類が増えすぎないように）
+
+    Returns:
+        str: 'quota_exceeded' / 'http_429' / 'timeout' / 'connection' / 例外クラス名 など
+    """
+    message = str(exc)
+    if 'QuotaExceeded' in message or 'Throttled' in type(exc).__name__:
+        return 'quota_exceeded'
+
+    response = getattr(exc, 'response', None)
+    status_code = getattr(response, 'status_code', None)
+    if isinstance(status_code, int):
+        return f'http_{status_code}'
+
+    name = type(exc).__name__
+    if 'Timeout' in name:
+        return 'timeout'
+    if 'Connection' in name:
+        return 'connection'
+    return name
+
+
+def caller_name(depth: int = 2) -> str:
+    """呼び出し元の関数名（_request 等の共通メソッドから操作名を得るため）"""
+    try:
+        return sys._getframe(depth).f_code.co_name
+    except ValueError:
+        return 'unknown'
+
+
+class _Series:
+    """1系列（service, operation, account）の集計値"""
+
+    __slots__ = ('calls', 'errors', 'bucket_counts', 'latency_sum', 'latency_max',
+                 'throttle_waits', 'throttle_wait_seconds')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors: Dict[str, int] = {}
+        self.bucket_counts = [0] * (len(LATENCY_BUCKETS) + 1)  # 最後は +Inf
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.throttle_waits = 0
+        self.throttle_wait_seconds = 0.0
+
+    def observe(self, seconds: float):
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.bucket_counts[i] += 1
+                break
+        else:
+            self.bucket_counts[-1] += 1
+        self.latency_sum += seconds
+        if seconds > self.latency_max:
+            self.latency_max = seconds
+
+    def quantile(self, q: float) -> Optional[float]:
+        """ヒストグラムからの近似分位点（バケット上限）"""
+        total = sum(self.bucket_counts)
+        if total == 0:
+            return None
+        threshold = q * total
+        cumulative = 0
+        for i, count in enumerate(self.bucket_counts):
+            cumulative += count
+            if cumulative >= threshold:
+                return LATENCY_BUCKETS[i] if i < len(LATENCY_BUCKETS) else self.latency_max
+        return self.latency_max
+
+
+class MetricsRegistry:
+    """
+    メトリクスの集計（スレッドセーフ）
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series: Dict[SeriesKey, _Series] = {}
+        self._gauges: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+        self.started_at = time.time()
+
+    def _get(self, service: str, operation: str, account: Optional[str]) -> _Series:
+        key = (service, operation, account or '')
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = _Series()
+        return series
+
+    def record_call(
+        self,
+        service: str,
+        operation: str,
+        account: Optional[str],
+        duration: float,
+        error_class: Optional[str] = None
+    ):
+        """
+        呼び出しを1件記録
+
+        Args:
+            service: 'sp_api' / 'base' / 'ebay' / 'master_db' / 'daemon' 等
+            operation: 操作名（メソッド名）
+            account: アカウントID（無い場合はNone）
+            duration: 所要時間（秒）
+            error_class: エラー種別（成功時はNone）
+        """
+        with self._lock:
+            series = self._get(service, operation, account)
+            series.calls += 1
+            series.observe(duration)
+            if error_class:
+                series.errors[error_class] = series.errors.get(error_class, 0) + 1
+
+    def record_throttle_wait(self, service: str, operation: str, account: Optional[str], seconds: float):
+        """レート制限による待機を記録"""
+        if seconds <= 0:
+            return
+        with self._lock:
+            series = self._get(service, operation, account)
+            series.throttle_waits += 1
+            series.throttle_wait_seconds += seconds
+
+    def set_gauge(self, name: str, value: float, **labels):
+        """
+        ゲージを設定（クォータ残量・タスク統計など）
+
+        Args:
+            name: メトリクス名（接頭辞 ecauto_ は自動付与）
+            value: 値
+            **labels: ラベル
+        """
+        key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        with self._lock:
+            self._gauges[key] = float(value)
+
+    def reset(self):
+        """全メトリクスを初期化"""
+        with self._lock:
+            self._series.clear()
+            self._gauges.clear()
+            self.started_at = time.time()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        JSON向けの集計結果
+
+        Returns:
+            dict: {'started_at', 'series': [...], 'gauges': [...]}
+        """
+        with self._lock:
+            series = [
+                {
+                    'service': service,
+                    'operation': operation,
+                    'account': account,
+                    'calls': s.calls,
+                    'errors': dict(s.errors),
+                    'latency': {
+                        'sum': round(s.latency_sum, 4),
+                        'avg': round(s.latency_sum / s.calls, 4) if s.calls else None,
+                        'p50': s.quantile(0.5),
+                        'p95': s.quantile(0.95),
+                        'max': round(s.latency_max, 4),
+                    },
+                    'throttle_waits': s.throttle_waits,
+                    'throttle_wait_seconds': round(s.throttle_wait_seconds, 3),
+                }
+                for (service, operation, account), s in sorted(self._series.items())
+            ]
+            gauges = [
+                {'name': name, 'labels': dict(labels), 'value': value}
+                for (name, labels), value in sorted(self._gauges.items())
+            ]
+        return {'started_at': self.started_at, 'series': series, 'gauges': gauges}
+
+    def render_prometheus(self) -> str:
+        """Prometheusテキスト形式（exposition format 0.0.4）"""
+        p = METRIC_PREFIX
+        lines: List[str] = []
+
+        with self._lock:
+            items = sorted(self._series.items())
+            gauges = sorted(self._gauges.items())
+
+            lines.append(f'# HELP {p}_api_calls_total API呼び出し回数')
+            lines.append(f'# TYPE {p}_api_calls_total counter')
+            for key, s in items:
+                lines.append(f'{p}_api_calls_total{_labels(key)} {s.calls}')
+
+            lines.append(f'# HELP {p}_api_errors_total API呼び出しのエラー回数（種別ごと）')
+            lines.append(f'# TYPE {p}_api_errors_total counter')
+            for key, s in items:
+                for error_class, count in sorted(s.errors.items()):
+                    lines.append(f'{p}_api_errors_total{_labels(key, error_class=error_class)} {count}')
+
+            lines.append(f'# HELP {p}_api_call_duration_seconds API呼び出しの所要時間')
+            lines.append(f'# TYPE {p}_api_call_duration_seconds histogram')
+            for key, s in items:
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS, s.bucket_counts):
+                    cumulative += count
+                    lines.append(f'{p}_api_call_duration_seconds_bucket{_labels(key, le=_fmt(bound))} {cumulative}')
+                cumulative += s.bucket_counts[-1]
+                lines.append(f'{p}_api_call_duration_seconds_bucket{_labels(key, le="+Inf")} {cumulative}')
+                lines.append(f'{p}_api_call_duration_seconds_sum{_labels(key)} {_fmt(s.latency_sum)}')
+                lines.append(f'{p}_api_call_duration_seconds_count{_labels(key)} {s.calls}')
+
+            lines.append(f'# HELP {p}_api_throttle_waits_total レート制限による待機回数')
+            lines.append(f'# TYPE {p}_api_throttle_waits_total counter')
+            for key, s in items:
+                if s.throttle_waits:
+                    lines.append(f'{p}_api_throttle_waits_total{_labels(key)} {s.throttle_waits}')
+
+            lines.append(f'# HELP {p}_api_throttle_wait_seconds_total レート制限による待機時間の合計')
+            lines.append(f'# TYPE {p}_api_throttle_wait_seconds_total counter')
+            for key, s in items:
+                if s.throttle_waits:
+                    lines.append(f'{p}_api_throttle_wait_seconds_total{_labels(key)} {_fmt(s.throttle_wait_seconds)}')
+
+            seen = set()
+            for (name, labels), value in gauges:
+                if name not in seen:
+                    lines.append(f'# TYPE {p}_{name} gauge')
+                    seen.add(name)
+                label_str = ','.join(f'{k}="{_escape(v)}"' for k, v in labels)
+                lines.append(f'{p}_{name}{{{label_str}}} {_fmt(value)}' if label_str else f'{p}_{name} {_fmt(value)}')
+
+        lines.append(f'# TYPE {p}_process_start_time_seconds gauge')
+        lines.append(f'{p}_process_start_time_seconds {_fmt(self.started_at)}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _fmt(value: float) -> str:
+    if isinstance(value, float) and (math.isinf(value) or math.isnan(value)):
+        return '+Inf' if value > 0 else 'NaN'
+    return repr(round(value, 6)) if isinstance(value, float) else str(value)
+
+
+def _labels(key: SeriesKey, **extra) -> str:
+    service, operation, account = key
+    pairs = [('service', service), ('operation', operation), ('account', account)] + list(extra.items())
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in pairs) + '}'
+
+
+# プロセス内で共有するレジストリ
+_registry = MetricsRegistry()
+
+
+def get_registry() -> MetricsRegistry:
+    """共有レジストリを取得"""
+    return _registry
+
+
+class _Call:
+    """track() 内で結果（HTTPステータス等）を設定するためのオブジェクト"""
+
+    __slots__ = ('error_class',)
+
+    def __init__(self):
+        self.error_class: Optional[str] = None
+
+    def set_status(self, status_code: int):
+        """HTTPステータスを設定（4xx/5xx はエラーとして集計）"""
+        if status_code >= 400:
+            self.error_class = f'http_{status_code}'
+
+    def set_error(self, error_class: str):
+        """エラー種別を設定（例外にならないエラー用）"""
+        self.error_class = error_class
+
+
+@contextmanager
+def track(service: str, operation: str, account: Optional[str] = None):
+    """
+    呼び出しを計測するコンテキストマネージャー
+
+    例外が発生した場合は classify_error() の種別で記録して再送出する。
+
+    Args:
+        service: サービス名
+        operation: 操作名
+        account: アカウントID
+    """
+    call = _Call()
+    start = time.perf_counter()
+    try:
+        yield call
+    except BaseException as e:
+        call.error_class = classify_error(e)
+        raise
+    finally:
+        _registry.record_call(service, operation, account, time.perf_counter() - start, call.error_class)
+
+
+def record_throttle_wait(service: str, operation: str, account: Optional[str], seconds: float):
+    """レート制限による待機を記録（共有レジストリ）"""
+    _registry.record_throttle_wait(service, operation, account, seconds)
+
+
+def set_gauge(name: str, value: float, **labels):
+    """ゲージを設定（共有レジストリ）"""
+    _registry.set_gauge(name, value, **labels)
+
+
+def instrument_methods(service: str, account_attr: Optional[str] = None, exclude: Tuple[str, ...] = ()):
+    """
+    クラスの公開メソッドをまとめて計測するクラスデコレーター
+
+    Args:
+        service: サービス名
+        account_attr: アカウントIDを持つ属性名（無い場合はNone）
+        exclude: 計測しないメソッド名
+    """
+    def decorate(cls):
+        for name, func in list(vars(cls).items()):
+            if name.startswith('_') or name in exclude or not callable(func) or isinstance(func, (staticmethod, classmethod)):
+                continue
+            setattr(cls, name, _wrap_method(func, service, name, account_attr))
+        return cls
+    return decorate
+
+
+def _wrap_method(func, service: str, operation: str, account_attr: Optional[str]):
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        account = getattr(self, account_attr, None) if account_attr else None
+        start = time.perf_counter()
+        error_class = None
+        try:
+            return func(self, *args, **kwargs)
+        except BaseException as e:
+            error_class = classify_error(e)
+            raise
+        finally:
+            _registry.record_call(service, operation, account, time.perf_counter() - start, error_class)
+    return wrapper
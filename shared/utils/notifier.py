@@ -2,14 +2,265 @@
 通知ユーティリティ
 
 Chatwork、Discord、Slack、Windowsイベントログ、メールでの通知を提供
+
+通知はデフォルトでバックグラウンドスレッド（NotificationDispatcher）から送信され、
+notify() の呼び出し側は送信を待たない。
+- 同じイベント（event_type + タイトル）は coalesce_seconds 秒以内の重複をまとめ、件数付きの1通にする
+- 送信間隔を min_interval_seconds 秒以上あける（通知先ごと）
+- 送信スレッドは通知先（通知方法 + Webhook URL・ルームID等）ごとにプロセス内で1つを共有する
+  （sp_api_client / daemon_base 等が別々に Notifier を作成しても、同じ通知先への送信はまとめて制御される）
+- 送信失敗時は指数バックオフでリトライ
+- プロセス終了時に未送信分を送信
+
+設定（config/notifications.json の "dispatch"、省略時はデフォルト値）:
+    "dispatch": {
+        "async": true,
+        "coalesce_seconds": 60,
+        "queue_size": 100,
+        "min_interval_seconds": 1.0,
+        "max_retries": 3,
+        "retry_backoff_seconds": 2.0
+    }
 """
 
+import atexit
 import json
 import logging
+import queue
+import threading
+import time
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, Tuple
 from datetime import datetime
-import requests
+
+# requests は読み込みが重いため、各送信メソッド内で読み込む（通知を使わないプロセスの起動を速くするため）
+
+# レベルの重大度（まとめた通知は最も重いレベルで送る）
+LEVEL_SEVERITY = {'INFO': 0, 'WARNING': 1, 'ERROR': 2}
+
+_STOP = object()
+
+# 通知先 → 共有の送信スレッド
+_dispatchers: Dict[Tuple[str, ...], 'NotificationDispatcher'] = {}
+_dispatchers_lock = threading.Lock()
+
+
+def _channel_key(config: Dict[str, Any]) -> Tuple[str, ...]:
+    """通知先の識別キー（通知方法 + 送信先）"""
+    method = config.get('method', 'chatwork')
+    method_config = config.get(method, {}) or {}
+    if method in ('discord', 'slack'):
+        return (method, method_config.get('webhook_url', ''))
+    if method == 'chatwork':
+        return (method, str(method_config.get('room_id', '')))
+    if method == 'email':
+        return (method, method_config.get('smtp_server', ''), method_config.get('to_email', ''))
+    return (method,)
+
+
+def get_dispatcher(config: Dict[str, Any], send_func: Callable[[str, str, str], bool]) -> 'NotificationDispatcher':
+    """
+    通知先の共有送信スレッドを取得（無ければ作成）
+
+    同じ通知先には同じ設定で送信するため、送信関数は最初に作成した Notifier のものを使う。
+
+    Args:
+        config: 通知設定
+        send_func: 作成時に使う送信関数 (title, message, level) -> bool
+
+    Returns:
+        NotificationDispatcher: 停止済みの場合もそのまま返す（呼び出し側で closed を確認する）
+    """
+    key = _channel_key(config)
+    with _dispatchers_lock:
+        dispatcher = _dispatchers.get(key)
+        if dispatcher is None:
+            dispatch_config = config.get('dispatch', {})
+            dispatcher = NotificationDispatcher(
+                send_func,
+                channel=key[0],
+                coalesce_seconds=dispatch_config.get('coalesce_seconds', 60),
+                queue_size=dispatch_config.get('queue_size', 100),
+                min_interval_seconds=dispatch_config.get('min_interval_seconds', 1.0),
+                max_retries=dispatch_config.get('max_retries', 3),
+                retry_backoff_seconds=dispatch_config.get('retry_backoff_seconds', 2.0)
+            )
+            _dispatchers[key] = dispatcher
+        return dispatcher
+
+
+class NotificationDispatcher:
+    """
+    通知のバックグラウンド送信
+
+    submit() はキューに積むだけで即座に戻る（キューが満杯の場合は破棄してFalse）。
+    """
+
+    def __init__(
+        self,
+        send_func: Callable[[str, str, str], bool],
+        channel: str,
+        coalesce_seconds: float = 60,
+        queue_size: int = 100,
+        min_interval_seconds: float = 1.0,
+        max_retries: int = 3,
+        retry_backoff_seconds: float = 2.0
+    ):
+        """
+        Args:
+            send_func: 実際に送信する関数 (title, message, level) -> bool
+            channel: 通知方法（ログ表示用）
+            coalesce_seconds: 同じイベントをまとめる時間窓（秒）
+            queue_size: キューの上限
+            min_interval_seconds: 送信間隔の下限（秒）
+            max_retries: 送信失敗時のリトライ回数
+            retry_backoff_seconds: リトライ待機の初期値（秒、リトライごとに2倍）
+        """
+        self.send_func = send_func
+        self.channel = channel
+        self.coalesce_seconds = coalesce_seconds
+        self.min_interval_seconds = min_interval_seconds
+        self.max_retries = max_retries
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.logger = logging.getLogger('notifier')
+
+        self.stats = {'submitted': 0, 'sent': 0, 'coalesced': 0, 'dropped': 0, 'failed': 0}
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._windows: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._last_sent = 0.0
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='notifier-dispatcher', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed.is_set()
+
+    def submit(self, event_type: str, title: str, message: str, level: str) -> bool:
+        """
+        通知をキューに積む（送信は待たない）
+
+        Returns:
+            bool: キューに積めた場合True
+        """
+        try:
+            self._queue.put_nowait((event_type, title, message, level, datetime.now()))
+        except queue.Full:
+            self.stats['dropped'] += 1
+            self.logger.warning(f"通知キューが満杯のため破棄しました: {title}")
+            return False
+        self.stats['submitted'] += 1
+        return True
+
+    def close(self, timeout: float = 30):
+        """未送信の通知を送信してスレッドを停止"""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                break
+            if item is not None:
+                self._handle(item)
+            self._flush_windows(force=False)
+
+        # シャットダウン: 残りを処理してまとめ中の通知も送信
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                self._handle(item)
+        self._flush_windows(force=True)
+
+    def _handle(self, item):
+        """1件目は即送信し、時間窓内の重複はまとめる"""
+        event_type, title, message, level, created_at = item
+        key = (event_type, title)
+        now = time.monotonic()
+
+        window = self._windows.get(key)
+        if window and now < window['until']:
+            window['count'] += 1
+            window['message'] = message
+            window['last_at'] = created_at
+            if LEVEL_SEVERITY.get(level, 0) > LEVEL_SEVERITY.get(window['level'], 0):
+                window['level'] = level
+            self.stats['coalesced'] += 1
+            return
+
+        if window:
+            self._windows.pop(key)
+            self._send_summary(window)
+
+        self._windows[key] = {
+            'until': now + self.coalesce_seconds,
+            'title': title,
+            'message': message,
+            'level': level,
+            'count': 0,
+            'first_at': created_at,
+            'last_at': created_at,
+        }
+        self._deliver(title, message, level)
+        # 時間窓は送信完了から数える（送信・リトライ中に届いた重複もまとめる）
+        self._windows[key]['until'] = time.monotonic() + self.coalesce_seconds
+
+    def _flush_windows(self, force: bool):
+        """時間窓が終わったイベントのまとめ通知を送信"""
+        now = time.monotonic()
+        for key, window in list(self._windows.items()):
+            if force or now >= window['until']:
+                self._windows.pop(key)
+                self._send_summary(window)
+
+    def _send_summary(self, window: Dict[str, Any]):
+        """時間窓内の重複をまとめた通知を送信（重複が無ければ何もしない）"""
+        count = window['count']
+        if not count:
+            return
+        message = (
+            f"{window['first_at'].strftime('%H:%M:%S')}〜{window['last_at'].strftime('%H:%M:%S')} に"
+            f"同じ通知が他に{count}件ありました（最新の内容）\n\n{window['message']}"
+        )
+        self._deliver(f"{window['title']}（他{count}件）", message, window['level'])
+
+    def _deliver(self, title: str, message: str, level: str):
+        """送信間隔を守って送信（失敗時は指数バックオフでリトライ）"""
+        for attempt in range(self.max_retries + 1):
+            wait = self._last_sent + self.min_interval_seconds - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._last_sent = time.monotonic()
+
+            try:
+                ok = self.send_func(title, message, level)
+            except Exception as e:
+                self.logger.error(f"通知送信に失敗: {e}")
+                ok = False
+
+            if ok:
+                self.stats['sent'] += 1
+                return
+            if attempt < self.max_retries:
+                time.sleep(self.retry_backoff_seconds * (2 ** attempt))
+
+        self.stats['failed'] += 1
+        self.logger.error(f"通知を送信できませんでした（{self.channel}、{self.max_retries}回リトライ）: {title}")
 
 
 class Notifier:
@@ -24,10 +275,11 @@ class Notifier:
     - メール（SMTP）
     """
 
-    def __init__(self, config_path: Optional[Path] = None):
+    def __init__(self, config_path: Optional[Path] = None, async_dispatch: Optional[bool] = None):
         """
         Args:
             config_path: 通知設定ファイルのパス（デフォルト: config/notifications.json）
+            async_dispatch: バックグラウンドで送信するか（デフォルト: 設定の dispatch.async、未設定ならTrue）
         """
         if config_path is None:
             project_root = Path(__file__).resolve().parent.parent.parent
@@ -37,6 +289,13 @@ class Notifier:
         self.config = self._load_config()
         self.logger = logging.getLogger('notifier')
 
+        dispatch_config = self.config.get('dispatch', {})
+        if async_dispatch is None:
+            async_dispatch = dispatch_config.get('async', True)
+        self.async_dispatch = async_dispatch
+        self._dispatcher: Optional[NotificationDispatcher] = None
+        self._dispatcher_lock = threading.Lock()
+
     def _load_config(self) -> Dict[str, Any]:
         """設定ファイルを読み込む"""
         if not self.config_path.exists():
@@ -114,12 +373,52 @@ class Notifier:
             level: ログレベル（INFO, WARNING, ERROR）
 
         Returns:
-            bool: 成功時True
+            bool: 成功時True（バックグラウンド送信の場合はキューに積めればTrue）
         """
         # 通知が無効または該当イベントが無効な場合はスキップ
         if not self.is_enabled(event_type):
             return True
 
+        # バックグラウンド送信（キューに積んだ時点でTrue）
+        dispatcher = self._get_dispatcher()
+        if dispatcher:
+            return dispatcher.submit(event_type, title, message, level)
+
+        return self.send_now(title, message, level)
+
+    def _get_dispatcher(self) -> Optional[NotificationDispatcher]:
+        """通知先の共有送信スレッドを取得（初回の通知時に起動、停止後はNone）"""
+        if not self.async_dispatch:
+            return None
+        with self._dispatcher_lock:
+            if self._dispatcher is None:
+                self._dispatcher = get_dispatcher(self.config, self.send_now)
+            if self._dispatcher.closed:
+                return None
+            return self._dispatcher
+
+    def close(self, timeout: float = 30):
+        """
+        未送信の通知を送信して送信スレッドを停止（以降の通知は同期送信）
+
+        送信スレッドは同じ通知先の Notifier で共有しているため、それらの通知も以降は同期送信になる。
+        プロセス終了時（atexit）にも自動で呼ばれる。
+        """
+        if self._dispatcher:
+            self._dispatcher.close(timeout)
+
+    def send_now(self, title: str, message: str, level: str = 'INFO') -> bool:
+        """
+        設定された通知方法で即座に送信（呼び出し元スレッドで送信を待つ）
+
+        Args:
+            title: 通知タイトル
+            message: 通知メッセージ
+            level: ログレベル（INFO, WARNING, ERROR）
+
+        Returns:
+            bool: 成功時True
+        """
         method = self.config.get('method', 'chatwork')
 
         try:
@@ -170,6 +469,8 @@ class Notifier:
         }
 
         try:
+            import requests
+
             response = requests.post(
                 f'https://api.chatwork.com/v2/rooms/{room_id}/messages',
                 headers=headers,
@@ -207,6 +508,8 @@ class Notifier:
         }
 
         try:
+            import requests
+
             response = requests.post(
                 'https://notify-api.line.me/api/notify',
                 headers=headers,
@@ -245,6 +548,8 @@ class Notifier:
         }
 
         try:
+            import requests
+
             response = requests.post(
                 webhook_url,
                 json=data,
@@ -282,6 +587,8 @@ class Notifier:
         }
 
         try:
+            import requests
+
             response = requests.post(
                 webhook_url,
                 json=data,
@@ -0,0 +1,286 @@
+"""
+処理時間の内訳計測とプロファイリング
+
+デーモンの1サイクル（execute_task 1回分）を段階（ステージ）ごとに計測し、
+どの処理に時間がかかっているか（SP-API待機 / DB書き込み / BASE API / ログ等）を把握するためのモジュール。
+
+- CycleReport: ステージごとの経過時間・CPU時間・処理件数を集計
+- CycleProfiler: 1サイクル分のプロファイルをファイルに保存
+    - cprofile: cProfile（呼び出したスレッドのみ）→ .prof（pstats形式）+ 上位関数の .txt
+    - sample: 全スレッドのスタックを一定間隔でサンプリング → .folded（flamegraph.pl / speedscope で表示可能）
+
+使用例:
+    report = CycleReport()
+    with report.stage('phase1.fetch') as stage:
+        results = client.get_prices_batch(asins)
+        stage.add_items(len(results))
+    report.finish()
+    print('\\n'.join(report.format_lines()))
+"""
+
+import io
+import sys
+import time
+import pstats
+import cProfile
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+PROFILE_MODES = ('cprofile', 'sample')
+
+
+class _StageStats:
+    """1ステージの集計値"""
+
+    __slots__ = ('calls', 'wall', 'cpu', 'items', 'depth')
+
+    def __init__(self, depth: int):
+        self.calls = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.items = 0
+        self.depth = depth
+
+
+class StageHandle:
+    """with report.stage(...) as stage で受け取るハンドル（処理件数の加算用）"""
+
+    def __init__(self, items: int = 0):
+        self.items = items
+
+    def add_items(self, count: int = 1):
+        self.items += count
+
+
+class CycleReport:
+    """
+    1サイクルのステージ別計測結果
+
+    - 同じ名前のステージは合算（呼び出し回数も記録）
+    - ステージは入れ子にでき、レポートでは字下げして表示する
+    - CPU時間はプロセス全体（time.process_time）。並列処理中のステージでは
+      他スレッドの分も含まれるため、経過時間より大きくなることがある
+    - スレッドセーフ（ワーカースレッドから stage() を呼んでよい。作成したスレッドで
+      実行中のステージの子として扱う）
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        self.wall_seconds: Optional[float] = None
+        self.cpu_seconds: Optional[float] = None
+        self._stages: Dict[str, _StageStats] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._owner_stack: List[str] = []
+        self._local.stack = self._owner_stack
+
+    @contextmanager
+    def stage(self, name: str, items: int = 0):
+        """
+        ステージの計測（例外が発生しても計測結果は記録する）
+
+        Args:
+            name: ステージ名（例: 'phase1.fetch'）
+            items: 処理件数（後から StageHandle.add_items() で加算してもよい）
+        """
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        # ワーカースレッドのステージは、作成元スレッドで実行中のステージの子として扱う
+        depth = len(stack) if stack is self._owner_stack else len(self._owner_stack) + len(stack)
+        handle = StageHandle(items)
+        with self._lock:
+            # 開始順に表示するため、開始時に登録する
+            stats = self._stages.get(name)
+            if stats is None:
+                stats = self._stages[name] = _StageStats(depth)
+        stack.append(name)
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield handle
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            stack.pop()
+            with self._lock:
+                stats.calls += 1
+                stats.wall += wall
+                stats.cpu += cpu
+                stats.items += handle.items
+
+    def finish(self):
+        """サイクル全体の経過時間・CPU時間を確定"""
+        self.wall_seconds = time.perf_counter() - self._wall_start
+        self.cpu_seconds = time.process_time() - self._cpu_start
+
+    @property
+    def has_stages(self) -> bool:
+        return bool(self._stages)
+
+    def _totals(self):
+        if self.wall_seconds is not None:
+            return self.wall_seconds, self.cpu_seconds
+        return time.perf_counter() - self._wall_start, time.process_time() - self._cpu_start
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns:
+            dict: {'wall_seconds', 'cpu_seconds', 'unaccounted_seconds', 'stages': {name: {...}}}
+                  unaccounted_seconds はトップレベルのステージに含まれない時間
+        """
+        wall, cpu = self._totals()
+        with self._lock:
+            stages = {
+                name: {
+                    'calls': s.calls,
+                    'wall_seconds': round(s.wall, 3),
+                    'cpu_seconds': round(s.cpu, 3),
+                    'items': s.items,
+                    'depth': s.depth,
+                }
+                for name, s in self._stages.items()
+                if s.calls
+            }
+            top_level = sum(s.wall for s in self._stages.values() if s.depth == 0)
+        return {
+            'wall_seconds': round(wall, 3),
+            'cpu_seconds': round(cpu, 3),
+            'unaccounted_seconds': round(max(0.0, wall - top_level), 3),
+            'stages': stages,
+        }
+
+    def format_lines(self) -> List[str]:
+        """通知・ログ用の表示行（ステージは最初に開始した順）"""
+        data = self.to_dict()
+        wall = data['wall_seconds'] or 1e-9
+        lines = [f"合計: {data['wall_seconds']:.1f}秒（CPU {data['cpu_seconds']:.1f}秒）"]
+        for name, s in data['stages'].items():
+            indent = '  ' * (s['depth'] + 1)
+            line = f"{indent}{name}: {s['wall_seconds']:.1f}秒 ({s['wall_seconds'] / wall:.0%}) CPU {s['cpu_seconds']:.1f}秒"
+            if s['items']:
+                line += f" / {s['items']:,}件"
+                if s['wall_seconds'] > 0:
+                    line += f" ({s['items'] / s['wall_seconds']:.1f}件/秒)"
+            if s['calls'] > 1:
+                line += f" ×{s['calls']}"
+            lines.append(line)
+        if data['stages']:
+            lines.append(f"  (ステージ外): {data['unaccounted_seconds']:.1f}秒")
+        return lines
+
+
+class SamplingProfiler:
+    """
+    全スレッドのスタックを一定間隔でサンプリングするプロファイラ
+
+    cProfile と違いワーカースレッド（ThreadPoolExecutor等）も対象になり、
+    オーバーヘッドはサンプリング間隔で決まる（計測対象のコードは遅くならない）。
+    """
+
+    def __init__(self, interval: float = 0.01):
+        """
+        Args:
+            interval: サンプリング間隔（秒）
+        """
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        own_id = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            for thread in threading.enumerate():
+                names[thread.ident] = thread.name
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.samples[';'.join(reversed(stack))] += 1
+            self.sample_count += 1
+
+    def write(self, path: Path):
+        """collapsed stack 形式（1行 = 'スレッド;呼び出し元;...;関数 サンプル数'）で保存"""
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class CycleProfiler:
+    """1サイクル分のプロファイルを取得してファイルに保存"""
+
+    def __init__(self, mode: str = 'cprofile', sample_interval: float = 0.01):
+        """
+        Args:
+            mode: 'cprofile' または 'sample'
+            sample_interval: sample モードのサンプリング間隔（秒）
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"不明なプロファイルモード: {mode}（{', '.join(PROFILE_MODES)}）")
+        self.mode = mode
+        self._profiler = cProfile.Profile() if mode == 'cprofile' else SamplingProfiler(sample_interval)
+
+    def start(self):
+        if self.mode == 'cprofile':
+            self._profiler.enable()
+        else:
+            self._profiler.start()
+
+    def stop(self):
+        if self.mode == 'cprofile':
+            self._profiler.disable()
+        else:
+            self._profiler.stop()
+
+    def write(self, path_base: Path, top: int = 40) -> List[Path]:
+        """
+        プロファイルを保存
+
+        Args:
+            path_base: 拡張子なしの出力先
+            top: cprofile モードの .txt に出力する関数の数（累積時間順）
+
+        Returns:
+            list: 作成したファイル
+        """
+        path_base = Path(path_base)
+        path_base.parent.mkdir(parents=True, exist_ok=True)
+
+        if self.mode == 'sample':
+            path = path_base.with_suffix('.folded')
+            self._profiler.write(path)
+            return [path]
+
+        prof_path = path_base.with_suffix('.prof')
+        self._profiler.dump_stats(str(prof_path))
+
+        buffer = io.StringIO()
+        stats = pstats.Stats(self._profiler, stream=buffer)
+        stats.sort_stats('cumulative').print_stats(top)
+        txt_path = path_base.with_suffix('.txt')
+        txt_path.write_text(buffer.getvalue(), encoding='utf-8')
+        return [prof_path, txt_path]
@@ -0,0 +1,195 @@
+"""
+既知ASINインデックス
+
+抽出時の重複判定用に、既知のASINをメモリ上に保持する。
+
+対象:
+- sourcing.db の sourcing_candidates（候補登録済み）
+- master.db の products（商品登録済み）/ listings（出品登録済み）
+- config/blocked_asins.json（BlocklistManager、削除済み禁止商品）
+
+実行ごとに1回だけ読み込み、以降の判定はメモリ上で行う。
+候補を登録したら add() でインデックスにも反映する（再読み込み不要）。
+
+Bloomフィルタは偽陽性で新規ASINを取りこぼすため採用せず、
+ソース別の集合（set）で保持する（10万件程度で数MB）。
+
+使用例:
+    index = KnownAsinIndex.get_shared()
+    new_asins, duplicates = index.filter_new(extracted_asins)
+    ...
+    index.add(new_asins, KnownAsinIndex.CANDIDATE)
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from inventory.core.blocklist_manager import BlocklistManager
+from inventory.core.master_db import MasterDB
+
+
+project_root = Path(__file__).resolve().parent.parent.parent
+
+
+class KnownAsinIndex:
+    """
+    既知ASINのメモリ内インデックス（ソース別の集合）
+    """
+
+    # ソース種別（判定の優先順）
+    BLOCKED = 'blocked'
+    PRODUCT = 'product'
+    LISTING = 'listing'
+    CANDIDATE = 'candidate'
+    SOURCES = (BLOCKED, PRODUCT, LISTING, CANDIDATE)
+
+    _shared: Optional['KnownAsinIndex'] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        sourcing_db_path: Optional[Path] = None,
+        master_db: Optional[MasterDB] = None,
+        blocklist: Optional[BlocklistManager] = None
+    ):
+        """
+        Args:
+            sourcing_db_path: sourcing.db のパス（デフォルト: sourcing/data/sourcing.db）
+            master_db: MasterDBインスタンス（省略時はデフォルトパスで作成）
+            blocklist: BlocklistManagerインスタンス（省略時はデフォルトパスで作成）
+        """
+        self.sourcing_db_path = Path(sourcing_db_path or project_root / 'sourcing' / 'data' / 'sourcing.db')
+        self.master_db = master_db
+        self.blocklist = blocklist
+
+        self._sets: Dict[str, Set[str]] = {source: set() for source in self.SOURCES}
+        self._lock = threading.Lock()
+        self.loaded = False
+        self.load_seconds = 0.0
+
+    @classmethod
+    def get_shared(cls) -> 'KnownAsinIndex':
+        """
+        プロセス内で共有するインデックスを取得（初回呼び出し時に読み込み）
+
+        Returns:
+            KnownAsinIndex: 読み込み済みのインデックス
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls().load()
+            return cls._shared
+
+    def load(self) -> 'KnownAsinIndex':
+        """
+        全ソースからASINを読み込む
+
+        Returns:
+            KnownAsinIndex: self
+        """
+        started = time.perf_counter()
+        sets = {source: set() for source in self.SOURCES}
+
+        # sourcing.db
+        if self.sourcing_db_path.exists():
+            conn = sqlite3.connect(self.sourcing_db_path)
+            try:
+                cursor = conn.execute('SELECT asin FROM sourcing_candidates')
+                sets[self.CANDIDATE] = {row[0] for row in cursor if row[0]}
+            except sqlite3.OperationalError:
+                pass  # テーブル未作成
+            finally:
+                conn.close()
+
+        # master.db
+        master_db = self.master_db or MasterDB()
+        with master_db.get_connection() as conn:
+            sets[self.PRODUCT] = {row[0] for row in conn.execute('SELECT asin FROM products') if row[0]}
+            sets[self.LISTING] = {row[0] for row in conn.execute('SELECT DISTINCT asin FROM listings') if row[0]}
+
+        # ブロックリスト
+        blocklist = self.blocklist or BlocklistManager()
+        sets[self.BLOCKED] = set(blocklist.blocklist.get('blocked_asins', {}).keys())
+
+        with self._lock:
+            self._sets = sets
+            self.loaded = True
+            self.load_seconds = time.perf_counter() - started
+
+        return self
+
+    def classify(self, asin: str) -> Optional[str]:
+        """
+        ASINの既知ソースを取得
+
+        Args:
+            asin: ASIN
+
+        Returns:
+            str or None: 'blocked' / 'product' / 'listing' / 'candidate'（未知の場合None）
+        """
+        for source in self.SOURCES:
+            if asin in self._sets[source]:
+                return source
+        return None
+
+    def __contains__(self, asin: str) -> bool:
+        return self.classify(asin) is not None
+
+    def contains_any(self, asin: str, sources: Iterable[str]) -> bool:
+        """指定ソースのいずれかに含まれるか"""
+        return any(asin in self._sets[source] for source in sources)
+
+    def filter_new(
+        self,
+        asins: Iterable[str],
+        ignore_sources: Iterable[str] = ()
+    ) -> Tuple[List[str], Dict[str, int]]:
+        """
+        未知のASINのみを抽出
+
+        Args:
+            asins: 判定対象のASIN
+            ignore_sources: 重複とみなさないソース（例: 候補の再発見を許可する場合は 'candidate'）
+
+        Returns:
+            (new_asins, duplicates): 新規ASIN（入力順、重複除去済み）とソース別の重複件数
+        """
+        sources = [s for s in self.SOURCES if s not in set(ignore_sources)]
+        new_asins = []
+        duplicates = {source: 0 for source in sources}
+
+        for asin in dict.fromkeys(asins):
+            for source in sources:
+                if asin in self._sets[source]:
+                    duplicates[source] += 1
+                    break
+            else:
+                new_asins.append(asin)
+
+        return new_asins, duplicates
+
+    def add(self, asins: Iterable[str], source: str = CANDIDATE):
+        """
+        ASINをインデックスに追加（候補・商品登録時の差分反映）
+
+        Args:
+            asins: 追加するASIN
+            source: ソース種別
+        """
+        with self._lock:
+            self._sets[source].update(a for a in asins if a)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        ソース別の件数を取得
+
+        Returns:
+            dict: {'blocked', 'product', 'listing', 'candidate', 'total'}
+        """
+        stats = {source: len(self._sets[source]) for source in self.SOURCES}
+        stats['total'] = len(set().union(*self._sets.values()))
+        return stats
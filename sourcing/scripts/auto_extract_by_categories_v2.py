@@ -6,6 +6,7 @@ v1からの改善点:
 - 前回の続きから抽出を再開可能
 - ページ深さを20ページまで拡張可能（v1は10ページまで）
 - 履歴ファイル（JSON）で進捗を永続化
+- 複数ブラウザコンテキストによる並列抽出（--workers、コンテキストごとにスロットリング）
 
 使用例:
     # 初回実行（履歴ファイルを作成）
@@ -40,9 +41,11 @@ v1からの改善点:
 
 import argparse
 import asyncio
+import os
 import sys
 import sqlite3
 import json
+import threading
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Set, Optional
@@ -62,6 +65,16 @@ from sourcing.sources.sellersprite.utils.category_extractor import (
     build_product_research_url,
     create_browser_session
 )
+from sourcing.sources.sellersprite.utils.parallel_extractor import (
+    CategoryTask,
+    ParallelCategoryScheduler,
+    ITEMS_PER_PAGE,
+    MAX_PAGES,
+    wait_for_table
+)
+from sourcing.sources.sellersprite.utils.response_capture import enable_resource_blocking
+from sourcing.sources.sellersprite.auth_manager import create_shared_pages
+from sourcing.core.known_asin_index import KnownAsinIndex
 
 
 class CategoryHistoryManager:
@@ -70,6 +83,7 @@ class CategoryHistoryManager:
     def __init__(self, history_file: Path):
         self.history_file = history_file
         self.history = self._load_history()
+        self._lock = threading.Lock()
 
     def _load_history(self) -> Dict:
         """履歴ファイルを読み込む"""
@@ -86,10 +100,43 @@ class CategoryHistoryManager:
             }
 
     def save_history(self):
-        """履歴ファイルに保存"""
-        self.history_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.history_file, 'w', encoding='utf-8') as f:
-            json.dump(self.history, f, ensure_ascii=False, indent=2)
+        """
+        履歴ファイルに保存
+
+        保存前にディスク上の履歴とマージする（別プロセスの更新を失わないため）。
+        一時ファイルに書き込んでから置き換えるため、書き込み途中で中断しても
+        履歴ファイルが壊れない。
+        """
+        with self._lock:
+            self.history_file.parent.mkdir(parents=True, exist_ok=True)
+
+            if self.history_file.exists():
+                try:
+                    with open(self.history_file, 'r', encoding='utf-8') as f:
+                        on_disk = json.load(f)
+                    for cat_name, cat_info in on_disk.get('categories', {}).items():
+                        self._merge_category(cat_name, cat_info)
+                except (OSError, json.JSONDecodeError):
+                    pass  # 壊れた履歴は現在のメモリ上の内容で上書き
+
+            tmp_path = self.history_file.with_suffix(self.history_file.suffix + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.history, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.history_file)
+
+    def _merge_category(self, category_name: str, other: Dict):
+        """
+        カテゴリ情報をマージ（取得済みページ数は大きい方、その他は新しい方を採用）
+        """
+        current = self.history['categories'].get(category_name)
+        if current is None:
+            self.history['categories'][category_name] = dict(other)
+            return
+
+        pages_extracted = max(current.get('pages_extracted', 0), other.get('pages_extracted', 0))
+        if (other.get('last_updated') or '') > (current.get('last_updated') or ''):
+            current.update(other)
+        current['pages_extracted'] = pages_extracted
 
     def get_category_info(self, category_name: str) -> Optional[Dict]:
         """カテゴリ情報を取得"""
@@ -102,16 +149,18 @@ class CategoryHistoryManager:
         pages_extracted: int,
         asins_count: int
     ):
-        """カテゴリ情報を更新"""
-        if category_name not in self.history['categories']:
-            self.history['categories'][category_name] = {}
+        """
+        カテゴリ情報を更新
 
-        self.history['categories'][category_name].update({
-            'nodeIdPaths': node_id_paths,
-            'pages_extracted': pages_extracted,
-            'last_updated': datetime.now().isoformat(),
-            'asins_count': asins_count
-        })
+        並列ワーカーの完了順に関わらず、取得済みページ数は後退させない。
+        """
+        with self._lock:
+            self._merge_category(category_name, {
+                'nodeIdPaths': node_id_paths,
+                'pages_extracted': pages_extracted,
+                'last_updated': datetime.now().isoformat(),
+                'asins_count': asins_count
+            })
 
     def update_metadata(self, total_asins: int):
         """メタデータを更新"""
@@ -141,189 +190,6 @@ class CategoryHistoryManager:
         return categories_to_process
 
 
-async def extract_asins_with_categories_paginated(
-    page,
-    limit: int,
-    start_page: int = 1
-) -> List[Dict[str, str]]:
-    """
-    ページング対応のASIN抽出（開始ページ指定可能）
-
-    Args:
-        page: Playwrightページオブジェクト
-        limit: 取得件数
-        start_page: 開始ページ（1-20）
-
-    Returns:
-        [{"asin": "B00XXXXX", "category": "...", "nodeIdPaths": "..."}, ...]
-    """
-    from sourcing.sources.sellersprite.utils.category_extractor import log
-
-    all_data = []
-
-    try:
-        # リスト表示に切り替え
-        log("表示スタイルを「リスト」に切り替え中...")
-        try:
-            list_button = page.locator('div.el-button-group button').filter(has_text="リスト").first
-            button_count = await list_button.count()
-
-            if button_count > 0:
-                button_text = await list_button.text_content()
-                if button_text and button_text.strip() == "リスト":
-                    await list_button.click()
-                    await page.wait_for_timeout(2000)
-                    log("[OK] リスト表示に切り替えました")
-        except Exception as e:
-            log(f"[WARN] リスト表示への切り替えエラー: {e}")
-
-        # 必要なページ数を計算
-        pages_needed = (limit + 99) // 100
-        end_page = min(start_page + pages_needed - 1, 20)  # 最大20ページまで
-
-        log(f"ページネーション: {start_page}ページ目から{end_page}ページ目まで抽出予定")
-
-        # 開始ページまで移動（start_page > 1の場合）
-        if start_page > 1:
-            log(f"  開始ページ {start_page} まで移動中...")
-            for _ in range(start_page - 1):
-                try:
-                    next_button = page.locator('button.btn-next:not([disabled])')
-                    button_count = await next_button.count()
-
-                    if button_count > 0:
-                        await next_button.click()
-                        await page.wait_for_load_state("networkidle", timeout=30000)
-                        await asyncio.sleep(1)
-                    else:
-                        log(f"[WARN] 次のページボタンが見つかりません")
-                        return all_data
-                except Exception as e:
-                    log(f"[ERROR] ページ移動エラー: {e}")
-                    return all_data
-
-            log(f"  → {start_page}ページ目に到達")
-
-        # データ抽出ループ
-        for page_num in range(start_page, end_page + 1):
-            log(f"  ページ {page_num}/20 を処理中...")
-
-            # 全ての行を展開
-            log(f"    全ての行を展開中...")
-            expand_result = await page.evaluate('''() => {
-                const expandButtons = document.querySelectorAll('td.el-table__expand-column .el-table__expand-icon');
-                let clickedCount = 0;
-
-                expandButtons.forEach(button => {
-                    if (!button.classList.contains('el-table__expand-icon--expanded')) {
-                        button.click();
-                        clickedCount++;
-                    }
-                });
-
-                return {
-                    total: expandButtons.length,
-                    clicked: clickedCount
-                };
-            }''')
-            log(f"    → {expand_result['total']}個中{expand_result['clicked']}個の展開ボタンをクリック")
-
-            # DOM更新を待機
-            await page.wait_for_timeout(3000)
-
-            # テーブルの全行を走査してASINとカテゴリを抽出
-            data_on_page = await page.evaluate('''() => {
-                const data = [];
-                const rows = Array.from(document.querySelectorAll('table tbody tr'));
-
-                let currentAsin = null;
-
-                rows.forEach((row, index) => {
-                    const rowText = row.textContent || '';
-                    const asinMatch = rowText.match(/ASIN:\\s*([A-Z0-9]{10})/);
-
-                    if (asinMatch) {
-                        currentAsin = asinMatch[1];
-                    }
-
-                    const tableExpand = row.querySelector('.table-expand');
-                    if (tableExpand && currentAsin) {
-                        let categories = [];
-                        let nodeIdPaths = '';
-
-                        const productType = tableExpand.querySelector('.product-type');
-                        if (productType) {
-                            const categoryLinks = productType.querySelectorAll('a.type');
-
-                            categoryLinks.forEach((link, linkIndex) => {
-                                const categoryName = link.textContent.trim();
-                                if (categoryName) {
-                                    categories.push(categoryName);
-                                }
-
-                                if (linkIndex === categoryLinks.length - 1 && link.href) {
-                                    try {
-                                        const url = new URL(link.href, window.location.origin);
-                                        const nodeIdPathsParam = url.searchParams.get('nodeIdPaths');
-                                        if (nodeIdPathsParam) {
-                                            nodeIdPaths = nodeIdPathsParam;
-                                        }
-                                    } catch (e) {
-                                        // URLパースエラーは無視
-                                    }
-                                }
-                            });
-                        }
-
-                        data.push({
-                            asin: currentAsin,
-                            category: categories.join(' > '),
-                            nodeIdPaths: nodeIdPaths
-                        });
-
-                        currentAsin = null;
-                    }
-                });
-
-                return data;
-            }''')
-
-            categories_found = sum(1 for item in data_on_page if item.get('category'))
-            log(f"    → カテゴリ情報: {categories_found}件 / {len(data_on_page)}件")
-            log(f"    → {len(data_on_page)}件抽出")
-            all_data.extend(data_on_page)
-
-            # 最後のページでない場合、次のページに移動
-            if page_num < end_page:
-                try:
-                    next_button = page.locator('button.btn-next:not([disabled])')
-                    button_count = await next_button.count()
-
-                    if button_count > 0:
-                        await next_button.click()
-                        await page.wait_for_load_state("networkidle", timeout=30000)
-                        await asyncio.sleep(1)
-                        log(f"    次のページに移動しました")
-                    else:
-                        log(f"[WARN] 次のページボタンが見つかりません。{page_num}ページで終了します。")
-                        break
-
-                except Exception as e:
-                    log(f"[WARN] ページネーションエラー: {e}")
-                    log(f"[WARN] {page_num}ページまでの結果を返します")
-                    break
-
-        # limit件数まで制限
-        all_data = all_data[:limit]
-        log(f"合計 {len(all_data)}件のデータを抽出（目標: {limit}件）")
-
-        return all_data
-
-    except Exception as e:
-        log(f"[ERROR] データ抽出エラー: {e}")
-        raise
-
-
 class CategoryBasedExtractorV2:
     """カテゴリベースのASIN抽出クラス v2（履歴管理機能付き）"""
 
@@ -332,12 +198,16 @@ class CategoryBasedExtractorV2:
         self.db_path = project_root / 'sourcing' / 'data' / 'sourcing.db'
         self.history_manager = CategoryHistoryManager(Path(args.history_file))
 
+        # 既知ASINインデックス（sourcing.db / master.db / ブロックリスト、実行中に1回だけ読み込む）
+        self.known_index: Optional[KnownAsinIndex] = None
+
         # 統計情報
         self.stats = {
             'total_extracted': 0,
             'new_asins': 0,
             'duplicate_asins': 0,
             'categories_processed': 0,
+            'duplicates_by_source': {source: 0 for source in KnownAsinIndex.SOURCES},
         }
 
     def log(self, message: str):
@@ -354,10 +224,14 @@ class CategoryBasedExtractorV2:
         self.log(f"カテゴリあたりのページ数: {self.args.pages_per_category}ページ")
         self.log(f"再開モード: {'ON' if self.args.resume else 'OFF'}")
         self.log(f"履歴ファイル: {self.args.history_file}")
+        self.log(f"並列ワーカー数: {self.args.workers}（最小間隔: {self.args.min_interval}秒/コンテキスト）")
+        self.log(f"抽出方式: {self.args.capture_mode}{'（リソース遮断あり）' if self.args.block_resources else ''}")
         self.log("")
 
         try:
             async with create_browser_session(headless=False) as (browser, page):
+                self._browser = browser
+
                 if self.args.resume:
                     # 再開モード: 履歴から続きを処理
                     await self._resume_extraction(page)
@@ -374,6 +248,9 @@ class CategoryBasedExtractorV2:
                 self.log(f"処理カテゴリ数: {self.stats['categories_processed']}件")
                 self.log(f"総抽出ASIN数: {self.stats['total_extracted']}件")
                 self.log(f"重複ASIN数: {self.stats['duplicate_asins']}件")
+                by_source = self.stats['duplicates_by_source']
+                self.log(f"  内訳: 候補 {by_source['candidate']} / 商品 {by_source['product']} / "
+                         f"出品 {by_source['listing']} / ブロック {by_source['blocked']}")
                 if self.stats['total_extracted'] > 0:
                     self.log(f"新規率: {self.stats['new_asins'] / self.stats['total_extracted'] * 100:.1f}%")
 
@@ -405,33 +282,12 @@ class CategoryBasedExtractorV2:
 
         self.log(f"  処理対象カテゴリ数: {len(categories_to_process)}件")
 
-        all_new_asins = set()
-
-        for i, (category_name, category_info, start_page) in enumerate(categories_to_process):
-            if len(all_new_asins) >= self.args.target_new_asins:
-                self.log(f"[OK] 目標達成: {len(all_new_asins)}件の新規ASIN")
-                break
-
-            self.log("")
-            self.log(f"[カテゴリ {i+1}/{len(categories_to_process)}]")
-            self.log(f"  カテゴリ: {category_name}")
-            self.log(f"  nodeIdPaths: {category_info['nodeIdPaths']}")
-            self.log(f"  取得済みページ: {category_info.get('pages_extracted', 0)}ページ")
-            self.log(f"  開始ページ: {start_page}ページ")
-
-            # カテゴリ別抽出
-            new_asins = await self._extract_by_category_paginated(
-                page,
-                category_name,
-                category_info['nodeIdPaths'],
-                start_page,
-                all_new_asins
-            )
-
-            all_new_asins.update(new_asins)
-            self.stats['categories_processed'] += 1
-
-            self.log(f"  → 累計新規ASIN: {len(all_new_asins)}件 / {self.args.target_new_asins}件")
+        # 履歴の順序をそのまま優先度とする
+        tasks = [
+            (category_name, category_info, start_page)
+            for category_name, category_info, start_page in categories_to_process
+        ]
+        all_new_asins = await self._run_category_tasks(page, tasks)
 
         # 結果保存
         await self._save_results(all_new_asins, categories_to_process)
@@ -479,31 +335,13 @@ class CategoryBasedExtractorV2:
         # ステップ5: カテゴリ別抽出ループ
         self.log("")
         self.log("【ステップ5】カテゴリ別抽出を開始...")
-        all_new_asins = set()
-
-        for i, (category_name, category_info) in enumerate(prioritized_categories):
-            if len(all_new_asins) >= self.args.target_new_asins:
-                self.log(f"[OK] 目標達成: {len(all_new_asins)}件の新規ASIN")
-                break
-
-            self.log("")
-            self.log(f"[カテゴリ {i+1}/{len(prioritized_categories)}]")
-            self.log(f"  カテゴリ: {category_name}")
-            self.log(f"  nodeIdPaths: {category_info['nodeIdPaths']}")
-
-            # カテゴリ別抽出（1ページ目から）
-            new_asins = await self._extract_by_category_paginated(
-                page,
-                category_name,
-                category_info['nodeIdPaths'],
-                start_page=1,
-                already_found_asins=all_new_asins
-            )
-
-            all_new_asins.update(new_asins)
-            self.stats['categories_processed'] += 1
 
-            self.log(f"  → 累計新規ASIN: {len(all_new_asins)}件 / {self.args.target_new_asins}件")
+        # 優先順位付けの順序をそのまま優先度とする（1ページ目から）
+        tasks = [
+            (category_name, category_info, 1)
+            for category_name, category_info in prioritized_categories
+        ]
+        all_new_asins = await self._run_category_tasks(page, tasks)
 
         # 結果保存
         await self._save_results(all_new_asins, prioritized_categories)
@@ -526,7 +364,7 @@ class CategoryBasedExtractorV2:
         )
 
         await page.goto(url, wait_until="domcontentloaded", timeout=30000)
-        await page.wait_for_timeout(5000)
+        await wait_for_table(page)
 
         # データ抽出（フラグに応じて関数を選択）
         if self.args.use_intermediate_categories:
@@ -640,21 +478,35 @@ class CategoryBasedExtractorV2:
 
         return prioritized
 
-    async def _extract_by_category_paginated(
-        self,
-        page,
-        category_name: str,
-        node_id_paths: str,
-        start_page: int,
-        already_found_asins: Set[str]
-    ) -> Set[str]:
-        """特定カテゴリからASINを抽出（ページ指定可能）"""
-        if not node_id_paths:
-            self.log(f"  [WARN] nodeIdPathsが空のためスキップ")
-            return set()
+    async def _run_category_tasks(self, page, tasks: List[tuple]) -> Set[str]:
+        """
+        カテゴリ別抽出を並列ワーカーで実行
 
-        try:
-            url = build_product_research_url(
+        Args:
+            page: ログイン済みページ（ワーカー1が使用）
+            tasks: [(category_name, category_info, start_page), ...]（先頭ほど優先）
+
+        Returns:
+            set: 新規ASINのセット
+        """
+        all_new_asins: Set[str] = set()
+
+        # ワーカー用ページ（ログイン済みページ + 認証情報を共有する追加コンテキスト）
+        workers = max(1, self.args.workers)
+        extra_pages = []
+        if workers > 1:
+            extra_pages = await create_shared_pages(self._browser, page.context, workers - 1)
+        pages = [page] + [p for _, p in extra_pages]
+
+        request_filters = []
+        if self.args.block_resources:
+            for i, worker_page in enumerate(pages, 1):
+                request_filters.append(
+                    await enable_resource_blocking(worker_page, task_name=f'auto_extract_by_categories_v2#w{i}')
+                )
+
+        def url_builder(node_id_paths: str) -> str:
+            return build_product_research_url(
                 market=self.args.market,
                 sales_min=self.args.sales_min,
                 price_min=self.args.price_min,
@@ -663,61 +515,97 @@ class CategoryBasedExtractorV2:
                 node_id_paths=node_id_paths
             )
 
-            await page.goto(url, wait_until="domcontentloaded", timeout=30000)
-            await page.wait_for_timeout(5000)
+        scheduler = ParallelCategoryScheduler(
+            pages=pages,
+            url_builder=url_builder,
+            should_stop=lambda: len(all_new_asins) >= self.args.target_new_asins,
+            min_interval=self.args.min_interval,
+            capture_network=self.args.capture_mode == 'network'
+        )
 
-            # ページ数を計算
-            items_per_page = 100
-            pages_to_extract = self.args.pages_per_category - (start_page - 1)
-            limit = min(pages_to_extract * items_per_page, 2000)  # 最大2000件
+        for priority, (category_name, category_info, start_page) in enumerate(tasks):
+            node_id_paths = category_info.get('nodeIdPaths', '')
+            if not node_id_paths:
+                self.log(f"  [WARN] nodeIdPathsが空のためスキップ: {category_name}")
+                continue
 
-            # データ抽出
-            data = await extract_asins_with_categories_paginated(page, limit, start_page)
+            end_page = min(self.args.pages_per_category, MAX_PAGES)
+            if start_page > end_page:
+                continue
 
-            asins = {item['asin'] for item in data if item.get('asin')}
-            self.stats['total_extracted'] += len(asins)
+            scheduler.add_task(
+                CategoryTask(category_name, node_id_paths, start_page, end_page, category_info),
+                priority
+            )
 
-            # 既存DBのASINを取得
-            existing_asins = self._get_existing_asins()
+        async def on_result(task: CategoryTask, data: List[Dict]):
+            new_asins = self._record_category_result(task, data, all_new_asins)
+            all_new_asins.update(new_asins)
+            self.log(f"  → 累計新規ASIN: {len(all_new_asins)}件 / {self.args.target_new_asins}件")
 
-            # 重複チェック
-            new_asins = asins - existing_asins - already_found_asins
+        try:
+            await scheduler.run(on_result)
+        finally:
+            if request_filters:
+                summaries = [request_filter.record() for request_filter in request_filters]
+                self.log(f"リクエスト遮断: {sum(s['blocked_total'] for s in summaries)}件, "
+                         f"削減 約{sum(s['bytes_saved_estimate'] for s in summaries) / 1024 / 1024:.1f}MB")
+            for context, extra_page in extra_pages:
+                try:
+                    await (context.close() if context else extra_page.close())
+                except Exception:
+                    pass
 
-            duplicate_count = len(asins) - len(new_asins)
-            self.stats['duplicate_asins'] += duplicate_count
-            self.stats['new_asins'] += len(new_asins)
+        if len(all_new_asins) >= self.args.target_new_asins:
+            self.log(f"[OK] 目標達成: {len(all_new_asins)}件の新規ASIN")
 
-            self.log(f"  取得: {len(asins)}件")
-            self.log(f"  新規: {len(new_asins)}件 ({len(new_asins)/max(len(asins), 1)*100:.1f}%)")
-            self.log(f"  重複: {duplicate_count}件")
+        return all_new_asins
 
-            # 履歴を更新
+    def _record_category_result(
+        self,
+        task: CategoryTask,
+        data: List[Dict],
+        already_found_asins: Set[str]
+    ) -> Set[str]:
+        """カテゴリの抽出結果を集計し、履歴を更新"""
+        limit = min((task.end_page - task.start_page + 1) * ITEMS_PER_PAGE, 2000)  # 最大2000件
+        asins = {item['asin'] for item in data[:limit] if item.get('asin')}
+        self.stats['total_extracted'] += len(asins)
+        self.stats['categories_processed'] += 1
+
+        # 重複チェック（既知ASINインデックス + 今回の実行で発見済み）
+        known_new, duplicates = self._get_known_index().filter_new(asins)
+        for source, count in duplicates.items():
+            self.stats['duplicates_by_source'][source] += count
+        new_asins = set(known_new) - already_found_asins
+
+        duplicate_count = len(asins) - len(new_asins)
+        self.stats['duplicate_asins'] += duplicate_count
+        self.stats['new_asins'] += len(new_asins)
+
+        self.log(f"  [{task.category_name}] 取得: {len(asins)}件 / 新規: {len(new_asins)}件 "
+                 f"({len(new_asins)/max(len(asins), 1)*100:.1f}%) / 重複: {duplicate_count}件")
+
+        # 履歴を更新（抽出エラーで0件の場合は進捗を進めない）
+        if data:
             self.history_manager.update_category(
-                category_name,
-                node_id_paths,
-                start_page + pages_to_extract - 1,
+                task.category_name,
+                task.node_id_paths,
+                task.end_page,
                 len(new_asins)
             )
             self.history_manager.save_history()
 
-            return new_asins
-
-        except Exception as e:
-            self.log(f"  [ERROR] カテゴリ抽出エラー: {e}")
-            return set()
-
-    def _get_existing_asins(self) -> Set[str]:
-        """既存DBのASINセットを取得"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute('SELECT asin FROM sourcing_candidates')
-            rows = cursor.fetchall()
-            return {row[0] for row in rows}
+        return new_asins
 
-        finally:
-            conn.close()
+    def _get_known_index(self) -> KnownAsinIndex:
+        """既知ASINインデックスを取得（初回のみ読み込み）"""
+        if self.known_index is None:
+            self.known_index = KnownAsinIndex(sourcing_db_path=self.db_path).load()
+            stats = self.known_index.get_stats()
+            self.log(f"  既知ASINインデックス: {stats['total']}件（候補 {stats['candidate']} / 商品 {stats['product']} / "
+                     f"出品 {stats['listing']} / ブロック {stats['blocked']}、{self.known_index.load_seconds:.2f}秒）")
+        return self.known_index
 
     async def _save_results(self, new_asins: Set[str], categories: List[tuple]):
         """結果を保存"""
@@ -889,6 +777,32 @@ async def main():
         help="レポートファイルパス（Markdown形式）"
     )
 
+    # 並列抽出パラメータ
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=2,
+        help="並列ワーカー数（同じログイン状態を共有するブラウザコンテキスト数、デフォルト: 2）"
+    )
+    parser.add_argument(
+        "--min-interval",
+        type=float,
+        default=2.0,
+        help="コンテキストごとの最小リクエスト間隔（秒、デフォルト: 2.0）"
+    )
+
+    parser.add_argument(
+        "--capture-mode",
+        choices=["dom", "network"],
+        default="dom",
+        help="抽出方式（dom: テーブルから抽出、network: 商品リサーチAPIのレスポンスから抽出）"
+    )
+    parser.add_argument(
+        "--block-resources",
+        action="store_true",
+        help="画像・フォント・解析タグのリクエストを遮断する"
+    )
+
     # 中間カテゴリ機能（実験的）
     parser.add_argument(
         "--use-intermediate-categories",
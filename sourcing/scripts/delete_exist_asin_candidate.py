@@ -24,6 +24,7 @@ project_root = Path(__file__).resolve().parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from inventory.core.master_db import MasterDB
+from sourcing.core.known_asin_index import KnownAsinIndex
 from shared.utils.logger import setup_logger
 
 
@@ -159,23 +160,16 @@ class DuplicateASINRemover:
         duplicate_asins = set()
         new_asins = set()
 
-        # バッチ処理で効率化
-        batch_size = 500
-        total = len(asins)
+        # 既知ASINインデックス（master.dbのproductsを1回だけ読み込み、メモリ上で判定）
+        known_index = KnownAsinIndex(sourcing_db_path=self.sourcing_db_path, master_db=self.master_db).load()
 
-        for i in range(0, total, batch_size):
-            batch = asins[i:i + batch_size]
-
-            for asin in batch:
-                product = self.master_db.get_product(asin)
-                if product:
-                    duplicate_asins.add(asin)
-                else:
-                    new_asins.add(asin)
+        for asin in asins:
+            if known_index.contains_any(asin, (KnownAsinIndex.PRODUCT,)):
+                duplicate_asins.add(asin)
+            else:
+                new_asins.add(asin)
 
-            # 進捗表示
-            processed = min(i + batch_size, total)
-            self.logger.info(f"      チェック進捗: {processed}/{total}件")
+        self.logger.info(f"      チェック完了: {len(asins)}件（インデックス読み込み {known_index.load_seconds:.2f}秒）")
 
         return duplicate_asins, new_asins
 
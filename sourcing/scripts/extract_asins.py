@@ -148,6 +148,18 @@ async def main():
         default=False,
         help="ブラウザウィンドウを閉じずに開いたままにする（デバッグ用）"
     )
+    parser.add_argument(
+        "--capture-mode",
+        choices=["dom", "network"],
+        default="dom",
+        help="商品リサーチの抽出方式（dom: テーブルから抽出、network: APIレスポンスから抽出）"
+    )
+    parser.add_argument(
+        "--block-resources",
+        action="store_true",
+        default=False,
+        help="画像・フォント・解析タグのリクエストを遮断する（商品リサーチのみ）"
+    )
 
     args = parser.parse_args()
 
@@ -196,6 +208,7 @@ async def main():
         print(f"AMZ: {args.amz}")
         print(f"FBA: {args.fba}")
         print(f"取得件数: {args.limit}")
+        print(f"抽出方式: {args.capture_mode}")
         print()
 
         extractor = ProductResearchExtractor({
@@ -205,7 +218,9 @@ async def main():
             "fba": args.fba,
             "limit": args.limit,
             "market": args.market,
-            "keep_browser_open": args.keep_browser
+            "keep_browser_open": args.keep_browser,
+            "capture_mode": args.capture_mode,
+            "block_resources": args.block_resources
         })
 
     # 抽出実行
@@ -6,6 +6,12 @@ sourcing_candidatesから商品情報を取得し、master.dbに登録して出
 Phase 1: 手動実行版
 - daemon停止確認が必要
 - SP-API使用のため、約20分/2000件（バッチ処理想定）の処理時間
+
+ストリーミング処理:
+- 取得 → 禁止チェック → 振り分け → 登録 → キュー追加 → status更新 を
+  段ごとのスレッドで並行実行し、段間は上限付きキューで接続する
+- 1件ごとにキュー追加・status更新まで確定するため、後続の取得中でも
+  先頭の商品から出品を開始でき、途中で失敗しても処理済み分は無駄にならない
 """
 
 import sys
@@ -14,9 +20,12 @@ import sqlite3
 import random
 import argparse
 import json
+import queue
+import threading
+from dataclasses import dataclass
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Callable
 from dotenv import load_dotenv
 
 # プロジェクトルートをパスに追加
@@ -36,12 +45,36 @@ from shared.utils.sku_generator import generate_sku
 from shared.utils.logger import setup_logger
 
 
+# パイプラインの終端マーカー
+_END = object()
+
+
+@dataclass
+class ImportItem:
+    """パイプラインを流れる1件分の処理状態"""
+    asin: str
+    index: int
+    product_data: Optional[Dict[str, Any]] = None
+    account_id: Optional[str] = None
+    skip_reason: Optional[str] = None  # 除外理由（以降の段は処理せず、statusのみ更新）
+    failed: bool = False                # 想定外のエラー（statusを更新せず次回再処理）
+
+
 class CandidateImporter:
     """
     sourcing_candidatesからmaster.dbへの連携クラス
     """
 
-    def __init__(self, limit: Optional[int] = None, dry_run: bool = False, account_limits: Optional[Dict[str, int]] = None, check_prohibited: bool = True, add_to_listings: bool = True, add_to_queue: bool = True, use_category_routing: bool = False):
+    # 段間キューの上限件数（デフォルト）
+    DEFAULT_BUFFER_SIZE = 50
+
+    # account_limits未指定時の1アカウントあたりの割り当て件数
+    DEFAULT_ACCOUNT_SLOTS = 1000
+
+    # 進捗ログの出力間隔（件）
+    PROGRESS_INTERVAL = 50
+
+    def __init__(self, limit: Optional[int] = None, dry_run: bool = False, account_limits: Optional[Dict[str, int]] = None, check_prohibited: bool = True, add_to_listings: bool = True, add_to_queue: bool = True, use_category_routing: bool = False, buffer_size: int = DEFAULT_BUFFER_SIZE):
         """
         Args:
             limit: 処理する最大件数（Noneの場合は全件）
@@ -51,6 +84,7 @@ class CandidateImporter:
             add_to_listings: Trueの場合、listingsテーブルに追加（デフォルト: True）
             add_to_queue: Trueの場合、upload_queueに追加（デフォルト: True）
             use_category_routing: Trueの場合、カテゴリに基づいてアカウントを自動振り分け
+            buffer_size: パイプラインの段間キューの上限件数
         """
         self.limit = limit
         self.dry_run = dry_run
@@ -59,6 +93,7 @@ class CandidateImporter:
         self.add_to_listings = add_to_listings
         self.add_to_queue = add_to_queue
         self.use_category_routing = use_category_routing
+        self.buffer_size = max(1, buffer_size)
 
         # ロガーを設定（ファイルとコンソール両方に出力）
         self.logger = setup_logger('import_candidates_to_master', console_output=True)
@@ -123,8 +158,15 @@ class CandidateImporter:
             'added_to_listings': 0,
             'added_to_queue': 0,
             'failed_queue_count': 0,
+            'processed_count': 0,
             'updated_status_count': 0
         }
+        self._stats_lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+        # アカウント別の割り当て結果と残り枠
+        self.account_counts: Dict[str, int] = {}
+        self._account_slots = self._init_account_slots()
 
     def _load_active_accounts(self) -> List[str]:
         """
@@ -181,6 +223,7 @@ class CandidateImporter:
         else:
             tables_to_register.append('products')
         self.logger.info(f"登録対象テーブル: {' + '.join(tables_to_register)}")
+        self.logger.info(f"段間バッファ: {self.buffer_size}件")
 
         self.logger.info("=" * 70)
 
@@ -190,8 +233,12 @@ class CandidateImporter:
             self.logger.info("処理対象のASINがありません")
             return
 
+        # ランダム割り振り: 従来どおり全件をシャッフルしてからアカウント順に枠を埋める
+        if not self.use_category_routing:
+            random.shuffle(asins)
+
         self.stats['total_asins'] = len(asins)
-        self.logger.info(f"[1/6] 候補ASIN取得完了: {len(asins)}件")
+        self.logger.info(f"[1/3] 候補ASIN取得完了: {len(asins)}件")
 
         if self.dry_run:
             self.logger.info("[DRY RUN] 最初の10件を表示:")
@@ -200,52 +247,21 @@ class CandidateImporter:
             if len(asins) > 10:
                 self.logger.info(f"  ... 他 {len(asins) - 10}件")
 
-        # 2. SP-APIで商品情報取得
-        self.logger.info("[2/6] SP-APIで商品情報を取得中...")
+        # 2. パイプライン実行（1件ずつ 取得 → 禁止チェック → 振り分け → 登録 → キュー追加 → status更新）
+        self.logger.info("[2/3] パイプライン実行中...")
+        self.logger.info(f"      {' → '.join(name for name, _ in self._build_stages())} → status更新")
         self.logger.info("      注意: SP-APIレート制限により、処理に時間がかかります")
-        self.logger.info(f"      推定時間: 約{len(asins) * 12 / 60:.1f}分")
+        self.logger.info("      キュー追加済みの商品は、残りの取得中でも出品対象になります")
 
         if not self.dry_run:
-            products_data = self._fetch_products_data(asins)
-            self.logger.info(f"商品情報取得完了: 成功 {self.stats['fetched_count']}件 / 失敗 {self.stats['failed_fetch_count']}件")
-        else:
-            self.logger.info("[DRY RUN] SP-API呼び出しをスキップ")
-            products_data = {}
-
-        # 3. アカウント割り振り
-        self.logger.info("[3/6] アカウント割り振り中...")
-        if self.use_category_routing:
-            # カテゴリルーティング使用時は、products_dataからカテゴリを取得して振り分け
-            account_assignments = self._assign_accounts_by_category(asins, products_data)
-        else:
-            # 従来通りランダム or account_limits指定で振り分け
-            account_assignments = self._assign_accounts(asins)
-        for account_id, assigned_asins in account_assignments.items():
-            self.logger.info(f"      {account_id}: {len(assigned_asins)}件")
-
-        # 4. テーブル登録
-        tables_desc = ' + '.join(tables_to_register)
-        self.logger.info(f"[4/6] {tables_desc}への登録中...")
-        if not self.dry_run and products_data:
-            self._register_products_and_listings(products_data, account_assignments)
-            self.logger.info("      登録完了:")
-            self.logger.info(f"        - products:     {self.stats['added_to_products']}件")
-            if self.add_to_listings:
-                self.logger.info(f"        - listings:     {self.stats['added_to_listings']}件")
-            if self.add_to_queue:
-                self.logger.info(f"        - upload_queue: {self.stats['added_to_queue']}件")
-                if self.stats['failed_queue_count'] > 0:
-                    self.logger.info(f"        - 失敗:         {self.stats['failed_queue_count']}件")
+            self._run_pipeline(asins)
         else:
-            self.logger.info("[DRY RUN] 登録をスキップ")
+            self.logger.info("[DRY RUN] SP-API呼び出し・登録・status更新をスキップ")
 
-        # 6. sourcing_candidatesのstatus更新
-        self.logger.info("[6/6] sourcing_candidatesのstatus更新中...")
-        if not self.dry_run:
-            self._update_candidate_status(asins, 'imported')
-            self.logger.info(f"      更新完了: {self.stats['updated_status_count']}件")
-        else:
-            self.logger.info("[DRY RUN] status更新をスキップ")
+        # 3. アカウント別の振り分け結果
+        self.logger.info("[3/3] アカウント別の振り分け結果:")
+        for account_id, count in self.account_counts.items():
+            self.logger.info(f"      {account_id}: {count}件")
 
         # サマリー表示
         self._print_summary()
@@ -272,321 +288,389 @@ class CandidateImporter:
         finally:
             conn.close()
 
-    def _fetch_products_data(self, asins: List[str]) -> Dict[str, Dict[str, Any]]:
-        """
-        商品情報を取得
-        - 既存のASIN: productsテーブルから取得（SP-API不要）
-        - 新規のASIN: SP-APIで取得
+    # ------------------------------------------------------------------
+    # パイプライン
+    # ------------------------------------------------------------------
 
-        Args:
-            asins: ASINのリスト
+    def _build_stages(self) -> List[Tuple[str, Callable[[ImportItem], None]]]:
+        """
+        パイプラインの段（名前, 処理関数）を構築
 
-        Returns:
-            dict: ASIN別の商品情報
+        各段は別スレッドで動作し、段間は上限付きキューで接続する。
         """
-        products_data = {}
-        existing_asins = []
-        missing_asins = []
-
-        # 1. まず、productsテーブルから既存情報を確認
-        self.logger.info("  productsテーブルから既存情報を確認中...")
-        for asin in asins:
-            product = self.master_db.get_product(asin)
-            if product:
-                # 既存のproductsから情報を取得
-                products_data[asin] = {
-                    'title_ja': product.get('title_ja'),
-                    'title_en': product.get('title_en'),
-                    'description_ja': product.get('description_ja'),
-                    'description_en': product.get('description_en'),
-                    'category': product.get('category'),
-                    'brand': product.get('brand'),
-                    'images': product.get('images'),
-                    'amazon_price_jpy': product.get('amazon_price_jpy'),
-                    'amazon_in_stock': product.get('amazon_in_stock')
-                }
-                existing_asins.append(asin)
-                self.stats['fetched_count'] += 1
-            else:
-                missing_asins.append(asin)
+        stages = [
+            ('取得', self._stage_fetch),
+            ('禁止チェック', self._stage_check),
+            ('振り分け', self._stage_route),
+            ('登録', self._stage_register),
+        ]
+        if self.add_to_listings and self.add_to_queue:
+            stages.append(('キュー追加', self._stage_enqueue))
+        return stages
 
-        self.logger.info("  既存情報確認完了")
-        self.logger.info(f"    → 既存: {len(existing_asins)}件（DB取得）")
+    def _run_pipeline(self, asins: List[str]):
+        """
+        ストリーミングパイプラインを実行
 
-        # 2. productsに存在しないASINのみSP-APIで取得
-        if missing_asins:
-            self.logger.info(f"    → 新規: {len(missing_asins)}件（SP-API取得）")
-            self.logger.info(f"        推定時間: 約{len(missing_asins) * 2.5 / 60:.1f}分")
+        - 投入スレッド → 各段のスレッド → メインスレッド（status更新）の順に流す
+        - 段間キューは上限付き（上流が先行しすぎてメモリを占有しないように）
+        - status更新は1件ごとにコミットするため、中断しても処理済み分は確定している
+          （未処理分は status='candidate' のまま残り、次回実行で再処理される）
 
-            # 個別に処理
-            for i, asin in enumerate(missing_asins, 1):
-                try:
-                    self.logger.info(f"  [{i}/{len(missing_asins)}] {asin} を取得中...")
+        Args:
+            asins: ASINのリスト
+        """
+        stages = self._build_stages()
+        queues = [queue.Queue(maxsize=self.buffer_size) for _ in range(len(stages) + 1)]
+
+        threads = [threading.Thread(
+            target=self._feed_worker, args=(asins, queues[0]),
+            name='import-feed', daemon=True
+        )]
+        for i, (name, handler) in enumerate(stages):
+            threads.append(threading.Thread(
+                target=self._stage_worker, args=(name, handler, queues[i], queues[i + 1]),
+                name=f'import-stage-{i + 1}', daemon=True
+            ))
+
+        for thread in threads:
+            thread.start()
 
-                    # 商品情報取得
-                    batch_data = self.sp_api_client.get_products_batch([asin])
+        try:
+            self._consume_results(queues[-1])
+        except KeyboardInterrupt:
+            self.logger.warning("中断要求を受け付けました。処理中の商品を確定して終了します...")
+            self._stop_event.set()
+            self._consume_results(queues[-1])
 
-                    if asin in batch_data:
-                        products_data[asin] = batch_data[asin]
-                        self.stats['fetched_count'] += 1
-                        self.logger.info(f"  [{i}/{len(missing_asins)}] {asin} 取得成功")
-                    else:
-                        self.stats['failed_fetch_count'] += 1
-                        self.logger.warning(f"  [{i}/{len(missing_asins)}] {asin} 取得失敗 (データなし)")
+        for thread in threads:
+            thread.join()
 
-                except Exception as e:
-                    self.stats['failed_fetch_count'] += 1
-                    self.logger.error(f"  [{i}/{len(missing_asins)}] {asin} エラー: {e}")
-        else:
-            self.logger.info("    → 新規: 0件（SP-API呼び出しなし）")
+        self.logger.info(f"パイプライン完了: 取得成功 {self.stats['fetched_count']}件 / 失敗 {self.stats['failed_fetch_count']}件")
 
-        return products_data
+    def _feed_worker(self, asins: List[str], out_queue: queue.Queue):
+        """ASINをパイプラインに投入（キューが満杯の間は待機）"""
+        try:
+            for i, asin in enumerate(asins, 1):
+                if self._stop_event.is_set():
+                    break
+                out_queue.put(ImportItem(asin=asin, index=i))
+        finally:
+            out_queue.put(_END)
 
-    def _register_products_and_listings(
+    def _stage_worker(
         self,
-        products_data: Dict[str, Dict[str, Any]],
-        account_assignments: Dict[str, List[str]]
+        name: str,
+        handler: Callable[[ImportItem], None],
+        in_queue: queue.Queue,
+        out_queue: queue.Queue
     ):
         """
-        products + listings + queueに一括登録
+        1段分の処理ループ
 
-        Args:
-            products_data: ASIN別の商品情報
-            account_assignments: アカウントID別のASINリスト
+        除外済み（skip_reason設定済み）の商品は処理せずに次段へ流す（最後にstatus更新するため）。
+        想定外の例外が出た商品は failed=True とし、statusを更新しない（次回再処理）。
         """
-        # アカウント別に登録
-        for account_id, asins in account_assignments.items():
-            for asin in asins:
-                # 商品情報が取得できている場合のみ登録
-                if asin not in products_data:
-                    continue
-
-                product_data = products_data[asin]
-
-                # ブロックリストチェック
-                if self.blocklist_manager.is_blocked(asin):
-                    block_info = self.blocklist_manager.get_block_info(asin)
-                    self.logger.warning(f"  [BLOCKLIST] {asin}: ブロックリスト登録済み")
-                    self.logger.warning(f"              理由: {block_info.get('reason', '不明')}")
-                    self.logger.warning(f"              削除日: {block_info.get('deleted_at', '不明')}")
-                    self.stats['blocklist_blocked_count'] = self.stats.get('blocklist_blocked_count', 0) + 1
-                    continue
-
-                # 禁止商品チェック
-                if self.prohibited_checker:
-                    check_result = self.prohibited_checker.check_product({
-                        'asin': asin,
-                        'title_ja': product_data.get('title_ja', ''),
-                        'title_en': product_data.get('title_en', ''),
-                        'description_ja': product_data.get('description_ja', ''),
-                        'description_en': product_data.get('description_en', ''),
-                        'category': product_data.get('category', ''),
-                        'brand': product_data.get('brand', ''),
-                        'images': product_data.get('images', [])
-                    })
-
-                    if check_result['recommendation'] == 'auto_block':
-                        self.logger.warning(f"  [BLOCKED] {asin}: {check_result['risk_level']} (スコア: {check_result['risk_score']})")
-                        if check_result['matched_keywords']:
-                            self.logger.warning(f"            キーワード: {[k['keyword'] for k in check_result['matched_keywords']]}")
-                        if check_result['matched_categories']:
-                            self.logger.warning(f"            カテゴリ: {check_result['matched_categories']}")
-                        self.stats['blocked_count'] = self.stats.get('blocked_count', 0) + 1
-                        continue
-
-                # 個別のマネージャーで登録（リファクタリング後）
-                # Step 1: productsテーブルに登録
+        while True:
+            item = in_queue.get()
+            if item is _END:
+                out_queue.put(_END)
+                return
+
+            # 中断時は新しい商品を処理しない（status未更新のまま残す）
+            if self._stop_event.is_set():
+                continue
+
+            if item.skip_reason is None and not item.failed:
                 try:
-                    product_added = self.product_manager.add_product(
-                        asin=asin,
-                        title_ja=product_data.get('title_ja'),
-                        title_en=product_data.get('title_en'),
-                        description_ja=product_data.get('description_ja'),
-                        description_en=product_data.get('description_en'),
-                        category=product_data.get('category'),
-                        brand=product_data.get('brand'),
-                        images=product_data.get('images'),
-                        amazon_price_jpy=product_data.get('amazon_price_jpy'),
-                        amazon_in_stock=product_data.get('amazon_in_stock')
-                    )
-                    if product_added:
-                        self.stats['added_to_products'] += 1
+                    handler(item)
                 except Exception as e:
-                    self.logger.error(f"  [ERROR] products登録失敗 ({asin}): {e}")
-                    continue
-
-                # Step 2: listingsテーブルに登録（オプショナル）
-                if self.add_to_listings:
-                    try:
-                        # SKU生成
-                        sku = generate_sku(
-                            platform='base',
-                            asin=asin,
-                            timestamp=datetime.now()
-                        )
-
-                        # 売価計算（新しい価格決定モジュールを使用）
-                        amazon_price = product_data.get('amazon_price_jpy')
-                        selling_price = None
-                        if amazon_price:
-                            selling_price = self.price_calculator.calculate_selling_price(
-                                amazon_price=amazon_price,
-                                platform='base'
-                            )
-
-                        listing_id = self.listing_manager.add_listing(
-                            asin=asin,
-                            platform='base',
-                            account_id=account_id,
-                            sku=sku,
-                            selling_price=selling_price,
-                            currency='JPY',
-                            in_stock_quantity=1,
-                            status='pending',
-                            visibility='public'
-                        )
-                        if listing_id:
-                            self.stats['added_to_listings'] += 1
-                    except Exception as e:
-                        # UNIQUE制約違反の場合はスキップ
-                        if 'UNIQUE constraint failed' in str(e) or 'already exists' in str(e).lower():
-                            self.logger.info(f"  listings既存スキップ ({asin})")
-                        else:
-                            self.logger.error(f"  [ERROR] listings登録失敗 ({asin}): {e}")
-                            continue
-                else:
-                    self.logger.info(f"  listings登録スキップ ({asin}) - --products-only指定")
-
-                # Step 3: upload_queueに追加（オプショナル）
-                if self.add_to_queue:
-                    try:
-                        queue_added = self.queue_manager.add_to_queue(
-                            asin=asin,
-                            platform='base',
-                            account_id=account_id,
-                            priority=UploadQueueManager.PRIORITY_NORMAL
-                        )
-                        if queue_added:
-                            self.stats['added_to_queue'] += 1
-                        else:
-                            self.stats['failed_queue_count'] += 1
-                            self.logger.warning(f"  キュー追加失敗 ({asin})")
-                    except Exception as e:
-                        self.stats['failed_queue_count'] += 1
-                        self.logger.error(f"  [ERROR] キュー追加失敗 ({asin}): {e}")
-                else:
-                    self.logger.info(f"  キュー追加スキップ ({asin}) - --no-queue指定")
-
-    def _assign_accounts(self, asins: List[str]) -> Dict[str, List[str]]:
-        """
-        アカウント割り振り
+                    item.failed = True
+                    self.logger.error(f"  [ERROR] {name}で想定外のエラー ({item.asin}): {e}")
 
-        account_limitsが指定されている場合は指定された件数ずつ、
-        指定されていない場合は1000件ずつランダム割り振り
+            out_queue.put(item)
+
+    def _consume_results(self, in_queue: queue.Queue):
+        """
+        最終段: sourcing_candidatesのstatusを1件ずつ更新してコミット
 
         Args:
-            asins: ASINのリスト
+            in_queue: 最終段のキュー
+        """
+        conn = sqlite3.connect(self.sourcing_db_path)
+        cursor = conn.cursor()
 
-        Returns:
-            dict: アカウントID別のASINリスト
+        try:
+            while True:
+                item = in_queue.get()
+                if item is _END:
+                    return
+
+                self.stats['processed_count'] += 1
+
+                if not item.failed:
+                    cursor.execute(
+                        "UPDATE sourcing_candidates SET status=?, imported_at=? WHERE asin=?",
+                        ('imported', datetime.now().isoformat(), item.asin)
+                    )
+                    conn.commit()
+                    self.stats['updated_status_count'] += 1
+
+                if self.stats['processed_count'] % self.PROGRESS_INTERVAL == 0:
+                    self.logger.info(
+                        f"  進捗: {self.stats['processed_count']}/{self.stats['total_asins']}件 "
+                        f"(products {self.stats['added_to_products']}件 / "
+                        f"upload_queue {self.stats['added_to_queue']}件)"
+                    )
+
+        finally:
+            conn.close()
+
+    def _count(self, key: str, n: int = 1):
+        """統計を加算（複数段のスレッドから呼ばれるためロックする）"""
+        with self._stats_lock:
+            self.stats[key] = self.stats.get(key, 0) + n
+
+    # ------------------------------------------------------------------
+    # 各段の処理
+    # ------------------------------------------------------------------
+
+    def _stage_fetch(self, item: ImportItem):
+        """
+        商品情報を取得
+        - ブロックリスト登録済み: SP-APIを呼ばずに除外
+        - 既存のASIN: productsテーブルから取得（SP-API不要）
+        - 新規のASIN: SP-APIで取得
         """
-        # ASINをシャッフル
-        shuffled_asins = asins.copy()
-        random.shuffle(shuffled_asins)
+        asin = item.asin
+        progress = f"[{item.index}/{self.stats['total_asins']}]"
+
+        if self.blocklist_manager.is_blocked(asin):
+            block_info = self.blocklist_manager.get_block_info(asin)
+            self.logger.warning(f"  [BLOCKLIST] {asin}: ブロックリスト登録済み")
+            self.logger.warning(f"              理由: {block_info.get('reason', '不明')}")
+            self.logger.warning(f"              削除日: {block_info.get('deleted_at', '不明')}")
+            self._count('blocklist_blocked_count')
+            item.skip_reason = 'blocklist'
+            return
 
-        account_assignments = {}
+        product = self.master_db.get_product(asin)
+        if product:
+            item.product_data = {
+                'title_ja': product.get('title_ja'),
+                'title_en': product.get('title_en'),
+                'description_ja': product.get('description_ja'),
+                'description_en': product.get('description_en'),
+                'category': product.get('category'),
+                'brand': product.get('brand'),
+                'images': product.get('images'),
+                'amazon_price_jpy': product.get('amazon_price_jpy'),
+                'amazon_in_stock': product.get('amazon_in_stock')
+            }
+            self._count('fetched_count')
+            return
 
-        if self.account_limits:
-            # アカウント別の件数指定がある場合
-            current_idx = 0
-            for account_id in self.accounts:
-                limit = self.account_limits.get(account_id, 0)
-                if limit > 0:
-                    end_idx = min(current_idx + limit, len(shuffled_asins))
-                    account_assignments[account_id] = shuffled_asins[current_idx:end_idx]
-                    current_idx = end_idx
-                else:
-                    account_assignments[account_id] = []
+        try:
+            self.logger.info(f"  {progress} {asin} を取得中...")
+            batch_data = self.sp_api_client.get_products_batch([asin])
+        except Exception as e:
+            self._count('failed_fetch_count')
+            self.logger.error(f"  {progress} {asin} エラー: {e}")
+            item.skip_reason = 'fetch_failed'
+            return
+
+        if asin in batch_data:
+            item.product_data = batch_data[asin]
+            self._count('fetched_count')
+            self.logger.info(f"  {progress} {asin} 取得成功")
         else:
-            # デフォルト: 1000件ずつ割り振り
-            for i, account_id in enumerate(self.accounts):
-                start_idx = i * 1000
-                end_idx = min(start_idx + 1000, len(shuffled_asins))
-                account_assignments[account_id] = shuffled_asins[start_idx:end_idx]
+            self._count('failed_fetch_count')
+            self.logger.warning(f"  {progress} {asin} 取得失敗 (データなし)")
+            item.skip_reason = 'fetch_failed'
 
-        return account_assignments
+    def _stage_check(self, item: ImportItem):
+        """禁止商品チェック"""
+        if not self.prohibited_checker:
+            return
 
-    def _assign_accounts_by_category(
-        self,
-        asins: List[str],
-        products_data: Dict[str, Dict[str, Any]]
-    ) -> Dict[str, List[str]]:
-        """
-        カテゴリに基づいてアカウント割り振り
+        product_data = item.product_data
+        check_result = self.prohibited_checker.check_product({
+            'asin': item.asin,
+            'title_ja': product_data.get('title_ja', ''),
+            'title_en': product_data.get('title_en', ''),
+            'description_ja': product_data.get('description_ja', ''),
+            'description_en': product_data.get('description_en', ''),
+            'category': product_data.get('category', ''),
+            'brand': product_data.get('brand', ''),
+            'images': product_data.get('images', [])
+        })
+
+        if check_result['recommendation'] == 'auto_block':
+            self.logger.warning(f"  [BLOCKED] {item.asin}: {check_result['risk_level']} (スコア: {check_result['risk_score']})")
+            if check_result['matched_keywords']:
+                self.logger.warning(f"            キーワード: {[k['keyword'] for k in check_result['matched_keywords']]}")
+            if check_result['matched_categories']:
+                self.logger.warning(f"            カテゴリ: {check_result['matched_categories']}")
+            self._count('blocked_count')
+            item.skip_reason = 'prohibited'
+
+    def _stage_route(self, item: ImportItem):
+        """アカウント割り振り"""
+        if self.use_category_routing:
+            account_id = self._route_by_category(item.product_data.get('category') or '')
+        else:
+            account_id = self._take_account_slot()
 
-        Args:
-            asins: ASINのリスト
-            products_data: ASIN別の商品情報（categoryを含む）
+        if not account_id:
+            self._count('unassigned_count')
+            item.skip_reason = 'unassigned'
+            return
 
-        Returns:
-            dict: アカウントID別のASINリスト
-        """
-        account_assignments = {account_id: [] for account_id in self.accounts}
-
-        unassigned_count = 0
-
-        for asin in asins:
-            # 商品データからカテゴリを取得
-            product_data = products_data.get(asin, {})
-            category = product_data.get('category', '')
-
-            # カテゴリルーターでアカウントを決定
-            account_id = self.category_router.route(category, self.accounts)
-
-            if account_id:
-                if account_id in account_assignments:
-                    account_assignments[account_id].append(asin)
-                else:
-                    # アクティブでないアカウントが返された場合はデフォルトへ
-                    default_account = self.category_router.default_account
-                    if default_account and default_account in account_assignments:
-                        account_assignments[default_account].append(asin)
-                    else:
-                        unassigned_count += 1
+        item.account_id = account_id
+        with self._stats_lock:
+            self.account_counts[account_id] = self.account_counts.get(account_id, 0) + 1
+
+    def _stage_register(self, item: ImportItem):
+        """products + listingsに登録"""
+        asin = item.asin
+        product_data = item.product_data
+
+        # Step 1: productsテーブルに登録
+        try:
+            product_added = self.product_manager.add_product(
+                asin=asin,
+                title_ja=product_data.get('title_ja'),
+                title_en=product_data.get('title_en'),
+                description_ja=product_data.get('description_ja'),
+                description_en=product_data.get('description_en'),
+                category=product_data.get('category'),
+                brand=product_data.get('brand'),
+                images=product_data.get('images'),
+                amazon_price_jpy=product_data.get('amazon_price_jpy'),
+                amazon_in_stock=product_data.get('amazon_in_stock')
+            )
+            if product_added:
+                self._count('added_to_products')
+        except Exception as e:
+            self.logger.error(f"  [ERROR] products登録失敗 ({asin}): {e}")
+            item.skip_reason = 'register_failed'
+            return
+
+        # Step 2: listingsテーブルに登録（オプショナル）
+        if not self.add_to_listings:
+            self.logger.info(f"  listings登録スキップ ({asin}) - --products-only指定")
+            return
+
+        try:
+            # SKU生成
+            sku = generate_sku(
+                platform='base',
+                asin=asin,
+                timestamp=datetime.now()
+            )
+
+            # 売価計算（新しい価格決定モジュールを使用）
+            amazon_price = product_data.get('amazon_price_jpy')
+            selling_price = None
+            if amazon_price:
+                selling_price = self.price_calculator.calculate_selling_price(
+                    amazon_price=amazon_price,
+                    platform='base'
+                )
+
+            listing_id = self.listing_manager.add_listing(
+                asin=asin,
+                platform='base',
+                account_id=item.account_id,
+                sku=sku,
+                selling_price=selling_price,
+                currency='JPY',
+                in_stock_quantity=1,
+                status='pending',
+                visibility='public'
+            )
+            if listing_id:
+                self._count('added_to_listings')
+        except Exception as e:
+            # UNIQUE制約違反の場合はスキップ
+            if 'UNIQUE constraint failed' in str(e) or 'already exists' in str(e).lower():
+                self.logger.info(f"  listings既存スキップ ({asin})")
             else:
-                unassigned_count += 1
+                self.logger.error(f"  [ERROR] listings登録失敗 ({asin}): {e}")
+                item.skip_reason = 'register_failed'
 
-        if unassigned_count > 0:
-            self.logger.warning(f"  振り分け不可: {unassigned_count}件（カテゴリ不明またはルールなし）")
+    def _stage_enqueue(self, item: ImportItem):
+        """upload_queueに追加"""
+        try:
+            queue_added = self.queue_manager.add_to_queue(
+                asin=item.asin,
+                platform='base',
+                account_id=item.account_id,
+                priority=UploadQueueManager.PRIORITY_NORMAL
+            )
+            if queue_added:
+                self._count('added_to_queue')
+            else:
+                self._count('failed_queue_count')
+                self.logger.warning(f"  キュー追加失敗 ({item.asin})")
+        except Exception as e:
+            self._count('failed_queue_count')
+            self.logger.error(f"  [ERROR] キュー追加失敗 ({item.asin}): {e}")
 
-        # 空のアカウントを除去
-        account_assignments = {k: v for k, v in account_assignments.items() if v}
+    # ------------------------------------------------------------------
+    # アカウント割り振り
+    # ------------------------------------------------------------------
 
-        return account_assignments
+    def _init_account_slots(self) -> Dict[str, int]:
+        """
+        アカウント別の残り割り当て枠を作成
 
-    def _update_candidate_status(self, asins: List[str], new_status: str):
+        account_limitsが指定されている場合は指定された件数、
+        指定されていない場合は1アカウントあたりDEFAULT_ACCOUNT_SLOTS件
         """
-        sourcing_candidatesのstatusを更新
+        if self.account_limits:
+            return {account_id: self.account_limits.get(account_id, 0) for account_id in self.accounts}
+        return {account_id: self.DEFAULT_ACCOUNT_SLOTS for account_id in self.accounts}
 
-        Args:
-            asins: ASINのリスト
-            new_status: 新しいステータス
+    def _take_account_slot(self) -> Optional[str]:
         """
-        conn = sqlite3.connect(self.sourcing_db_path)
-        cursor = conn.cursor()
+        残り枠のある最初のアカウント（self.accounts の順）の枠を消費
 
-        try:
-            for asin in asins:
-                cursor.execute(
-                    "UPDATE sourcing_candidates SET status=?, imported_at=? WHERE asin=?",
-                    (new_status, datetime.now().isoformat(), asin)
-                )
-                self.stats['updated_status_count'] += 1
+        ASINは run() でシャッフル済みのため、全件をシャッフルしてアカウント順に枠数ずつ
+        切り出す従来方式と同じ割り振りになる（候補が全枠数より少ない場合も、先頭のアカウントから埋まる）。
 
-            conn.commit()
+        Returns:
+            str or None: アカウントID（全アカウントの枠が埋まっている場合None）
+        """
+        with self._stats_lock:
+            for account_id in self.accounts:
+                if self._account_slots.get(account_id, 0) > 0:
+                    self._account_slots[account_id] -= 1
+                    return account_id
+            return None
 
-        finally:
-            conn.close()
+    def _route_by_category(self, category: str) -> Optional[str]:
+        """
+        カテゴリに基づいてアカウントを決定
+
+        Args:
+            category: 商品カテゴリ
+
+        Returns:
+            str or None: アカウントID（カテゴリ不明またはルールなしの場合None）
+        """
+        account_id = self.category_router.route(category, self.accounts)
+        if not account_id:
+            return None
+
+        if account_id in self.accounts:
+            return account_id
+
+        # アクティブでないアカウントが返された場合はデフォルトへ
+        default_account = self.category_router.default_account
+        if default_account and default_account in self.accounts:
+            return default_account
+        return None
 
     def _print_summary(self):
         """サマリーを表示"""
@@ -600,6 +684,8 @@ class CandidateImporter:
             self.logger.info(f"ブロックリスト拒否:   {self.stats['blocklist_blocked_count']:>6}件")
         if self.check_prohibited and 'blocked_count' in self.stats:
             self.logger.info(f"禁止商品ブロック:     {self.stats['blocked_count']:>6}件")
+        if 'unassigned_count' in self.stats:
+            self.logger.info(f"振り分け不可:         {self.stats['unassigned_count']:>6}件")
         self.logger.info(f"productsテーブル追加: {self.stats['added_to_products']:>6}件")
         self.logger.info(f"listingsテーブル追加: {self.stats['added_to_listings']:>6}件")
         self.logger.info(f"upload_queue追加:     {self.stats['added_to_queue']:>6}件")
@@ -653,6 +739,13 @@ def main():
         help='config/category_routing.yaml に基づいてカテゴリでアカウントを自動振り分け'
     )
 
+    parser.add_argument(
+        '--buffer-size',
+        type=int,
+        default=CandidateImporter.DEFAULT_BUFFER_SIZE,
+        help=f'パイプラインの段間キューの上限件数（デフォルト: {CandidateImporter.DEFAULT_BUFFER_SIZE}）'
+    )
+
     args = parser.parse_args()
 
     # account_limitsをパース
@@ -674,7 +767,8 @@ def main():
         account_limits=account_limits,
         add_to_listings=add_to_listings,
         add_to_queue=add_to_queue,
-        use_category_routing=args.use_category_routing
+        use_category_routing=args.use_category_routing,
+        buffer_size=args.buffer_size
     )
     importer.run()
 
@@ -789,6 +789,45 @@ async def get_authenticated_browser():
     return (context, context, page, p)
 
 
+async def create_shared_pages(browser, source_context, count: int) -> list:
+    """
+    ログイン済みコンテキストと同じ認証情報を持つワーカー用ページを作成
+
+    並列抽出（複数コンテキスト）用。ログイン済みコンテキストの storage_state
+    （Cookie / LocalStorage）を新しいコンテキストへ引き継ぐため、ワーカーごとの
+    再ログインは不要。
+
+    - browser が Browser の場合: storage_state を引き継いだ新規コンテキストを作成
+    - browser が BrowserContext の場合（launch_persistent_context）:
+      永続コンテキストは追加できないため、同一コンテキスト内に新規ページを作成
+
+    Args:
+        browser: Browser または BrowserContext
+        source_context: ログイン済みのコンテキスト
+        count: 作成するページ数
+
+    Returns:
+        list: [(context, page), ...]（呼び出し側で context/page をクローズすること）
+    """
+    pages = []
+
+    if hasattr(browser, 'new_context'):
+        storage_state = await source_context.storage_state()
+        for _ in range(count):
+            context = await browser.new_context(
+                storage_state=storage_state,
+                viewport={"width": 1920, "height": 1080},
+                locale="ja-JP",
+                timezone_id="Asia/Tokyo",
+            )
+            pages.append((context, await context.new_page()))
+    else:
+        for _ in range(count):
+            pages.append((None, await source_context.new_page()))
+
+    return pages
+
+
 async def example_usage():
     """
     使用例：認証済みブラウザを取得して作業を実行
@@ -334,12 +334,21 @@ class BaseExtractor(ABC):
         if not asins:
             return
 
+        # 既知ASINインデックス（master.db登録済み・ブロック済みは候補に追加しない）
+        from sourcing.core.known_asin_index import KnownAsinIndex
+        known_index = KnownAsinIndex.get_shared()
+        if Path(self.db_path).resolve() != known_index.sourcing_db_path.resolve():
+            known_index = KnownAsinIndex(sourcing_db_path=self.db_path).load()
+
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
 
         try:
             saved_count = 0
             updated_count = 0
+            skipped_count = 0
+            inserted_asins = []
+            seen = set()
 
             for item in asins:
                 # 辞書の場合はASINを取得、文字列の場合はそのまま使用
@@ -348,14 +357,17 @@ class BaseExtractor(ABC):
                 else:
                     asin = item
 
-                if not asin:
+                # バッチ内の重複は1件として扱う
+                if not asin or asin in seen:
                     continue
+                seen.add(asin)
 
-                # 既存チェック
-                cursor.execute('SELECT id FROM sourcing_candidates WHERE asin = ?', (asin,))
-                existing = cursor.fetchone()
+                # 既存チェック（メモリ上で判定）
+                known_source = known_index.classify(asin)
 
-                if existing:
+                if known_source in (KnownAsinIndex.BLOCKED, KnownAsinIndex.PRODUCT, KnownAsinIndex.LISTING):
+                    skipped_count += 1
+                elif known_source == KnownAsinIndex.CANDIDATE:
                     # 既存の場合は更新（最終発見日時を更新）
                     cursor.execute('''
                         UPDATE sourcing_candidates
@@ -365,6 +377,8 @@ class BaseExtractor(ABC):
                     updated_count += 1
                 else:
                     # 新規の場合は挿入
+                    # （インデックス読み込み後に他のワーカーが登録した場合は、バッチ全体を失敗させずに更新）
+                    now = datetime.now().isoformat()
                     cursor.execute('''
                         INSERT INTO sourcing_candidates (
                             asin,
@@ -372,11 +386,23 @@ class BaseExtractor(ABC):
                             status,
                             discovered_at
                         ) VALUES (?, 'sellersprite', 'candidate', ?)
-                    ''', (asin, datetime.now().isoformat()))
-                    saved_count += 1
+                        ON CONFLICT(asin) DO NOTHING
+                    ''', (asin, now))
+                    if cursor.rowcount == 1:
+                        saved_count += 1
+                    else:
+                        cursor.execute('''
+                            UPDATE sourcing_candidates
+                            SET discovered_at = ?
+                            WHERE asin = ?
+                        ''', (now, asin))
+                        updated_count += 1
+                    inserted_asins.append(asin)
 
             conn.commit()
-            self.log(f"候補保存: 新規={saved_count}件, 更新={updated_count}件")
+            known_index.add(inserted_asins, KnownAsinIndex.CANDIDATE)
+            self.log(f"候補保存: 新規={saved_count}件, 更新={updated_count}件, "
+                     f"登録済み/ブロック済みのためスキップ={skipped_count}件")
 
         except Exception as e:
             self.log(f"[WARN] 候補保存エラー: {e}")
@@ -16,6 +16,15 @@ SellerSprite 商品リサーチ抽出
     })
 
     asins = await extractor.extract()
+
+    # 商品リサーチAPIのレスポンスから抽出（DOM操作なし、画像等を遮断）
+    extractor = ProductResearchExtractor({
+        "sales_min": 300,
+        "price_min": 2500,
+        "limit": 500,
+        "capture_mode": "network",
+        "block_resources": True
+    })
 """
 
 import asyncio
@@ -24,6 +33,8 @@ from typing import List, Dict, Any
 
 from .base_extractor import BaseExtractor
 from ..browser_controller import BrowserController
+from ..utils.parallel_extractor import ContextThrottle, extract_pages_from_responses
+from ..utils.response_capture import capture_product_research_page, enable_resource_blocking
 
 
 class ProductResearchExtractor(BaseExtractor):
@@ -45,7 +56,9 @@ class ProductResearchExtractor(BaseExtractor):
                 "fba": bool,          # FBAのみ（デフォルト: True）
                 "limit": int,         # 取得件数（デフォルト: 100）
                 "market": str,        # 市場（デフォルト: "JP"、他: "US", "UK", "DE"等）
-                "categories": List[str]  # カテゴリリスト（例: ["Health & Household > Healthcare"]）
+                "categories": List[str],  # カテゴリリスト（例: ["Health & Household > Healthcare"]）
+                "capture_mode": str,  # 抽出方式（"dom": テーブルから抽出、"network": APIレスポンスから抽出）
+                "block_resources": bool  # 画像・フォント・解析タグを遮断（デフォルト: False）
             }
         """
         super().__init__("product_research", parameters)
@@ -61,6 +74,9 @@ class ProductResearchExtractor(BaseExtractor):
         self.market = parameters.get("market", "JP")  # デフォルト: 日本市場
         self.node_id_paths = parameters.get("node_id_paths", "[]")  # nodeIdPaths（デフォルト: 空配列）
         self.extract_category_info = parameters.get("extract_category_info", False)  # カテゴリ情報も抽出するか
+        self.capture_mode = parameters.get("capture_mode", "dom")
+        self.block_resources = parameters.get("block_resources", False)
+        self.request_filter = None
 
         # ページネーション対応: 最大2000件（20ページ）まで取得可能
         if self.limit > 2000:
@@ -86,8 +102,20 @@ class ProductResearchExtractor(BaseExtractor):
             product_research_url = self._build_complete_url()
             self.log(f"[URL] アクセス先: {product_research_url}")
 
-            # ページ遷移
             page = controller.page
+
+            if self.block_resources:
+                self.request_filter = await enable_resource_blocking(page)
+
+            # APIレスポンスから抽出（リスト表示切替・行展開・描画待ちが不要）
+            if self.capture_mode == "network":
+                result = await self._extract_via_network(controller, product_research_url)
+                if result is not None:
+                    self.log(f"[OK] {len(result)}件のASINを抽出しました（レスポンスキャプチャ）")
+                    return result
+                self.log("[WARN] レスポンスを取得できなかったためDOM抽出に切り替えます")
+
+            # ページ遷移
             success = await controller.goto(product_research_url, wait_until="domcontentloaded", timeout=30000)
 
             if not success:
@@ -153,8 +181,48 @@ class ProductResearchExtractor(BaseExtractor):
                 self.log(f"[WARN] スクリーンショット保存失敗: {screenshot_error}")
             raise
 
+        finally:
+            # リクエスト遮断の統計を記録
+            if self.request_filter:
+                summary = self.request_filter.record()
+                self.log(f"[INFO] リクエスト遮断: {summary['blocked_total']}件, "
+                         f"削減 約{summary['bytes_saved_estimate'] / 1024 / 1024:.1f}MB")
+
         return asins
 
+    async def _extract_via_network(self, controller: BrowserController, url: str):
+        """
+        商品リサーチAPIのレスポンスからASIN（とカテゴリ情報）を抽出
+
+        Args:
+            controller: BrowserControllerインスタンス
+            url: 商品リサーチURL
+
+        Returns:
+            extract_category_info=True の場合: [{"asin", "category", "nodeIdPaths", "rank"}, ...]
+            それ以外: ASINリスト
+            レスポンスを取得できなかった場合: None
+        """
+        page = controller.page
+        captured = await capture_product_research_page(
+            page, lambda: controller.goto(url, wait_until="domcontentloaded", timeout=30000)
+        )
+        if captured is None:
+            return None
+
+        if 'login' in page.url:
+            raise Exception("セッションが無効です。再ログインが必要です")
+
+        pages_needed = (self.limit + 99) // 100
+        records = await extract_pages_from_responses(
+            page, captured, 1, pages_needed, ContextThrottle(min_interval=0, jitter=0), ''
+        )
+        records = records[:self.limit]
+
+        if self.extract_category_info:
+            return records
+        return list(dict.fromkeys(record['asin'] for record in records))
+
     def _build_complete_url(self) -> str:
         """
         完全なURLを構築（すべてのフィルター条件を含む）
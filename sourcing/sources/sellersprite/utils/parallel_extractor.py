@@ -0,0 +1,471 @@
+"""
+SellerSprite 並列カテゴリ抽出ユーティリティ
+
+同じログイン状態を共有する複数のブラウザコンテキストで、
+優先度付きのカテゴリ作業キューを並列に処理する。
+
+- 固定待機（wait_for_timeout / networkidle + sleep）の代わりに
+  条件ベースの待機（テーブル行の描画・展開行の出現・先頭ASINの変化）を使用
+- コンテキストごとのスロットリング（最小間隔 + ゆらぎ、空ページ時のバックオフ）で
+  短時間の集中アクセスを避ける
+- capture_network=True の場合はDOMではなく商品リサーチAPIのレスポンスから抽出
+  （response_capture.py 参照。キャプチャできない場合はDOM抽出にフォールバック）
+
+使用例:
+    scheduler = ParallelCategoryScheduler(
+        pages=[page1, page2, page3],
+        url_builder=lambda node_id_paths: build_product_research_url(...),
+        should_stop=lambda: len(found) >= target
+    )
+    for priority, task in enumerate(tasks):
+        scheduler.add_task(CategoryTask(...), priority)
+    await scheduler.run(on_result=handle_result)
+"""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from typing import List, Dict, Optional, Callable, Awaitable, Any
+
+from sourcing.sources.sellersprite.utils.category_extractor import log
+from sourcing.sources.sellersprite.utils.response_capture import capture_product_research_page
+
+
+# 1ページあたりの件数（SellerSprite商品リサーチ）
+ITEMS_PER_PAGE = 100
+
+# SellerSpriteで参照可能な最大ページ数
+MAX_PAGES = 20
+
+# 条件待機のタイムアウト（ミリ秒）
+TABLE_TIMEOUT_MS = 30000
+EXPAND_TIMEOUT_MS = 10000
+PAGINATION_TIMEOUT_MS = 30000
+
+# コンテキストごとのスロットリング（秒）
+DEFAULT_MIN_INTERVAL = 2.0
+DEFAULT_JITTER = 1.0
+MAX_INTERVAL = 30.0
+
+
+# テーブルにASIN行が描画されたか
+_TABLE_READY_JS = '''() => {
+    const tbody = document.querySelector('table tbody');
+    return !!tbody && /ASIN:\\s*[A-Z0-9]{10}/.test(tbody.textContent || '');
+}'''
+
+# 先頭行のASIN
+_FIRST_ASIN_JS = '''() => {
+    const tbody = document.querySelector('table tbody');
+    const m = tbody ? (tbody.textContent || '').match(/ASIN:\\s*([A-Z0-9]{10})/) : null;
+    return m ? m[1] : null;
+}'''
+
+# 先頭行のASINが変化したか（ページ遷移完了の判定）
+_FIRST_ASIN_CHANGED_JS = '''(prev) => {
+    const tbody = document.querySelector('table tbody');
+    const m = tbody ? (tbody.textContent || '').match(/ASIN:\\s*([A-Z0-9]{10})/) : null;
+    return !!m && m[1] !== prev;
+}'''
+
+# 未展開の行を全て展開
+_EXPAND_ROWS_JS = '''() => {
+    const expandButtons = document.querySelectorAll('td.el-table__expand-column .el-table__expand-icon');
+    let clickedCount = 0;
+
+    expandButtons.forEach(button => {
+        if (!button.classList.contains('el-table__expand-icon--expanded')) {
+            button.click();
+            clickedCount++;
+        }
+    });
+
+    return {
+        total: expandButtons.length,
+        clicked: clickedCount
+    };
+}'''
+
+# 展開行（カテゴリ情報）が指定数描画されたか
+_EXPANDED_READY_JS = '''(expected) => {
+    return document.querySelectorAll('.table-expand .product-type').length >= expected;
+}'''
+
+# ASINと最深カテゴリ・nodeIdPathsを抽出
+_EXTRACT_ROWS_JS = '''() => {
+    const data = [];
+    const rows = Array.from(document.querySelectorAll('table tbody tr'));
+
+    let currentAsin = null;
+
+    rows.forEach((row) => {
+        const rowText = row.textContent || '';
+        const asinMatch = rowText.match(/ASIN:\\s*([A-Z0-9]{10})/);
+
+        if (asinMatch) {
+            currentAsin = asinMatch[1];
+        }
+
+        const tableExpand = row.querySelector('.table-expand');
+        if (tableExpand && currentAsin) {
+            let categories = [];
+            let nodeIdPaths = '';
+
+            const productType = tableExpand.querySelector('.product-type');
+            if (productType) {
+                const categoryLinks = productType.querySelectorAll('a.type');
+
+                categoryLinks.forEach((link, linkIndex) => {
+                    const categoryName = link.textContent.trim();
+                    if (categoryName) {
+                        categories.push(categoryName);
+                    }
+
+                    if (linkIndex === categoryLinks.length - 1 && link.href) {
+                        try {
+                            const url = new URL(link.href, window.location.origin);
+                            const nodeIdPathsParam = url.searchParams.get('nodeIdPaths');
+                            if (nodeIdPathsParam) {
+                                nodeIdPaths = nodeIdPathsParam;
+                            }
+                        } catch (e) {
+                            // URLパースエラーは無視
+                        }
+                    }
+                });
+            }
+
+            data.push({
+                asin: currentAsin,
+                category: categories.join(' > '),
+                nodeIdPaths: nodeIdPaths
+            });
+
+            currentAsin = null;
+        }
+    });
+
+    return data;
+}'''
+
+
+class ContextThrottle:
+    """
+    コンテキスト単位のリクエスト間隔制御
+
+    前回のページ取得から min_interval（+ ランダムなゆらぎ）が経過するまで待機する。
+    空ページ・エラー時は間隔を倍にし（上限 MAX_INTERVAL）、成功時は元に戻す。
+    """
+
+    def __init__(self, min_interval: float = DEFAULT_MIN_INTERVAL, jitter: float = DEFAULT_JITTER):
+        self.base_interval = min_interval
+        self.interval = min_interval
+        self.jitter = jitter
+        self._last_request = 0.0
+
+    async def wait(self):
+        """次のリクエストまで待機"""
+        delay = self._last_request + self.interval + random.uniform(0, self.jitter) - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        self._last_request = time.monotonic()
+
+    def backoff(self):
+        """間隔を延ばす（空ページ・エラー時）"""
+        self.interval = min(self.interval * 2, MAX_INTERVAL)
+
+    def reset(self):
+        """間隔を元に戻す"""
+        self.interval = self.base_interval
+
+
+async def wait_for_table(page, timeout_ms: int = TABLE_TIMEOUT_MS) -> bool:
+    """
+    商品テーブルにASIN行が描画されるまで待機
+
+    Returns:
+        bool: 描画された場合True（タイムアウト = 0件の可能性）
+    """
+    try:
+        await page.wait_for_function(_TABLE_READY_JS, timeout=timeout_ms)
+        return True
+    except Exception:
+        return False
+
+
+async def switch_to_list_view(page):
+    """表示スタイルを「リスト」に切り替え（展開列の出現まで待機）"""
+    try:
+        list_button = page.locator('div.el-button-group button').filter(has_text="リスト").first
+        if await list_button.count() == 0:
+            return
+
+        button_text = await list_button.text_content()
+        if button_text and button_text.strip() == "リスト":
+            await list_button.click()
+            try:
+                await page.wait_for_selector('td.el-table__expand-column', timeout=5000)
+            except Exception:
+                log("[WARN] リスト表示の描画を確認できませんでした。続行します。")
+    except Exception as e:
+        log(f"[WARN] リスト表示への切り替えエラー: {e}")
+
+
+async def expand_and_extract(page) -> List[Dict[str, str]]:
+    """
+    現在のページの全行を展開してASIN・カテゴリを抽出
+
+    展開行の描画数が展開ボタン数に達するまで待機する（固定待機なし）。
+    """
+    expand_result = await page.evaluate(_EXPAND_ROWS_JS)
+
+    if expand_result['total'] > 0:
+        try:
+            await page.wait_for_function(
+                _EXPANDED_READY_JS, arg=expand_result['total'], timeout=EXPAND_TIMEOUT_MS
+            )
+        except Exception:
+            log(f"    [WARN] 展開行の描画待機がタイムアウトしました（取得できた分のみ抽出）")
+
+    return await page.evaluate(_EXTRACT_ROWS_JS)
+
+
+async def go_to_next_page(page) -> bool:
+    """
+    次のページへ移動（先頭ASINの変化で遷移完了を判定）
+
+    Returns:
+        bool: 移動できた場合True
+    """
+    next_button = page.locator('button.btn-next:not([disabled])')
+    if await next_button.count() == 0:
+        return False
+
+    first_asin = await page.evaluate(_FIRST_ASIN_JS)
+    await next_button.click()
+    await page.wait_for_function(_FIRST_ASIN_CHANGED_JS, arg=first_asin, timeout=PAGINATION_TIMEOUT_MS)
+    return True
+
+
+async def extract_pages_from_responses(
+    page,
+    first_page: tuple,
+    start_page: int,
+    end_page: int,
+    throttle: ContextThrottle,
+    label: str
+) -> List[Dict[str, Any]]:
+    """
+    1ページ目のレスポンス以降、次ページボタンで発生するレスポンスを順に取得
+
+    Args:
+        first_page: 1ページ目の (records, total)
+
+    Returns:
+        start_page〜end_page のレコード
+    """
+    all_data = []
+    records, total = first_page
+
+    for page_num in range(1, end_page + 1):
+        if page_num >= start_page:
+            log(f"  {label}ページ {page_num}/{end_page}: {len(records)}件取得（レスポンス）")
+            all_data.extend(records)
+
+        if page_num == end_page or (total is not None and page_num * ITEMS_PER_PAGE >= total):
+            break
+
+        # ページャーの描画はレスポンス受信より後になるため、表示まで待つ
+        next_button = page.locator('button.btn-next:not([disabled])').first
+        try:
+            await next_button.wait_for(state='visible', timeout=5000)
+        except Exception:
+            log(f"  {label}[INFO] 最終ページに到達しました（{page_num}ページ）")
+            break
+
+        await throttle.wait()
+        captured = await capture_product_research_page(page, next_button.click)
+        if captured is None:
+            throttle.backoff()
+            break
+        throttle.reset()
+        records, total = captured[0], captured[1] if captured[1] is not None else total
+
+    return all_data
+
+
+async def extract_category_pages(
+    page,
+    url: str,
+    start_page: int,
+    end_page: int,
+    throttle: Optional[ContextThrottle] = None,
+    label: str = '',
+    capture_network: bool = False
+) -> List[Dict[str, str]]:
+    """
+    カテゴリの商品リサーチページから指定ページ範囲のASINを抽出
+
+    Args:
+        page: Playwrightページオブジェクト
+        url: 商品リサーチURL（nodeIdPaths指定済み）
+        start_page: 開始ページ（1-20）
+        end_page: 終了ページ（1-20）
+        throttle: コンテキストのスロットル（省略時は制御なし）
+        label: ログ用ラベル（ワーカー名など）
+        capture_network: 商品リサーチAPIのレスポンスから抽出する
+
+    Returns:
+        [{"asin": "B00XXXXX", "category": "...", "nodeIdPaths": "..."}, ...]
+        （capture_network時は "rank" も含む）
+    """
+    throttle = throttle or ContextThrottle(min_interval=0, jitter=0)
+    end_page = min(end_page, MAX_PAGES)
+    all_data = []
+
+    await throttle.wait()
+
+    if capture_network:
+        captured = await capture_product_research_page(
+            page, lambda: page.goto(url, wait_until="domcontentloaded", timeout=30000)
+        )
+        if captured is not None:
+            return await extract_pages_from_responses(page, captured, start_page, end_page, throttle, label)
+        log(f"  {label}[WARN] レスポンスを取得できなかったためDOM抽出に切り替えます")
+    else:
+        await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+
+    if not await wait_for_table(page):
+        log(f"  {label}[WARN] 商品テーブルが表示されません（該当0件またはアクセス制限の可能性）")
+        throttle.backoff()
+        return all_data
+
+    await switch_to_list_view(page)
+
+    # 開始ページまで移動
+    for _ in range(start_page - 1):
+        await throttle.wait()
+        if not await go_to_next_page(page):
+            log(f"  {label}[WARN] 次のページボタンが見つかりません（開始ページに到達できません）")
+            return all_data
+
+    for page_num in range(start_page, end_page + 1):
+        data_on_page = await expand_and_extract(page)
+        log(f"  {label}ページ {page_num}/{end_page}: {len(data_on_page)}件抽出")
+        all_data.extend(data_on_page)
+
+        if not data_on_page:
+            throttle.backoff()
+            break
+        throttle.reset()
+
+        if page_num < end_page:
+            await throttle.wait()
+            try:
+                if not await go_to_next_page(page):
+                    log(f"  {label}[INFO] 最終ページに到達しました（{page_num}ページ）")
+                    break
+            except Exception as e:
+                log(f"  {label}[WARN] ページネーションエラー: {e}")
+                throttle.backoff()
+                break
+
+    return all_data
+
+
+@dataclass
+class CategoryTask:
+    """カテゴリ抽出タスク"""
+    category_name: str
+    node_id_paths: str
+    start_page: int
+    end_page: int
+    info: Dict[str, Any]
+
+
+class ParallelCategoryScheduler:
+    """
+    優先度付きカテゴリ作業キューを複数ページ（コンテキスト）で並列処理するスケジューラ
+
+    各ワーカーは自分のページとスロットルを持ち、キューからカテゴリを取り出して
+    extract_category_pages を実行し、結果を on_result コールバックに渡す。
+    コールバックは同一イベントループ上で逐次実行されるため、
+    共有状態（既出ASINセット・履歴）の更新にロックは不要。
+    """
+
+    def __init__(
+        self,
+        pages: List[Any],
+        url_builder: Callable[[str], str],
+        should_stop: Optional[Callable[[], bool]] = None,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        jitter: float = DEFAULT_JITTER,
+        capture_network: bool = False
+    ):
+        """
+        Args:
+            pages: ワーカーごとのPlaywrightページ
+            url_builder: nodeIdPaths から商品リサーチURLを作成する関数
+            should_stop: Trueを返したら新しいタスクを取り出さない（目標達成判定）
+            min_interval: コンテキストごとの最小リクエスト間隔（秒）
+            jitter: 間隔に加えるランダムなゆらぎの最大値（秒）
+            capture_network: 商品リサーチAPIのレスポンスから抽出する
+        """
+        self.pages = pages
+        self.url_builder = url_builder
+        self.should_stop = should_stop or (lambda: False)
+        self.capture_network = capture_network
+        self.throttles = [ContextThrottle(min_interval, jitter) for _ in pages]
+        self.queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._seq = 0
+
+    def add_task(self, task: CategoryTask, priority: float = 0):
+        """タスクを追加（priorityが小さいほど先に処理）"""
+        self.queue.put_nowait((priority, self._seq, task))
+        self._seq += 1
+
+    async def run(self, on_result: Callable[[CategoryTask, List[Dict[str, str]]], Awaitable[None]]):
+        """
+        全ワーカーを起動してキューが空になるまで（または should_stop まで）処理
+
+        Args:
+            on_result: タスク完了時のコールバック（task, data）
+        """
+        workers = [
+            asyncio.create_task(self._worker(i, page, self.throttles[i], on_result))
+            for i, page in enumerate(self.pages)
+        ]
+        await asyncio.gather(*workers)
+
+    async def _worker(self, index: int, page, throttle: ContextThrottle, on_result):
+        """ワーカー: キューからタスクを取り出して処理"""
+        label = f"[W{index + 1}] "
+
+        # 同時アクセスを避けるため起動をずらす
+        await asyncio.sleep(index * throttle.base_interval)
+
+        while not self.should_stop():
+            try:
+                _, _, task = self.queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+
+            log(f"{label}カテゴリ: {task.category_name}（{task.start_page}〜{task.end_page}ページ）")
+
+            try:
+                data = await extract_category_pages(
+                    page,
+                    self.url_builder(task.node_id_paths),
+                    task.start_page,
+                    task.end_page,
+                    throttle=throttle,
+                    label=label,
+                    capture_network=self.capture_network
+                )
+            except Exception as e:
+                log(f"{label}[ERROR] カテゴリ抽出エラー: {e}")
+                throttle.backoff()
+                data = []
+
+            await on_result(task, data)
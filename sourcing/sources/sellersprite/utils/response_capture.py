@@ -0,0 +1,225 @@
+"""
+SellerSprite 商品リサーチ レスポンスキャプチャ
+
+商品リサーチページが読み込むXHR/JSONレスポンスを横取りして、
+ASIN・カテゴリ・ランキングを直接取得する（DOMスクレイピングの代替）。
+
+- リスト表示への切り替え・行の展開・描画待ちが不要
+- 1ページ = 1回のネットワーク往復
+- 画像・フォント・解析タグのリクエストを遮断するオプション付き
+  （common/browser/request_filter.py の 'sellersprite' プロファイルを使用）
+
+レスポンスのJSON構造は公開仕様ではないため、ASINを持つオブジェクトの配列を
+再帰的に探索し、既知のキー名候補からカテゴリ・nodeIdPath・ランクを読み取る。
+キャプチャできなかった場合、呼び出し側はDOM抽出にフォールバックすること。
+
+使用例:
+    request_filter = await enable_resource_blocking(page)
+    records = await capture_product_research_page(
+        page, lambda: page.goto(url, wait_until="domcontentloaded")
+    )
+"""
+
+import json
+import re
+from typing import List, Dict, Any, Optional, Callable, Awaitable, Tuple
+
+from common.browser.request_filter import RequestFilter
+from sourcing.sources.sellersprite.utils.category_extractor import log
+
+
+# 商品リサーチAPIとみなすURLの部分文字列
+PRODUCT_RESEARCH_URL_PATTERNS = ('product-research',)
+
+# レスポンス待機のタイムアウト（ミリ秒）
+RESPONSE_TIMEOUT_MS = 30000
+
+# リクエスト遮断プロファイル名（config/request_filter_profiles.json）
+REQUEST_FILTER_PROFILE = 'sellersprite'
+
+# キー名候補（大文字小文字は区別しない）
+_CATEGORY_KEYS = ('nodelabelpath', 'nodelabelpathlocale', 'categorypath', 'category')
+_NODE_ID_KEYS = ('nodeidpath', 'nodeidpaths')
+_RANK_KEYS = ('bsrrank', 'bsr', 'rank')
+_TOTAL_KEYS = ('total', 'totalcount', 'total_count')
+
+_ASIN_RE = re.compile(r'^[A-Z0-9]{10}$')
+
+
+async def enable_resource_blocking(
+    page,
+    profile: str = REQUEST_FILTER_PROFILE,
+    task_name: Optional[str] = None
+) -> RequestFilter:
+    """
+    画像・フォント・解析タグ等のリクエストを遮断
+
+    Args:
+        page: Playwrightページオブジェクト
+        profile: 遮断プロファイル名
+        task_name: 遮断統計のタスク名（デフォルト: 実行スクリプト名）
+
+    Returns:
+        RequestFilter: 遮断件数・削減バイト数の集計（終了時に record() で記録する）
+    """
+    request_filter = RequestFilter.for_platform(profile, task_name=task_name)
+    await request_filter.install(page)
+    return request_filter
+
+
+def _is_product_research_response(response) -> bool:
+    """商品リサーチAPIのXHR/fetchレスポンスか"""
+    request = response.request
+    return (
+        request.resource_type in ('xhr', 'fetch')
+        and any(p in response.url for p in PRODUCT_RESEARCH_URL_PATTERNS)
+        and 'json' in (response.headers.get('content-type') or '')
+    )
+
+
+async def capture_product_research_page(
+    page,
+    trigger: Callable[[], Awaitable[Any]],
+    timeout_ms: int = RESPONSE_TIMEOUT_MS
+) -> Optional[Tuple[List[Dict[str, Any]], Optional[int]]]:
+    """
+    trigger（ページ遷移・次ページボタンのクリック）で発生する商品リサーチAPIの
+    レスポンスを1件待ち受けてパースする
+
+    Args:
+        page: Playwrightページオブジェクト
+        trigger: レスポンスを発生させる操作
+        timeout_ms: 待機タイムアウト（ミリ秒）
+
+    Returns:
+        (records, total) または None（キャプチャできなかった場合）
+    """
+    try:
+        async with page.expect_response(_is_product_research_response, timeout=timeout_ms) as response_info:
+            await trigger()
+        response = await response_info.value
+        payload = await response.json()
+    except Exception as e:
+        log(f"    [WARN] 商品リサーチAPIのレスポンスを取得できませんでした: {e}")
+        return None
+
+    records = parse_product_research_payload(payload)
+    if not records:
+        log(f"    [WARN] レスポンスから商品データを検出できませんでした: {response.url}")
+        return None
+
+    return records, _find_total(payload)
+
+
+def parse_product_research_payload(payload: Any) -> List[Dict[str, Any]]:
+    """
+    商品リサーチAPIのJSONから候補レコードを作成
+
+    Args:
+        payload: レスポンスJSON
+
+    Returns:
+        [{"asin": "B00XXXXX", "category": "...", "nodeIdPaths": "...", "rank": int|None}, ...]
+    """
+    items = _find_item_list(payload)
+    if not items:
+        return []
+
+    records = []
+    for item in items:
+        lowered = {str(k).lower(): v for k, v in item.items()}
+        asin = str(lowered.get('asin') or '').strip().upper()
+        if not _ASIN_RE.match(asin):
+            continue
+
+        node_id_path = _first_value(lowered, _NODE_ID_KEYS)
+        category = _normalize_category(_first_value(lowered, _CATEGORY_KEYS), node_id_path)
+
+        records.append({
+            'asin': asin,
+            'category': category,
+            'nodeIdPaths': _to_node_id_paths_param(node_id_path),
+            'rank': _to_int(_first_value(lowered, _RANK_KEYS)),
+        })
+
+    return records
+
+
+def _find_item_list(node: Any, depth: int = 0) -> Optional[List[Dict[str, Any]]]:
+    """ASINキーを持つオブジェクトの配列を再帰的に探索"""
+    if depth > 6:
+        return None
+
+    if isinstance(node, list):
+        dicts = [x for x in node if isinstance(x, dict)]
+        if dicts and any('asin' in (str(k).lower() for k in d) for d in dicts):
+            return dicts
+        children = node
+    elif isinstance(node, dict):
+        children = node.values()
+    else:
+        return None
+
+    for child in children:
+        if isinstance(child, (list, dict)):
+            found = _find_item_list(child, depth + 1)
+            if found:
+                return found
+    return None
+
+
+def _find_total(node: Any, depth: int = 0) -> Optional[int]:
+    """総件数を探索"""
+    if depth > 3 or not isinstance(node, dict):
+        return None
+    for key, value in node.items():
+        if str(key).lower() in _TOTAL_KEYS:
+            total = _to_int(value)
+            if total is not None:
+                return total
+    for value in node.values():
+        total = _find_total(value, depth + 1)
+        if total is not None:
+            return total
+    return None
+
+
+def _first_value(lowered: Dict[str, Any], keys: Tuple[str, ...]) -> Any:
+    for key in keys:
+        value = lowered.get(key)
+        if value not in (None, '', []):
+            return value
+    return None
+
+
+def _normalize_category(value: Any, node_id_path: Any) -> str:
+    """カテゴリ階層を 'A > B > C' 形式に揃える（DOM抽出と同じ形式）"""
+    if not value:
+        return ''
+    if isinstance(value, list):
+        return ' > '.join(str(v).strip() for v in value if str(v).strip())
+
+    value = str(value).strip()
+    # ':' 区切りのラベルは nodeIdPath と階層数が一致する場合のみ分割
+    if ':' in value and isinstance(node_id_path, str) and value.count(':') == node_id_path.count(':'):
+        return ' > '.join(part.strip() for part in value.split(':'))
+    return value
+
+
+def _to_node_id_paths_param(node_id_path: Any) -> str:
+    """nodeIdPath をURLパラメータ nodeIdPaths の形式（JSON配列文字列）に変換"""
+    if not node_id_path:
+        return ''
+    if isinstance(node_id_path, list):
+        return json.dumps([str(p) for p in node_id_path])
+    node_id_path = str(node_id_path)
+    if node_id_path.startswith('['):
+        return node_id_path
+    return json.dumps([node_id_path])
+
+
+def _to_int(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,39 @@
+"""
+モジュール読み込み時間のテスト
+
+benchmarks/import_time.py と同じチェック（予算・禁止モジュール）を対象ごとに実行する。
+遅い環境では環境変数 ECAUTO_IMPORT_BUDGET_SCALE で予算を調整する（例: 2）。
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from benchmarks.import_time import TARGETS, check, measure
+
+BUDGET_SCALE = float(os.getenv('ECAUTO_IMPORT_BUDGET_SCALE', '1.0'))
+REPEAT = 3
+
+
+@pytest.fixture(scope='module')
+def startup_modules():
+    """インタプリタの起動時に読み込まれるモジュール（チェック対象外）"""
+    _, modules = measure()
+    return set(modules)
+
+
+@pytest.mark.parametrize('module', list(TARGETS))
+def test_import_within_budget(module, startup_modules):
+    result = check(module, TARGETS[module], REPEAT, BUDGET_SCALE, startup_modules)
+
+    assert not result['forbidden'], (
+        f"{module} が禁止モジュールを読み込んでいます: {', '.join(result['forbidden'])}"
+    )
+    assert result['ms'] <= result['budget_ms'], (
+        f"{module} の読み込み時間 {result['ms']:.1f}ms が予算 {result['budget_ms']:.0f}ms を超えています"
+    )
@@ -1,10 +1,27 @@
-"""アクティブアカウントフィルタリングの検証スクリプト"""
+"""
+アクティブアカウントフィルタリングの検証スクリプト
+
+使用例:
+    python verify_active_account_filter.py
+
+    # 稼働中の master.db ではなく分析用スナップショットを読む
+    # （事前に python inventory/scripts/export_snapshot.py を実行）
+    python verify_active_account_filter.py --snapshot
+"""
+import sys
 import sqlite3
+import argparse
 from pathlib import Path
 
 # データベースパス
 project_root = Path(__file__).resolve().parent
 db_path = project_root / 'inventory' / 'data' / 'master.db'
+sys.path.insert(0, str(project_root))
+
+parser = argparse.ArgumentParser(description='アクティブアカウントフィルタリングの検証')
+parser.add_argument('--snapshot', action='store_true',
+                    help='分析用スナップショット（export_snapshot.py で作成）の listings / upload_queue を読む')
+args = parser.parse_args()
 
 # テストしたASINs
 test_asins = ['B0BXWF22P9', 'B09Q1MR3D2', 'B0BLV2CZ8M']
@@ -15,9 +32,18 @@ print("=" * 70)
 print(f"\nテスト対象ASIN: {', '.join(test_asins)}")
 print(f"期待されるアカウント: base_account_2 のみ\n")
 
-# データベース接続
-with sqlite3.connect(db_path) as conn:
+# データベース接続（スナップショットの場合はメモリ上のSQLiteに読み込んで同じSQLを実行）
+if args.snapshot:
+    from inventory.core.snapshot_store import SnapshotReader
+
+    reader = SnapshotReader()
+    print(f"スナップショット: {reader.snapshot_dir}（{reader.info('listings')['exported_at']} 時点）\n")
+    conn = reader.to_sqlite(['listings', 'upload_queue'])
+else:
+    conn = sqlite3.connect(db_path)
     conn.row_factory = sqlite3.Row
+
+with conn:
     cursor = conn.cursor()
 
     # listingsテーブルを確認